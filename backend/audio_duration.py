@@ -0,0 +1,218 @@
+"""
+오디오 길이 조회 서비스
+세그먼트 길이 계획에 쓰는 TTS 길이를 FFmpeg 실행 없이 파일 헤더에서 읽는다.
+- MP3: Xing/Info(VBR) 또는 VBRI 헤더의 프레임 수, 없으면 프레임 헤더를 따라가며 샘플 수 합산
+- WAV: RIFF fmt/data 청크 (바이트 레이트와 데이터 크기)
+- 그 외 또는 해석 실패 시에만 ffprobe (media_probe 캐시)
+결과는 경로 + 크기 + 수정 시각 기준으로 메모하고, TTS 캐시 항목에는 길이를 함께 저장한다.
+"""
+
+import os
+import struct
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from media_probe import media_duration
+from utils.logger_config import get_logger
+
+logger = get_logger('audio_duration')
+
+DURATION_MEMO_SIZE = int(os.getenv('DURATION_MEMO_SIZE', '2048'))
+
+# MPEG 오디오 헤더 테이블 (kbps) - [MPEG1/2] [Layer I/II/III]
+_BITRATES = {
+    (1, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (1, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (1, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (2, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (2, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (2, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_SAMPLE_RATES = {1: [44100, 48000, 32000], 2: [22050, 24000, 16000], 25: [11025, 12000, 8000]}
+
+
+def _parse_frame_header(header: bytes) -> Optional[Dict[str, int]]:
+    """MPEG 오디오 프레임 헤더 4바이트 해석 (유효하지 않으면 None)"""
+    if len(header) < 4:
+        return None
+    b1, b2, b3 = header[1], header[2], header[3]
+    if header[0] != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+
+    version_bits = (b1 >> 3) & 0x03   # 0: MPEG2.5, 2: MPEG2, 3: MPEG1
+    layer_bits = (b1 >> 1) & 0x03     # 1: Layer III, 2: Layer II, 3: Layer I
+    bitrate_index = (b2 >> 4) & 0x0F
+    sample_rate_index = (b2 >> 2) & 0x03
+    if version_bits == 1 or layer_bits == 0 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+
+    version = {3: 1, 2: 2, 0: 25}[version_bits]
+    layer = 4 - layer_bits
+    bitrate = _BITRATES[(1 if version == 1 else 2, layer)][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version][sample_rate_index]
+    padding = (b2 >> 1) & 0x01
+    mono = ((b3 >> 6) & 0x03) == 3
+
+    if layer == 1:
+        samples = 384
+        frame_length = (12 * bitrate // sample_rate + padding) * 4
+    else:
+        samples = 1152 if (layer == 2 or version == 1) else 576
+        frame_length = samples // 8 * bitrate // sample_rate + padding
+
+    return {'version': version, 'layer': layer, 'sample_rate': sample_rate,
+            'samples': samples, 'frame_length': frame_length, 'mono': mono}
+
+
+def mp3_duration(path: str) -> Optional[float]:
+    """MP3 길이 (초) - 헤더만 읽음, 해석 실패 시 None"""
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    offset = 0
+    # ID3v2 태그 건너뛰기 (synchsafe 크기)
+    if data[:3] == b'ID3' and len(data) >= 10:
+        size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        offset = 10 + size + (10 if data[5] & 0x10 else 0)
+    end = len(data) - (128 if data[-128:-125] == b'TAG' else 0)
+
+    # 첫 번째 유효 프레임 찾기 (다음 프레임 헤더까지 확인해 오탐 방지)
+    first = None
+    while offset < min(end, 64 * 1024):
+        if data[offset] == 0xFF:
+            header = _parse_frame_header(data[offset:offset + 4])
+            if header and header['frame_length'] > 0:
+                next_offset = offset + header['frame_length']
+                if next_offset >= end or _parse_frame_header(data[next_offset:next_offset + 4]):
+                    first = header
+                    break
+        offset += 1
+    if first is None:
+        return None
+
+    # Xing/Info 헤더 (side info 크기 뒤) 또는 VBRI 헤더 (32바이트 뒤)의 전체 프레임 수
+    side_info = (17 if first['mono'] else 32) if first['version'] == 1 else (9 if first['mono'] else 17)
+    xing_offset = offset + 4 + side_info
+    if data[xing_offset:xing_offset + 4] in (b'Xing', b'Info'):
+        flags = struct.unpack('>I', data[xing_offset + 4:xing_offset + 8])[0]
+        if flags & 0x01:
+            frames = struct.unpack('>I', data[xing_offset + 8:xing_offset + 12])[0]
+            return frames * first['samples'] / first['sample_rate']
+    vbri_offset = offset + 4 + 32
+    if data[vbri_offset:vbri_offset + 4] == b'VBRI':
+        frames = struct.unpack('>I', data[vbri_offset + 14:vbri_offset + 18])[0]
+        return frames * first['samples'] / first['sample_rate']
+
+    # 헤더가 없으면(CBR) 프레임을 따라가며 샘플 수 합산
+    total_samples = 0
+    sample_rate = first['sample_rate']
+    while offset + 4 <= end:
+        header = _parse_frame_header(data[offset:offset + 4])
+        if header is None or header['frame_length'] <= 0:
+            break
+        total_samples += header['samples']
+        offset += header['frame_length']
+    return total_samples / sample_rate if total_samples else None
+
+
+def wav_duration(path: str) -> Optional[float]:
+    """WAV 길이 (초) - RIFF fmt/data 청크만 읽음 (PCM/float 모두), 해석 실패 시 None"""
+    with open(path, 'rb') as f:
+        riff = f.read(12)
+        if len(riff) < 12 or riff[:4] != b'RIFF' or riff[8:12] != b'WAVE':
+            return None
+        byte_rate = None
+        file_size = os.path.getsize(path)
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                return None
+            chunk_id, chunk_size = chunk[:4], struct.unpack('<I', chunk[4:])[0]
+            if chunk_id == b'fmt ':
+                fmt = f.read(chunk_size)
+                byte_rate = struct.unpack('<I', fmt[8:12])[0]
+                if chunk_size % 2:
+                    f.seek(1, os.SEEK_CUR)
+            elif chunk_id == b'data':
+                if not byte_rate:
+                    return None
+                # 스트리밍으로 쓴 WAV는 data 크기가 0 또는 최대값일 수 있음 → 실제 남은 크기 사용
+                data_size = min(chunk_size, file_size - f.tell()) if chunk_size else file_size - f.tell()
+                return data_size / byte_rate
+            else:
+                f.seek(chunk_size + (chunk_size % 2), os.SEEK_CUR)
+
+
+class AudioDurationService:
+    """오디오 길이 조회 + 메모 (헤더 해석 → 실패 시 ffprobe)"""
+
+    def __init__(self, memo_size: int = DURATION_MEMO_SIZE):
+        self.memo_size = memo_size
+        self.lock = threading.Lock()
+        self.memo: 'OrderedDict[tuple, float]' = OrderedDict()
+        self.stats = {'memo': 0, 'header': 0, 'probe': 0, 'failed': 0}
+
+    def _key(self, path: str) -> Optional[tuple]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (os.path.realpath(path), stat.st_size, stat.st_mtime)
+
+    def remember(self, path: str, duration: Optional[float]):
+        """이미 알고 있는 길이 등록 (TTS 캐시에 저장된 길이 등)"""
+        key = self._key(path)
+        if key is None or not duration or duration <= 0:
+            return
+        with self.lock:
+            self.memo[key] = duration
+            self.memo.move_to_end(key)
+            while len(self.memo) > self.memo_size:
+                self.memo.popitem(last=False)
+
+    def read_header(self, path: str) -> Optional[float]:
+        """파일 헤더에서 길이 읽기 (메모/프로브 없이)"""
+        extension = os.path.splitext(path)[1].lower()
+        try:
+            if extension == '.mp3':
+                return mp3_duration(path)
+            if extension == '.wav':
+                return wav_duration(path)
+        except Exception as e:
+            logger.debug(f"오디오 헤더 해석 실패 ({os.path.basename(path)}): {e}")
+        return None
+
+    def get_duration(self, path: str) -> Optional[float]:
+        """오디오 길이 (초) - 알 수 없으면 None"""
+        key = self._key(path)
+        if key is None:
+            return None
+        with self.lock:
+            cached = self.memo.get(key)
+            if cached is not None:
+                self.stats['memo'] += 1
+                return cached
+
+        duration = self.read_header(path)
+        source = 'header'
+        if not duration:
+            duration = media_duration(path)
+            source = 'probe'
+        if not duration:
+            with self.lock:
+                self.stats['failed'] += 1
+            return None
+
+        with self.lock:
+            self.stats[source] += 1
+        self.remember(path, duration)
+        return duration
+
+    def get_stats(self) -> Dict[str, int]:
+        with self.lock:
+            return dict(self.stats, memo_entries=len(self.memo))
+
+
+# 전역 서비스 인스턴스
+audio_duration = AudioDurationService()
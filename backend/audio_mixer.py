@@ -0,0 +1,200 @@
+"""
+오디오 믹싱 단계
+TTS 나레이션(정확한 오프셋), 배경음악/원본 비디오 소리(반복·자르기), 더킹, 라우드니스 정규화를
+FFmpeg filter_complex 한 번으로 렌더해 오디오 파일 1개를 만들고,
+영상은 재인코딩 없이(-c:v copy) 그 오디오와 합친다.
+MoviePy 합성 오디오는 인코딩 중 청크마다 모든 소스를 다시 읽으므로 이를 대체한다.
+"""
+
+import os
+import subprocess
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from utils.logger_config import get_logger
+from utils.stage_timer import stage_span
+
+logger = get_logger('audio_mixer')
+
+AUDIO_MIX_ENGINE = os.getenv('AUDIO_MIX_ENGINE', 'ffmpeg')            # ffmpeg / moviepy
+AUDIO_DUCKING = os.getenv('AUDIO_DUCKING', 'fixed')                   # fixed / sidechain
+AUDIO_LOUDNORM = os.getenv('AUDIO_LOUDNORM', 'false').lower() == 'true'
+AUDIO_LOUDNORM_TARGET = float(os.getenv('AUDIO_LOUDNORM_TARGET', '-16'))  # LUFS
+AUDIO_MIX_BITRATE = os.getenv('AUDIO_MIX_BITRATE', '192k')
+
+MIX_SAMPLE_RATE = 44100
+MIX_FORMAT = f"aformat=sample_fmts=fltp:sample_rates={MIX_SAMPLE_RATE}:channel_layouts=stereo"
+PCM_FORMAT = {'sample_fmt': 's16le', 'sample_rate': MIX_SAMPLE_RATE, 'channels': 2}  # 디코딩된 PCM 버퍼 형식
+FFMPEG_TIMEOUT = 300
+
+
+@dataclass
+class AudioInput:
+    """믹서 입력 - 일반 오디오/비디오 파일 또는 디코딩된 PCM 파일(raw_format 지정)"""
+    path: str
+    raw_format: Optional[Dict] = None  # {'sample_fmt': 's16le', 'sample_rate': 44100, 'channels': 2}
+
+    def ffmpeg_args(self, loop: bool = False) -> List[str]:
+        args = ['-stream_loop', '-1'] if loop else []
+        if self.raw_format:
+            args += ['-f', self.raw_format.get('sample_fmt', 's16le'),
+                     '-ar', str(self.raw_format.get('sample_rate', MIX_SAMPLE_RATE)),
+                     '-ac', str(self.raw_format.get('channels', 2))]
+        return args + ['-i', self.path]
+
+
+@dataclass
+class AudioMixPlan:
+    """최종 오디오 구성
+
+    narration: 세그먼트 순서대로 (TTS 경로 또는 None, 길이) - None은 같은 길이의 무음
+    bed: 배경음악 또는 원본 비디오 소리 (영상 길이에 맞춰 반복/자르기)
+    """
+    duration: float
+    narration: List[Tuple[Optional[str], float]] = field(default_factory=list)
+    narration_gain: float = 1.0
+    bed: Optional[AudioInput] = None
+    bed_gain: float = 1.0        # 나레이션과 함께일 때
+    bed_solo_gain: float = 1.0   # 나레이션이 없을 때
+    ducking: str = AUDIO_DUCKING
+    loudnorm: bool = AUDIO_LOUDNORM
+    description: str = ''
+
+    @property
+    def has_narration(self) -> bool:
+        return any(path for path, _ in self.narration)
+
+    @property
+    def is_silent(self) -> bool:
+        return not self.has_narration and self.bed is None
+
+
+def build_filter_graph(plan: AudioMixPlan) -> Tuple[List[str], str, str]:
+    """믹스 계획을 FFmpeg 입력 인자 + filter_complex 문자열로 변환
+
+    Returns:
+        tuple: (입력 인자, filter_complex, 출력 라벨)
+    """
+    input_args: List[str] = []
+    filters: List[str] = []
+    input_index = 0
+    total = f"{plan.duration:.6f}"
+
+    narration_label = None
+    if plan.has_narration:
+        parts = []
+        for k, (path, duration) in enumerate(plan.narration):
+            length = f"{max(duration, 0.0):.6f}"
+            if path:
+                input_args += ['-i', path]
+                # 각 TTS를 정확히 자기 길이로 맞춤 (짧으면 무음 패딩, 길면 자름) → 다음 TTS 시작 위치 고정
+                filters.append(f"[{input_index}:a]{MIX_FORMAT},apad,atrim=0:{length},asetpts=N/SR/TB[n{k}]")
+                input_index += 1
+            else:
+                # TTS 실패/자막 지속 시간 모드 세그먼트: 같은 길이 무음으로 자리 유지
+                filters.append(f"anullsrc=r={MIX_SAMPLE_RATE}:cl=stereo,atrim=0:{length},{MIX_FORMAT}[n{k}]")
+            parts.append(f"[n{k}]")
+        filters.append(f"{''.join(parts)}concat=n={len(parts)}:v=0:a=1,volume={plan.narration_gain}[narr]")
+        narration_label = 'narr'
+
+    bed_label = None
+    if plan.bed is not None:
+        input_args += plan.bed.ffmpeg_args(loop=True)
+        gain = plan.bed_gain if narration_label else plan.bed_solo_gain
+        filters.append(f"[{input_index}:a]{MIX_FORMAT},atrim=0:{total},asetpts=N/SR/TB,volume={gain}[bed]")
+        input_index += 1
+        bed_label = 'bed'
+
+    if narration_label and bed_label:
+        if plan.ducking == 'sidechain':
+            # 나레이션이 나올 때만 배경을 추가로 눌러줌
+            filters.append(f"[{narration_label}]asplit=2[narr_mix][narr_key]")
+            filters.append(f"[{bed_label}][narr_key]sidechaincompress=threshold=0.03:ratio=6:attack=20:release=400[bed_ducked]")
+            filters.append("[narr_mix][bed_ducked]amix=inputs=2:duration=longest:normalize=0[mixed]")
+        else:
+            filters.append(f"[{narration_label}][{bed_label}]amix=inputs=2:duration=longest:normalize=0[mixed]")
+        mixed_label = 'mixed'
+    else:
+        mixed_label = narration_label or bed_label
+
+    # 영상 길이에 정확히 맞춤 + 선택적 라우드니스 정규화
+    tail = f"apad,atrim=0:{total},asetpts=N/SR/TB"
+    if plan.loudnorm:
+        tail += f",loudnorm=I={AUDIO_LOUDNORM_TARGET}:TP=-1.5:LRA=11,aresample={MIX_SAMPLE_RATE}"
+    filters.append(f"[{mixed_label}]{tail}[out]")
+
+    return input_args, ';'.join(filters), 'out'
+
+
+def render_audio_mix(plan: AudioMixPlan, output_path: str) -> Optional[str]:
+    """믹스 계획을 오디오 파일 1개로 렌더 (무음 계획이면 None)
+
+    Raises:
+        RuntimeError: FFmpeg 실패
+    """
+    if plan.is_silent or plan.duration <= 0:
+        return None
+
+    input_args, filter_complex, out_label = build_filter_graph(plan)
+    cmd = (['ffmpeg', '-y', '-loglevel', 'error'] + input_args +
+           ['-filter_complex', filter_complex, '-map', f"[{out_label}]",
+            '-c:a', 'aac', '-b:a', AUDIO_MIX_BITRATE, '-ar', str(MIX_SAMPLE_RATE), output_path])
+
+    with stage_span('audio_mix', inputs=len(plan.narration) + (1 if plan.bed else 0)) as span:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=FFMPEG_TIMEOUT)
+        if result.returncode != 0 or not os.path.exists(output_path):
+            stderr_tail = '\n'.join(result.stderr.strip().split('\n')[-3:]) if result.stderr else ''
+            raise RuntimeError(f"오디오 믹싱 실패 (returncode={result.returncode}): {stderr_tail}")
+        span['bytes'] = os.path.getsize(output_path)
+
+    logger.info(f"🎚️ 오디오 믹싱 완료: {plan.description or '나레이션'} ({plan.duration:.1f}초)")
+    return output_path
+
+
+def mux_audio(video_path: str, audio_path: Optional[str], output_path: str) -> str:
+    """영상 스트림은 그대로 복사하고 믹싱된 오디오만 붙임 (오디오가 없으면 영상만 이동)
+
+    Raises:
+        RuntimeError: FFmpeg 실패
+    """
+    if not audio_path:
+        os.replace(video_path, output_path)
+        return output_path
+
+    cmd = ['ffmpeg', '-y', '-loglevel', 'error',
+           '-i', video_path, '-i', audio_path,
+           '-map', '0:v:0', '-map', '1:a:0',
+           '-c', 'copy', '-movflags', '+faststart',
+           output_path]
+
+    with stage_span('mux') as span:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=FFMPEG_TIMEOUT)
+        if result.returncode != 0 or not os.path.exists(output_path):
+            raise RuntimeError(f"오디오/영상 합치기 실패 (returncode={result.returncode}): {result.stderr.strip()[-300:]}")
+        span['bytes'] = os.path.getsize(output_path)
+
+    return output_path
+
+
+def extract_audio_pcm(source_path: str, output_path: str, max_duration: Optional[float] = None) -> AudioInput:
+    """원본 비디오에서 오디오 스트림만 PCM으로 추출 (비디오 스트림은 디코딩하지 않음)
+
+    반복/자르기는 믹싱 단계에서 이 PCM 버퍼를 입력으로 처리한다.
+
+    Raises:
+        RuntimeError: FFmpeg 실패
+    """
+    cmd = ['ffmpeg', '-y', '-loglevel', 'error', '-vn', '-sn', '-dn', '-i', source_path,
+           '-map', '0:a:0', '-vn']
+    if max_duration:
+        cmd += ['-t', f"{max_duration:.3f}"]  # 영상보다 긴 오디오는 필요한 길이만 디코딩
+    cmd += ['-f', PCM_FORMAT['sample_fmt'], '-ac', str(PCM_FORMAT['channels']), '-ar', str(PCM_FORMAT['sample_rate']),
+            output_path]
+
+    with stage_span('audio_extract', source=os.path.basename(source_path)) as span:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=FFMPEG_TIMEOUT)
+        if result.returncode != 0 or not os.path.exists(output_path) or os.path.getsize(output_path) == 0:
+            raise RuntimeError(f"오디오 추출 실패 (returncode={result.returncode}): {result.stderr.strip()[-300:]}")
+        span['bytes'] = os.path.getsize(output_path)
+
+    return AudioInput(output_path, raw_format=dict(PCM_FORMAT))
@@ -0,0 +1,347 @@
+"""
+BGM 카탈로그
+bgm/<mood> 폴더의 음악을 기동 시 1회 분석해 길이, 통합 라우드니스(LUFS), 믹싱 샘플레이트의 PCM 캐시를 보관
+- 작업마다 폴더를 다시 검색하거나 mp3를 다시 디코딩하지 않음
+- 폴더 변경(추가/삭제/교체)은 폴더 수정 시각으로 감지해 바뀐 파일만 다시 분석
+- 배경음악 더킹 볼륨을 고정 15% 대신 실제 라우드니스로 계산
+"""
+
+import os
+import re
+import json
+import random
+import hashlib
+import threading
+import subprocess
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional
+
+from audio_mixer import AudioInput, MIX_SAMPLE_RATE, PCM_FORMAT
+from utils.logger_config import get_logger
+
+logger = get_logger('bgm_catalog')
+
+BGM_FOLDER = os.getenv('BGM_FOLDER', os.path.join(os.path.dirname(__file__), 'bgm'))
+BGM_CACHE_DIR = os.getenv('BGM_CACHE_DIR', os.path.join(os.path.dirname(__file__), 'bgm_cache'))
+BGM_PCM_CACHE_MB = int(os.getenv('BGM_PCM_CACHE_MB', '1024'))       # 0이면 PCM 캐시 사용 안함
+BGM_CATALOG_POLL_SECONDS = int(os.getenv('BGM_CATALOG_POLL_SECONDS', '30'))
+# 나레이션 기준 라우드니스와, 배경음악을 나레이션보다 얼마나 낮출지 (-14 LUFS 곡에서 기존 15%와 같은 볼륨)
+BGM_NARRATION_LUFS = float(os.getenv('BGM_NARRATION_LUFS', '-16'))
+BGM_DUCK_BELOW_NARRATION_DB = float(os.getenv('BGM_DUCK_BELOW_NARRATION_DB', '14.5'))
+BGM_DEFAULT_DUCK_GAIN = 0.15
+
+VALID_MOODS = ["bright", "calm", "romantic", "sad", "suspense"]
+MOOD_DISPLAY_NAMES = {
+    "bright": "밝은 음악",
+    "calm": "차분한 음악",
+    "romantic": "로맨틱한 음악",
+    "sad": "슬픈 음악",
+    "suspense": "긴장감 있는 음악"
+}
+MUSIC_EXTENSIONS = ('.mp3', '.wav', '.m4a')
+PCM_BYTES_PER_SECOND = MIX_SAMPLE_RATE * 2 * 2
+
+
+@dataclass
+class BGMTrack:
+    """카탈로그 항목 (분석 전에는 duration/loudness가 None)"""
+    mood: str
+    filename: str
+    path: str
+    size: int
+    mtime: float
+    duration: Optional[float] = None
+    loudness_lufs: Optional[float] = None
+    pcm_path: Optional[str] = None
+
+    @property
+    def signature(self) -> str:
+        return hashlib.sha1(f"{os.path.realpath(self.path)}|{self.size}|{self.mtime}".encode()).hexdigest()[:16]
+
+    @property
+    def display_name(self) -> str:
+        # 파일명에서 아티스트와 제목 분리 (기존 /bgm-list 표시 방식)
+        display_name = os.path.splitext(self.filename)[0]
+        if ' - ' in display_name:
+            display_name = display_name.split(' - ')[0]
+        return display_name
+
+    def to_api(self) -> Dict[str, Any]:
+        return {
+            "filename": self.filename,
+            "displayName": self.display_name,
+            "mood": self.mood,
+            "url": f"/bgm/{self.mood}/{self.filename}",
+            "duration": self.duration,
+            "loudnessLufs": self.loudness_lufs,
+        }
+
+
+def _probe_duration(path: str) -> Optional[float]:
+    result = subprocess.run(
+        ['ffprobe', '-v', 'error', '-show_entries', 'format=duration', '-of', 'csv=p=0', path],
+        capture_output=True, text=True, timeout=30
+    )
+    try:
+        return round(float(result.stdout.strip()), 3)
+    except ValueError:
+        return None
+
+
+def _measure_loudness(path: str) -> Optional[float]:
+    """EBU R128 통합 라우드니스 (LUFS)"""
+    result = subprocess.run(
+        ['ffmpeg', '-hide_banner', '-nostats', '-i', path, '-af', 'ebur128=framelog=quiet', '-f', 'null', '-'],
+        capture_output=True, text=True, timeout=300
+    )
+    matches = re.findall(r'I:\s*(-?[\d.]+|-inf)\s*LUFS', result.stderr)
+    if not matches or matches[-1] == '-inf':
+        return None
+    return float(matches[-1])
+
+
+def _decode_pcm(path: str, pcm_path: str) -> bool:
+    """믹싱 샘플레이트 스테레오 s16le PCM으로 디코딩 (원자적 저장)"""
+    part_path = f"{pcm_path}.{os.getpid()}.part"
+    result = subprocess.run(
+        ['ffmpeg', '-y', '-loglevel', 'error', '-i', path, '-vn',
+         '-f', PCM_FORMAT['sample_fmt'], '-ac', str(PCM_FORMAT['channels']), '-ar', str(PCM_FORMAT['sample_rate']),
+         part_path],
+        capture_output=True, text=True, timeout=300
+    )
+    if result.returncode != 0 or not os.path.exists(part_path):
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        return False
+    os.replace(part_path, pcm_path)
+    return True
+
+
+class BGMCatalog:
+    """BGM 폴더 메모리 카탈로그 (분석 결과는 캐시 폴더의 index.json에 보관해 재기동 시 재사용)"""
+
+    def __init__(self, bgm_folder: str = BGM_FOLDER, cache_dir: str = BGM_CACHE_DIR):
+        self.bgm_folder = bgm_folder
+        self.cache_dir = cache_dir
+        self.lock = threading.RLock()
+        self.tracks: Dict[str, BGMTrack] = {}          # realpath → track
+        self.folder_mtimes: Dict[str, float] = {}
+        self.analysis_lock = threading.Lock()
+        self.watcher = None
+        self.stop_event = threading.Event()
+
+    def configure(self, bgm_folder: str):
+        """BGM 폴더 경로 지정 (main.py에서 호출)"""
+        with self.lock:
+            if os.path.realpath(bgm_folder) != os.path.realpath(self.bgm_folder):
+                self.bgm_folder = bgm_folder
+                self.tracks = {}
+                self.folder_mtimes = {}
+
+    # ---------- 인덱스 ----------
+
+    def _index_path(self) -> str:
+        return os.path.join(self.cache_dir, 'index.json')
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self._index_path(), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self):
+        with self.lock:
+            data = {track.signature: asdict(track) for track in self.tracks.values() if track.duration is not None}
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temp_path = f"{self._index_path()}.{os.getpid()}.part"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(temp_path, self._index_path())
+
+    # ---------- 갱신 ----------
+
+    def _folder_state(self) -> Dict[str, float]:
+        state = {}
+        for mood in VALID_MOODS:
+            mood_folder = os.path.join(self.bgm_folder, mood)
+            try:
+                state[mood] = os.path.getmtime(mood_folder)
+            except OSError:
+                state[mood] = 0.0
+        return state
+
+    def refresh(self, force: bool = False) -> bool:
+        """폴더가 바뀌었으면 목록 갱신 (목록은 즉시, 분석은 백그라운드)
+
+        Returns:
+            bool: 목록이 갱신되었는지
+        """
+        state = self._folder_state()
+        with self.lock:
+            if not force and self.tracks and state == self.folder_mtimes:
+                return False
+
+            index = self._load_index()
+            tracks: Dict[str, BGMTrack] = {}
+            for mood in VALID_MOODS:
+                mood_folder = os.path.join(self.bgm_folder, mood)
+                if not os.path.isdir(mood_folder):
+                    continue
+                for filename in sorted(os.listdir(mood_folder)):
+                    if not filename.lower().endswith(MUSIC_EXTENSIONS):
+                        continue
+                    path = os.path.join(mood_folder, filename)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    track = BGMTrack(mood=mood, filename=filename, path=path, size=stat.st_size, mtime=stat.st_mtime)
+                    known = self.tracks.get(os.path.realpath(path))
+                    cached = index.get(track.signature)
+                    if known is not None and known.signature == track.signature:
+                        track = known
+                    elif cached:
+                        track.duration = cached.get('duration')
+                        track.loudness_lufs = cached.get('loudness_lufs')
+                        pcm_path = cached.get('pcm_path')
+                        track.pcm_path = pcm_path if pcm_path and os.path.exists(pcm_path) else None
+                    tracks[os.path.realpath(path)] = track
+
+            self.tracks = tracks
+            self.folder_mtimes = state
+
+        logger.info(f"🎼 BGM 카탈로그 갱신: {len(tracks)}곡")
+        if any(track.duration is None for track in tracks.values()):
+            threading.Thread(target=self.analyze_pending, name='bgm-analyze', daemon=True).start()
+        return True
+
+    def analyze_pending(self):
+        """분석되지 않은 곡의 길이/라우드니스 측정 + PCM 캐시 생성"""
+        if not self.analysis_lock.acquire(blocking=False):
+            return  # 이미 분석 중
+        try:
+            with self.lock:
+                pending = [track for track in self.tracks.values() if track.duration is None]
+            for track in pending:
+                try:
+                    self._analyze(track)
+                except Exception as e:
+                    logger.warning(f"⚠️ BGM 분석 실패 ({track.filename}): {e}")
+            if pending:
+                self._prune_pcm_cache()
+                self._save_index()
+                logger.info(f"🎼 BGM 분석 완료: {len(pending)}곡")
+        finally:
+            self.analysis_lock.release()
+
+    def _analyze(self, track: BGMTrack):
+        duration = _probe_duration(track.path)
+        loudness = _measure_loudness(track.path)
+
+        pcm_path = None
+        if BGM_PCM_CACHE_MB > 0 and duration and self._pcm_bytes() + duration * PCM_BYTES_PER_SECOND <= BGM_PCM_CACHE_MB * 1024 * 1024:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            candidate = os.path.join(self.cache_dir, f"{track.signature}.pcm")
+            if os.path.exists(candidate) or _decode_pcm(track.path, candidate):
+                pcm_path = candidate
+
+        with self.lock:
+            track.duration = duration or 0.0
+            track.loudness_lufs = loudness
+            track.pcm_path = pcm_path
+
+    def _pcm_bytes(self) -> int:
+        with self.lock:
+            paths = [track.pcm_path for track in self.tracks.values() if track.pcm_path]
+        return sum(os.path.getsize(path) for path in paths if os.path.exists(path))
+
+    def _prune_pcm_cache(self):
+        """카탈로그에 없는 곡(삭제/교체됨)의 PCM 캐시 삭제"""
+        if not os.path.isdir(self.cache_dir):
+            return
+        with self.lock:
+            in_use = {os.path.basename(track.pcm_path) for track in self.tracks.values() if track.pcm_path}
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.pcm') and name not in in_use:
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
+
+    def start_watcher(self):
+        """기동 시 1회 갱신 + 주기적으로 폴더 변경 확인"""
+        self.refresh(force=True)
+        if self.watcher is not None or BGM_CATALOG_POLL_SECONDS <= 0:
+            return
+
+        def _watch():
+            while not self.stop_event.wait(BGM_CATALOG_POLL_SECONDS):
+                try:
+                    self.refresh()
+                except Exception as e:
+                    logger.warning(f"⚠️ BGM 카탈로그 갱신 실패: {e}")
+
+        self.watcher = threading.Thread(target=_watch, name='bgm-catalog', daemon=True)
+        self.watcher.start()
+
+    # ---------- 조회 ----------
+
+    def list_tracks(self, mood: Optional[str] = None) -> List[BGMTrack]:
+        self.refresh()
+        with self.lock:
+            tracks = list(self.tracks.values())
+        return [track for track in tracks if mood is None or track.mood == mood]
+
+    def list_by_mood(self) -> Dict[str, Any]:
+        """/bgm-list 응답 데이터"""
+        tracks = self.list_tracks()
+        return {
+            mood: {
+                "mood": mood,
+                "displayName": MOOD_DISPLAY_NAMES.get(mood, mood),
+                "files": [track.to_api() for track in tracks if track.mood == mood]
+            }
+            for mood in VALID_MOODS
+        }
+
+    def select_random(self, mood: str, rng: Optional[random.Random] = None) -> Optional[str]:
+        """성격별 랜덤 곡 경로 (곡이 없으면 None) - rng를 주면 그 난수열로 선택 (작업 시드 고정)"""
+        tracks = sorted(self.list_tracks(mood), key=lambda track: track.path)
+        return (rng or random).choice(tracks).path if tracks else None
+
+    def get_track(self, path: Optional[str]) -> Optional[BGMTrack]:
+        if not path:
+            return None
+        with self.lock:
+            return self.tracks.get(os.path.realpath(path))
+
+    def mix_input(self, path: str) -> AudioInput:
+        """믹서 입력 - PCM 캐시가 있으면 디코딩 없이 PCM 사용"""
+        track = self.get_track(path)
+        if track is not None and track.pcm_path and os.path.exists(track.pcm_path):
+            return AudioInput(track.pcm_path, raw_format=dict(PCM_FORMAT))
+        return AudioInput(path)
+
+    def ducking_gain(self, path: str) -> float:
+        """나레이션과 함께 깔릴 배경음악 볼륨 (라우드니스 미측정 곡/업로드 곡은 기존 15%)"""
+        track = self.get_track(path)
+        if track is None or track.loudness_lufs is None:
+            return BGM_DEFAULT_DUCK_GAIN
+        target_lufs = BGM_NARRATION_LUFS - BGM_DUCK_BELOW_NARRATION_DB
+        gain = 10 ** ((target_lufs - track.loudness_lufs) / 20)
+        return round(min(max(gain, 0.03), 0.5), 4)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            tracks = list(self.tracks.values())
+        return {
+            'tracks': len(tracks),
+            'analyzed': sum(1 for track in tracks if track.duration is not None),
+            'pcm_cached': sum(1 for track in tracks if track.pcm_path),
+            'pcm_bytes': self._pcm_bytes(),
+        }
+
+
+# 전역 카탈로그 인스턴스
+bgm_catalog = BGMCatalog()
@@ -13,6 +13,10 @@ from utils.logger_config import get_logger
 
 logger = get_logger('cleanup_scheduler')
 
+# 중단된 작업 회수 (하트비트가 끊긴 워커의 processing 작업)
+STALE_JOB_REAPER_INTERVAL_SECONDS = int(os.getenv('STALE_JOB_REAPER_INTERVAL_SECONDS', '60'))
+STALE_JOB_LEGACY_MINUTES = int(os.getenv('STALE_JOB_LEGACY_MINUTES', '120'))  # worker_id 없는 이전 작업 기준
+
 class CleanupScheduler:
     """주기적 임시 파일 정리 스케줄러"""
 
@@ -30,6 +34,9 @@ class CleanupScheduler:
         self.output_age_days = output_age_days
         self.is_running = False
         self.cleanup_thread: Optional[threading.Thread] = None
+        self.reaper_stop = threading.Event()
+        self.reaper_thread: Optional[threading.Thread] = None
+        self.reaped_total = 0
 
         logger.info(f"🗑️ CleanupScheduler 초기화:")
         logger.info(f"   정리 간격: {cleanup_interval_hours}시간")
@@ -55,8 +62,76 @@ class CleanupScheduler:
         self.is_running = False
         if self.cleanup_thread:
             self.cleanup_thread.join(timeout=5)
+        self.stop_reaper()
         logger.info("🛑 CleanupScheduler 중지")
 
+    def start_reaper(self):
+        """중단된 작업 회수 루프 시작 (파일 정리 주기와 별개로 짧은 간격 실행)"""
+        if self.reaper_thread and self.reaper_thread.is_alive():
+            return
+        self.reaper_stop.clear()
+        self.reaper_thread = threading.Thread(target=self._reaper_loop, name='stale-job-reaper', daemon=True)
+        self.reaper_thread.start()
+        logger.info(f"♻️ 중단 작업 회수 시작 ({STALE_JOB_REAPER_INTERVAL_SECONDS}초 간격)")
+
+    def stop_reaper(self):
+        self.reaper_stop.set()
+        if self.reaper_thread:
+            self.reaper_thread.join(timeout=5)
+
+    def _reaper_loop(self):
+        while not self.reaper_stop.wait(STALE_JOB_REAPER_INTERVAL_SECONDS):
+            self._reap_stale_jobs()
+
+    def _reap_stale_jobs(self) -> int:
+        """하트비트가 끊긴 워커의 처리 중 작업을 대기열로 되돌림 (재시도 한도 초과 시 실패)"""
+        try:
+            from job_queue import job_queue
+            from worker_heartbeat import live_workers
+            from job_progress import publish_state
+
+            live_ids = [worker['worker_id'] for worker in live_workers()]
+            reaped = job_queue.requeue_stale_jobs(live_ids, legacy_timeout_minutes=STALE_JOB_LEGACY_MINUTES)
+        except Exception as e:
+            logger.error(f"❌ 중단 작업 회수 실패: {e}")
+            return 0
+
+        for job in reaped:
+            message = f"워커 응답 없음 ({job['worker_id'] or '알 수 없는 워커'})"
+            publish_state(job['job_id'], job['status'], stage=None, message=message)
+            if job['status'] == 'failed':
+                try:
+                    from job_logger import job_logger
+                    job_logger.update_job_status(job['job_id'], "failed", message)
+                except Exception as log_error:
+                    logger.warning(f"⚠️ Job 로그 실패 업데이트 실패: {log_error}")
+                self._finish_failed_job(job_queue, job['job_id'], message)
+
+        if reaped:
+            self.reaped_total += len(reaped)
+            logger.warning(f"♻️ 중단 작업 회수: {len(reaped)}건 (재대기 {sum(1 for job in reaped if job['status'] == 'pending')}건)")
+        return len(reaped)
+
+    def _finish_failed_job(self, job_queue, job_id: str, message: str):
+        """회수 중 최종 실패한 작업 마무리 - 워커의 최종 실패와 같은 경로 (실패 알림, 배치 완료, Job 폴더 정리)"""
+        try:
+            from job_notifications import notify_job_failed, finish_batch
+
+            job_data = job_queue.get_job(job_id)
+            if not job_data:
+                return
+            logger.error(f"💀 최종 실패: {job_id} - 실패 알림 기록")
+            notify_job_failed(job_data, message)
+            finish_batch(job_data, job_queue)
+        except Exception as e:
+            logger.error(f"❌ 회수 작업 실패 알림 기록 실패: {job_id} - {e}")
+
+        try:
+            if folder_manager.cleanup_job_folders(job_id, keep_output=False):
+                logger.info(f"✅ Job 폴더 정리 완료: {job_id}")
+        except Exception as cleanup_error:
+            logger.error(f"❌ Job 폴더 정리 실패: {job_id} - {cleanup_error}")
+
     def _cleanup_loop(self):
         """정리 작업 루프"""
         while self.is_running:
@@ -85,11 +160,34 @@ class CleanupScheduler:
             # 2. 오래된 output 폴더 정리
             output_cleaned = self._cleanup_old_outputs()
 
-            # 3. 통계 정보 로깅
+            # 3. 오래된 TTS 캐시 / 세그먼트 캐시 정리
+            tts_cleaned = self._cleanup_tts_cache()
+            segments_cleaned = self._cleanup_segment_cache()
+
+            # 4. 종료된 프로세스가 남긴 작업 공간(scratch) 정리
+            scratch_cleaned = self._cleanup_scratch_workspaces()
+
+            # 5. 오래된 작업 진행 상황 파일 / 끊긴 워커 하트비트 정리
+            progress_cleaned = self._cleanup_progress_files()
+            try:
+                from worker_heartbeat import remove_dead_heartbeats
+                remove_dead_heartbeats()
+            except Exception as e:
+                logger.error(f"❌ 워커 하트비트 정리 실패: {e}")
+
+            # 6. 오래된 알림 발송 기록 정리
+            notifications_cleaned = self._cleanup_notifications()
+
+            # 7. 통계 정보 로깅
             stats = folder_manager.get_folder_stats()
             logger.info(f"📊 정리 완료:")
             logger.info(f"   uploads 폴더 정리: {uploads_cleaned}개")
             logger.info(f"   output 폴더 정리: {output_cleaned}개")
+            logger.info(f"   TTS 캐시 정리: {tts_cleaned}개")
+            logger.info(f"   세그먼트 캐시 정리: {segments_cleaned}개")
+            logger.info(f"   작업 공간 정리: {scratch_cleaned}개")
+            logger.info(f"   진행 상황 파일 정리: {progress_cleaned}개")
+            logger.info(f"   알림 발송 기록 정리: {notifications_cleaned}개")
             logger.info(f"   남은 uploads 폴더: {stats.get('uploads_folders', 0)}개")
             logger.info(f"   남은 output 폴더: {stats.get('output_folders', 0)}개")
             logger.info(f"   총 uploads 크기: {self._format_size(stats.get('total_uploads_size', 0))}")
@@ -109,7 +207,8 @@ class CleanupScheduler:
                 return 0
 
             for folder_name in os.listdir(uploads_base):
-                if folder_name.startswith("job_"):
+                # job_: 작업별 폴더, batch_: 배치 공유 미디어 폴더
+                if folder_name.startswith(("job_", "batch_")):
                     folder_path = os.path.join(uploads_base, folder_name)
 
                     if os.path.isdir(folder_path):
@@ -164,6 +263,51 @@ class CleanupScheduler:
             logger.error(f"❌ output 폴더 정리 실패: {e}")
             return 0
 
+    def _cleanup_tts_cache(self) -> int:
+        """오래되었거나 용량을 초과한 TTS 캐시 정리"""
+        try:
+            from tts_cache import tts_cache
+            return tts_cache.prune()
+        except Exception as e:
+            logger.error(f"❌ TTS 캐시 정리 실패: {e}")
+            return 0
+
+    def _cleanup_segment_cache(self) -> int:
+        """오래되었거나 용량을 초과한 세그먼트 렌더 캐시 정리"""
+        try:
+            from segment_cache import segment_cache
+            return segment_cache.prune()
+        except Exception as e:
+            logger.error(f"❌ 세그먼트 캐시 정리 실패: {e}")
+            return 0
+
+    def _cleanup_scratch_workspaces(self) -> int:
+        """종료된 프로세스의 작업 공간 정리"""
+        try:
+            from scratch_space import cleanup_stale_workspaces
+            return cleanup_stale_workspaces()
+        except Exception as e:
+            logger.error(f"❌ 작업 공간 정리 실패: {e}")
+            return 0
+
+    def _cleanup_progress_files(self) -> int:
+        """완료된 지 오래된 작업의 진행 상황 파일 정리"""
+        try:
+            from job_progress import cleanup_progress_files
+            return cleanup_progress_files()
+        except Exception as e:
+            logger.error(f"❌ 진행 상황 파일 정리 실패: {e}")
+            return 0
+
+    def _cleanup_notifications(self) -> int:
+        """발송 완료/최종 실패 후 오래된 알림 기록 정리"""
+        try:
+            from notification_outbox import notification_outbox
+            return notification_outbox.cleanup()
+        except Exception as e:
+            logger.error(f"❌ 알림 발송 기록 정리 실패: {e}")
+            return 0
+
     def _format_size(self, size_bytes: int) -> str:
         """파일 크기를 읽기 쉬운 형태로 변환"""
         if size_bytes == 0:
@@ -192,7 +336,9 @@ class CleanupScheduler:
             'uploads_age_hours': self.uploads_age_hours,
             'output_age_days': self.output_age_days,
             'folder_stats': stats,
-            'next_cleanup': self._get_next_cleanup_time() if self.is_running else None
+            'next_cleanup': self._get_next_cleanup_time() if self.is_running else None,
+            'reaper_running': bool(self.reaper_thread and self.reaper_thread.is_alive()),
+            'reaped_jobs': self.reaped_total
         }
 
     def _get_next_cleanup_time(self) -> str:
@@ -207,6 +353,10 @@ def start_cleanup_scheduler():
     """정리 스케줄러 시작"""
     cleanup_scheduler.start()
 
+def start_stale_job_reaper():
+    """중단 작업 회수 루프만 시작"""
+    cleanup_scheduler.start_reaper()
+
 def stop_cleanup_scheduler():
     """정리 스케줄러 중지"""
     cleanup_scheduler.stop()
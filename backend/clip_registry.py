@@ -0,0 +1,138 @@
+"""
+클립 리더 수명 관리
+VideoFileClip / AudioFileClip은 생성 시 FFmpeg 서브프로세스와 파이프를 열기 때문에
+작업 단위 레지스트리에 등록해 두고 작업이 끝나면(예외 포함) 한 번에 닫는다.
+"""
+
+import threading
+import contextvars
+from typing import Any, Dict, List
+
+from utils.logger_config import get_logger
+
+logger = get_logger('clip_registry')
+
+# 현재 작업의 레지스트리 (렌더 스레드 풀에는 contextvars.copy_context로 전파)
+_active_registry = contextvars.ContextVar('clip_registry', default=None)
+
+# 프로세스 전체 통계 (워커 상태 조회용)
+_stats_lock = threading.Lock()
+_live_registries: Dict[int, 'ClipRegistry'] = {}
+_process_stats = {'opened': 0, 'closed_by_owner': 0, 'closed_at_scope_end': 0, 'untracked': 0}
+
+
+def _is_open(clip) -> bool:
+    """리더(FFmpeg 프로세스)가 아직 열려 있는지"""
+    reader = getattr(clip, 'reader', None)
+    if reader is not None and getattr(reader, 'proc', None) is not None:
+        return True
+    audio = getattr(clip, 'audio', None)
+    audio_reader = getattr(audio, 'reader', None) if audio is not None else None
+    return audio_reader is not None and getattr(audio_reader, 'proc', None) is not None
+
+
+def _close_clip(clip):
+    try:
+        clip.close()
+    except Exception as e:
+        logger.debug(f"클립 닫기 실패 (무시): {e}")
+
+
+class ClipRegistry:
+    """작업 1건 동안 생성된 파일 기반 클립 리더 추적"""
+
+    def __init__(self, label: str = ''):
+        self.label = label
+        self.lock = threading.Lock()
+        self.clips: List[Any] = []
+
+    def track(self, clip):
+        """클립 등록 후 그대로 반환 (예: clip = registry.track(VideoFileClip(path)))"""
+        with self.lock:
+            self.clips.append(clip)
+        with _stats_lock:
+            _process_stats['opened'] += 1
+        return clip
+
+    def release(self, clip):
+        """작업 도중 명시적으로 닫기 (더 이상 쓰지 않는 리더)"""
+        _close_clip(clip)
+        with self.lock:
+            self.clips = [tracked for tracked in self.clips if tracked is not clip]
+        with _stats_lock:
+            _process_stats['closed_by_owner'] += 1
+
+    def open_count(self) -> int:
+        with self.lock:
+            return sum(1 for clip in self.clips if _is_open(clip))
+
+    def close_all(self) -> int:
+        """남아 있는 모든 리더 닫기 (생성 역순)
+
+        Returns:
+            int: 닫은 시점에 열려 있던 리더 수
+        """
+        with self.lock:
+            clips, self.clips = self.clips, []
+
+        still_open = 0
+        for clip in reversed(clips):
+            if _is_open(clip):
+                still_open += 1
+            _close_clip(clip)
+
+        with _stats_lock:
+            _process_stats['closed_at_scope_end'] += len(clips)
+        if still_open:
+            logger.info(f"🧹 클립 리더 정리: {self.label} - {still_open}개 닫음 (등록 {len(clips)}개)")
+        return still_open
+
+    def activate(self):
+        """현재 컨텍스트의 레지스트리로 지정 - 반환된 토큰으로 deactivate"""
+        with _stats_lock:
+            _live_registries[id(self)] = self
+        return _active_registry.set(self)
+
+    def deactivate(self, token):
+        _active_registry.reset(token)
+        with _stats_lock:
+            _live_registries.pop(id(self), None)
+
+    def __enter__(self):
+        self._token = self.activate()
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            self.close_all()
+        finally:
+            self.deactivate(self._token)
+
+
+def track_clip(clip):
+    """활성 레지스트리에 클립 등록 (레지스트리 밖에서 열린 클립은 통계에만 기록)"""
+    registry = _active_registry.get()
+    if registry is not None:
+        return registry.track(clip)
+    with _stats_lock:
+        _process_stats['untracked'] += 1
+    return clip
+
+
+def release_clip(clip):
+    """클립을 즉시 닫기 (활성 레지스트리가 있으면 추적 목록에서도 제거)"""
+    registry = _active_registry.get()
+    if registry is not None:
+        registry.release(clip)
+    else:
+        _close_clip(clip)
+
+
+def get_reader_stats() -> Dict[str, Any]:
+    """프로세스 전체 클립 리더 통계 (워커 상태용)"""
+    with _stats_lock:
+        registries = list(_live_registries.values())
+        stats = dict(_process_stats)
+    stats['active_scopes'] = len(registries)
+    stats['open_readers'] = sum(registry.open_count() for registry in registries)
+    return stats
@@ -0,0 +1,372 @@
+"""
+합성(Composite) 최적화
+세그먼트 레이어 목록을 CompositeVideoClip으로 만들기 전에 프레임마다 반복되는 불필요한 합성을 제거
+- 완전히 가려지는 레이어 제거 (불투명 타이틀 아래의 검은 ColorClip 등)
+- 알파가 전부 1인 마스크 제거
+- 크기/위치가 고정된 중첩 CompositeVideoClip 평탄화
+- 수명(시작~끝)이 같은 고정 이미지 레이어를 한 장으로 미리 합성
+- 불투명 레이어가 화면 전체를 덮으면 마스크 합성 없는 배경색 합성으로 생성
+- 연결할 클립이 모두 같은 크기이고 마스크가 없으면 compose 대신 chain 연결
+"""
+
+import os
+import threading
+import contextvars
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from moviepy.editor import CompositeVideoClip, ImageClip, concatenate_videoclips
+
+from utils.logger_config import get_logger
+
+logger = get_logger('composite_optimizer')
+
+COMPOSITE_OPTIMIZER = os.getenv('COMPOSITE_OPTIMIZER', 'true').lower() == 'true'
+
+# 움직이는 레이어의 위치/프레임당 합성 수를 확인할 시점 수
+POSITION_SAMPLES = 9
+
+# 현재 작업의 최적화 보고서 (렌더 스레드 풀에는 contextvars.copy_context로 전파)
+_active_report = contextvars.ContextVar('composite_report', default=None)
+
+
+class CompositeReport:
+    """작업 1건 동안 제거한 레이어/합성 수 집계"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = {
+            'composites': 0, 'layers_in': 0, 'layers_out': 0,
+            'occluded_removed': 0, 'masks_dropped': 0, 'flattened': 0, 'merged': 0,
+            'opaque_composites': 0, 'chain_concats': 0,
+        }
+        self.blits_before = 0.0
+        self.blits_after = 0.0
+
+    def add(self, blits_before: float = 0.0, blits_after: float = 0.0, **counts):
+        with self.lock:
+            for name, value in counts.items():
+                self.counts[name] = self.counts.get(name, 0) + value
+            self.blits_before += blits_before
+            self.blits_after += blits_after
+
+    def summary(self) -> Dict[str, Any]:
+        """프레임당 합성(blit) 수는 세그먼트별 평균의 합 - 전후 차이가 제거된 프레임당 합성 수"""
+        with self.lock:
+            summary = dict(self.counts)
+            summary['blits_per_frame_before'] = round(self.blits_before, 2)
+            summary['blits_per_frame_after'] = round(self.blits_after, 2)
+            summary['blits_per_frame_removed'] = round(self.blits_before - self.blits_after, 2)
+        return summary
+
+    def activate(self):
+        return _active_report.set(self)
+
+    def deactivate(self, token):
+        _active_report.reset(token)
+
+
+def get_active_report() -> Optional[CompositeReport]:
+    return _active_report.get()
+
+
+# ---------- 레이어 속성 ----------
+
+def _static_position(clip) -> Optional[Tuple[int, int]]:
+    """전체 수명 동안 고정된 숫자 위치 (움직이거나 'center' 같은 문자열 위치면 None)"""
+    duration = clip.duration or 0
+    positions = set()
+    for i in range(POSITION_SAMPLES if duration else 1):
+        t = duration * i / (POSITION_SAMPLES - 1) if duration else 0
+        pos = clip.pos(t)
+        if not isinstance(pos, (tuple, list)) or len(pos) != 2 or \
+                not all(isinstance(v, (int, float, np.integer, np.floating)) for v in pos):
+            return None
+        positions.add((int(pos[0]), int(pos[1])))
+        if len(positions) > 1:
+            return None
+    return positions.pop()
+
+
+def _covered_rect(clip) -> Optional[Tuple[int, int, int, int]]:
+    """수명 동안 항상 덮는 영역 (x1, y1, x2, y2) - 선형 이동은 샘플 시점 영역의 교집합으로 계산"""
+    duration = clip.duration or 0
+    width, height = clip.size
+    rect = None
+    for i in range(POSITION_SAMPLES if duration else 1):
+        t = duration * i / (POSITION_SAMPLES - 1) if duration else 0
+        pos = clip.pos(t)
+        if not isinstance(pos, (tuple, list)) or len(pos) != 2 or \
+                not all(isinstance(v, (int, float, np.integer, np.floating)) for v in pos):
+            return None
+        x, y = int(pos[0]), int(pos[1])
+        current = (x, y, x + width, y + height)
+        rect = current if rect is None else (max(rect[0], current[0]), max(rect[1], current[1]),
+                                             min(rect[2], current[2]), min(rect[3], current[3]))
+        if rect[0] >= rect[2] or rect[1] >= rect[3]:
+            return None
+    return rect
+
+
+def _is_opaque(clip) -> bool:
+    return clip.mask is None and not clip.ismask
+
+
+def _is_static_image(clip) -> bool:
+    """프레임이 시간에 따라 변하지 않는 이미지 레이어 (fx가 적용되지 않은 ImageClip/ColorClip)"""
+    if not isinstance(clip, ImageClip) or getattr(clip, 'img', None) is None:
+        return False
+    try:
+        if clip.get_frame(0) is not clip.img:
+            return False
+        if clip.mask is not None:
+            return isinstance(clip.mask, ImageClip) and clip.mask.get_frame(0) is clip.mask.img
+    except Exception:
+        return False
+    return True
+
+
+def _is_plain_composite(clip) -> bool:
+    """fx/변형이 적용되지 않은 투명 CompositeVideoClip"""
+    make_frame = getattr(clip, 'make_frame', None)
+    return (isinstance(clip, CompositeVideoClip) and clip.mask is not None and getattr(clip, 'created_bg', False) and
+            getattr(make_frame, '__qualname__', '') == 'CompositeVideoClip.__init__.<locals>.make_frame')
+
+
+def _lifetime_covers(outer, inner) -> bool:
+    if outer.start > inner.start:
+        return False
+    if outer.end is None:
+        return True
+    return inner.end is not None and inner.end <= outer.end
+
+
+def _contains(outer: Tuple[int, int, int, int], inner: Tuple[int, int, int, int]) -> bool:
+    return outer[0] <= inner[0] and outer[1] <= inner[1] and outer[2] >= inner[2] and outer[3] >= inner[3]
+
+
+def _blits_at(clip, t: float) -> int:
+    """시점 t의 프레임 1장을 만드는 데 필요한 레이어 합성(blit) 수 (마스크 합성 포함)"""
+    if not isinstance(clip, CompositeVideoClip):
+        return 0
+    count = 0
+    for child in clip.clips:
+        if child.is_playing(t):
+            count += 1 + _blits_at(child, t - child.start)
+    if clip.mask is not None:
+        count += _blits_at(clip.mask, t)
+    return count
+
+
+def _average_blits(layers: List, duration: float, mask_composite: bool) -> float:
+    """레이어 목록을 합성할 때 프레임당 평균 blit 수 (투명 합성이면 마스크 합성도 같은 수만큼)"""
+    if not duration:
+        return 0.0
+    total = 0
+    for i in range(POSITION_SAMPLES):
+        t = duration * (i + 0.5) / POSITION_SAMPLES
+        blits = 0
+        for layer in layers:
+            if layer.is_playing(t):
+                local = t - layer.start
+                blits += 1 + _blits_at(layer, local)
+                if mask_composite:
+                    blits += 1 + (_blits_at(layer.mask, local) if layer.mask is not None else 0)
+        total += blits
+    return total / POSITION_SAMPLES
+
+
+# ---------- 최적화 단계 ----------
+
+def _drop_opaque_masks(layers: List) -> Tuple[List, int]:
+    """알파가 전부 1인 이미지 마스크 제거"""
+    dropped = 0
+    result = []
+    for layer in layers:
+        mask = layer.mask
+        if mask is not None and isinstance(mask, ImageClip) and getattr(mask, 'img', None) is not None \
+                and mask.get_frame(0) is mask.img and float(np.min(mask.img)) >= 1.0:
+            layer = layer.set_mask(None)
+            dropped += 1
+        result.append(layer)
+    return result, dropped
+
+
+def _flatten_nested(layers: List) -> Tuple[List, int]:
+    """고정 위치의 중첩 투명 CompositeVideoClip을 부모 레이어로 펼침
+
+    자식이 모두 고정 위치이고 중첩 클립 영역 안에 있을 때만 (잘림이 없어야 결과가 같음)
+    """
+    flattened = 0
+    result = []
+    for layer in layers:
+        offset = _static_position(layer) if _is_plain_composite(layer) else None
+        children = layer.clips if offset is not None else []
+        width, height = layer.size if offset is not None else (0, 0)
+        safe = bool(children)
+        for child in children:
+            position = _static_position(child)
+            if position is None or position[0] < 0 or position[1] < 0 or \
+                    position[0] + child.size[0] > width or position[1] + child.size[1] > height:
+                safe = False
+                break
+        if not safe:
+            result.append(layer)
+            continue
+
+        for child in children:
+            x, y = _static_position(child)
+            child_end = layer.duration if child.end is None or layer.duration is None else min(child.end, layer.duration)
+            lifted = child.set_start(layer.start + child.start)
+            if child_end is not None:
+                lifted = lifted.set_end(layer.start + child_end)
+            result.append(lifted.set_position((offset[0] + x, offset[1] + y)))
+        flattened += 1
+    return result, flattened
+
+
+def _remove_occluded(layers: List, size: Tuple[int, int]) -> Tuple[List, int]:
+    """위쪽의 불투명 고정 레이어에 수명 내내 완전히 가려지거나 화면 밖에 있는 레이어 제거"""
+    rects = [_covered_rect(layer) if _is_opaque(layer) and _static_position(layer) is not None else None
+             for layer in layers]
+
+    kept = []
+    removed = 0
+    for index, layer in enumerate(layers):
+        position = _static_position(layer)
+        if position is not None:
+            bounds = (position[0], position[1], position[0] + layer.size[0], position[1] + layer.size[1])
+            clipped = (max(bounds[0], 0), max(bounds[1], 0), min(bounds[2], size[0]), min(bounds[3], size[1]))
+            if clipped[0] >= clipped[2] or clipped[1] >= clipped[3]:
+                removed += 1
+                continue
+            if any(rects[upper] is not None and _contains(rects[upper], clipped) and
+                   _lifetime_covers(layers[upper], layer)
+                   for upper in range(index + 1, len(layers))):
+                removed += 1
+                continue
+        kept.append(layer)
+    return kept, removed
+
+
+def _blend_layers(group: List) -> ImageClip:
+    """고정 이미지 레이어들을 아래→위 순서로 한 장에 미리 합성 (MoviePy blit과 같은 알파 합성)"""
+    positions = [_static_position(layer) for layer in group]
+    x1 = min(p[0] for p in positions)
+    y1 = min(p[1] for p in positions)
+    x2 = max(p[0] + layer.size[0] for p, layer in zip(positions, group))
+    y2 = max(p[1] + layer.size[1] for p, layer in zip(positions, group))
+
+    color = np.zeros((y2 - y1, x2 - x1, 3), dtype=np.float32)
+    alpha = np.zeros((y2 - y1, x2 - x1), dtype=np.float32)
+    for (x, y), layer in zip(positions, group):
+        region = (slice(y - y1, y - y1 + layer.size[1]), slice(x - x1, x - x1 + layer.size[0]))
+        layer_color = layer.img[:, :, :3].astype(np.float32)
+        layer_alpha = layer.mask.img.astype(np.float32) if layer.mask is not None else np.ones(layer.size[::-1], np.float32)
+        below_alpha = alpha[region]
+        out_alpha = layer_alpha + below_alpha * (1 - layer_alpha)
+        premultiplied = layer_color * layer_alpha[..., None] + color[region] * (below_alpha * (1 - layer_alpha))[..., None]
+        color[region] = np.where(out_alpha[..., None] > 0, premultiplied / np.maximum(out_alpha, 1e-6)[..., None], 0)
+        alpha[region] = out_alpha
+
+    first = group[0]
+    merged = ImageClip(np.clip(np.rint(color), 0, 255).astype('uint8'))
+    if float(alpha.min()) < 1.0:
+        merged = merged.set_mask(ImageClip(alpha, ismask=True))
+    merged = merged.set_start(first.start).set_duration(first.duration)
+    return merged.set_position((x1, y1))
+
+
+def _merge_shared_lifetime(layers: List) -> Tuple[List, int]:
+    """인접한 고정 이미지 레이어 중 시작/끝이 같은 것끼리 미리 합성"""
+    result = []
+    merged = 0
+    group: List = []
+
+    def flush():
+        nonlocal merged
+        if len(group) > 1:
+            result.append(_blend_layers(group))
+            merged += len(group) - 1
+        else:
+            result.extend(group)
+        group.clear()
+
+    for layer in layers:
+        mergeable = _is_static_image(layer) and _static_position(layer) is not None
+        if mergeable and group and layer.start == group[0].start and layer.end == group[0].end:
+            group.append(layer)
+            continue
+        flush()
+        if mergeable:
+            group.append(layer)
+        else:
+            result.append(layer)
+    flush()
+    return result, merged
+
+
+def _covers_canvas(layers: List, size: Tuple[int, int], duration: Optional[float]) -> bool:
+    """수명 내내 화면 전체를 덮는 불투명 레이어가 있는지 (이 경우 합성 마스크가 필요 없음)"""
+    covered = np.zeros((size[1], size[0]), dtype=bool)
+    for layer in layers:
+        if not _is_opaque(layer) or layer.start > 0:
+            continue
+        if layer.end is not None and (duration is None or layer.end < duration):
+            continue
+        rect = _covered_rect(layer)
+        if rect is None:
+            continue
+        covered[max(rect[1], 0):max(rect[3], 0), max(rect[0], 0):max(rect[2], 0)] = True
+    return bool(covered.all())
+
+
+def optimize_layers(layers: List, size: Tuple[int, int]) -> Tuple[List, Dict[str, int]]:
+    """레이어 목록 최적화 (아래→위 순서 유지)"""
+    layers, masks_dropped = _drop_opaque_masks(layers)
+    layers, flattened = _flatten_nested(layers)
+    layers, more_masks_dropped = _drop_opaque_masks(layers)
+    layers, occluded_removed = _remove_occluded(layers, size)
+    layers, merged = _merge_shared_lifetime(layers)
+    return layers, {
+        'masks_dropped': masks_dropped + more_masks_dropped,
+        'flattened': flattened,
+        'occluded_removed': occluded_removed,
+        'merged': merged,
+    }
+
+
+def compose_layers(layers: List, size: Tuple[int, int]) -> CompositeVideoClip:
+    """최적화 후 CompositeVideoClip 생성 (CompositeVideoClip(layers, size=size) 대체)"""
+    if not COMPOSITE_OPTIMIZER:
+        return CompositeVideoClip(layers, size=size)
+
+    duration = max((layer.end for layer in layers if layer.end is not None), default=None)
+    before = _average_blits(layers, duration, mask_composite=True)
+    try:
+        optimized, counts = optimize_layers(layers, size)
+    except Exception as e:
+        logger.warning(f"⚠️ 합성 최적화 실패 - 원본 레이어 사용: {e}")
+        return CompositeVideoClip(layers, size=size)
+
+    # 화면 전체가 불투명 레이어로 덮이면 투명 합성(마스크 합성) 대신 검은 배경 합성 - 결과 프레임은 동일
+    opaque = _covers_canvas(optimized, size, duration)
+    composite = CompositeVideoClip(optimized, size=size, bg_color=(0, 0, 0) if opaque else None)
+    after = _average_blits(optimized, duration, mask_composite=not opaque)
+
+    report = _active_report.get()
+    if report is not None:
+        report.add(blits_before=before, blits_after=after, composites=1, layers_in=len(layers),
+                   layers_out=len(optimized), opaque_composites=int(opaque), **counts)
+    return composite
+
+
+def concatenate_clips(clips: List):
+    """클립 연결 - 모두 같은 크기이고 마스크가 없으면 chain(프레임 합성 없음), 아니면 compose"""
+    if COMPOSITE_OPTIMIZER and clips and all(clip.mask is None and tuple(clip.size) == tuple(clips[0].size) for clip in clips):
+        report = _active_report.get()
+        if report is not None:
+            # compose 연결은 프레임마다 배경 위 클립 합성 + 마스크 합성 각 1회
+            report.add(blits_before=2, blits_after=0, chain_concats=1)
+        return concatenate_videoclips(clips, method="chain")
+    return concatenate_videoclips(clips, method="compose")
@@ -7,6 +7,8 @@ import smtplib
 import os
 import json
 import jwt
+import time
+import threading
 import traceback
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -14,7 +16,7 @@ from email.mime.base import MIMEBase
 from email import encoders
 from email.utils import formatdate
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from jinja2 import Template
 from dotenv import load_dotenv
 from utils.logger_config import get_logger
@@ -25,6 +27,12 @@ load_dotenv()
 # 로깅 설정
 logger = get_logger('email_service')
 
+# SMTP 연결 재사용 유휴 한도 (초) - 넘으면 새로 연결 (Gmail은 유휴 연결을 수 분 내 종료)
+SMTP_IDLE_SECONDS = int(os.getenv('SMTP_IDLE_SECONDS', '120'))
+
+# 다중 출력 작업 완료 메일의 포맷별 다운로드 버튼 이름
+OUTPUT_FORMAT_LABELS = {'reels': '릴스(세로)', 'youtube': 'YouTube(가로)'}
+
 class EmailService:
     def __init__(self):
         # Gmail SMTP 설정
@@ -39,6 +47,11 @@ class EmailService:
         # JWT 시크릿 키 (다운로드 링크 보안용)
         self.jwt_secret = os.getenv("JWT_SECRET_KEY", "default-secret-key-change-me")
 
+        # 재사용 SMTP 연결 (여러 알림을 연결 1개로 발송)
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._smtp_lock = threading.Lock()
+        self._smtp_last_used = 0.0
+
         # 기본 설정 검증
         self._validate_config()
 
@@ -68,6 +81,23 @@ class EmailService:
         logger.info(f"🔐 다운로드 토큰 생성: {user_email} (만료: {expire_hours}시간)")
         return token
 
+    def download_url(self, video_path: str, user_email: str) -> str:
+        """보안 다운로드 링크 (/api/download-video?token=...)"""
+        base_url = os.getenv("BASE_URL", "http://localhost:8097")
+        return f"{base_url}/api/download-video?token={self.generate_download_token(video_path, user_email)}"
+
+    def public_job_result(self, result: Optional[Dict[str, Any]], user_email: str) -> Optional[Dict[str, Any]]:
+        """작업 결과를 API 응답용으로 변환 (서버 파일 경로 대신 다운로드 링크)"""
+        if not result:
+            return result
+        public = {key: value for key, value in result.items() if key not in ('video_path', 'outputs')}
+        if result.get('video_path'):
+            public['video_url'] = self.download_url(result['video_path'], user_email)
+        if result.get('outputs'):
+            public['outputs'] = {video_format: self.download_url(path, user_email)
+                                 for video_format, path in result['outputs'].items()}
+        return public
+
     def verify_download_token(self, token: str) -> Optional[Dict[str, Any]]:
         """다운로드 토큰 검증"""
         try:
@@ -196,9 +226,11 @@ class EmailService:
             {% endif %}
 
             <div style="text-align: center;">
-                <a href="{{ download_link }}" class="download-btn">
-                    <span class="emoji">⬇️</span>영상 다운로드
+                {% for label, link in download_links %}
+                <a href="{{ link }}" class="download-btn">
+                    <span class="emoji">⬇️</span>{{ label }}
                 </a>
+                {% endfor %}
             </div>
 
             <div class="warning">
@@ -232,76 +264,85 @@ class EmailService:
             return ""
         return json.dumps(content_data, ensure_ascii=False, indent=2)
 
-    def send_completion_email(self,
-                             user_email: str,
-                             video_path: str,
-                             video_title: str = "릴스 영상",
-                             duration: str = "약 10-30초",
-                             content_data: Optional[Dict[str, Any]] = None) -> bool:
-        """영상 생성 완료 이메일 발송"""
-        try:
-            logger.info(f"📧 [완료메일] 발송 시작 - 수신자: {user_email}, 제목: {video_title}")
-
-            # 설정 검증
-            if not self.gmail_email or not self.gmail_password:
-                logger.error(f"❌ [완료메일] Gmail 설정 누락 - email: {'설정됨' if self.gmail_email else '없음'}, password: {'설정됨' if self.gmail_password else '없음'}")
-                return False
-
-            # 수신자 이메일 형식 검증
-            if not user_email or '@' not in user_email:
-                logger.error(f"❌ [완료메일] 유효하지 않은 수신자 이메일: {user_email}")
-                return False
-
-            logger.debug(f"📧 [완료메일] 발신자: {self.gmail_email}, 수신자: {user_email}")
-
-            # 다운로드 토큰 생성
-            download_token = self.generate_download_token(video_path, user_email)
-            logger.debug(f"📧 [완료메일] 다운로드 토큰 생성 완료 (길이: {len(download_token)})")
-
-            # 다운로드 링크 생성 (기존 /download-video 엔드포인트 사용)
-            base_url = os.getenv("BASE_URL", "http://localhost:8097")
-            download_link = f"{base_url}/api/download-video?token={download_token}"
-            logger.debug(f"📧 [완료메일] 다운로드 링크: {download_link[:80]}...")
-
-            # 이메일 템플릿 렌더링
-            template = Template(self.get_email_template())
-            script_json = self._build_script_json(content_data)
-            html_content = template.render(
-                user_email=user_email,
-                video_title=video_title,
-                completed_at=datetime.now().strftime("%Y년 %m월 %d일 %H시 %M분"),
-                duration=duration,
-                download_link=download_link,
-                script_json=script_json
-            )
-            logger.debug(f"📧 [완료메일] HTML 템플릿 렌더링 완료 (길이: {len(html_content)})")
-
-            # 이메일 메시지 생성
-            msg = MIMEMultipart('alternative')
-            msg['From'] = f"{self.from_name} <{self.gmail_email}>"
-            msg['To'] = user_email
-            msg['Subject'] = f"🎬 릴스 영상 생성 완료 - {video_title}"
-            msg['Date'] = formatdate(localtime=True)  # 현재 시간으로 Date 헤더 설정
-
-            logger.debug(f"📧 [완료메일] Date 헤더: {msg['Date']}")
-
-            # HTML 내용 추가
-            html_part = MIMEText(html_content, 'html')
-            msg.attach(html_part)
-
-            # 텍스트 버전도 추가 (HTML 미지원 클라이언트용)
-            script_text = ""
-            if script_json:
-                script_text = f"\n📝 대본 내용:\n{script_json}\n"
-
-            text_content = f"""
+    def build_completion_message(self,
+                                 user_email: str,
+                                 video_path: str,
+                                 video_title: str = "릴스 영상",
+                                 duration: str = "약 10-30초",
+                                 content_data: Optional[Dict[str, Any]] = None,
+                                 outputs: Optional[Dict[str, str]] = None) -> Optional[MIMEMultipart]:
+        """영상 생성 완료 이메일 메시지 구성 (설정/수신자 오류 시 None)
+
+        outputs({포맷: 영상 경로})에 포맷이 2개 이상이면 포맷별 다운로드 링크를 모두 넣는다.
+        """
+        logger.info(f"📧 [완료메일] 메시지 구성 시작 - 수신자: {user_email}, 제목: {video_title}")
+
+        if not self._check_sendable(user_email, "완료메일"):
+            return None
+
+        logger.debug(f"📧 [완료메일] 발신자: {self.gmail_email}, 수신자: {user_email}")
+
+        # 다운로드 토큰 생성
+        download_token = self.generate_download_token(video_path, user_email)
+        logger.debug(f"📧 [완료메일] 다운로드 토큰 생성 완료 (길이: {len(download_token)})")
+
+        # 다운로드 링크 생성 (기존 /download-video 엔드포인트 사용)
+        base_url = os.getenv("BASE_URL", "http://localhost:8097")
+        download_link = f"{base_url}/api/download-video?token={download_token}"
+        logger.debug(f"📧 [완료메일] 다운로드 링크: {download_link[:80]}...")
+
+        # 다중 출력 작업: 포맷별 다운로드 링크
+        download_links = [("영상 다운로드", download_link)]
+        if outputs and len(outputs) > 1:
+            download_links = [
+                (f"{OUTPUT_FORMAT_LABELS.get(video_format, video_format)} 다운로드",
+                 f"{base_url}/api/download-video?token={self.generate_download_token(path, user_email)}")
+                for video_format, path in outputs.items()
+            ]
+
+        # 이메일 템플릿 렌더링
+        template = Template(self.get_email_template())
+        script_json = self._build_script_json(content_data)
+        html_content = template.render(
+            user_email=user_email,
+            video_title=video_title,
+            completed_at=datetime.now().strftime("%Y년 %m월 %d일 %H시 %M분"),
+            duration=duration,
+            download_links=download_links,
+            script_json=script_json
+        )
+        logger.debug(f"📧 [완료메일] HTML 템플릿 렌더링 완료 (길이: {len(html_content)})")
+
+        # 이메일 메시지 생성
+        msg = MIMEMultipart('alternative')
+        msg['From'] = f"{self.from_name} <{self.gmail_email}>"
+        msg['To'] = user_email
+        msg['Subject'] = f"🎬 릴스 영상 생성 완료 - {video_title}"
+        msg['Date'] = formatdate(localtime=True)  # 현재 시간으로 Date 헤더 설정
+
+        logger.debug(f"📧 [완료메일] Date 헤더: {msg['Date']}")
+
+        # HTML 내용 추가
+        html_part = MIMEText(html_content, 'html')
+        msg.attach(html_part)
+
+        # 텍스트 버전도 추가 (HTML 미지원 클라이언트용)
+        script_text = ""
+        if script_json:
+            script_text = f"\n📝 대본 내용:\n{script_json}\n"
+        if len(download_links) > 1:
+            download_text = "\n".join(f"{label}: {link}" for label, link in download_links)
+        else:
+            download_text = f"다운로드 링크: {download_link}"
+
+        text_content = f"""
 릴스 영상 생성 완료!
 
 {user_email}님, 안녕하세요!
 
 요청해주신 릴스 영상 '{video_title}'이 성공적으로 생성되었습니다.
 {script_text}
-다운로드 링크: {download_link}
+{download_text}
 
 ⚠️ 중요 안내:
 - 다운로드 링크는 48시간 후 만료됩니다
@@ -310,96 +351,32 @@ class EmailService:
 감사합니다!
 릴스 영상 생성 서비스
             """
-            text_part = MIMEText(text_content, 'plain')
-            msg.attach(text_part)
-
-            logger.info(f"📧 [완료메일] 메시지 구성 완료 - From: {msg['From']}, To: {msg['To']}, Subject: {msg['Subject']}")
-
-            # SMTP 서버 연결 및 메일 발송
-            logger.info(f"📧 [완료메일] SMTP 서버 연결 시작: {self.smtp_server}:{self.smtp_port}")
+        text_part = MIMEText(text_content, 'plain')
+        msg.attach(text_part)
 
-            with smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=30) as server:
-                # SMTP 디버그 모드 (환경변수로 제어)
-                if os.getenv("SMTP_DEBUG", "").lower() == "true":
-                    server.set_debuglevel(2)
-                    logger.info("📧 [완료메일] SMTP 디버그 모드 활성화")
+        logger.info(f"📧 [완료메일] 메시지 구성 완료 - From: {msg['From']}, To: {msg['To']}, Subject: {msg['Subject']}")
+        return msg
 
-                logger.info(f"📧 [완료메일] SMTP 연결 성공, STARTTLS 시작...")
-                server.starttls()
-                logger.info(f"📧 [완료메일] STARTTLS 완료, 로그인 시도: {self.gmail_email}")
+    def build_error_message(self, user_email: str, job_id: str, error_message: str,
+                            content_data: Optional[Dict[str, Any]] = None) -> Optional[MIMEMultipart]:
+        """영상 생성 실패 이메일 메시지 구성 (설정/수신자 오류 시 None)"""
+        logger.info(f"📧 [실패메일] 메시지 구성 시작 - 수신자: {user_email}, job_id: {job_id}")
 
-                server.login(self.gmail_email, self.gmail_password)
-                logger.info(f"📧 [완료메일] SMTP 로그인 성공")
-
-                # send_message 결과 확인 (거부된 수신자 딕셔너리 반환)
-                logger.info(f"📧 [완료메일] 메시지 발송 중...")
-                refused = server.send_message(msg)
-
-                if refused:
-                    # 일부 수신자가 거부됨
-                    logger.error(f"❌ [완료메일] 일부 수신자 거부됨: {refused}")
-                    return False
-
-                # SMTP 서버 응답 확인
-                logger.info(f"📧 [완료메일] SMTP 발송 완료 - 거부된 수신자 없음")
+        if not self._check_sendable(user_email, "실패메일"):
+            return None
 
-            logger.info(f"✅ [완료메일] 발송 성공: {user_email} (제목: {video_title})")
-            return True
+        subject = "⚠️ 릴스 영상 생성 실패 안내"
 
-        except smtplib.SMTPAuthenticationError as e:
-            logger.error(f"❌ [완료메일] SMTP 인증 실패 - Gmail 앱 비밀번호를 확인하세요: {e}")
-            return False
-        except smtplib.SMTPRecipientsRefused as e:
-            logger.error(f"❌ [완료메일] 수신자 거부됨 - 이메일 주소 확인 필요: {user_email}, 상세: {e}")
-            return False
-        except smtplib.SMTPSenderRefused as e:
-            logger.error(f"❌ [완료메일] 발신자 거부됨 - Gmail 설정 확인 필요: {e}")
-            return False
-        except smtplib.SMTPDataError as e:
-            logger.error(f"❌ [완료메일] SMTP 데이터 오류 - 메일 내용 문제: {e}")
-            return False
-        except smtplib.SMTPConnectError as e:
-            logger.error(f"❌ [완료메일] SMTP 연결 실패 - 네트워크 또는 서버 문제: {e}")
-            return False
-        except smtplib.SMTPServerDisconnected as e:
-            logger.error(f"❌ [완료메일] SMTP 서버 연결 끊김: {e}")
-            return False
-        except TimeoutError as e:
-            logger.error(f"❌ [완료메일] SMTP 연결 타임아웃 (30초): {e}")
-            return False
-        except Exception as e:
-            logger.error(f"❌ [완료메일] 예상치 못한 오류 발생: {type(e).__name__}: {e}")
-            logger.error(f"❌ [완료메일] 스택 트레이스:\n{traceback.format_exc()}")
-            return False
+        # 대사 HTML 생성 (JSON 형식)
+        script_json = self._build_script_json(content_data)
+        script_html = ""
+        if script_json:
+            script_html = '<div style="background: #f0f7f0; padding: 15px; border-radius: 5px; margin: 15px 0; border-left: 4px solid #27ae60;">\n'
+            script_html += '        <strong>📝 대본 내용:</strong><br>\n'
+            script_html += f'        <pre style="background: #f5f5f5; padding: 12px; border-radius: 6px; font-size: 13px; line-height: 1.5; white-space: pre-wrap; word-wrap: break-word; overflow-x: auto;">{script_json}</pre>\n'
+            script_html += '    </div>'
 
-    def send_error_email(self, user_email: str, job_id: str, error_message: str,
-                        content_data: Optional[Dict[str, Any]] = None) -> bool:
-        """영상 생성 실패 이메일 발송"""
-        try:
-            logger.info(f"📧 [실패메일] 발송 시작 - 수신자: {user_email}, job_id: {job_id}")
-
-            # 설정 검증
-            if not self.gmail_email or not self.gmail_password:
-                logger.error(f"❌ [실패메일] Gmail 설정 누락 - email: {'설정됨' if self.gmail_email else '없음'}, password: {'설정됨' if self.gmail_password else '없음'}")
-                return False
-
-            # 수신자 이메일 형식 검증
-            if not user_email or '@' not in user_email:
-                logger.error(f"❌ [실패메일] 유효하지 않은 수신자 이메일: {user_email}")
-                return False
-
-            subject = "⚠️ 릴스 영상 생성 실패 안내"
-
-            # 대사 HTML 생성 (JSON 형식)
-            script_json = self._build_script_json(content_data)
-            script_html = ""
-            if script_json:
-                script_html = '<div style="background: #f0f7f0; padding: 15px; border-radius: 5px; margin: 15px 0; border-left: 4px solid #27ae60;">\n'
-                script_html += '        <strong>📝 대본 내용:</strong><br>\n'
-                script_html += f'        <pre style="background: #f5f5f5; padding: 12px; border-radius: 6px; font-size: 13px; line-height: 1.5; white-space: pre-wrap; word-wrap: break-word; overflow-x: auto;">{script_json}</pre>\n'
-                script_html += '    </div>'
-
-            html_content = f"""
+        html_content = f"""
 <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto; padding: 20px;">
     <h2 style="color: #e74c3c;">⚠️ 릴스 영상 생성 실패</h2>
 
@@ -421,64 +398,151 @@ class EmailService:
 </div>
             """
 
-            msg = MIMEMultipart()
-            msg['From'] = f"{self.from_name} <{self.gmail_email}>"
-            msg['To'] = user_email
-            msg['Subject'] = subject
-            msg['Date'] = formatdate(localtime=True)  # 현재 시간으로 Date 헤더 설정
-            msg.attach(MIMEText(html_content, 'html'))
+        msg = MIMEMultipart()
+        msg['From'] = f"{self.from_name} <{self.gmail_email}>"
+        msg['To'] = user_email
+        msg['Subject'] = subject
+        msg['Date'] = formatdate(localtime=True)  # 현재 시간으로 Date 헤더 설정
+        msg.attach(MIMEText(html_content, 'html'))
 
-            logger.info(f"📧 [실패메일] 메시지 구성 완료 - From: {msg['From']}, To: {msg['To']}, Date: {msg['Date']}")
-            logger.info(f"📧 [실패메일] SMTP 서버 연결 시작: {self.smtp_server}:{self.smtp_port}")
+        logger.info(f"📧 [실패메일] 메시지 구성 완료 - From: {msg['From']}, To: {msg['To']}, Date: {msg['Date']}")
+        return msg
 
-            with smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=30) as server:
-                if os.getenv("SMTP_DEBUG", "").lower() == "true":
-                    server.set_debuglevel(2)
+    def _check_sendable(self, user_email: str, label: str) -> bool:
+        """Gmail 설정 + 수신자 이메일 형식 검증"""
+        if not self.gmail_email or not self.gmail_password:
+            logger.error(f"❌ [{label}] Gmail 설정 누락 - email: {'설정됨' if self.gmail_email else '없음'}, password: {'설정됨' if self.gmail_password else '없음'}")
+            return False
 
-                logger.info(f"📧 [실패메일] SMTP 연결 성공, STARTTLS 시작...")
-                server.starttls()
-                logger.info(f"📧 [실패메일] STARTTLS 완료, 로그인 시도: {self.gmail_email}")
+        if not user_email or '@' not in user_email:
+            logger.error(f"❌ [{label}] 유효하지 않은 수신자 이메일: {user_email}")
+            return False
+        return True
 
-                server.login(self.gmail_email, self.gmail_password)
-                logger.info(f"📧 [실패메일] SMTP 로그인 성공")
+    def _get_smtp(self, label: str) -> smtplib.SMTP:
+        """재사용 SMTP 연결 (유휴 시간 초과 또는 NOOP 실패 시 재연결) - _smtp_lock 보유 상태에서 호출"""
+        if self._smtp is not None:
+            if time.time() - self._smtp_last_used < SMTP_IDLE_SECONDS:
+                try:
+                    if self._smtp.noop()[0] == 250:
+                        return self._smtp
+                except (smtplib.SMTPException, OSError):
+                    pass
+            self._close_smtp()
+
+        logger.info(f"📧 [{label}] SMTP 서버 연결 시작: {self.smtp_server}:{self.smtp_port}")
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=30)
+        try:
+            # SMTP 디버그 모드 (환경변수로 제어)
+            if os.getenv("SMTP_DEBUG", "").lower() == "true":
+                server.set_debuglevel(2)
+                logger.info(f"📧 [{label}] SMTP 디버그 모드 활성화")
+
+            logger.info(f"📧 [{label}] SMTP 연결 성공, STARTTLS 시작...")
+            server.starttls()
+            logger.info(f"📧 [{label}] STARTTLS 완료, 로그인 시도: {self.gmail_email}")
+
+            server.login(self.gmail_email, self.gmail_password)
+            logger.info(f"📧 [{label}] SMTP 로그인 성공")
+        except Exception:
+            server.close()
+            raise
+        self._smtp = server
+        return server
+
+    def _close_smtp(self):
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            self._smtp.close()
+        self._smtp = None
 
-                logger.info(f"📧 [실패메일] 메시지 발송 중...")
-                refused = server.send_message(msg)
+    def close(self):
+        """재사용 중인 SMTP 연결 종료"""
+        with self._smtp_lock:
+            self._close_smtp()
 
-                if refused:
-                    logger.error(f"❌ [실패메일] 일부 수신자 거부됨: {refused}")
-                    return False
+    def send_message(self, msg: MIMEMultipart, label: str = "메일") -> Tuple[bool, bool]:
+        """구성된 메시지 발송 (SMTP 연결 재사용)
 
-                logger.info(f"📧 [실패메일] SMTP 발송 완료 - 거부된 수신자 없음")
+        Returns:
+            tuple: (발송 성공 여부, 재시도 가치 여부) - 수신자/발신자 거부, 메일 내용 오류는 재시도하지 않음
+        """
+        to = msg['To']
+        with self._smtp_lock:
+            try:
+                server = self._get_smtp(label)
 
-            logger.info(f"✅ [실패메일] 발송 성공: {user_email} (job_id: {job_id})")
-            return True
+                # send_message 결과 확인 (거부된 수신자 딕셔너리 반환)
+                logger.info(f"📧 [{label}] 메시지 발송 중...")
+                refused = server.send_message(msg)
+                self._smtp_last_used = time.time()
 
-        except smtplib.SMTPAuthenticationError as e:
-            logger.error(f"❌ [실패메일] SMTP 인증 실패 - Gmail 앱 비밀번호를 확인하세요: {e}")
-            return False
-        except smtplib.SMTPRecipientsRefused as e:
-            logger.error(f"❌ [실패메일] 수신자 거부됨 - 이메일 주소 확인 필요: {user_email}, 상세: {e}")
-            return False
-        except smtplib.SMTPSenderRefused as e:
-            logger.error(f"❌ [실패메일] 발신자 거부됨 - Gmail 설정 확인 필요: {e}")
-            return False
-        except smtplib.SMTPDataError as e:
-            logger.error(f"❌ [실패메일] SMTP 데이터 오류 - 메일 내용 문제: {e}")
-            return False
-        except smtplib.SMTPConnectError as e:
-            logger.error(f"❌ [실패메일] SMTP 연결 실패 - 네트워크 또는 서버 문제: {e}")
-            return False
-        except smtplib.SMTPServerDisconnected as e:
-            logger.error(f"❌ [실패메일] SMTP 서버 연결 끊김: {e}")
-            return False
-        except TimeoutError as e:
-            logger.error(f"❌ [실패메일] SMTP 연결 타임아웃 (30초): {e}")
+                if refused:
+                    # 일부 수신자가 거부됨
+                    logger.error(f"❌ [{label}] 일부 수신자 거부됨: {refused}")
+                    return False, False
+
+                logger.info(f"✅ [{label}] 발송 성공: {to} (제목: {msg['Subject']})")
+                return True, False
+
+            except smtplib.SMTPAuthenticationError as e:
+                logger.error(f"❌ [{label}] SMTP 인증 실패 - Gmail 앱 비밀번호를 확인하세요: {e}")
+                self._close_smtp()
+                return False, True
+            except smtplib.SMTPRecipientsRefused as e:
+                logger.error(f"❌ [{label}] 수신자 거부됨 - 이메일 주소 확인 필요: {to}, 상세: {e}")
+                return False, False
+            except smtplib.SMTPSenderRefused as e:
+                logger.error(f"❌ [{label}] 발신자 거부됨 - Gmail 설정 확인 필요: {e}")
+                return False, False
+            except smtplib.SMTPDataError as e:
+                logger.error(f"❌ [{label}] SMTP 데이터 오류 - 메일 내용 문제: {e}")
+                return False, False
+            except smtplib.SMTPConnectError as e:
+                logger.error(f"❌ [{label}] SMTP 연결 실패 - 네트워크 또는 서버 문제: {e}")
+                self._close_smtp()
+                return False, True
+            except smtplib.SMTPServerDisconnected as e:
+                logger.error(f"❌ [{label}] SMTP 서버 연결 끊김: {e}")
+                self._smtp = None
+                return False, True
+            except TimeoutError as e:
+                logger.error(f"❌ [{label}] SMTP 연결 타임아웃 (30초): {e}")
+                self._close_smtp()
+                return False, True
+            except Exception as e:
+                logger.error(f"❌ [{label}] 예상치 못한 오류 발생: {type(e).__name__}: {e}")
+                logger.error(f"❌ [{label}] 스택 트레이스:\n{traceback.format_exc()}")
+                self._close_smtp()
+                return False, True
+
+    def send_completion_email(self,
+                             user_email: str,
+                             video_path: str,
+                             video_title: str = "릴스 영상",
+                             duration: str = "약 10-30초",
+                             content_data: Optional[Dict[str, Any]] = None,
+                             outputs: Optional[Dict[str, str]] = None) -> bool:
+        """영상 생성 완료 이메일 발송 (즉시 발송 - 워커는 notification_outbox를 통해 발송)"""
+        try:
+            msg = self.build_completion_message(user_email, video_path, video_title, duration, content_data, outputs)
+        except Exception as e:
+            logger.error(f"❌ [완료메일] 메시지 구성 실패: {type(e).__name__}: {e}")
             return False
+        return msg is not None and self.send_message(msg, "완료메일")[0]
+
+    def send_error_email(self, user_email: str, job_id: str, error_message: str,
+                        content_data: Optional[Dict[str, Any]] = None) -> bool:
+        """영상 생성 실패 이메일 발송 (즉시 발송 - 워커는 notification_outbox를 통해 발송)"""
+        try:
+            msg = self.build_error_message(user_email, job_id, error_message, content_data)
         except Exception as e:
-            logger.error(f"❌ [실패메일] 예상치 못한 오류 발생: {type(e).__name__}: {e}")
-            logger.error(f"❌ [실패메일] 스택 트레이스:\n{traceback.format_exc()}")
+            logger.error(f"❌ [실패메일] 메시지 구성 실패: {type(e).__name__}: {e}")
             return False
+        return msg is not None and self.send_message(msg, "실패메일")[0]
 
 # 전역 인스턴스
 email_service = EmailService()
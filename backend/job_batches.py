@@ -0,0 +1,142 @@
+"""
+작업 배치(대량 제출) 관리
+한 번의 요청으로 여러 대본을 제출한 배치의 구성(작업 ID 목록, 공유 미디어 폴더, 완료 webhook)을
+JSON 파일에 보관하고, 배치 전체 진행 상황을 작업 큐 1회 조회로 집계한다.
+"""
+
+import os
+import json
+import uuid
+import shutil
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from job_progress import read_progress, progress_fraction
+from utils.logger_config import get_logger
+
+logger = get_logger('job_batches')
+
+TERMINAL_STATUSES = ('completed', 'failed')
+
+
+class BatchRegistry:
+    def __init__(self, batch_file: str = "batches.json"):
+        self.batch_file = batch_file
+        self.lock = threading.Lock()
+        if not os.path.exists(self.batch_file):
+            with open(self.batch_file, 'w') as f:
+                json.dump({}, f)
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(self.batch_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save(self, batches: Dict[str, Any]):
+        temp_path = f"{self.batch_file}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(batches, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.batch_file)
+
+    def new_batch_id(self) -> str:
+        return str(uuid.uuid4())
+
+    def create_batch(self, batch_id: str, user_email: str, job_ids: List[str],
+                     webhook_url: Optional[str] = None, media_folder: Optional[str] = None,
+                     item_refs: Optional[List[Optional[str]]] = None) -> Dict[str, Any]:
+        """배치 등록 (작업들은 호출 측에서 이미 큐에 추가한 상태)"""
+        batch = {
+            'batch_id': batch_id,
+            'user_email': user_email,
+            'job_ids': job_ids,
+            'item_refs': item_refs or [None] * len(job_ids),
+            'webhook_url': webhook_url,
+            'media_folder': media_folder,
+            'created_at': datetime.now().isoformat(),
+            'finished_at': None,
+        }
+        with self.lock:
+            batches = self._load()
+            batches[batch_id] = batch
+            self._save(batches)
+        logger.info(f"📦 배치 등록: {batch_id} (작업 {len(job_ids)}개, 사용자: {user_email})")
+        return batch
+
+    def get_batch(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        return self._load().get(batch_id)
+
+    def summarize(self, batch: Dict[str, Any], job_queue) -> Dict[str, Any]:
+        """배치 진행 상황 집계 (큐 1회 조회 + 처리 중 작업만 진행 상황 파일 조회)"""
+        jobs = job_queue.get_jobs(batch['job_ids'])
+        counts = {'pending': 0, 'processing': 0, 'completed': 0, 'failed': 0, 'missing': 0}
+        items = []
+        progress_total = 0.0
+
+        for job_id, item_ref in zip(batch['job_ids'], batch['item_refs']):
+            job = jobs.get(job_id)
+            status = job['status'] if job else 'missing'
+            counts[status] = counts.get(status, 0) + 1
+            item = {'job_id': job_id, 'ref': item_ref, 'status': status}
+            if status in TERMINAL_STATUSES or status == 'missing':
+                progress_total += 1.0
+            elif status == 'processing':
+                snapshot = read_progress(job_id)
+                fraction = progress_fraction(snapshot) if snapshot else 0.0
+                progress_total += fraction
+                item['stage'] = snapshot.get('stage') if snapshot else None
+                item['progress'] = round(fraction * 100, 1)
+            if job and job.get('result'):
+                item['video_path'] = job['result'].get('video_path')
+            if job and job.get('error_message'):
+                item['error_message'] = job['error_message']
+            items.append(item)
+
+        total = len(batch['job_ids'])
+        done = counts['completed'] + counts['failed'] + counts['missing']
+        if done < total:
+            status = 'processing' if done or counts['processing'] else 'pending'
+        elif counts['completed'] == total:
+            status = 'completed'
+        elif counts['completed'] == 0:
+            status = 'failed'
+        else:
+            status = 'partial'
+
+        return {
+            'batch_id': batch['batch_id'],
+            'status': status,
+            'total': total,
+            'counts': counts,
+            'progress': round(progress_total / total * 100, 1) if total else 100.0,
+            'created_at': batch['created_at'],
+            'finished_at': batch.get('finished_at'),
+            'jobs': items,
+        }
+
+    def finish_if_done(self, batch_id: str, job_queue) -> Optional[Dict[str, Any]]:
+        """배치의 모든 작업이 끝났으면 완료 처리 후 (배치, 집계) 반환 - 배치당 1회만 반환"""
+        with self.lock:
+            batches = self._load()
+            batch = batches.get(batch_id)
+            if not batch or batch.get('finished_at'):
+                return None
+            summary = self.summarize(batch, job_queue)
+            if summary['status'] in ('pending', 'processing'):
+                return None
+            batch['finished_at'] = datetime.now().isoformat()
+            self._save(batches)
+
+        summary['finished_at'] = batch['finished_at']
+        logger.info(f"📦 배치 완료: {batch_id} ({summary['status']}, 성공 {summary['counts']['completed']}/{summary['total']})")
+
+        # 공유 미디어 폴더 정리 (각 작업 폴더에는 하드링크/복사본만 있었음)
+        if batch.get('media_folder'):
+            shutil.rmtree(batch['media_folder'], ignore_errors=True)
+        return {'batch': batch, 'summary': summary}
+
+
+# 전역 인스턴스
+batch_registry = BatchRegistry()
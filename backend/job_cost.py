@@ -0,0 +1,375 @@
+"""
+작업 렌더 비용 추정 / 대기 시간(ETA) / 접수 제어
+접수 시점에 작업 파라미터(대사 수, TTS 엔진)와 업로드 미디어 probe 결과(영상 길이/해상도/회전)로
+렌더 시간과 메모리를 추정한다. 단가는 최근 작업의 단계별 측정(stage_timings)으로 보정한다.
+
+- 예상 대기 시간: 공정 분배 순서상 앞선 대기 작업 + 처리 중 작업의 남은 비용 / 살아 있는 워커 수
+- 접수 제어: 레인별 허용 대기 시간을 넘으면 429 + Retry-After
+- 워커 배치: 대기열 앞쪽 작업 중 현재 가용 메모리에 맞는 작업을 선택
+"""
+
+import os
+import json
+import time
+import threading
+from datetime import datetime, timedelta
+from statistics import median
+from typing import Any, Dict, List, Optional
+
+from media_probe import probe_media
+from render_config import parse_output_formats
+from job_queue import QUEUE_LANE_WEIGHTS
+from job_progress import read_progress, progress_fraction
+from worker_heartbeat import live_workers
+from utils.stage_timer import get_current_rss_mb
+from utils.logger_config import get_logger
+
+logger = get_logger('job_cost')
+
+try:
+    from job_logger import job_logger
+    JOB_LOGGER_AVAILABLE = True
+except ImportError:
+    JOB_LOGGER_AVAILABLE = False
+
+
+def _parse_lane_limits(spec: str) -> Dict[str, int]:
+    """'interactive:1800,api:3600,batch:0' 형식 파싱 (0 = 제한 없음)"""
+    limits = {lane: 0 for lane in QUEUE_LANE_WEIGHTS}
+    for item in spec.split(','):
+        lane, _, seconds = item.partition(':')
+        lane = lane.strip()
+        if lane in limits:
+            try:
+                limits[lane] = max(0, int(seconds))
+            except ValueError:
+                logger.warning(f"⚠️ 잘못된 허용 대기 시간 무시: {item}")
+    return limits
+
+
+# 레인별 허용 대기 시간 (초, 예상 대기 시간이 넘으면 429)
+ADMISSION_MAX_WAIT_SECONDS = _parse_lane_limits(
+    os.getenv('ADMISSION_MAX_WAIT_SECONDS', 'interactive:1800,api:3600,batch:0'))
+COST_CALIBRATION_JOBS = int(os.getenv('COST_CALIBRATION_JOBS', '200'))
+COST_CALIBRATION_TTL_SECONDS = int(os.getenv('COST_CALIBRATION_TTL_SECONDS', '600'))
+COST_MIN_SAMPLES = int(os.getenv('COST_MIN_SAMPLES', '5'))  # 단가 보정에 필요한 최소 표본 수
+WORKER_MEMORY_RESERVE_MB = int(os.getenv('WORKER_MEMORY_RESERVE_MB', '512'))
+WORKER_PACKING_LOOKAHEAD = int(os.getenv('WORKER_PACKING_LOOKAHEAD', '5'))
+WORKER_PACKING_MAX_SKIPS = int(os.getenv('WORKER_PACKING_MAX_SKIPS', '3'))  # 맨 앞 작업을 건너뛸 수 있는 최대 횟수
+
+VIDEO_EXTENSIONS = ('mp4', 'mov', 'avi', 'webm')
+OUTPUT_FPS = 30
+DEFAULT_VIDEO_SECONDS = 10.0  # probe 불가 영상의 가정 길이
+REFERENCE_PIXELS = 1920 * 1080
+
+# 보정 전 기본 단가 (측정 이력이 부족할 때 사용)
+DEFAULT_RATES = {
+    'tts_ms': {'edge': 1500.0, 'qwen': 8000.0},  # 대사 1개당
+    'media_prep_ms': 400.0,         # 미디어 파일 1개당
+    'rotation_ms': 8000.0,          # 회전 정규화 1회당
+    'encode_ms_per_frame': 30.0,
+    'frames_per_body': 105.0,       # 대사 1개당 출력 프레임 (약 3.5초)
+    'scale': 1.6,                   # 실제 전체 시간 / 주요 단계 합 (합성·믹싱·대기 등)
+    'base_memory_mb': 900.0,        # 작업 1건 최대 RSS
+    'video_memory_mb': 150.0,       # 입력 영상 1개당 추가 메모리 (1080p 기준, 해상도 비례)
+}
+
+
+def _video_info(path: str) -> Dict[str, Any]:
+    """영상 길이/해상도/회전 여부 (probe 실패 시 기본값)"""
+    data = probe_media(path)
+    stream = next((s for s in data.get('streams', []) if s.get('codec_type') == 'video'), None)
+    try:
+        duration = float(data.get('format', {}).get('duration'))
+    except (TypeError, ValueError):
+        duration = DEFAULT_VIDEO_SECONDS
+    if not stream:
+        return {'duration': duration, 'pixels': REFERENCE_PIXELS, 'rotated': False}
+
+    rotation = (stream.get('tags') or {}).get('rotate')
+    for side_data in stream.get('side_data_list') or []:
+        rotation = side_data.get('rotation', rotation)
+    try:
+        rotated = int(float(rotation or 0)) % 360 != 0
+    except (TypeError, ValueError):
+        rotated = False
+    pixels = (stream.get('width') or 1920) * (stream.get('height') or 1080)
+    return {'duration': duration, 'pixels': pixels, 'rotated': rotated}
+
+
+class JobCostModel:
+    """작업 비용 추정 + 대기 시간 예측 + 메모리 기반 작업 선택"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.rates: Dict[str, Any] = json.loads(json.dumps(DEFAULT_RATES))
+        self.calibrated_at = 0.0
+        self.sample_jobs = 0
+        self.calibrated_keys: List[str] = []
+        self.skipped: Dict[str, int] = {}  # 메모리 부족으로 건너뛴 맨 앞 작업 → 횟수
+
+    # ---------- 단가 보정 ----------
+
+    def _current_rates(self) -> Dict[str, Any]:
+        with self.lock:
+            if time.time() - self.calibrated_at < COST_CALIBRATION_TTL_SECONDS:
+                return self.rates
+            self.calibrated_at = time.time()
+        try:
+            self._calibrate()
+        except Exception as e:
+            logger.warning(f"⚠️ 비용 단가 보정 실패 (기존 단가 사용): {e}")
+        with self.lock:
+            return self.rates
+
+    def _calibrate(self):
+        """최근 작업의 단계별 측정으로 단가 보정 (표본이 부족한 항목은 기본값 유지)"""
+        if not JOB_LOGGER_AVAILABLE:
+            return
+        timings_list = job_logger.get_recent_stage_timings(COST_CALIBRATION_JOBS)
+
+        samples: Dict[str, List[float]] = {}
+        tts_samples: Dict[str, List[float]] = {}
+        for timings in timings_list:
+            if (timings.get('outputs') or 1) > 1:
+                continue  # 다중 출력 작업은 포맷별 렌더가 겹쳐 단계 합계/메모리가 단일 출력 기준과 다름
+            stages = timings.get('stages') or {}
+            spans = timings.get('spans') or []
+
+            engine_ms: Dict[str, List[float]] = {}
+            for span in spans:
+                if span.get('stage') == 'tts' and span.get('status') == 'ok':
+                    engine_ms.setdefault(span.get('engine') or 'edge', []).append(span['duration_ms'])
+            for engine, values in engine_ms.items():
+                tts_samples.setdefault(engine, []).append(sum(values) / len(values))
+
+            for stage, key in (('media_prep', 'media_prep_ms'), ('rotation_normalize', 'rotation_ms')):
+                info = stages.get(stage)
+                if info and info.get('count'):
+                    samples.setdefault(key, []).append(info['total_ms'] / info['count'])
+
+            encode = stages.get('encode') or {}
+            if encode.get('frames'):
+                samples.setdefault('encode_ms_per_frame', []).append(encode['total_ms'] / encode['frames'])
+                tts_count = (stages.get('tts') or {}).get('count')
+                if tts_count:
+                    samples.setdefault('frames_per_body', []).append(encode['frames'] / tts_count)
+
+            modeled_ms = sum((stages.get(stage) or {}).get('total_ms', 0.0)
+                             for stage in ('tts', 'media_prep', 'rotation_normalize', 'encode'))
+            if modeled_ms > 0 and timings.get('total_ms'):
+                samples.setdefault('scale', []).append(timings['total_ms'] / modeled_ms)
+            # 작업 중 샘플링한 RSS 최고치만 사용 (baseline_rss_mb가 없는 이전 기록의 peak_rss_mb는
+            # 프로세스 평생 최대값 ru_maxrss라 워커가 겪은 가장 큰 작업 값으로 고정되어 버림)
+            if timings.get('peak_rss_mb') and timings.get('baseline_rss_mb') is not None:
+                samples.setdefault('base_memory_mb', []).append(timings['peak_rss_mb'])
+
+        rates = json.loads(json.dumps(DEFAULT_RATES))
+        calibrated_keys = []
+        for key, values in samples.items():
+            if len(values) >= COST_MIN_SAMPLES:
+                # 메모리는 여유 있게 p90, 시간은 중앙값
+                rates[key] = sorted(values)[int(len(values) * 0.9) - 1] if key == 'base_memory_mb' else median(values)
+                calibrated_keys.append(key)
+        for engine, values in tts_samples.items():
+            if len(values) >= COST_MIN_SAMPLES:
+                rates['tts_ms'][engine] = median(values)
+                calibrated_keys.append(f"tts_ms.{engine}")
+
+        with self.lock:
+            self.rates = rates
+            self.sample_jobs = len(timings_list)
+            self.calibrated_keys = sorted(calibrated_keys)
+        logger.info(f"📐 비용 단가 보정: 표본 {len(timings_list)}건, 보정 항목 {len(calibrated_keys)}개")
+
+    # ---------- 작업 비용 ----------
+
+    def estimate(self, video_params: Dict[str, Any], media_folder: Optional[str] = None) -> Dict[str, Any]:
+        """작업 1건의 렌더 비용 추정
+
+        media_folder가 있으면 업로드 영상을 probe해 길이/해상도/회전을 반영 (probe 결과는 캐시되어
+        워커의 미디어 준비 단계에서 재사용됨), 없으면 파일 확장자만 보고 기본값 사용.
+
+        Returns:
+            dict: {'cost_seconds', 'memory_mb', 'bodies', 'images', 'videos', 'video_seconds', 'outputs', 'calibrated'}
+        """
+        rates = self._current_rates()
+
+        content = video_params.get('content_data') or {}
+        if isinstance(content, str):
+            try:
+                content = json.loads(content)
+            except ValueError:
+                content = {}
+        bodies = sum(1 for key, value in content.items() if key.startswith('body') and str(value).strip())
+
+        images = 0
+        videos: List[Dict[str, Any]] = []
+        for filename in video_params.get('uploaded_files') or []:
+            if filename.rsplit('.', 1)[-1].lower() not in VIDEO_EXTENSIONS:
+                images += 1
+                continue
+            path = os.path.join(media_folder, filename) if media_folder else None
+            if path and os.path.exists(path):
+                videos.append(_video_info(path))
+            else:
+                videos.append({'duration': DEFAULT_VIDEO_SECONDS, 'pixels': REFERENCE_PIXELS, 'rotated': False})
+
+        if video_params.get('voice_narration', 'enabled') == 'enabled':
+            engine = video_params.get('tts_engine') or 'edge'
+            tts_ms = bodies * rates['tts_ms'].get(engine, rates['tts_ms']['edge'])
+            frames = bodies * rates['frames_per_body']
+        else:
+            tts_ms = 0.0
+            subtitle_duration = float(video_params.get('subtitle_duration') or 0)
+            frames = bodies * (subtitle_duration * OUTPUT_FPS if subtitle_duration > 0 else rates['frames_per_body'])
+
+        # 다중 출력 작업: TTS/미디어 준비는 1회, 합성/인코딩과 렌더 메모리는 포맷 수만큼 (포맷별 병렬 렌더)
+        outputs = len(parse_output_formats(video_params.get('output_formats'), video_params.get('video_format') or 'reels'))
+
+        modeled_ms = (
+            tts_ms
+            + (images + len(videos)) * rates['media_prep_ms']
+            + sum(1 for video in videos if video['rotated']) * rates['rotation_ms']
+            + frames * rates['encode_ms_per_frame'] * outputs
+        )
+        memory_mb = (rates['base_memory_mb'] + sum(
+            rates['video_memory_mb'] * video['pixels'] / REFERENCE_PIXELS for video in videos
+        )) * outputs
+
+        return {
+            'cost_seconds': round(modeled_ms * rates['scale'] / 1000, 1),
+            'memory_mb': round(memory_mb),
+            'bodies': bodies,
+            'images': images,
+            'videos': len(videos),
+            'video_seconds': round(sum(video['duration'] for video in videos), 1),
+            'outputs': outputs,
+            'calibrated': bool(self.calibrated_keys),
+        }
+
+    def job_cost_seconds(self, job_data: Dict[str, Any]) -> float:
+        """큐에 기록된 추정 비용 (추정 없이 들어온 이전 작업은 파라미터만으로 추정)"""
+        estimate = job_data.get('estimate') or self.estimate(job_data.get('video_params') or {})
+        return estimate['cost_seconds']
+
+    def job_memory_mb(self, job_data: Dict[str, Any]) -> float:
+        estimate = job_data.get('estimate') or self.estimate(job_data.get('video_params') or {})
+        return estimate['memory_mb']
+
+    def remaining_seconds(self, job_data: Dict[str, Any]) -> float:
+        """처리 중 작업의 남은 비용 (진행 상황 파일 기준, 없으면 경과 시간 기준)"""
+        cost = self.job_cost_seconds(job_data)
+        snapshot = read_progress(job_data['job_id'])
+        if snapshot and snapshot.get('state') == 'processing':
+            return cost * (1 - progress_fraction(snapshot))
+        try:
+            elapsed = (datetime.now() - datetime.fromisoformat(job_data['started_at'])).total_seconds()
+        except (KeyError, TypeError, ValueError):
+            elapsed = 0.0
+        return max(cost - elapsed, cost * 0.1)
+
+    # ---------- 대기 시간 / 접수 제어 ----------
+
+    def projected_wait(self, job_queue, lane: str, client_key: str) -> Dict[str, Any]:
+        """지금 제출하면 시작까지 걸릴 예상 시간"""
+        ahead, processing = job_queue.jobs_ahead(lane, client_key)
+        workers = max(1, len(live_workers()))
+        backlog = sum(self.job_cost_seconds(job) for job in ahead) + sum(self.remaining_seconds(job) for job in processing)
+        return {
+            'queue_wait_seconds': round(backlog / workers, 1),
+            'jobs_ahead': len(ahead),
+            'processing': len(processing),
+            'workers': workers,
+        }
+
+    def check_admission(self, job_queue, lane: str, client_key: str) -> Dict[str, Any]:
+        """레인별 허용 대기 시간 초과 여부
+
+        Returns:
+            dict: projected_wait 결과 + {'admitted', 'limit_seconds', 'retry_after'}
+        """
+        projection = self.projected_wait(job_queue, lane, client_key)
+        limit = ADMISSION_MAX_WAIT_SECONDS.get(lane, 0)
+        wait = projection['queue_wait_seconds']
+        admitted = limit <= 0 or wait <= limit
+        projection.update(
+            admitted=admitted,
+            limit_seconds=limit,
+            # 초과분만큼 대기열이 줄어든 뒤 다시 시도
+            retry_after=0 if admitted else max(30, int(wait - limit) + 1),
+        )
+        if not admitted:
+            logger.warning(f"🚦 접수 제한: 레인 {lane}, 예상 대기 {wait:.0f}초 > 허용 {limit}초 (클라이언트: {client_key})")
+        return projection
+
+    def eta(self, queue_wait_seconds: float, estimate: Dict[str, Any]) -> Dict[str, Any]:
+        """응답에 포함할 예상 시작/완료 시각"""
+        now = datetime.now()
+        completion = queue_wait_seconds + estimate['cost_seconds']
+        return {
+            'queue_wait_seconds': round(queue_wait_seconds),
+            'render_seconds': round(estimate['cost_seconds']),
+            'estimated_start_at': (now + timedelta(seconds=queue_wait_seconds)).isoformat(timespec='seconds'),
+            'estimated_completion_at': (now + timedelta(seconds=completion)).isoformat(timespec='seconds'),
+        }
+
+    # ---------- 워커 작업 선택 ----------
+
+    def pick_job(self, pending_jobs: List[Dict[str, Any]], other_busy_workers: int) -> Optional[Dict[str, Any]]:
+        """대기열 앞쪽 작업 중 가용 메모리에 맞는 작업 선택 (없으면 None → 잠시 대기)
+
+        다른 워커가 아무것도 처리하지 않으면 기다려도 메모리가 풀리지 않으므로 맨 앞 작업을 그대로 실행.
+        맨 앞 작업을 WORKER_PACKING_MAX_SKIPS번 넘게 건너뛰지는 않음 (큰 작업 기아 방지).
+        """
+        if not pending_jobs:
+            return None
+        head = pending_jobs[0]
+        available = available_memory_mb()
+        if available is None or other_busy_workers == 0:
+            self.skipped.pop(head['job_id'], None)
+            return head
+
+        # 이 워커 프로세스가 이미 점유한 메모리는 작업 최대 RSS에 포함되어 있으므로 제외
+        budget = available - WORKER_MEMORY_RESERVE_MB + (get_current_rss_mb() or 0)
+        if self.job_memory_mb(head) <= budget:
+            self.skipped.pop(head['job_id'], None)
+            return head
+        if self.skipped.get(head['job_id'], 0) >= WORKER_PACKING_MAX_SKIPS:
+            logger.info(f"⏳ 메모리 대기: {head['job_id']} (필요 {self.job_memory_mb(head):.0f}MB, 가용 {budget:.0f}MB)")
+            return None
+
+        for job in pending_jobs[1:WORKER_PACKING_LOOKAHEAD]:
+            if self.job_memory_mb(job) <= budget:
+                self.skipped[head['job_id']] = self.skipped.get(head['job_id'], 0) + 1
+                logger.info(f"🧩 메모리 예산 배치: {job['job_id']} 먼저 실행 "
+                            f"({head['job_id']} 필요 {self.job_memory_mb(head):.0f}MB > 가용 {budget:.0f}MB)")
+                return job
+        return None
+
+    def describe(self) -> Dict[str, Any]:
+        """현재 단가/보정 상태 (/queue-stats 노출용)"""
+        rates = self._current_rates()
+        return {
+            'rates': rates,
+            'sample_jobs': self.sample_jobs,
+            'calibrated_keys': self.calibrated_keys,
+            'admission_max_wait_seconds': dict(ADMISSION_MAX_WAIT_SECONDS),
+            'memory_reserve_mb': WORKER_MEMORY_RESERVE_MB,
+        }
+
+
+def available_memory_mb() -> Optional[float]:
+    """시스템 가용 메모리 (MB, /proc/meminfo MemAvailable - Linux 외에는 None)"""
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+# 전역 인스턴스
+job_cost_model = JobCostModel()
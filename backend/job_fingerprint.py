@@ -0,0 +1,142 @@
+"""
+중복 제출 판별용 작업 지문 (fingerprint)
+정규화한 video_params + 업로드 미디어 내용 해시 + 사용자로 지문을 만든다.
+타임아웃 후 재전송이나 두 번 클릭으로 같은 대본/미디어가 다시 들어오면 job_queue가
+대기·처리 중인 작업에 합류시키거나 보존 중인 완료 결과를 그대로 돌려준다.
+
+랜덤 선택(BGM, 패닝, 전환 등)은 요청에서 지정하지 않았으면 대사 텍스트를 뺀 지문에서 만든 render_seed로
+고정한다. 같은 제출은 같은 결과가 나오고, 대사만 고쳐 다시 렌더해도 시드가 그대로여서
+바뀌지 않은 세그먼트는 세그먼트 캐시를 재사용할 수 있다.
+"""
+
+import os
+import json
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.logger_config import get_logger
+
+logger = get_logger('job_fingerprint')
+
+# 결과물에 영향을 주지 않는 파라미터 (알림/출처/배치 정보, 미디어 파일명은 내용 해시로 대체)
+# render_seed는 요청에서 지정한 경우에만 지문 계산 전에 들어 있으므로 그대로 지문에 포함
+VOLATILE_PARAMS = ('uploaded_files', 'webhook_url', 'batch_id', 'source')
+# JSON 문자열로 전달되는 파라미터 (키 순서/공백 차이를 없애기 위해 파싱 후 정렬)
+JSON_PARAMS = ('content_data', 'edited_texts', 'image_panning_options', 'per_body_tts_settings')
+# 대사 텍스트 파라미터 (렌더 시드 계산에서 제외)
+TEXT_PARAMS = ('content_data', 'edited_texts')
+
+_HASH_CHUNK = 1024 * 1024
+_QUICK_SAMPLE = 64 * 1024
+
+
+def _normalize_json(value: Any) -> Any:
+    if isinstance(value, str):
+        if not value.strip():
+            return None
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return value.strip()
+    if isinstance(value, dict):
+        return {str(k): _normalize_json(v) for k, v in value.items() if v not in (None, '', {}, [])}
+    if isinstance(value, list):
+        return [_normalize_json(v) for v in value]
+    if isinstance(value, str):
+        return value.strip()
+    return value
+
+
+def normalize_params(video_params: Dict[str, Any]) -> Dict[str, Any]:
+    """지문 계산용 파라미터 정규화"""
+    normalized = {}
+    for key, value in video_params.items():
+        if key in VOLATILE_PARAMS:
+            continue
+        normalized[key] = _normalize_json(value) if key in JSON_PARAMS else value
+    return normalized
+
+
+def media_digest(path: str) -> Optional[str]:
+    """미디어 파일 내용 해시 (sha256, 읽기 실패 시 None)"""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(_HASH_CHUNK), b''):
+                digest.update(chunk)
+    except OSError as e:
+        logger.debug(f"미디어 해시 실패 ({os.path.basename(path)}): {e}")
+        return None
+    return digest.hexdigest()
+
+
+def media_quick_digest(path: str) -> Optional[str]:
+    """미디어 파일 간이 해시 (크기 + 앞/뒤 _QUICK_SAMPLE 바이트) - 전체를 읽지 않고 같은 파일일 가능성만 판단할 때 사용"""
+    digest = hashlib.sha256()
+    try:
+        size = os.path.getsize(path)
+        digest.update(str(size).encode('ascii'))
+        with open(path, 'rb') as f:
+            digest.update(f.read(_QUICK_SAMPLE))
+            if size > _QUICK_SAMPLE:
+                f.seek(max(size - _QUICK_SAMPLE, _QUICK_SAMPLE))
+                digest.update(f.read(_QUICK_SAMPLE))
+    except OSError as e:
+        logger.debug(f"미디어 간이 해시 실패 ({os.path.basename(path)}): {e}")
+        return None
+    return digest.hexdigest()
+
+
+def stream_digest(file_obj) -> str:
+    """업로드 스트림 내용 해시 (sha256, 저장 전에 지문을 계산할 때 사용 - 읽은 뒤 처음으로 되돌림)"""
+    digest = hashlib.sha256()
+    file_obj.seek(0)
+    for chunk in iter(lambda: file_obj.read(_HASH_CHUNK), b''):
+        digest.update(chunk)
+    file_obj.seek(0)
+    return digest.hexdigest()
+
+
+def _media_digests(video_params: Dict[str, Any], media_folder: Optional[str],
+                   known_digests: Optional[Dict[str, str]] = None) -> Optional[List[str]]:
+    """업로드 순번(1.jpg, 2.mp4 ...)이 렌더 순서이므로 미디어 해시는 파일명 순서를 유지한다."""
+    media: List[str] = []
+    for filename in video_params.get('uploaded_files') or []:
+        if known_digests and filename in known_digests:
+            digest = known_digests[filename]
+        elif media_folder:
+            digest = media_digest(os.path.join(media_folder, filename))
+        else:
+            digest = None
+        if digest is None:
+            return None
+        media.append(f"{os.path.splitext(filename)[0]}:{digest}")
+    return media
+
+
+def _digest_document(user_email: str, params: Dict[str, Any], media: List[str]) -> str:
+    document = {
+        'user': (user_email or '').strip().lower(),
+        'params': params,
+        'media': media,
+    }
+    encoded = json.dumps(document, ensure_ascii=False, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def compute_fingerprint(user_email: str, video_params: Dict[str, Any], media_folder: Optional[str],
+                        media_digests: Optional[Dict[str, str]] = None) -> Tuple[Optional[str], Optional[int]]:
+    """(작업 지문, 렌더 시드) - 업로드 미디어를 읽을 수 없으면 (None, None) → 중복 판별 없이 새 작업
+
+    media_digests(파일명 -> stream_digest)를 주면 해당 파일은 폴더에서 다시 읽지 않는다 (저장 전 판별용).
+    렌더 시드는 대사 텍스트를 뺀 같은 문서의 해시에서 도출한다 (미디어는 1회만 해시).
+    """
+    media = _media_digests(video_params, media_folder, media_digests)
+    if media is None:
+        return None, None
+
+    params = normalize_params(video_params)
+    fingerprint = _digest_document(user_email, params, media)
+    seed_params = {key: value for key, value in params.items() if key not in TEXT_PARAMS}
+    render_seed = int(_digest_document(user_email, seed_params, media)[:8], 16)
+    return fingerprint, render_seed
@@ -3,6 +3,7 @@ Job 로깅 시스템 - SQLite 기반
 """
 import sqlite3
 import json
+import math
 import os
 import shutil
 from datetime import datetime
@@ -152,12 +153,19 @@ class JobLogger:
             logger.error(f"Job 상태 업데이트 실패: {e}")
             raise
 
-    def update_job_metadata(self, job_id: str, metadata: Dict[str, Any]):
-        """Job의 metadata 업데이트"""
+    def update_job_metadata(self, job_id: str, metadata: Dict[str, Any], merge: bool = False):
+        """Job의 metadata 업데이트 (merge=True이면 기존 metadata에 키 단위로 병합)"""
         try:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
 
+                if merge:
+                    cursor.execute('SELECT metadata FROM jobs WHERE job_id = ?', (job_id,))
+                    row = cursor.fetchone()
+                    existing = json.loads(row[0]) if row and row[0] else {}
+                    existing.update(metadata)
+                    metadata = existing
+
                 cursor.execute('''
                     UPDATE jobs
                     SET metadata = ?
@@ -319,7 +327,7 @@ class JobLogger:
             logger.error(f"사용자별 Job 목록 조회 실패: {e}")
             raise
 
-    def get_job_statistics(self) -> Dict[str, Any]:
+    def get_job_statistics(self, recent_jobs: int = 200) -> Dict[str, Any]:
         """Job 통계 정보"""
         try:
             with sqlite3.connect(self.db_path) as conn:
@@ -347,15 +355,76 @@ class JobLogger:
                 ''')
                 daily_stats = {row[0]: row[1] for row in cursor.fetchall()}
 
-                return {
-                    'total_jobs': total_jobs,
-                    'status_stats': status_stats,
-                    'daily_stats': daily_stats
-                }
+            return {
+                'total_jobs': total_jobs,
+                'status_stats': status_stats,
+                'daily_stats': daily_stats,
+                'stage_stats': self.get_stage_statistics(recent_jobs)
+            }
 
         except Exception as e:
             logger.error(f"Job 통계 조회 실패: {e}")
             raise
 
+    def get_recent_stage_timings(self, recent_jobs: int = 200) -> List[Dict[str, Any]]:
+        """최근 Job들의 stage_timings 목록 (최신순)"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT metadata FROM jobs
+                WHERE metadata LIKE '%"stage_timings"%'
+                ORDER BY created_at DESC
+                LIMIT ?
+            ''', (recent_jobs,))
+            rows = cursor.fetchall()
+
+        timings_list = []
+        for (metadata_text,) in rows:
+            try:
+                timings = json.loads(metadata_text).get('stage_timings')
+            except (TypeError, ValueError):
+                continue
+            if timings:
+                timings_list.append(timings)
+        return timings_list
+
+    def get_stage_statistics(self, recent_jobs: int = 200) -> Dict[str, Any]:
+        """최근 Job들의 단계별 소요 시간 p50/p95 (metadata의 stage_timings 기준)"""
+        timings_list = self.get_recent_stage_timings(recent_jobs)
+
+        # Job 1건 내 같은 단계(예: 대사별 TTS)는 합산해서 Job 단위 분포를 계산
+        durations: Dict[str, List[float]] = {}
+        peak_rss: List[float] = []
+        for timings in timings_list:
+            for stage, stage_info in (timings.get('stages') or {}).items():
+                durations.setdefault(stage, []).append(stage_info.get('total_ms', 0.0))
+            if timings.get('total_ms') is not None:
+                durations.setdefault('total', []).append(timings['total_ms'])
+            if timings.get('peak_rss_mb') is not None:
+                peak_rss.append(timings['peak_rss_mb'])
+
+        stages = {
+            stage: {
+                'jobs': len(values),
+                'p50_ms': _percentile(values, 50),
+                'p95_ms': _percentile(values, 95),
+                'max_ms': max(values),
+            }
+            for stage, values in durations.items()
+        }
+        return {
+            'sampled_jobs': len(timings_list),
+            'stages': stages,
+            'peak_rss_mb_p95': _percentile(peak_rss, 95) if peak_rss else None,
+        }
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    """nearest-rank 백분위수"""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
 # 전역 인스턴스
 job_logger = JobLogger()
\ No newline at end of file
@@ -0,0 +1,118 @@
+"""
+작업 종료 알림 기록 (완료/실패 webhook, 실패 이메일, 배치 완료 webhook)
+워커와 중단 작업 회수(cleanup_scheduler의 reaper)가 같은 경로로 알림 아웃박스에 기록한다.
+실제 발송은 알림 발송 스레드(NotificationSender)가 담당한다.
+"""
+
+import os
+import json
+from typing import Any, Dict, Optional
+
+from notification_outbox import notification_outbox
+from utils.logger_config import get_logger
+
+logger = get_logger('job_notifications')
+
+try:
+    from email_service import email_service
+    EMAIL_SERVICE_AVAILABLE = True
+except ImportError as e:
+    logger.warning(f"⚠️ 이메일 서비스 로드 실패 (배치 webhook video_url 생략): {e}")
+    email_service = None
+    EMAIL_SERVICE_AVAILABLE = False
+
+try:
+    from job_batches import batch_registry
+    BATCH_REGISTRY_AVAILABLE = True
+except ImportError as e:
+    logger.warning(f"⚠️ 작업 배치 관리 로드 실패: {e}")
+    batch_registry = None
+    BATCH_REGISTRY_AVAILABLE = False
+
+
+def queue_notification(enqueue, *args) -> None:
+    """알림 아웃박스 기록 (실패해도 작업 결과에는 영향 없음)"""
+    try:
+        enqueue(*args)
+    except Exception as outbox_error:
+        logger.error(f"❌ 알림 기록 실패: {args[0]} - {outbox_error}")
+
+
+def webhook_urls(job_data: Dict[str, Any]) -> list:
+    """작업 webhook 목록 (요청 webhook + 중복 제출로 합류한 요청들의 webhook)"""
+    video_params = job_data.get('video_params', {})
+    urls = [video_params.get('webhook_url')] + video_params.get('attached_webhook_urls', [])
+    return [url for url in urls if url]
+
+
+def send_job_webhook(webhook_url: str, job_id: str, status: str, video_url: Optional[str] = None,
+                     outputs: Optional[Dict[str, str]] = None) -> None:
+    """작업 완료/실패 webhook 기록
+
+    다중 출력 작업은 outputs({포맷: 다운로드 URL})를 함께 보낸다 (video_url은 첫 번째 포맷).
+    """
+    payload = {"job_id": job_id, "status": status}
+    if video_url:
+        payload["video_url"] = video_url
+    if outputs:
+        payload["outputs"] = outputs
+    queue_notification(notification_outbox.enqueue_webhook, job_id, webhook_url, payload, status)
+
+
+def notify_job_failed(job_data: Dict[str, Any], error_message: Optional[str] = None) -> None:
+    """최종 실패 알림 기록 (실패 이메일 + 작업 webhook)"""
+    job_id = job_data['job_id']
+    user_email = job_data.get('user_email', 'unknown')
+    error_message = error_message or job_data.get('error_message') or '알 수 없는 오류'
+
+    # video_params에서 대사 데이터 추출
+    video_params = job_data.get('video_params', {})
+    try:
+        content_data_str = video_params.get('content_data', '{}')
+        error_content = json.loads(content_data_str) if isinstance(content_data_str, str) else content_data_str
+    except Exception:
+        error_content = None
+
+    queue_notification(notification_outbox.enqueue_error_email, job_id, user_email, error_message, error_content)
+
+    # Webhook 알림 (webhook_url이 있을 때만, 합류한 중복 제출의 webhook 포함)
+    for webhook_url in webhook_urls(job_data):
+        send_job_webhook(webhook_url, job_id, "failed")
+
+
+def finish_batch(job_data: Dict[str, Any], job_queue) -> None:
+    """배치 작업이 최종 완료/실패하면 배치 전체 완료 여부 확인 후 배치 webhook 1회 기록"""
+    batch_id = job_data.get('video_params', {}).get('batch_id')
+    if not batch_id or not BATCH_REGISTRY_AVAILABLE:
+        return
+    try:
+        finished = batch_registry.finish_if_done(batch_id, job_queue)
+    except Exception as batch_error:
+        logger.warning(f"⚠️ 배치 완료 확인 실패: {batch_id} - {batch_error}")
+        return
+    if not finished or not finished['batch'].get('webhook_url'):
+        return
+
+    summary = finished['summary']
+    base_url = os.getenv("BASE_URL", "http://localhost:8097")
+    jobs = []
+    for item in summary['jobs']:
+        entry = {"job_id": item['job_id'], "ref": item.get('ref'), "status": item['status']}
+        if item['status'] == 'completed' and item.get('video_path') and EMAIL_SERVICE_AVAILABLE:
+            try:
+                token = email_service.generate_download_token(item['video_path'], finished['batch']['user_email'])
+                entry["video_url"] = f"{base_url}/api/download-video?token={token}"
+            except Exception as token_error:
+                logger.warning(f"⚠️ 배치 webhook video_url 생성 실패: {item['job_id']} - {token_error}")
+        jobs.append(entry)
+
+    payload = {
+        "batch_id": batch_id,
+        "status": summary['status'],
+        "total": summary['total'],
+        "completed": summary['counts']['completed'],
+        "failed": summary['total'] - summary['counts']['completed'],
+        "jobs": jobs,
+    }
+    queue_notification(notification_outbox.enqueue_webhook, batch_id, finished['batch']['webhook_url'],
+                       payload, f"batch:{summary['status']}")
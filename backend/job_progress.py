@@ -0,0 +1,287 @@
+"""
+작업 진행 상황 채널
+워커 프로세스가 작업별 진행 상황(상태 전환, 단계, 세그먼트 i/N, 인코딩 프레임 수)을
+작업별 JSON 파일 1개에 기록하고(원자적 교체), API 프로세스는 파일 수정 시각만 확인하다가
+바뀌었을 때만 읽어 SSE(/job-events/{job_id})로 전달한다.
+큐 파일(jobs.json)과 SQLite를 주기적으로 읽는 폴링을 대체한다.
+"""
+
+import os
+import json
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+from utils.logger_config import get_logger
+
+logger = get_logger('job_progress')
+
+try:
+    from proglog import ProgressBarLogger
+    PROGLOG_AVAILABLE = True
+except ImportError:
+    ProgressBarLogger = object
+    PROGLOG_AVAILABLE = False
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+PROGRESS_DIR = os.getenv('JOB_PROGRESS_DIR', os.path.join(current_dir, 'job_progress'))
+PROGRESS_MIN_INTERVAL = float(os.getenv('JOB_PROGRESS_MIN_INTERVAL', '0.5'))  # 같은 단계 안에서 최소 기록 간격 (초)
+PROGRESS_MAX_AGE_HOURS = int(os.getenv('JOB_PROGRESS_MAX_AGE_HOURS', '48'))
+
+TERMINAL_STATES = ('completed', 'failed')
+
+# 현재 작업의 진행 상황 기록기 (렌더 스레드 풀에는 contextvars.copy_context로 전파)
+_active_reporter = contextvars.ContextVar('job_progress', default=None)
+# 다중 출력 작업에서 현재 렌더 중인 출력 포맷 (포맷별 진행 상황을 따로 기록)
+_active_part = contextvars.ContextVar('job_progress_part', default=None)
+
+# 렌더 단계 순서 (다중 출력 작업의 대표 단계는 가장 뒤처진 포맷의 단계)
+STAGE_ORDER = ('prepare', 'composite', 'audio_mix', 'encode', 'mux')
+
+
+def progress_path(job_id: str) -> str:
+    return os.path.join(PROGRESS_DIR, f"{job_id}.json")
+
+
+def read_progress(job_id: str) -> Optional[Dict[str, Any]]:
+    """작업 진행 상황 (기록이 없거나 읽기 실패 시 None)"""
+    try:
+        with open(progress_path(job_id), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def progress_mtime(job_id: str) -> Optional[int]:
+    """진행 상황 파일 수정 시각 (ns, 없으면 None) - 변경 감지용"""
+    try:
+        return os.stat(progress_path(job_id)).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _render_fraction(progress: Dict[str, Any]) -> float:
+    segments_total = progress.get('segments_total') or 0
+    segment_ratio = min(progress.get('segments_done', 0) / segments_total, 1.0) if segments_total else 0.0
+    return 0.5 * segment_ratio + 0.5 * (progress.get('encode_percent') or 0.0) / 100
+
+
+def progress_fraction(snapshot: Dict[str, Any]) -> float:
+    """진행 상황 → 대략적인 완료 비율 (0~1, 세그먼트 합성 절반 + 인코딩 절반)
+
+    다중 출력 작업은 포맷별 진행 비율의 평균.
+    """
+    if snapshot.get('state') in TERMINAL_STATES:
+        return 1.0
+    outputs = snapshot.get('outputs')
+    if outputs:
+        return round(sum(_render_fraction(part) for part in outputs.values()) / len(outputs), 3)
+    return round(_render_fraction(snapshot), 3)
+
+
+def _new_part() -> Dict[str, Any]:
+    return {'stage': None, 'segments_done': 0, 'segments_total': 0,
+            'frames_written': 0, 'frames_total': 0, 'encode_percent': 0.0}
+
+
+class ProgressReporter:
+    """작업 1건의 진행 상황 기록 (여러 렌더 스레드에서 동시에 기록 가능)"""
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self.lock = threading.Lock()
+        self.last_write = 0.0
+        # 재시도 등으로 다시 만들어져도 이벤트 순번(seq)은 이어서 증가
+        previous = read_progress(job_id) or {}
+        self.state: Dict[str, Any] = {
+            'job_id': job_id,
+            'state': previous.get('state', 'pending'),
+            'stage': None,
+            'segments_done': 0,
+            'segments_total': 0,
+            'frames_written': 0,
+            'frames_total': 0,
+            'encode_percent': 0.0,
+            'attempt': previous.get('attempt', 0),
+            'message': None,
+            'seq': previous.get('seq', 0),
+        }
+
+    @contextmanager
+    def activate(self):
+        """이 기록기를 현재 컨텍스트의 활성 기록기로 지정"""
+        token = _active_reporter.set(self)
+        try:
+            yield self
+        finally:
+            _active_reporter.reset(token)
+
+    def set_state(self, state: str, **fields):
+        """작업 상태 전환 (pending / processing / completed / failed) - 즉시 기록"""
+        with self.lock:
+            self.state['state'] = state
+            if state == 'processing':
+                self.state['attempt'] = self.state.get('attempt', 0) + 1
+                self.state.update(_new_part())
+                self.state.pop('outputs', None)
+            self.state.update(fields)
+            self._write()
+
+    def add_part(self, part: str):
+        """다중 출력 작업의 포맷별 진행 상황 등록 (렌더 시작 전에 모두 등록해야 평균 비율이 맞음)"""
+        with self.lock:
+            self.state.setdefault('outputs', {}).setdefault(part, _new_part())
+
+    def _target(self, part: Optional[str]) -> Dict[str, Any]:
+        """기록 대상 (포맷이 지정되면 포맷별 진행 상황, 아니면 작업 전체) - 호출 측에서 lock 보유"""
+        if part is None:
+            return self.state
+        return self.state.setdefault('outputs', {}).setdefault(part, _new_part())
+
+    def _aggregate(self):
+        """포맷별 진행 상황 → 작업 전체 값 (세그먼트/프레임은 합계, 인코딩 %는 평균, 단계는 가장 뒤처진 포맷)"""
+        parts = list(self.state.get('outputs', {}).values())
+        if not parts:
+            return
+        for key in ('segments_done', 'segments_total', 'frames_written', 'frames_total'):
+            self.state[key] = sum(part[key] for part in parts)
+        self.state['encode_percent'] = round(sum(part['encode_percent'] for part in parts) / len(parts), 1)
+        stages = [part['stage'] for part in parts]
+        if None in stages:
+            self.state['stage'] = next((stage for stage in stages if stage is not None), None)
+        else:
+            self.state['stage'] = min(stages, key=lambda stage: STAGE_ORDER.index(stage) if stage in STAGE_ORDER else 0)
+
+    def set_stage(self, stage: str, part: Optional[str] = None, **fields):
+        """렌더 단계 전환 - 즉시 기록"""
+        part = part or _active_part.get()
+        with self.lock:
+            target = self._target(part)
+            target['stage'] = stage
+            target.update(fields)
+            if part is not None:
+                self._aggregate()
+            self._write()
+
+    def segment_done(self, part: Optional[str] = None):
+        """세그먼트 1개 합성 완료"""
+        part = part or _active_part.get()
+        with self.lock:
+            target = self._target(part)
+            target['segments_done'] += 1
+            total = target['segments_total']
+            if part is not None:
+                self._aggregate()
+            self._write(force=total > 0 and target['segments_done'] >= total)
+
+    def encode_frames(self, frames_written: int, frames_total: int, part: Optional[str] = None):
+        """인코딩 진행 (기록된 프레임 수)"""
+        part = part or _active_part.get()
+        with self.lock:
+            target = self._target(part)
+            target['frames_written'] = frames_written
+            target['frames_total'] = frames_total
+            if frames_total:
+                target['encode_percent'] = round(min(frames_written / frames_total, 1.0) * 100, 1)
+            if part is not None:
+                self._aggregate()
+            self._write(force=frames_total > 0 and frames_written >= frames_total)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            return dict(self.state)
+
+    def _write(self, force: bool = True):
+        """원자적 교체로 기록 (호출 측에서 lock 보유) - force가 아니면 최소 간격 적용"""
+        now = time.time()
+        if not force and now - self.last_write < PROGRESS_MIN_INTERVAL:
+            return
+        self.state['seq'] += 1
+        self.state['updated_at'] = now
+        path = progress_path(self.job_id)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(PROGRESS_DIR, exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.state, f, ensure_ascii=False)
+            os.replace(temp_path, path)
+            self.last_write = now
+        except OSError as e:
+            logger.debug(f"진행 상황 기록 실패 ({self.job_id}): {e}")
+
+
+def get_active_reporter() -> Optional[ProgressReporter]:
+    """현재 컨텍스트의 활성 기록기"""
+    return _active_reporter.get()
+
+
+@contextmanager
+def progress_part(part: str):
+    """with 블록 안의 진행 기록을 출력 포맷 part의 진행 상황으로 분리 (다중 출력 작업의 포맷별 렌더)"""
+    token = _active_part.set(part)
+    try:
+        yield part
+    finally:
+        _active_part.reset(token)
+
+
+def report_stage(stage: str, **fields):
+    """현재 작업의 렌더 단계 전환 기록 (활성 기록기가 없으면 무시)"""
+    reporter = _active_reporter.get()
+    if reporter is not None:
+        reporter.set_stage(stage, **fields)
+
+
+def report_segment_done():
+    """현재 작업의 세그먼트 완료 기록 (활성 기록기가 없으면 무시)"""
+    reporter = _active_reporter.get()
+    if reporter is not None:
+        reporter.segment_done()
+
+
+class EncodeProgressLogger(ProgressBarLogger):
+    """MoviePy 인코딩 진행 막대(t = 기록된 프레임 인덱스)를 진행 상황 기록기로 전달"""
+
+    def __init__(self, reporter: ProgressReporter, frames_total: int, part: Optional[str] = None):
+        super().__init__()
+        self.reporter = reporter
+        self.frames_total = frames_total
+        self.part = part
+
+    def bars_callback(self, bar, attr, value, old_value=None):
+        if bar == 't' and attr == 'index':
+            self.reporter.encode_frames(value, self.bars[bar].get('total') or self.frames_total, part=self.part)
+
+
+def encode_progress_logger(frames_total: int):
+    """write_videofile(logger=...) 인자 - 활성 기록기가 없거나 proglog가 없으면 None(기존과 동일하게 출력 없음)"""
+    reporter = _active_reporter.get()
+    if reporter is None or not PROGLOG_AVAILABLE:
+        return None
+    part = _active_part.get()
+    reporter.encode_frames(0, frames_total, part=part)
+    return EncodeProgressLogger(reporter, frames_total, part)
+
+
+def publish_state(job_id: str, state: str, **fields):
+    """렌더 컨텍스트 밖(워커 루프 재시도 처리 등)에서 상태 전환 기록"""
+    ProgressReporter(job_id).set_state(state, **fields)
+
+
+def cleanup_progress_files(max_age_hours: int = PROGRESS_MAX_AGE_HOURS) -> int:
+    """오래된 진행 상황 파일 정리"""
+    if not os.path.isdir(PROGRESS_DIR):
+        return 0
+    cutoff = time.time() - max_age_hours * 3600
+    removed = 0
+    for name in os.listdir(PROGRESS_DIR):
+        path = os.path.join(PROGRESS_DIR, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+        except OSError:
+            continue
+    return removed
@@ -1,17 +1,22 @@
 """
 파일 기반 작업 큐 시스템
 Redis 없이 JSON 파일을 사용한 간단한 작업 큐 관리
+
+대기 작업은 우선순위 레인(interactive / api / batch) 사이에서 가중치 공정 분배로,
+같은 레인 안에서는 클라이언트(user_email 또는 지정한 client_key)별로 공정하게 순서를 정한다.
+한 클라이언트가 대량으로 넣은 작업이 웹 UI 사용자 작업을 계속 밀어내지 않도록 하기 위함.
 """
 
 import json
 import uuid
 import os
 import threading
-from datetime import datetime
-from typing import Dict, List, Optional, Any
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Any, Tuple
 from enum import Enum
 import time
 from utils.logger_config import get_logger
+from render_config import new_render_seed, parse_render_seed
 
 logger = get_logger('job_queue')
 
@@ -21,6 +26,82 @@ class JobStatus(Enum):
     COMPLETED = "completed"
     FAILED = "failed"
 
+class JobLane(Enum):
+    INTERACTIVE = "interactive"  # 웹 UI
+    API = "api"                  # 외부 API
+    BATCH = "batch"              # 대량 제출
+
+
+def _parse_lane_weights(spec: str) -> Dict[str, int]:
+    """'interactive:6,api:3,batch:1' 형식 파싱 (잘못된 항목은 기본값 유지)"""
+    weights = {JobLane.INTERACTIVE.value: 6, JobLane.API.value: 3, JobLane.BATCH.value: 1}
+    for item in spec.split(','):
+        lane, _, weight = item.partition(':')
+        lane = lane.strip()
+        if lane in weights:
+            try:
+                weights[lane] = max(1, int(weight))
+            except ValueError:
+                logger.warning(f"⚠️ 잘못된 레인 가중치 무시: {item}")
+    return weights
+
+
+# 레인별 가중치 (가중치 비율대로 작업 시작 기회를 나눔) / 공정 분배 기준 시간 창
+QUEUE_LANE_WEIGHTS = _parse_lane_weights(os.getenv('QUEUE_LANE_WEIGHTS', 'interactive:6,api:3,batch:1'))
+QUEUE_FAIR_WINDOW_MINUTES = int(os.getenv('QUEUE_FAIR_WINDOW_MINUTES', '60'))
+# 레인 우선순위 (가중치 점수가 같을 때 앞선 레인 우선)
+LANE_ORDER = [JobLane.INTERACTIVE.value, JobLane.API.value, JobLane.BATCH.value]
+
+
+def job_lane(job_data: Dict[str, Any]) -> str:
+    """작업의 레인 (레인 필드가 없는 기존 작업은 소스로 추정)"""
+    lane = job_data.get('lane')
+    if lane in QUEUE_LANE_WEIGHTS:
+        return lane
+    source = (job_data.get('video_params') or {}).get('source', 'web_ui')
+    return JobLane.API.value if source == 'external_api' else JobLane.INTERACTIVE.value
+
+
+def job_client(job_data: Dict[str, Any]) -> str:
+    """공정 분배 단위 (client_key, 없으면 user_email)"""
+    return job_data.get('client_key') or job_data.get('user_email') or 'unknown'
+
+
+def fair_order(pending_jobs: List[Dict[str, Any]], recent_starts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """대기 작업을 실행 순서로 정렬 (가중치 공정 분배)
+
+    레인 선택: (최근 시작 수 + 이번 순서까지 배정 수) / 가중치가 가장 작은 레인
+    레인 안에서: 최근 시작 수 + 배정 수가 가장 적은 클라이언트의 가장 오래된 작업
+    """
+    lane_served = {lane: 0 for lane in QUEUE_LANE_WEIGHTS}
+    client_served: Dict[tuple, int] = {}
+    for job in recent_starts:
+        lane = job_lane(job)
+        lane_served[lane] += 1
+        key = (lane, job_client(job))
+        client_served[key] = client_served.get(key, 0) + 1
+
+    # 레인 → 클라이언트 → 오래된 순 작업 목록
+    queues: Dict[str, Dict[str, List[Dict[str, Any]]]] = {lane: {} for lane in QUEUE_LANE_WEIGHTS}
+    for job in sorted(pending_jobs, key=lambda x: x['created_at']):
+        queues[job_lane(job)].setdefault(job_client(job), []).append(job)
+
+    ordered = []
+    while len(ordered) < len(pending_jobs):
+        lane = min(
+            (lane for lane in LANE_ORDER if queues[lane]),
+            key=lambda lane: ((lane_served[lane] + 1) / QUEUE_LANE_WEIGHTS[lane], LANE_ORDER.index(lane))
+        )
+        clients = queues[lane]
+        client = min(clients, key=lambda c: (client_served.get((lane, c), 0), clients[c][0]['created_at']))
+        ordered.append(clients[client].pop(0))
+        if not clients[client]:
+            del clients[client]
+        lane_served[lane] += 1
+        client_served[(lane, client)] = client_served.get((lane, client), 0) + 1
+    return ordered
+
+
 class JobQueue:
     def __init__(self, queue_file: str = "jobs.json"):
         self.queue_file = queue_file
@@ -46,8 +127,25 @@ class JobQueue:
         with open(self.queue_file, 'w', encoding='utf-8') as f:
             json.dump(queue_data, f, ensure_ascii=False, indent=2)
 
-    def add_job(self, user_email: str, video_params: Dict[str, Any], job_id: str = None) -> str:
-        """새 작업을 큐에 추가"""
+    def add_job(self, user_email: str, video_params: Dict[str, Any], job_id: str = None,
+                lane: str = JobLane.INTERACTIVE.value, client_key: Optional[str] = None,
+                estimate: Optional[Dict[str, Any]] = None, fingerprint: Optional[str] = None) -> str:
+        """새 작업을 큐에 추가
+
+        Args:
+            lane: 우선순위 레인 (interactive / api / batch)
+            client_key: 공정 분배 단위 (미지정 시 user_email)
+            estimate: 렌더 비용 추정 (job_cost - 대기 시간 예측/워커 메모리 배치에 사용)
+            fingerprint: 중복 제출 판별 지문 (job_fingerprint) - 같은 지문의 대기/처리 중 작업이나
+                결과물이 남아 있는 완료 작업이 있으면 새 작업을 만들지 않고 그 작업 ID를 반환
+
+        Returns:
+            str: 작업 ID (중복 제출이면 기존 작업 ID)
+        """
+        if lane not in QUEUE_LANE_WEIGHTS:
+            logger.warning(f"⚠️ 알 수 없는 레인 '{lane}', {JobLane.API.value}로 대체")
+            lane = JobLane.API.value
+
         if job_id is None:
             job_id = str(uuid.uuid4())
         else:
@@ -63,29 +161,93 @@ class JobQueue:
             'result': None,
             'error_message': None,
             'retry_count': 0,
-            'max_retries': 2
+            'max_retries': 2,
+            'lane': lane,
+            'client_key': client_key or user_email,
+            'started_at': None,
+            'estimate': estimate,
+            'fingerprint': fingerprint
         }
 
         with self.lock:
             queue_data = self._load_queue()
+            duplicate = self._find_duplicate(queue_data, fingerprint) if fingerprint else None
+            if duplicate:
+                self._attach_duplicate(duplicate, video_params)
+                self._save_queue(queue_data)
+                logger.info(f"♊ 중복 제출 → 기존 작업 사용: {duplicate['job_id']} ({duplicate['status']}, 요청 ID: {job_id})")
+                return duplicate['job_id']
             queue_data[job_id] = job_data
             self._save_queue(queue_data)
 
-        logger.info(f"✅ 새 작업 추가됨: {job_id} (이메일: {user_email})")
+        logger.info(f"✅ 새 작업 추가됨: {job_id} (이메일: {user_email}, 레인: {lane})")
         return job_id
 
+    def find_duplicate(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """같은 지문의 재사용 가능한 작업 조회"""
+        return self._find_duplicate(self._load_queue(), fingerprint)
+
+    def attach_duplicate(self, job_id: str, video_params: Dict[str, Any]):
+        """중복 제출을 기존 작업에 합류"""
+        with self.lock:
+            queue_data = self._load_queue()
+            if job_id in queue_data:
+                self._attach_duplicate(queue_data[job_id], video_params)
+                self._save_queue(queue_data)
+                logger.info(f"♊ 중복 제출 → 기존 작업 사용: {job_id} ({queue_data[job_id]['status']})")
+
+    def _find_duplicate(self, queue_data: Dict[str, Any], fingerprint: str) -> Optional[Dict[str, Any]]:
+        """같은 지문의 재사용 가능한 작업 (대기/처리 중, 또는 결과 파일이 남아 있는 완료 작업 - 최신 우선)"""
+        candidates = sorted(
+            (job for job in queue_data.values() if job.get('fingerprint') == fingerprint),
+            key=lambda job: job['created_at'], reverse=True
+        )
+        for job in candidates:
+            if job['status'] in (JobStatus.PENDING.value, JobStatus.PROCESSING.value):
+                return job
+            if job['status'] == JobStatus.COMPLETED.value:
+                video_path = (job.get('result') or {}).get('video_path')
+                if video_path and os.path.exists(video_path):
+                    return job
+        return None
+
+    def _attach_duplicate(self, job: Dict[str, Any], video_params: Dict[str, Any]):
+        """중복 제출 합류 기록 (진행 중 작업이면 새 요청의 webhook도 완료 시 함께 호출)"""
+        job['duplicate_submissions'] = job.get('duplicate_submissions', 0) + 1
+        webhook_url = video_params.get('webhook_url')
+        if webhook_url and job['status'] != JobStatus.COMPLETED.value:
+            known = [job['video_params'].get('webhook_url')] + job['video_params'].get('attached_webhook_urls', [])
+            if webhook_url not in known:
+                job['video_params'].setdefault('attached_webhook_urls', []).append(webhook_url)
+
     def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
         """특정 작업 정보 조회"""
         queue_data = self._load_queue()
         return queue_data.get(job_id)
 
+    def get_jobs(self, job_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """여러 작업 정보를 큐 파일 1회 읽기로 조회"""
+        queue_data = self._load_queue()
+        return {job_id: queue_data[job_id] for job_id in job_ids if job_id in queue_data}
+
     def update_job_status(self, job_id: str, status: JobStatus,
                          result: Optional[Dict[str, Any]] = None,
-                         error_message: Optional[str] = None):
-        """작업 상태 업데이트"""
+                         error_message: Optional[str] = None,
+                         worker_id: Optional[str] = None) -> bool:
+        """작업 상태 업데이트 (적용 여부 반환)
+
+        worker_id를 주면 그 워커가 클레임한 처리 중 작업일 때만 적용한다. 하트비트 지연으로 재대기된 뒤
+        다른 워커가 다시 클레임한 작업에 이전 워커의 완료/실패 결과가 덮어쓰이지 않도록.
+        """
         with self.lock:
             queue_data = self._load_queue()
             if job_id in queue_data:
+                job = queue_data[job_id]
+                if worker_id is not None and (job['status'] != JobStatus.PROCESSING.value
+                                              or job.get('worker_id') != worker_id):
+                    logger.warning(f"⚠️ 작업 상태 업데이트 무시: {job_id} → {status.value} "
+                                   f"(처리 워커 {job.get('worker_id')}, 요청 워커 {worker_id}, 상태 {job['status']})")
+                    return False
                 queue_data[job_id]['status'] = status.value
                 queue_data[job_id]['updated_at'] = datetime.now().isoformat()
 
@@ -97,32 +259,67 @@ class JobQueue:
 
                 self._save_queue(queue_data)
                 logger.info(f"🔄 작업 상태 업데이트: {job_id} → {status.value}")
+                return True
+            return False
 
     def get_pending_jobs(self) -> List[Dict[str, Any]]:
-        """대기 중인 작업 목록 조회"""
+        """대기 중인 작업 목록 조회 (실행 순서 - 레인 가중치/클라이언트 공정 분배 적용)"""
         queue_data = self._load_queue()
-        pending_jobs = []
-
-        for job_id, job_data in queue_data.items():
-            if job_data['status'] == JobStatus.PENDING.value:
-                pending_jobs.append(job_data)
+        pending_jobs = [job for job in queue_data.values() if job['status'] == JobStatus.PENDING.value]
+        return fair_order(pending_jobs, self._recent_starts(queue_data))
 
-        # 생성 시간 순으로 정렬 (오래된 것부터)
-        pending_jobs.sort(key=lambda x: x['created_at'])
-        return pending_jobs
-
-    def claim_job(self, job_id: str) -> bool:
-        """작업을 처리 상태로 변경 (워커가 작업 시작할 때 호출)"""
+    def jobs_ahead(self, lane: str, client_key: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """지금 (lane, client_key)로 제출하면 먼저 시작될 대기 작업 목록과 처리 중 작업 목록"""
+        queue_data = self._load_queue()
+        pending_jobs = [job for job in queue_data.values() if job['status'] == JobStatus.PENDING.value]
+        processing_jobs = [job for job in queue_data.values() if job['status'] == JobStatus.PROCESSING.value]
+        probe = {'job_id': None, 'lane': lane, 'client_key': client_key, 'created_at': datetime.now().isoformat()}
+        ordered = fair_order(pending_jobs + [probe], self._recent_starts(queue_data))
+        return ordered[:ordered.index(probe)], processing_jobs
+
+    def _recent_starts(self, queue_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """공정 분배 기준 시간 창 안에 시작된 작업 (대기 중이 아닌 작업)"""
+        window_start = (datetime.now() - timedelta(minutes=QUEUE_FAIR_WINDOW_MINUTES)).isoformat()
+        return [
+            job for job in queue_data.values()
+            if job['status'] != JobStatus.PENDING.value and (job.get('started_at') or '') >= window_start
+        ]
+
+    def claim_job(self, job_id: str, worker_id: Optional[str] = None) -> bool:
+        """작업을 처리 상태로 변경 (워커가 작업 시작할 때 호출)
+
+        worker_id는 하트비트가 끊긴 워커의 작업을 되돌리는 데 사용 (requeue_stale_jobs)
+        """
         with self.lock:
             queue_data = self._load_queue()
             if job_id in queue_data and queue_data[job_id]['status'] == JobStatus.PENDING.value:
                 queue_data[job_id]['status'] = JobStatus.PROCESSING.value
                 queue_data[job_id]['updated_at'] = datetime.now().isoformat()
+                queue_data[job_id]['started_at'] = queue_data[job_id]['updated_at']
+                queue_data[job_id]['worker_id'] = worker_id
                 self._save_queue(queue_data)
-                logger.info(f"🏃 작업 시작: {job_id}")
+                logger.info(f"🏃 작업 시작: {job_id} (레인: {job_lane(queue_data[job_id])})")
                 return True
             return False
 
+    def ensure_render_seed(self, job_id: str) -> Optional[int]:
+        """작업의 렌더 시드를 video_params에 확정 (없으면 새로 만들어 저장)
+
+        첫 클레임 때 저장해 두면 재시도/하트비트 재큐잉 후에도 같은 시드로 다시 렌더한다.
+        """
+        with self.lock:
+            queue_data = self._load_queue()
+            if job_id not in queue_data:
+                return None
+            video_params = queue_data[job_id]['video_params']
+            render_seed = parse_render_seed(video_params.get('render_seed'))
+            if render_seed is None:
+                render_seed = new_render_seed()
+            if video_params.get('render_seed') != render_seed:
+                video_params['render_seed'] = render_seed
+                self._save_queue(queue_data)
+            return render_seed
+
     def retry_job(self, job_id: str) -> bool:
         """실패한 작업을 재시도 큐에 추가"""
         with self.lock:
@@ -141,8 +338,49 @@ class JobQueue:
                     logger.warning(f"❌ 최대 재시도 횟수 초과: {job_id}")
             return False
 
-    def get_job_stats(self) -> Dict[str, int]:
-        """작업 통계 조회"""
+    def requeue_stale_jobs(self, live_worker_ids: List[str], legacy_timeout_minutes: int = 120) -> List[Dict[str, Any]]:
+        """하트비트가 끊긴 워커가 처리 중이던 작업을 대기열로 되돌림 (재시도 한도 초과 시 실패 처리)
+
+        worker_id가 기록되지 않은 이전 작업은 legacy_timeout_minutes 동안 갱신이 없을 때만 대상.
+
+        Returns:
+            list: [{'job_id', 'worker_id', 'status'(pending/failed), 'retry_count'}, ...]
+        """
+        live = set(live_worker_ids)
+        legacy_cutoff = (datetime.now() - timedelta(minutes=legacy_timeout_minutes)).isoformat()
+        reaped = []
+
+        with self.lock:
+            queue_data = self._load_queue()
+            for job_id, job in queue_data.items():
+                if job['status'] != JobStatus.PROCESSING.value:
+                    continue
+                worker_id = job.get('worker_id')
+                if worker_id:
+                    if worker_id in live:
+                        continue
+                elif job['updated_at'] >= legacy_cutoff:
+                    continue
+
+                job['updated_at'] = datetime.now().isoformat()
+                job['error_message'] = f"워커 응답 없음 ({worker_id or '알 수 없는 워커'})"
+                if job['retry_count'] < job['max_retries']:
+                    job['status'] = JobStatus.PENDING.value
+                    job['retry_count'] += 1
+                    logger.warning(f"♻️ 중단된 작업 재대기: {job_id} (워커: {worker_id}, 시도 {job['retry_count']}/{job['max_retries']})")
+                else:
+                    job['status'] = JobStatus.FAILED.value
+                    logger.error(f"💀 중단된 작업 최종 실패: {job_id} (워커: {worker_id}, 재시도 한도 초과)")
+                job['worker_id'] = None
+                reaped.append({'job_id': job_id, 'worker_id': worker_id,
+                               'status': job['status'], 'retry_count': job['retry_count']})
+
+            if reaped:
+                self._save_queue(queue_data)
+        return reaped
+
+    def get_job_stats(self) -> Dict[str, Any]:
+        """작업 통계 조회 (레인별 현황 + 스케줄러 설정 포함)"""
         queue_data = self._load_queue()
         stats = {
             'total': len(queue_data),
@@ -152,11 +390,31 @@ class JobQueue:
             'failed': 0
         }
 
+        lanes = {
+            lane: {'weight': weight, 'pending': 0, 'processing': 0, 'recent_started': 0, 'pending_clients': 0}
+            for lane, weight in QUEUE_LANE_WEIGHTS.items()
+        }
+        pending_clients = {lane: set() for lane in QUEUE_LANE_WEIGHTS}
         for job_data in queue_data.values():
             status = job_data['status']
             if status in stats:
                 stats[status] += 1
-
+            lane = job_lane(job_data)
+            if status in ('pending', 'processing'):
+                lanes[lane][status] += 1
+            if status == 'pending':
+                pending_clients[lane].add(job_client(job_data))
+        for job_data in self._recent_starts(queue_data):
+            lanes[job_lane(job_data)]['recent_started'] += 1
+        for lane, clients in pending_clients.items():
+            lanes[lane]['pending_clients'] = len(clients)
+
+        stats['lanes'] = lanes
+        stats['scheduler'] = {
+            'policy': 'weighted_fair',
+            'lane_weights': dict(QUEUE_LANE_WEIGHTS),
+            'fair_window_minutes': QUEUE_FAIR_WINDOW_MINUTES,
+        }
         return stats
 
     def cleanup_old_jobs(self, days: int = 7):
@@ -97,6 +97,46 @@ except ImportError as e:
     generate_missing_thumbnails = None
     THUMBNAIL_GENERATOR_AVAILABLE = False
 
+# TTS 선행 합성 시스템 import
+try:
+    from tts_cache import tts_prefetcher
+    TTS_PREFETCH_AVAILABLE = True
+    logger.info("✅ TTS 선행 합성 시스템 로드 성공")
+except ImportError as e:
+    logger.warning(f"⚠️ TTS 선행 합성 시스템 로드 실패: {e}")
+    tts_prefetcher = None
+    TTS_PREFETCH_AVAILABLE = False
+
+# BGM 카탈로그 import
+try:
+    from bgm_catalog import bgm_catalog
+    BGM_CATALOG_AVAILABLE = True
+    logger.info("✅ BGM 카탈로그 로드 성공")
+except ImportError as e:
+    logger.warning(f"⚠️ BGM 카탈로그 로드 실패: {e}")
+    bgm_catalog = None
+    BGM_CATALOG_AVAILABLE = False
+
+# 작업 배치(대량 제출) 관리 import
+try:
+    from job_batches import batch_registry
+    BATCH_REGISTRY_AVAILABLE = True
+    logger.info("✅ 작업 배치 관리 로드 성공")
+except ImportError as e:
+    logger.warning(f"⚠️ 작업 배치 관리 로드 실패: {e}")
+    batch_registry = None
+    BATCH_REGISTRY_AVAILABLE = False
+
+# 미리보기 렌더링 서비스 import
+try:
+    from preview_service import preview_service
+    PREVIEW_SERVICE_AVAILABLE = True
+    logger.info("✅ 미리보기 렌더링 서비스 로드 성공")
+except ImportError as e:
+    logger.warning(f"⚠️ 미리보기 렌더링 서비스 로드 실패: {e}")
+    preview_service = None
+    PREVIEW_SERVICE_AVAILABLE = False
+
 # 통합 로깅 시스템 초기화 완료
 logger.info("🚀 Main 서버 초기화 시작")
 
@@ -288,14 +328,24 @@ def get_file_extension(url: str) -> str:
 
     return ''  # 확장자 없음
 
-def select_random_bgm(mood: str) -> str:
-    """bgm 폴더에서 지정된 성격의 음악을 랜덤 선택"""
+def select_random_bgm(mood: str, render_seed: Optional[int] = None) -> str:
+    """bgm 폴더에서 지정된 성격의 음악을 랜덤 선택 (render_seed를 주면 같은 시드는 같은 곡)"""
+    rng = random.Random(render_seed) if render_seed is not None else random
     valid_moods = ["bright", "calm", "romantic", "sad", "suspense"]
 
     if mood not in valid_moods:
         print(f"⚠️ 잘못된 음악 성격: {mood}, 기본값 'bright' 사용")
         mood = "bright"
 
+    # 카탈로그 사용 시 폴더를 다시 검색하지 않고 메모리 목록에서 선택
+    if BGM_CATALOG_AVAILABLE:
+        selected_music = bgm_catalog.select_random(mood, rng=rng)
+        if not selected_music:
+            print(f"❌ bgm/{mood} 폴더에 음악 파일이 없습니다. test 폴더 음악 사용")
+            return None
+        print(f"🎵 선택된 {mood} 음악: {os.path.basename(selected_music)}")
+        return selected_music
+
     mood_folder = os.path.join(BGM_FOLDER, mood)
 
     # bgm 폴더가 없는 경우
@@ -309,13 +359,14 @@ def select_random_bgm(mood: str) -> str:
 
     for pattern in music_patterns:
         music_files.extend(glob.glob(os.path.join(mood_folder, pattern)))
+    music_files.sort()
 
     if not music_files:
         print(f"❌ bgm/{mood} 폴더에 음악 파일이 없습니다. test 폴더 음악 사용")
         return None
 
     # 랜덤 선택
-    selected_music = random.choice(music_files)
+    selected_music = rng.choice(music_files)
     print(f"🎵 선택된 {mood} 음악: {os.path.basename(selected_music)}")
 
     return selected_music
@@ -359,7 +410,7 @@ def copy_test_images():
 async def prepare_files(json_url: str, music_mood: str, image_urls: str,
                        content_data: str, background_music, use_test_files: bool,
                        selected_bgm_path: str = "", uploaded_images: List = [],
-                       edited_texts: str = "{}"):
+                       edited_texts: str = "{}", render_seed: Optional[int] = None):
     """모든 파일을 uploads 폴더에 준비"""
 
     # 1. JSON 파일 처리
@@ -430,14 +481,14 @@ async def prepare_files(json_url: str, music_mood: str, image_urls: str,
         else:
             # 선택된 파일이 없으면 랜덤 선택으로 폴백
             print(f"⚠️ 선택된 파일({selected_bgm_path})을 찾을 수 없어 랜덤 선택으로 변경")
-            selected_bgm = select_random_bgm(music_mood)
+            selected_bgm = select_random_bgm(music_mood, render_seed)
             if not selected_bgm:
                 raise ValueError(f"배경음악을 찾을 수 없습니다. bgm/{music_mood} 폴더에 음악 파일을 추가해주세요.")
             CURRENT_BGM_PATH = selected_bgm
     else:
         # bgm 폴더에서 성격별 랜덤 음악 선택 (우선순위 3)
         print(f"🎵 음악 성격 '{music_mood}' 기반으로 bgm 랜덤 선택 중...")
-        selected_bgm = select_random_bgm(music_mood)
+        selected_bgm = select_random_bgm(music_mood, render_seed)
 
         if not selected_bgm:
             raise ValueError(f"배경음악을 찾을 수 없습니다. bgm/{music_mood} 폴더에 음악 파일(.mp3/.wav/.m4a)을 추가해주세요.")
@@ -597,7 +648,7 @@ job_router.set_dependencies(
     FOLDER_MANAGER_AVAILABLE
 )
 
-asset_router.set_dependencies(BGM_FOLDER)
+asset_router.set_dependencies(BGM_FOLDER, bgm_catalog if BGM_CATALOG_AVAILABLE else None)
 
 media_router.set_dependencies(
     folder_manager,
@@ -638,7 +689,9 @@ video_router.set_dependencies(
     OUTPUT_FOLDER,
     CURRENT_BGM_PATH,
     VideoGenerator,
-    prepare_files
+    prepare_files,
+    tts_prefetcher,
+    preview_service
 )
 
 external_api_router.set_dependencies(
@@ -648,6 +701,7 @@ external_api_router.set_dependencies(
     JOB_QUEUE_AVAILABLE,
     UPLOAD_FOLDER,
     OUTPUT_FOLDER,
+    batch_registry if BATCH_REGISTRY_AVAILABLE else None,
 )
 
 # Include routers
@@ -661,6 +715,24 @@ app.include_router(image_router.router)
 app.include_router(video_router.router)
 app.include_router(external_api_router.router)
 
+# 미리보기 생성기/폰트 사전 로드 (서버 기동을 막지 않도록 백그라운드 실행)
+if PREVIEW_SERVICE_AVAILABLE:
+    import threading
+    threading.Thread(target=preview_service.warm_up, name='preview-warmup', daemon=True).start()
+
+# BGM 카탈로그 구축 (곡 분석/PCM 캐시는 백그라운드, 이후 폴더 변경 시 자동 갱신)
+if BGM_CATALOG_AVAILABLE:
+    bgm_catalog.configure(BGM_FOLDER)
+    bgm_catalog.start_watcher()
+
+# 중단 작업 회수 (하트비트가 끊긴 워커의 처리 중 작업을 대기열로 되돌림)
+if JOB_QUEUE_AVAILABLE:
+    try:
+        from cleanup_scheduler import start_stale_job_reaper
+        start_stale_job_reaper()
+    except ImportError as e:
+        logger.warning(f"⚠️ 중단 작업 회수 시작 실패: {e}")
+
 # ============================================================================
 # Static File Mounts
 # ============================================================================
@@ -0,0 +1,78 @@
+"""
+미디어 probe 캐시
+ffprobe 결과(스트림/포맷 정보)를 파일 경로 + 크기 + 수정 시각 기준으로 프로세스 안에서 재사용
+미디어 준비 단계에서 한 번 probe해 두면 이후 단계(오디오 추출 등)는 ffprobe를 다시 실행하지 않는다.
+"""
+
+import os
+import json
+import threading
+import subprocess
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from utils.logger_config import get_logger
+
+logger = get_logger('media_probe')
+
+PROBE_CACHE_SIZE = int(os.getenv('PROBE_CACHE_SIZE', '512'))
+
+_cache_lock = threading.Lock()
+_probe_cache: 'OrderedDict[tuple, Dict[str, Any]]' = OrderedDict()
+
+
+def _cache_key(path: str) -> Optional[tuple]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (os.path.realpath(path), stat.st_size, stat.st_mtime)
+
+
+def probe_media(path: str) -> Dict[str, Any]:
+    """ffprobe -show_streams -show_format 결과 (실패 시 빈 dict, 결과는 캐시)"""
+    key = _cache_key(path)
+    if key is None:
+        return {}
+
+    with _cache_lock:
+        cached = _probe_cache.get(key)
+        if cached is not None:
+            _probe_cache.move_to_end(key)
+            return cached
+
+    try:
+        result = subprocess.run(
+            ['ffprobe', '-v', 'error', '-show_streams', '-show_format', '-of', 'json', path],
+            capture_output=True, text=True, timeout=30
+        )
+        data = json.loads(result.stdout) if result.returncode == 0 and result.stdout else {}
+    except Exception as e:
+        logger.debug(f"ffprobe 실패 ({os.path.basename(path)}): {e}")
+        data = {}
+
+    with _cache_lock:
+        _probe_cache[key] = data
+        while len(_probe_cache) > PROBE_CACHE_SIZE:
+            _probe_cache.popitem(last=False)
+    return data
+
+
+def audio_stream(path: str) -> Optional[Dict[str, Any]]:
+    """첫 번째 오디오 스트림 정보 (없으면 None)"""
+    for stream in probe_media(path).get('streams', []):
+        if stream.get('codec_type') == 'audio':
+            return stream
+    return None
+
+
+def has_audio(path: str) -> bool:
+    return audio_stream(path) is not None
+
+
+def media_duration(path: str) -> Optional[float]:
+    """컨테이너 길이 (초)"""
+    try:
+        return float(probe_media(path).get('format', {}).get('duration'))
+    except (TypeError, ValueError):
+        return None
@@ -15,6 +15,7 @@ class JobStatusResponse(BaseModel):
     updated_at: str
     result: Optional[dict] = None
     error_message: Optional[str] = None
+    notifications: Optional[list] = None  # 알림(이메일/webhook)별 발송 상태
 
 
 class CreateJobFolderResponse(BaseModel):
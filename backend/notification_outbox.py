@@ -0,0 +1,331 @@
+"""
+알림 아웃박스 (완료/실패 이메일, webhook)
+워커는 작업이 끝나면 알림을 SQLite 아웃박스에 기록만 하고 바로 다음 작업으로 넘어간다.
+발송 스레드(NotificationSender)가 아웃박스를 비우며 SMTP 연결과 HTTP 세션을 재사용하고,
+일시적인 실패는 지수 백오프로 재시도한다. 알림별 발송 상태는 작업 ID로 조회한다 (/job-status).
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.logger_config import get_logger
+
+logger = get_logger('notification_outbox')
+
+try:
+    import requests
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    REQUESTS_AVAILABLE = False
+
+try:
+    from email_service import email_service
+    EMAIL_SERVICE_AVAILABLE = True
+except ImportError as e:
+    logger.warning(f"⚠️ 이메일 서비스 로드 실패 (이메일 알림 발송 불가): {e}")
+    email_service = None
+    EMAIL_SERVICE_AVAILABLE = False
+
+OUTBOX_DB_PATH = os.getenv('NOTIFICATION_OUTBOX_DB', 'log/notification_outbox.db')
+NOTIFY_MAX_ATTEMPTS = int(os.getenv('NOTIFY_MAX_ATTEMPTS', '6'))
+NOTIFY_BACKOFF_BASE_SECONDS = int(os.getenv('NOTIFY_BACKOFF_BASE_SECONDS', '30'))   # 30초, 1분, 2분, 4분 ...
+NOTIFY_BACKOFF_MAX_SECONDS = int(os.getenv('NOTIFY_BACKOFF_MAX_SECONDS', '3600'))
+NOTIFY_POLL_SECONDS = float(os.getenv('NOTIFY_POLL_SECONDS', '2'))
+NOTIFY_LEASE_SECONDS = int(os.getenv('NOTIFY_LEASE_SECONDS', '300'))  # 발송 중 상태로 멈춘 알림(발송 프로세스 종료)을 다시 가져오는 시간
+NOTIFY_RETENTION_DAYS = int(os.getenv('NOTIFY_RETENTION_DAYS', '14'))
+WEBHOOK_TIMEOUT_SECONDS = int(os.getenv('WEBHOOK_TIMEOUT_SECONDS', '10'))
+
+
+class NotificationKind(Enum):
+    COMPLETION_EMAIL = "completion_email"
+    ERROR_EMAIL = "error_email"
+    WEBHOOK = "webhook"
+
+
+class DeliveryStatus(Enum):
+    PENDING = "pending"
+    SENDING = "sending"
+    SENT = "sent"
+    FAILED = "failed"
+
+
+def backoff_seconds(attempts: int) -> int:
+    """attempts번 실패한 뒤 다음 시도까지 대기 시간"""
+    return min(NOTIFY_BACKOFF_BASE_SECONDS * (2 ** max(attempts - 1, 0)), NOTIFY_BACKOFF_MAX_SECONDS)
+
+
+class NotificationOutbox:
+    """SQLite 기반 알림 아웃박스 (여러 워커 프로세스가 동시에 기록/발송 가능)"""
+
+    def __init__(self, db_path: str = OUTBOX_DB_PATH):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self._init_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_database(self):
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS notifications (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_id TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    target TEXT NOT NULL,
+                    label TEXT,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL NOT NULL,
+                    claimed_by TEXT,
+                    claimed_at REAL,
+                    last_error TEXT,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    sent_at TEXT
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_notifications_due ON notifications(status, next_attempt_at)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_notifications_job_id ON notifications(job_id)')
+
+    # ---------- 기록 ----------
+
+    def enqueue(self, job_id: str, kind: NotificationKind, target: str,
+                payload: Dict[str, Any], label: Optional[str] = None) -> int:
+        """알림 1건 기록 (job_id는 작업 ID 또는 배치 ID)"""
+        now = datetime.now().isoformat()
+        with self._connect() as conn:
+            cursor = conn.execute('''
+                INSERT INTO notifications (job_id, kind, target, label, payload, status, next_attempt_at, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (job_id, kind.value, target, label, json.dumps(payload, ensure_ascii=False, default=str),
+                  DeliveryStatus.PENDING.value, time.time(), now, now))
+            notification_id = cursor.lastrowid
+        logger.info(f"📮 알림 기록: #{notification_id} {kind.value} → {target} (작업: {job_id})")
+        return notification_id
+
+    def enqueue_completion_email(self, job_id: str, user_email: str, video_path: str, video_title: str,
+                                 duration: str, content_data: Optional[Dict[str, Any]] = None,
+                                 outputs: Optional[Dict[str, str]] = None) -> int:
+        payload = {
+            'user_email': user_email,
+            'video_path': video_path,
+            'video_title': video_title,
+            'duration': duration,
+            'content_data': content_data,
+        }
+        if outputs and len(outputs) > 1:
+            payload['outputs'] = outputs  # 다중 출력 작업: 포맷별 다운로드 링크
+        return self.enqueue(job_id, NotificationKind.COMPLETION_EMAIL, user_email, payload, label='completed')
+
+    def enqueue_error_email(self, job_id: str, user_email: str, error_message: str,
+                            content_data: Optional[Dict[str, Any]] = None) -> int:
+        return self.enqueue(job_id, NotificationKind.ERROR_EMAIL, user_email, {
+            'user_email': user_email,
+            'job_id': job_id,
+            'error_message': error_message,
+            'content_data': content_data,
+        }, label='failed')
+
+    def enqueue_webhook(self, job_id: str, webhook_url: str, payload: Dict[str, Any], label: str) -> int:
+        return self.enqueue(job_id, NotificationKind.WEBHOOK, webhook_url, payload, label=label)
+
+    # ---------- 발송 상태 ----------
+
+    def claim_due(self, claimed_by: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """발송할 알림 가져오기 (발송 시각이 된 대기 알림 + 임대 시간이 지난 발송 중 알림)"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            rows = conn.execute('''
+                SELECT * FROM notifications
+                WHERE (status = ? AND next_attempt_at <= ?) OR (status = ? AND claimed_at < ?)
+                ORDER BY next_attempt_at
+                LIMIT ?
+            ''', (DeliveryStatus.PENDING.value, now, DeliveryStatus.SENDING.value,
+                  now - NOTIFY_LEASE_SECONDS, limit)).fetchall()
+            for row in rows:
+                conn.execute('''
+                    UPDATE notifications SET status = ?, claimed_by = ?, claimed_at = ?, updated_at = ?
+                    WHERE id = ?
+                ''', (DeliveryStatus.SENDING.value, claimed_by, now, datetime.now().isoformat(), row['id']))
+            conn.commit()
+        finally:
+            conn.close()
+        return [dict(row) for row in rows]
+
+    def mark_sent(self, notification_id: int):
+        now = datetime.now().isoformat()
+        with self._connect() as conn:
+            conn.execute('''
+                UPDATE notifications SET status = ?, attempts = attempts + 1, sent_at = ?, updated_at = ?, last_error = NULL
+                WHERE id = ?
+            ''', (DeliveryStatus.SENT.value, now, now, notification_id))
+
+    def mark_failed_attempt(self, notification: Dict[str, Any], error: str, retryable: bool) -> str:
+        """발송 실패 기록 - 재시도 가능하고 한도 전이면 백오프 후 재대기, 아니면 최종 실패
+
+        Returns:
+            str: 변경된 상태 (pending / failed)
+        """
+        attempts = notification['attempts'] + 1
+        if retryable and attempts < NOTIFY_MAX_ATTEMPTS:
+            status = DeliveryStatus.PENDING.value
+            next_attempt_at = time.time() + backoff_seconds(attempts)
+        else:
+            status = DeliveryStatus.FAILED.value
+            next_attempt_at = notification['next_attempt_at']
+        with self._connect() as conn:
+            conn.execute('''
+                UPDATE notifications SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ?, updated_at = ?
+                WHERE id = ?
+            ''', (status, attempts, next_attempt_at, error[:500], datetime.now().isoformat(), notification['id']))
+        return status
+
+    def delivery_status(self, job_id: str) -> List[Dict[str, Any]]:
+        """작업(또는 배치)의 알림별 발송 상태"""
+        with self._connect() as conn:
+            rows = conn.execute('''
+                SELECT id, kind, target, label, status, attempts, last_error, created_at, sent_at, next_attempt_at
+                FROM notifications WHERE job_id = ? ORDER BY id
+            ''', (job_id,)).fetchall()
+        results = []
+        for row in rows:
+            item = dict(row)
+            next_attempt_at = item.pop('next_attempt_at')
+            if item['status'] == DeliveryStatus.PENDING.value and item['attempts']:
+                item['next_attempt_at'] = datetime.fromtimestamp(next_attempt_at).isoformat(timespec='seconds')
+            results.append(item)
+        return results
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            rows = conn.execute('SELECT status, COUNT(*) FROM notifications GROUP BY status').fetchall()
+        stats = {status.value: 0 for status in DeliveryStatus}
+        stats.update({row[0]: row[1] for row in rows})
+        return stats
+
+    def cleanup(self, days: int = NOTIFY_RETENTION_DAYS) -> int:
+        """오래된 발송 완료/최종 실패 알림 정리"""
+        cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+        with self._connect() as conn:
+            cursor = conn.execute('DELETE FROM notifications WHERE status IN (?, ?) AND updated_at < ?',
+                                  (DeliveryStatus.SENT.value, DeliveryStatus.FAILED.value, cutoff))
+            return cursor.rowcount
+
+
+class NotificationSender:
+    """아웃박스 발송 스레드 (SMTP 연결 / HTTP 세션 재사용)"""
+
+    def __init__(self, outbox: NotificationOutbox, sender_id: str, poll_interval: float = NOTIFY_POLL_SECONDS):
+        self.outbox = outbox
+        self.sender_id = sender_id
+        self.poll_interval = poll_interval
+        self.stop_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+        self.session = requests.Session() if REQUESTS_AVAILABLE else None
+        if self.session is not None:
+            self.session.headers.update({"Content-Type": "application/json", "User-Agent": "Mozilla/5.0"})
+
+    def start(self):
+        self.thread = threading.Thread(target=self._loop, name=f"notify-{self.sender_id}", daemon=True)
+        self.thread.start()
+        logger.info(f"📮 알림 발송 스레드 시작: {self.sender_id}")
+
+    def stop(self):
+        """발송 중인 알림까지 마치고 종료 (남은 알림은 아웃박스에 보존)"""
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=WEBHOOK_TIMEOUT_SECONDS + 35)
+        if self.session is not None:
+            self.session.close()
+        if EMAIL_SERVICE_AVAILABLE:
+            email_service.close()
+        logger.info(f"📮 알림 발송 스레드 종료: {self.sender_id}")
+
+    def _loop(self):
+        while not self.stop_event.is_set():
+            try:
+                delivered = self.drain()
+            except Exception as e:
+                logger.error(f"❌ 알림 발송 루프 오류: {e}")
+                delivered = 0
+            if not delivered:
+                self.stop_event.wait(self.poll_interval)
+
+    def drain(self) -> int:
+        """발송 시각이 된 알림 발송 (처리한 건수 반환)"""
+        notifications = self.outbox.claim_due(self.sender_id)
+        for notification in notifications:
+            if self.stop_event.is_set():
+                break
+            self.deliver(notification)
+        return len(notifications)
+
+    def deliver(self, notification: Dict[str, Any]):
+        label = f"#{notification['id']} {notification['kind']} → {notification['target']}"
+        try:
+            payload = json.loads(notification['payload'])
+            kind = NotificationKind(notification['kind'])
+            if kind == NotificationKind.WEBHOOK:
+                sent, retryable, error = self._send_webhook(notification['target'], payload, notification['label'])
+            else:
+                sent, retryable, error = self._send_email(kind, payload)
+        except Exception as e:
+            sent, retryable, error = False, True, f"{type(e).__name__}: {e}"
+
+        if sent:
+            self.outbox.mark_sent(notification['id'])
+            logger.info(f"✅ 알림 발송 완료: {label} (작업: {notification['job_id']}, 시도 {notification['attempts'] + 1})")
+            return
+
+        status = self.outbox.mark_failed_attempt(notification, error, retryable)
+        if status == DeliveryStatus.PENDING.value:
+            logger.warning(f"⚠️ 알림 발송 실패, {backoff_seconds(notification['attempts'] + 1)}초 후 재시도: {label} - {error}")
+        else:
+            logger.error(f"❌ 알림 최종 실패: {label} (시도 {notification['attempts'] + 1}회) - {error}")
+
+    def _send_email(self, kind: NotificationKind, payload: Dict[str, Any]) -> Tuple[bool, bool, str]:
+        if not EMAIL_SERVICE_AVAILABLE:
+            return False, False, "이메일 서비스 사용 불가"
+        if kind == NotificationKind.COMPLETION_EMAIL:
+            msg = email_service.build_completion_message(**payload)
+            label = "완료메일"
+        else:
+            msg = email_service.build_error_message(**payload)
+            label = "실패메일"
+        if msg is None:
+            return False, False, "Gmail 설정 누락 또는 유효하지 않은 수신자"
+        sent, retryable = email_service.send_message(msg, label)
+        return sent, retryable, "" if sent else "SMTP 발송 실패"
+
+    def _send_webhook(self, webhook_url: str, payload: Dict[str, Any], status: Optional[str]) -> Tuple[bool, bool, str]:
+        """webhook POST 전송 - 2xx 성공, 408/429/5xx/네트워크 오류는 재시도, 그 외 4xx는 최종 실패"""
+        if self.session is None:
+            return False, False, "requests 모듈 없음"
+        try:
+            resp = self.session.post(webhook_url, json=payload, timeout=WEBHOOK_TIMEOUT_SECONDS)
+        except requests.RequestException as e:
+            return False, True, f"{type(e).__name__}: {e}"
+        if resp.ok:
+            logger.info(f"🔗 Webhook 전송 성공: {webhook_url} (status={status}, http={resp.status_code})")
+            return True, False, ""
+        # 응답 body 앞 500자 기록 (JSON vs HTML 판별용)
+        body_preview = resp.text[:500].replace('\n', ' ')
+        retryable = resp.status_code in (408, 429) or resp.status_code >= 500
+        return False, retryable, f"http={resp.status_code} | body={body_preview}"
+
+
+# 전역 인스턴스
+notification_outbox = NotificationOutbox()
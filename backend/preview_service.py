@@ -0,0 +1,298 @@
+"""
+미리보기 렌더링 서비스
+공유 생성기(폰트/사전 로드 완료)와 결과 캐시로 반복 편집 시 미리보기를 즉시 반환
+"""
+
+import io
+import os
+import json
+import hashlib
+import tempfile
+import threading
+import subprocess
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from PIL import Image as PILImage
+from utils.logger_config import get_logger
+
+logger = get_logger('preview_service')
+
+PREVIEW_CACHE_SIZE = int(os.getenv('PREVIEW_CACHE_SIZE', '128'))       # 완성된 미리보기 PNG
+PREVIEW_MEDIA_CACHE_SIZE = int(os.getenv('PREVIEW_MEDIA_CACHE_SIZE', '16'))  # 디코딩된 배경 이미지
+PREVIEW_LAYER_CACHE_SIZE = int(os.getenv('PREVIEW_LAYER_CACHE_SIZE', '64'))  # 타이틀/본문 텍스트 레이어
+
+VIDEO_EXTENSIONS = ['.mp4', '.mov', '.avi', '.webm', '.mkv']
+
+
+class PreviewService:
+    """미리보기 합성 서비스
+
+    - 생성기: get_shared_generator()의 warm 인스턴스 사용 (요청별 RenderConfig 적용)
+    - 비디오 첫 프레임: FFmpeg 1회 seek로 추출 (MoviePy 클립을 열지 않음)
+    - 캐시: (미디어 해시, 텍스트, 스타일 파라미터) → PNG, 타이틀/본문 레이어, 디코딩된 미디어
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.preview_cache = OrderedDict()
+        self.media_cache = OrderedDict()
+        self.layer_cache = OrderedDict()
+        self.stats = {'hits': 0, 'misses': 0}
+
+    # ==================== 캐시 헬퍼 ====================
+
+    def _cache_get(self, cache: OrderedDict, key, count: bool = False):
+        """LRU 조회 (count=True면 같은 잠금 안에서 적중/미스 집계 - 요청 스레드와 워밍업 스레드가 동시에 호출)"""
+        with self.lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+            if count:
+                self.stats['hits' if value is not None else 'misses'] += 1
+            return value
+
+    def _cache_put(self, cache: OrderedDict, key, value, max_size: int):
+        with self.lock:
+            cache[key] = value
+            cache.move_to_end(key)
+            while len(cache) > max_size:
+                cache.popitem(last=False)
+
+    # ==================== 생성기 ====================
+
+    def _get_generator(self, video_format: str):
+        """포맷별 공유 생성기 반환"""
+        from video_generator import VideoGenerator, get_shared_generator
+        if video_format == 'youtube':
+            try:
+                from youtube_generator import YouTubeVideoGenerator
+                return get_shared_generator(YouTubeVideoGenerator)
+            except ImportError as e:
+                logger.warning(f"⚠️ [Preview] YouTubeVideoGenerator 로드 실패, 기본 생성기 사용: {e}")
+        return get_shared_generator(VideoGenerator)
+
+    def warm_up(self):
+        """생성기/폰트 사전 로드 (서버 시작 시 백그라운드 호출)"""
+        try:
+            for video_format in ('reels', 'youtube'):
+                generator = self._get_generator(video_format)
+                with generator.use_render_config(generator.base_render_config(video_format)):
+                    self._get_title_layer(generator, "미리보기", "BMYEONSUNG_otf.otf", 42)
+                    self._get_text_layer(generator, "미리보기", "bottom", "outline", "keep",
+                                         "BMYEONSUNG_otf.otf", "BMYEONSUNG_otf.otf", 42, 36)
+            logger.info("✅ 미리보기 생성기 사전 로드 완료")
+        except Exception as e:
+            logger.warning(f"⚠️ 미리보기 생성기 사전 로드 실패 (요청 시 로드): {e}")
+
+    # ==================== 미디어 ====================
+
+    def extract_video_frame(self, video_path: str) -> Optional[PILImage.Image]:
+        """FFmpeg 1회 seek로 비디오 첫 프레임 추출 (회전 메타데이터 자동 반영)"""
+        try:
+            result = subprocess.run(
+                ['ffmpeg', '-v', 'error', '-ss', '0', '-i', video_path,
+                 '-frames:v', '1', '-f', 'image2pipe', '-vcodec', 'png', 'pipe:1'],
+                capture_output=True, timeout=15
+            )
+            if result.returncode == 0 and result.stdout:
+                return PILImage.open(io.BytesIO(result.stdout)).convert('RGB')
+            logger.warning(f"⚠️ FFmpeg 프레임 추출 실패: {result.stderr.decode('utf-8', 'ignore')[:200]}")
+        except Exception as e:
+            logger.warning(f"⚠️ FFmpeg 프레임 추출 오류: {e}")
+        return None
+
+    def _load_media(self, media_digest: str, media_bytes: Optional[bytes], filename: str,
+                    media_path: Optional[str]) -> Optional[PILImage.Image]:
+        """미디어를 RGB 이미지로 디코딩 (해시 기준 캐시)"""
+        cached = self._cache_get(self.media_cache, media_digest)
+        if cached is not None:
+            return cached
+
+        is_video = any(filename.lower().endswith(ext) for ext in VIDEO_EXTENSIONS)
+        image = None
+        if is_video:
+            # FFmpeg는 파일 입력이 필요하므로 업로드 데이터만 임시 파일로 기록
+            temp_path = None
+            try:
+                if media_path is None:
+                    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(filename)[1])
+                    temp_file.write(media_bytes)
+                    temp_file.close()
+                    temp_path = temp_file.name
+                image = self.extract_video_frame(media_path or temp_path)
+            finally:
+                if temp_path and os.path.exists(temp_path):
+                    os.unlink(temp_path)
+            if image is not None:
+                logger.info(f"비디오에서 프레임 추출 완료: {filename}")
+        else:
+            source = io.BytesIO(media_bytes) if media_bytes is not None else media_path
+            with PILImage.open(source) as img:
+                image = img.convert('RGB')
+
+        if image is not None:
+            self._cache_put(self.media_cache, media_digest, image, PREVIEW_MEDIA_CACHE_SIZE)
+        return image
+
+    # ==================== 텍스트 레이어 ====================
+
+    def _get_title_layer(self, generator, title, title_font, title_font_size) -> PILImage.Image:
+        """타이틀 이미지 (동일 타이틀/폰트/레이아웃이면 재사용)"""
+        config = generator.render_config
+        key = ('title', type(generator).__name__, title, config.video_width, config.title_height, title_font, title_font_size)
+        layer = self._cache_get(self.layer_cache, key)
+        if layer is None:
+            title_image_path = generator.create_title_image(title, config.video_width, config.title_height, title_font, title_font_size)
+            try:
+                with PILImage.open(title_image_path) as img:
+                    layer = img.convert('RGB')
+            finally:
+                if os.path.exists(title_image_path):
+                    os.unlink(title_image_path)
+            self._cache_put(self.layer_cache, key, layer, PREVIEW_LAYER_CACHE_SIZE)
+        return layer
+
+    def _get_text_layer(self, generator, body, text_position, text_style, title_area_mode,
+                        title_font, body_font, title_font_size, body_font_size) -> PILImage.Image:
+        """본문 텍스트 오버레이 (동일 텍스트/스타일/레이아웃이면 재사용)"""
+        config = generator.render_config
+        key = ('body', type(generator).__name__, config.video_format, body, text_position, text_style,
+               title_area_mode, title_font, body_font, title_font_size, body_font_size)
+        layer = self._cache_get(self.layer_cache, key)
+        if layer is None:
+            body_text_image_path = generator.create_text_image(
+                body,
+                config.video_width,
+                config.video_height,
+                text_position,
+                text_style,
+                is_title=False,
+                title_font=title_font,
+                body_font=body_font,
+                title_area_mode=title_area_mode,
+                title_font_size=title_font_size,
+                body_font_size=body_font_size
+            )
+            try:
+                with PILImage.open(body_text_image_path) as img:
+                    layer = img.convert('RGBA')
+            finally:
+                if os.path.exists(body_text_image_path):
+                    os.unlink(body_text_image_path)
+            self._cache_put(self.layer_cache, key, layer, PREVIEW_LAYER_CACHE_SIZE)
+        return layer
+
+    # ==================== 합성 ====================
+
+    def _paste_background(self, final_image, bg_image, video_format, work_area_height, y_offset,
+                          enable_panning, mode_label):
+        """배경 미디어 배치 (기존 /preview-video 배치 규칙과 동일)"""
+        vw = final_image.size[0]
+        if video_format == 'youtube' and mode_label == 'remove':
+            # YouTube: letterbox fit (종횡비 유지 + 검은 여백)
+            orig_w, orig_h = bg_image.size
+            scale = min(vw / orig_w, work_area_height / orig_h)
+            new_w = int(orig_w * scale)
+            new_h = int(orig_h * scale)
+            resized = bg_image.resize((new_w, new_h), PILImage.Resampling.LANCZOS)
+            x_off = (vw - new_w) // 2
+            y_off = (work_area_height - new_h) // 2
+            final_image.paste(resized, (x_off, y_off))
+        elif enable_panning:
+            resized = bg_image.resize((vw, work_area_height), PILImage.Resampling.LANCZOS)
+            final_image.paste(resized, (0, y_offset))
+        else:
+            img_width, img_height = bg_image.size
+            new_height = int(img_height * vw / img_width)
+            resized = bg_image.resize((vw, new_height), PILImage.Resampling.LANCZOS)
+            final_image.paste(resized, (0, y_offset))
+            logger.info(f"📐 패닝 OFF 미리보기 ({mode_label}): {img_width}x{img_height} → {vw}x{new_height}, Y={y_offset}")
+
+    def render(self, title: str, body: str, media_bytes: Optional[bytes] = None, media_filename: str = "",
+               media_path: Optional[str] = None, text_position: str = "bottom", text_style: str = "outline",
+               title_area_mode: str = "keep", title_font: str = "BMYEONSUNG_otf.otf",
+               body_font: str = "BMYEONSUNG_otf.otf", title_font_size: int = 42, body_font_size: int = 36,
+               image_panning_options: str = "{}", video_format: str = "reels") -> Tuple[bytes, str, bool]:
+        """미리보기 PNG 생성
+
+        Args:
+            media_bytes: 업로드된 미디어 데이터 (없으면 media_path 사용)
+            media_path: 디스크에 있는 미디어 경로 (테스트 이미지 등)
+
+        Returns:
+            tuple: (PNG 바이트, 캐시 키, 캐시 적중 여부)
+        """
+        if video_format == 'youtube':
+            # YouTube: 타이틀 영역 강제 제거
+            title_area_mode = 'remove'
+
+        # 패닝 옵션 파싱 (첫 번째 미디어 기준)
+        enable_panning = True
+        if image_panning_options and image_panning_options != "{}":
+            try:
+                enable_panning = json.loads(image_panning_options).get("0", True)
+            except Exception as e:
+                logger.warning(f"⚠️ 패닝 옵션 파싱 실패, 기본값(True) 사용: {e}")
+
+        # 캐시 키: 미디어 해시 + 텍스트 + 스타일 파라미터
+        if media_bytes is not None:
+            media_digest = hashlib.sha1(media_bytes).hexdigest()
+        else:
+            stat = os.stat(media_path)
+            media_digest = hashlib.sha1(f"{media_path}:{stat.st_size}:{stat.st_mtime_ns}".encode('utf-8')).hexdigest()
+        params = json.dumps([media_digest, title, body, text_position, text_style, title_area_mode,
+                             title_font, body_font, title_font_size, body_font_size, enable_panning,
+                             video_format], ensure_ascii=False)
+        cache_key = hashlib.sha256(params.encode('utf-8')).hexdigest()
+
+        cached_png = self._cache_get(self.preview_cache, cache_key, count=True)
+        if cached_png is not None:
+            return cached_png, cache_key, True
+
+        bg_image = self._load_media(media_digest, media_bytes, media_filename or media_path or "", media_path)
+        if bg_image is None:
+            raise ValueError("미리보기용 이미지를 찾을 수 없습니다")
+
+        generator = self._get_generator(video_format)
+        with generator.use_render_config(generator.base_render_config(video_format)):
+            vw = generator.video_width
+            vh = generator.video_height
+            th = generator.title_height
+
+            final_image = PILImage.new('RGB', (vw, vh), color=(0, 0, 0))
+
+            if title_area_mode == "keep":
+                # 기존 방식: 타이틀 영역 + 미디어 영역
+                self._paste_background(final_image, bg_image, video_format, generator.work_height_keep, th,
+                                       enable_panning, 'keep')
+                final_image.paste(self._get_title_layer(generator, title, title_font, title_font_size), (0, 0))
+            else:
+                # remove 모드: 전체 화면 미디어
+                self._paste_background(final_image, bg_image, video_format, generator.work_height_remove, 0,
+                                       enable_panning, 'remove')
+
+            # 본문 텍스트 이미지 합성 (오버레이) - 모든 모드 공통
+            body_img = self._get_text_layer(generator, body, text_position, text_style, title_area_mode,
+                                            title_font, body_font, title_font_size, body_font_size)
+            final_image.paste(body_img, (0, 0), body_img)
+
+        buffer = io.BytesIO()
+        final_image.save(buffer, "PNG", compress_level=1)  # 미리보기는 속도 우선
+        png_bytes = buffer.getvalue()
+        self._cache_put(self.preview_cache, cache_key, png_bytes, PREVIEW_CACHE_SIZE)
+        return png_bytes, cache_key, False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 통계"""
+        with self.lock:
+            return {
+                'hits': self.stats['hits'],
+                'misses': self.stats['misses'],
+                'previews': len(self.preview_cache),
+                'media': len(self.media_cache),
+                'layers': len(self.layer_cache),
+            }
+
+
+# 전역 인스턴스
+preview_service = PreviewService()
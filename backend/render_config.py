@@ -0,0 +1,180 @@
+"""
+작업별 렌더 설정
+영상 포맷(레이아웃)과 TTS 설정을 불변 객체로 묶어 생성기에 명시적으로 전달
+"""
+
+import random
+from dataclasses import dataclass, field, replace
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Union
+
+# 렌더 시드 범위 (32bit - 작업 지문 앞 8자리 16진수와 같은 범위)
+RENDER_SEED_BITS = 32
+
+# 포맷별 레이아웃 (VideoGenerator.set_video_format과 동일한 값)
+LAYOUT_PRESETS = {
+    'reels': {
+        'video_width': 504,
+        'video_height': 890,
+        'title_height': 220,
+        'work_height_keep': 670,
+        'work_height_remove': 890,
+        'text_y_top': 430,
+        'text_y_bottom': 610,
+        'text_y_bottom_edge_margin': 80,
+        'panning_range': 60,
+    },
+    'youtube': {
+        'video_width': 1280,
+        'video_height': 720,
+        'title_height': 120,
+        'work_height_keep': 600,
+        'work_height_remove': 720,
+        'text_y_top': 340,
+        'text_y_bottom': 520,
+        'text_y_bottom_edge_margin': 60,
+        'panning_range': 60,
+    },
+}
+
+
+def _freeze_per_body(per_body_tts_settings: Optional[Dict[str, Any]]) -> Mapping[str, Mapping[str, Any]]:
+    """대사별 TTS 설정을 읽기 전용 매핑으로 변환"""
+    if not per_body_tts_settings:
+        return MappingProxyType({})
+    return MappingProxyType({
+        body_key: MappingProxyType(dict(setting or {}))
+        for body_key, setting in per_body_tts_settings.items()
+    })
+
+
+@dataclass(frozen=True)
+class RenderConfig:
+    """작업 1건의 렌더 설정 (생성 후 변경 불가)
+
+    하나의 생성기 인스턴스를 여러 작업/스레드가 공유할 수 있도록
+    작업별 상태는 모두 이 객체에 담아 전달한다.
+    """
+
+    video_format: str = 'reels'
+
+    # 레이아웃
+    video_width: int = 504
+    video_height: int = 890
+    title_height: int = 220
+    work_height_keep: int = 670
+    work_height_remove: int = 890
+    text_y_top: int = 430
+    text_y_bottom: int = 610
+    text_y_bottom_edge_margin: int = 80
+    panning_range: int = 60
+
+    # TTS
+    tts_engine: str = 'edge'
+    qwen_speaker: str = 'Sohee'
+    qwen_speed: str = 'normal'
+    qwen_style: str = 'neutral'
+    edge_speaker: str = 'female'
+    edge_speed: str = 'normal'
+    edge_pitch: str = 'normal'
+    per_body_tts_settings: Mapping[str, Mapping[str, Any]] = field(default_factory=lambda: MappingProxyType({}))
+
+    # 랜덤 선택(패닝 방향, 전환 효과 등) 시드 - None이면 매 렌더마다 다른 결과
+    render_seed: Optional[int] = None
+
+    # 수정 텍스트 재렌더 (세그먼트 캐시 auto 모드에서 바뀌지 않은 세그먼트 재사용을 위해 중간 파일 경로 사용)
+    reuse_segments: bool = False
+
+    @classmethod
+    def for_format(cls, video_format: str = 'reels', **overrides) -> 'RenderConfig':
+        """포맷 프리셋으로 설정 생성 ('reels' 외 알 수 없는 값은 reels로 처리)"""
+        preset_name = video_format if video_format in LAYOUT_PRESETS else 'reels'
+        values = dict(LAYOUT_PRESETS[preset_name], video_format=preset_name)
+        values.update(overrides)
+        if 'per_body_tts_settings' in values:
+            values['per_body_tts_settings'] = _freeze_per_body(values['per_body_tts_settings'])
+        return cls(**values)
+
+    def copy_with(self, **changes) -> 'RenderConfig':
+        """일부 필드만 바꾼 새 설정 반환"""
+        if 'per_body_tts_settings' in changes:
+            changes['per_body_tts_settings'] = _freeze_per_body(changes['per_body_tts_settings'])
+        return replace(self, **changes)
+
+    def with_tts(self, engine: str, speaker: str = None, speed: str = None, style: str = None,
+                 per_body_tts_settings: dict = None, edge_speaker: str = None,
+                 edge_speed: str = None, edge_pitch: str = None) -> 'RenderConfig':
+        """TTS 설정을 적용한 새 설정 반환 (VideoGenerator.set_tts_engine과 동일한 규칙)"""
+        if engine not in ['edge', 'qwen']:
+            engine = 'edge'
+
+        changes = {'tts_engine': engine}
+        if engine == 'edge':
+            if edge_speaker:
+                changes['edge_speaker'] = edge_speaker
+            if edge_speed:
+                changes['edge_speed'] = edge_speed
+            if edge_pitch:
+                changes['edge_pitch'] = edge_pitch
+        else:
+            if speaker:
+                changes['qwen_speaker'] = speaker
+            if speed:
+                changes['qwen_speed'] = speed
+            if style:
+                changes['qwen_style'] = style
+
+        if per_body_tts_settings is not None:
+            changes['per_body_tts_settings'] = per_body_tts_settings
+        return self.copy_with(**changes)
+
+    def rng(self, *scope) -> Union[random.Random, Any]:
+        """render_seed + scope로 고정된 난수 생성기 (render_seed가 없으면 전역 random 모듈)
+
+        세그먼트는 여러 스레드에서 순서 없이 렌더되므로 난수열을 공유하지 않고
+        (시드, 세그먼트, 용도)마다 독립된 생성기를 만든다. 같은 입력이면 스레드 실행 순서와 무관하게 같은 선택.
+        """
+        if self.render_seed is None:
+            return random
+        return random.Random(":".join(str(part) for part in (self.render_seed,) + scope))
+
+    def for_body(self, body_key: str) -> 'RenderConfig':
+        """대사별 화자/스타일이 적용된 설정 반환 (Qwen 엔진에서만 적용)"""
+        body_setting = self.per_body_tts_settings.get(body_key)
+        if not body_setting or self.tts_engine != 'qwen':
+            return self
+        return replace(
+            self,
+            qwen_speaker=body_setting.get('speaker', self.qwen_speaker),
+            qwen_style=body_setting.get('style', self.qwen_style),
+        )
+
+
+def new_render_seed() -> int:
+    """시드가 지정되지 않은 렌더용 새 시드 (기록해 두면 같은 결과를 다시 만들 수 있음)"""
+    return random.SystemRandom().getrandbits(RENDER_SEED_BITS)
+
+
+def parse_render_seed(value: Any) -> Optional[int]:
+    """요청/작업 파라미터의 render_seed 정규화 (없거나 잘못된 값이면 None)"""
+    if value is None or value == '':
+        return None
+    try:
+        return int(value) % (1 << RENDER_SEED_BITS)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_output_formats(value: Any, default_format: str = 'reels') -> List[str]:
+    """다중 출력 포맷 목록 정규화 ("reels,youtube" 또는 리스트, 알 수 없는 값/중복 제거)
+
+    비어 있으면 [default_format] - 기존 단일 포맷 작업과 동일
+    """
+    if isinstance(value, str):
+        value = value.split(',')
+    formats: List[str] = []
+    for item in value or []:
+        name = str(item).strip().lower()
+        if name in LAYOUT_PRESETS and name not in formats:
+            formats.append(name)
+    return formats or [default_format]
@@ -14,18 +14,30 @@ logger = get_logger('asset_router')
 
 # 전역 변수 (main.py에서 설정)
 BGM_FOLDER = "bgm"
+bgm_catalog = None
 
 
-def set_dependencies(bgm_folder):
-    """main.py에서 호출하여 폴더 경로 설정"""
-    global BGM_FOLDER
+def set_dependencies(bgm_folder, catalog=None):
+    """main.py에서 호출하여 폴더 경로 / BGM 카탈로그 설정"""
+    global BGM_FOLDER, bgm_catalog
     BGM_FOLDER = bgm_folder
+    bgm_catalog = catalog
 
 
 @router.get("/bgm-list")
 async def get_bgm_list():
     """BGM 폴더 목록 및 각 폴더의 파일 목록 조회"""
     try:
+        # 카탈로그 사용 시 메모리 목록으로 응답 (길이/라우드니스 포함)
+        if bgm_catalog is not None:
+            return JSONResponse(
+                status_code=200,
+                content={
+                    "status": "success",
+                    "data": bgm_catalog.list_by_mood()
+                }
+            )
+
         bgm_data = {}
         valid_moods = ["bright", "calm", "romantic", "sad", "suspense"]
 
@@ -96,6 +108,15 @@ async def get_bgm_by_mood(mood: str):
                 }
             )
 
+        if bgm_catalog is not None:
+            return JSONResponse(
+                status_code=200,
+                content={
+                    "status": "success",
+                    "data": [track.to_api() for track in bgm_catalog.list_tracks(mood)]
+                }
+            )
+
         mood_folder = os.path.join(BGM_FOLDER, mood)
         files = []
 
@@ -5,9 +5,18 @@
 
 from fastapi import APIRouter, HTTPException, Form, File, UploadFile, Header
 from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, ValidationError, field_validator
 from utils.logger_config import get_logger
-from typing import Optional
+from job_cost import job_cost_model
+from job_fingerprint import compute_fingerprint, stream_digest
+from render_config import parse_render_seed, parse_output_formats
+from notification_outbox import notification_outbox
+from email_service import email_service
+from typing import Any, Dict, List, Optional, Union
 import os
+import re
+import json
 import shutil
 import uuid
 
@@ -17,10 +26,12 @@ logger = get_logger('external_api_router')
 # 전역 변수 (main.py에서 설정)
 folder_manager = None
 job_queue = None
+batch_registry = None
 FOLDER_MANAGER_AVAILABLE = False
 JOB_QUEUE_AVAILABLE = False
 UPLOAD_FOLDER = "uploads"
 OUTPUT_FOLDER = "output_videos"
+BATCH_MAX_ITEMS = int(os.getenv('BATCH_MAX_ITEMS', '100'))
 
 # 프리셋 설정 (하드코딩)
 PRESET = {
@@ -44,9 +55,9 @@ PRESET = {
 }
 
 
-def set_dependencies(fm, jq, fm_avail, jq_avail, upload_folder, output_folder):
+def set_dependencies(fm, jq, fm_avail, jq_avail, upload_folder, output_folder, batches=None):
     """main.py에서 호출하여 의존성 설정"""
-    global folder_manager, job_queue
+    global folder_manager, job_queue, batch_registry
     global FOLDER_MANAGER_AVAILABLE, JOB_QUEUE_AVAILABLE
     global UPLOAD_FOLDER, OUTPUT_FOLDER
 
@@ -56,6 +67,102 @@ def set_dependencies(fm, jq, fm_avail, jq_avail, upload_folder, output_folder):
     JOB_QUEUE_AVAILABLE = jq_avail
     UPLOAD_FOLDER = upload_folder
     OUTPUT_FOLDER = output_folder
+    batch_registry = batches
+
+
+def _verify_api_key(x_api_key: Optional[str], user_email: str):
+    """API Key 검증 (실패 시 HTTPException)"""
+    expected_api_key = os.getenv("EXTERNAL_API_KEY", "")
+    if not expected_api_key:
+        logger.error("EXTERNAL_API_KEY 환경변수가 설정되지 않았습니다")
+        raise HTTPException(status_code=500, detail="서버 설정 오류: API Key가 구성되지 않았습니다.")
+
+    if not x_api_key or x_api_key != expected_api_key:
+        logger.warning(f"인증 실패: 잘못된 API Key (user_email={user_email})")
+        raise HTTPException(status_code=401, detail="Unauthorized: 유효하지 않은 API Key입니다.")
+
+
+def _build_video_params(content_data: str, saved_files: list, voice: Optional[str], webhook_url: Optional[str],
+                        render_seed: Optional[int] = None, output_formats: Any = None) -> dict:
+    """프리셋 값 + 전달받은 content_data/미디어 파일로 video_params 구성"""
+    # voice 파라미터 처리: "qwen" 또는 "edge", 미지정 시 "qwen"
+    selected_voice = (voice or "qwen").lower()
+    if selected_voice not in ("qwen", "edge"):
+        logger.warning(f"⚠️ 알 수 없는 voice 값 '{voice}', qwen으로 대체")
+        selected_voice = "qwen"
+
+    if selected_voice == "edge":
+        # edge TTS: 여성 화자, 빠른 속도, 보통 톤
+        effective_tts_engine = "edge"
+        effective_edge_speaker = "female"
+        effective_edge_speed = "normal"
+        effective_edge_pitch = "normal"
+        effective_qwen_speaker = PRESET['qwen_speaker']
+        effective_qwen_speed = PRESET['qwen_speed']
+        effective_qwen_style = PRESET['qwen_style']
+    else:
+        # qwen TTS: 프리셋 값 사용
+        effective_tts_engine = "qwen"
+        effective_edge_speaker = "female"
+        effective_edge_speed = "normal"
+        effective_edge_pitch = "normal"
+        effective_qwen_speaker = PRESET['qwen_speaker']
+        effective_qwen_speed = PRESET['qwen_speed']
+        effective_qwen_style = PRESET['qwen_style']
+
+    logger.info(f"📋 [외부API] PRESET: tts={effective_tts_engine}, pos={PRESET['text_position']}, "
+                f"alloc={PRESET['image_allocation_mode']}, xdissolve={PRESET['cross_dissolve']}")
+    video_params = {
+        'content_data': content_data,
+        'music_mood': PRESET['music_mood'],
+        'image_allocation_mode': PRESET['image_allocation_mode'],
+        'text_position': PRESET['text_position'],
+        'text_style': PRESET['text_style'],
+        'title_area_mode': PRESET['title_area_mode'],
+        'selected_bgm_path': '',
+        'use_test_files': False,
+        'uploaded_files': saved_files,
+        'title_font': PRESET['title_font'],
+        'body_font': PRESET['body_font'],
+        'title_font_size': PRESET['title_font_size'],
+        'body_font_size': PRESET['body_font_size'],
+        'voice_narration': PRESET['voice_narration'],
+        'cross_dissolve': PRESET['cross_dissolve'],
+        'subtitle_duration': PRESET['subtitle_duration'],
+        'edited_texts': '{}',
+        'image_panning_options': '{}',
+        'tts_engine': effective_tts_engine,
+        'qwen_speaker': effective_qwen_speaker,
+        'qwen_speed': effective_qwen_speed,
+        'qwen_style': effective_qwen_style,
+        'per_body_tts_settings': '',
+        'edge_speaker': effective_edge_speaker,
+        'edge_speed': effective_edge_speed,
+        'edge_pitch': effective_edge_pitch,
+        'video_format': PRESET['video_format'],
+        'source': 'external_api',
+        'webhook_url': webhook_url,
+    }
+    # 요청에서 지정한 렌더 시드는 지문에 포함 (시드가 다르면 다른 결과물)
+    render_seed = parse_render_seed(render_seed)
+    if render_seed is not None:
+        video_params['render_seed'] = render_seed
+    # 다중 출력 포맷 (예: "reels,youtube") - 지정한 경우에만 기록 (미지정 시 프리셋 포맷 1개)
+    if output_formats:
+        video_params['output_formats'] = parse_output_formats(output_formats, PRESET['video_format'])
+    return video_params
+
+
+def _check_admission(lane: str, user_email: str) -> Dict[str, Any]:
+    """예상 대기 시간이 레인 허용치를 넘으면 429 + Retry-After (중복 제출 판별 후, 업로드 저장 전에 호출)"""
+    admission = job_cost_model.check_admission(job_queue, lane, user_email)
+    if not admission['admitted']:
+        raise HTTPException(
+            status_code=429,
+            detail=f"현재 대기 작업이 많습니다. 약 {admission['retry_after']}초 후 다시 시도해주세요.",
+            headers={"Retry-After": str(admission['retry_after'])}
+        )
+    return admission
 
 
 @router.post("/generate-reels")
@@ -70,6 +177,15 @@ async def generate_reels_external(
     webhook_url: Optional[str] = Form(None),
     callback_url: Optional[str] = Form(None),
 
+    # 작업 우선순위 레인: "api"(기본) 또는 "batch" (대량 제출 시 batch 권장)
+    priority: Optional[str] = Form(None),
+
+    # 렌더 시드 (같은 시드 + 같은 입력이면 같은 결과물, 미지정 시 요청 내용에서 도출)
+    render_seed: Optional[int] = Form(None),
+
+    # 다중 출력 포맷 (예: "reels,youtube" - 준비 단계를 공유해 포맷별 영상을 함께 생성, 미지정 시 릴스만)
+    output_formats: Optional[str] = Form(None),
+
     # 이미지 파일 업로드 (최대 50개)
     image_1: Optional[UploadFile] = File(None),
     image_2: Optional[UploadFile] = File(None),
@@ -128,14 +244,7 @@ async def generate_reels_external(
     """외부 시스템용 릴스 생성 API - 프리셋 옵션 + API Key 인증"""
 
     # 1. API Key 검증
-    expected_api_key = os.getenv("EXTERNAL_API_KEY", "")
-    if not expected_api_key:
-        logger.error("EXTERNAL_API_KEY 환경변수가 설정되지 않았습니다")
-        raise HTTPException(status_code=500, detail="서버 설정 오류: API Key가 구성되지 않았습니다.")
-
-    if not x_api_key or x_api_key != expected_api_key:
-        logger.warning(f"인증 실패: 잘못된 API Key (user_email={user_email})")
-        raise HTTPException(status_code=401, detail="Unauthorized: 유효하지 않은 API Key입니다.")
+    _verify_api_key(x_api_key, user_email)
 
     # 2. 작업 시스템 가용성 확인
     if not JOB_QUEUE_AVAILABLE:
@@ -143,38 +252,21 @@ async def generate_reels_external(
 
     logger.info(f"🌐 외부 API 릴스 생성 요청: {user_email}")
 
+    # 외부 API는 웹 UI보다 낮은 레인, 사용자 이메일 단위로 공정 분배
+    lane = "batch" if (priority or "").lower() == "batch" else "api"
+
     try:
         # 3. Job ID 생성
         job_id = str(uuid.uuid4())
         logger.info(f"🆔 Job ID 생성: {job_id}")
 
-        # 4. Job 폴더 생성
-        if FOLDER_MANAGER_AVAILABLE:
-            try:
-                job_uploads_folder, job_output_folder = folder_manager.create_job_folders(job_id)
-                uploads_folder_to_use = job_uploads_folder
-                logger.info(f"📁 Job 폴더 생성: {uploads_folder_to_use}")
-            except Exception as folder_error:
-                logger.warning(f"⚠️ Job 폴더 생성 실패, 기본 폴더 사용: {folder_error}")
-                uploads_folder_to_use = UPLOAD_FOLDER
-                os.makedirs(uploads_folder_to_use, exist_ok=True)
-        else:
-            uploads_folder_to_use = UPLOAD_FOLDER
-            os.makedirs(uploads_folder_to_use, exist_ok=True)
-
-        # 5. content_data를 text.json으로 저장
-        import json
+        # 4. content_data 검증
         try:
             content_dict = json.loads(content_data)
         except json.JSONDecodeError as e:
             raise HTTPException(status_code=400, detail=f"content_data JSON 파싱 오류: {str(e)}")
 
-        json_save_path = os.path.join(uploads_folder_to_use, "text.json")
-        with open(json_save_path, 'w', encoding='utf-8') as f:
-            json.dump(content_dict, f, ensure_ascii=False, indent=2)
-        logger.info(f"✅ content_data 저장: {json_save_path}")
-
-        # 6. 이미지 파일들 저장
+        # 5. 업로드 파일명(1.jpg, 2.mp4 ...)과 내용 해시 (저장은 중복 판별/접수 제어 후)
         uploaded_files = [
             ("image_1", image_1), ("image_2", image_2), ("image_3", image_3), ("image_4", image_4), ("image_5", image_5),
             ("image_6", image_6), ("image_7", image_7), ("image_8", image_8), ("image_9", image_9), ("image_10", image_10),
@@ -188,89 +280,82 @@ async def generate_reels_external(
             ("image_46", image_46), ("image_47", image_47), ("image_48", image_48), ("image_49", image_49), ("image_50", image_50),
         ]
 
-        saved_files = []
+        pending_files = []
         for field_name, uploaded_file in uploaded_files:
             if uploaded_file and uploaded_file.filename:
                 file_number = field_name.split('_')[1]
                 file_extension = uploaded_file.filename.split('.')[-1].lower()
-                save_filename = f"{file_number}.{file_extension}"
-                save_path = os.path.join(uploads_folder_to_use, save_filename)
-
-                with open(save_path, "wb") as buffer:
-                    shutil.copyfileobj(uploaded_file.file, buffer)
-
-                saved_files.append(save_filename)
-                logger.info(f"📁 파일 저장: {save_filename}")
-
-        logger.info(f"📊 총 {len(saved_files)}개 파일 저장 완료")
+                pending_files.append((f"{file_number}.{file_extension}", uploaded_file))
+        saved_files = [save_filename for save_filename, _ in pending_files]
+        upload_digests = await run_in_threadpool(
+            lambda: {save_filename: stream_digest(uploaded_file.file) for save_filename, uploaded_file in pending_files}
+        )
 
-        # 7. video_params 구성 (프리셋 값 + 전달받은 content_data 경로)
+        # 6. video_params 구성 (프리셋 값 + 전달받은 content_data 경로)
         # webhook_url 우선순위: webhook_url > callback_url
         effective_webhook_url = webhook_url or callback_url or None
         if effective_webhook_url:
             logger.info(f"🔗 Webhook URL 등록: {effective_webhook_url}")
 
-        # voice 파라미터 처리: "qwen" 또는 "edge", 미지정 시 "qwen"
-        selected_voice = (voice or "qwen").lower()
-        if selected_voice not in ("qwen", "edge"):
-            logger.warning(f"⚠️ 알 수 없는 voice 값 '{voice}', qwen으로 대체")
-            selected_voice = "qwen"
-
-        if selected_voice == "edge":
-            # edge TTS: 여성 화자, 빠른 속도, 보통 톤
-            effective_tts_engine = "edge"
-            effective_edge_speaker = "female"
-            effective_edge_speed = "normal"
-            effective_edge_pitch = "normal"
-            effective_qwen_speaker = PRESET['qwen_speaker']
-            effective_qwen_speed = PRESET['qwen_speed']
-            effective_qwen_style = PRESET['qwen_style']
+        video_params = _build_video_params(content_data, saved_files, voice, effective_webhook_url, render_seed,
+                                          output_formats)
+
+        # 7. 중복 제출 판별 (타임아웃 후 재전송 등 - 기존 작업에 합류하거나 남아 있는 결과 재사용)
+        # 접수 제어보다 먼저 판별해 혼잡할 때 재전송이 429 대신 기존 작업에 합류하도록 함
+        fingerprint, derived_seed = compute_fingerprint(user_email, video_params, None, upload_digests)
+        if fingerprint:
+            video_params.setdefault('render_seed', derived_seed)
+            duplicate = job_queue.find_duplicate(fingerprint)
+            if duplicate:
+                job_queue.attach_duplicate(duplicate['job_id'], video_params)
+                return JSONResponse(
+                    status_code=200,
+                    content={
+                        "status": "success",
+                        "job_id": duplicate['job_id'],
+                        "message": "동일한 요청이 이미 접수되어 기존 작업을 사용합니다.",
+                        "email": user_email,
+                        "duplicate": True,
+                        "job_status": duplicate['status'],
+                        "result": email_service.public_job_result(duplicate.get('result'), user_email),
+                    }
+                )
+
+        # 8. 접수 제어 (새 작업만) 후 Job 폴더 생성 + content_data/이미지 파일 저장
+        admission = _check_admission(lane, user_email)
+
+        if FOLDER_MANAGER_AVAILABLE:
+            try:
+                job_uploads_folder, job_output_folder = folder_manager.create_job_folders(job_id)
+                uploads_folder_to_use = job_uploads_folder
+                logger.info(f"📁 Job 폴더 생성: {uploads_folder_to_use}")
+            except Exception as folder_error:
+                logger.warning(f"⚠️ Job 폴더 생성 실패, 기본 폴더 사용: {folder_error}")
+                uploads_folder_to_use = UPLOAD_FOLDER
+                os.makedirs(uploads_folder_to_use, exist_ok=True)
         else:
-            # qwen TTS: 프리셋 값 사용
-            effective_tts_engine = "qwen"
-            effective_edge_speaker = "female"
-            effective_edge_speed = "normal"
-            effective_edge_pitch = "normal"
-            effective_qwen_speaker = PRESET['qwen_speaker']
-            effective_qwen_speed = PRESET['qwen_speed']
-            effective_qwen_style = PRESET['qwen_style']
-
-        logger.info(f"📋 [외부API] PRESET: tts={effective_tts_engine}, pos={PRESET['text_position']}, "
-                    f"alloc={PRESET['image_allocation_mode']}, xdissolve={PRESET['cross_dissolve']}")
-        video_params = {
-            'content_data': content_data,
-            'music_mood': PRESET['music_mood'],
-            'image_allocation_mode': PRESET['image_allocation_mode'],
-            'text_position': PRESET['text_position'],
-            'text_style': PRESET['text_style'],
-            'title_area_mode': PRESET['title_area_mode'],
-            'selected_bgm_path': '',
-            'use_test_files': False,
-            'uploaded_files': saved_files,
-            'title_font': PRESET['title_font'],
-            'body_font': PRESET['body_font'],
-            'title_font_size': PRESET['title_font_size'],
-            'body_font_size': PRESET['body_font_size'],
-            'voice_narration': PRESET['voice_narration'],
-            'cross_dissolve': PRESET['cross_dissolve'],
-            'subtitle_duration': PRESET['subtitle_duration'],
-            'edited_texts': '{}',
-            'image_panning_options': '{}',
-            'tts_engine': effective_tts_engine,
-            'qwen_speaker': effective_qwen_speaker,
-            'qwen_speed': effective_qwen_speed,
-            'qwen_style': effective_qwen_style,
-            'per_body_tts_settings': '',
-            'edge_speaker': effective_edge_speaker,
-            'edge_speed': effective_edge_speed,
-            'edge_pitch': effective_edge_pitch,
-            'video_format': PRESET['video_format'],
-            'source': 'external_api',
-            'webhook_url': effective_webhook_url,
-        }
-
-        # 8. 작업 큐에 추가
-        actual_job_id = job_queue.add_job(user_email, video_params, job_id=job_id)
+            uploads_folder_to_use = UPLOAD_FOLDER
+            os.makedirs(uploads_folder_to_use, exist_ok=True)
+
+        json_save_path = os.path.join(uploads_folder_to_use, "text.json")
+        with open(json_save_path, 'w', encoding='utf-8') as f:
+            json.dump(content_dict, f, ensure_ascii=False, indent=2)
+        logger.info(f"✅ content_data 저장: {json_save_path}")
+
+        for save_filename, uploaded_file in pending_files:
+            save_path = os.path.join(uploads_folder_to_use, save_filename)
+
+            with open(save_path, "wb") as buffer:
+                shutil.copyfileobj(uploaded_file.file, buffer)
+
+            logger.info(f"📁 파일 저장: {save_filename}")
+
+        logger.info(f"📊 총 {len(saved_files)}개 파일 저장 완료")
+
+        # 9. 렌더 비용 추정 후 작업 큐에 추가
+        estimate = await run_in_threadpool(job_cost_model.estimate, video_params, uploads_folder_to_use)
+        actual_job_id = job_queue.add_job(user_email, video_params, job_id=job_id, lane=lane,
+                                          estimate=estimate, fingerprint=fingerprint)
         logger.info(f"✅ 작업 큐 등록 완료: {actual_job_id}")
 
         return JSONResponse(
@@ -280,6 +365,7 @@ async def generate_reels_external(
                 "job_id": actual_job_id,
                 "message": "릴스 생성 작업이 접수되었습니다. 완료 시 이메일로 알림됩니다.",
                 "email": user_email,
+                "eta": job_cost_model.eta(admission['queue_wait_seconds'], estimate),
             }
         )
 
@@ -288,3 +374,194 @@ async def generate_reels_external(
     except Exception as e:
         logger.error(f"❌ 외부 API 릴스 생성 실패: {e}")
         raise HTTPException(status_code=500, detail=f"릴스 생성 요청 중 오류가 발생했습니다: {str(e)}")
+
+
+def _link_or_copy(source_path: str, target_path: str):
+    """공유 미디어를 작업 폴더에 하드링크로 연결 (다른 파일시스템 등 실패 시 복사)"""
+    try:
+        os.link(source_path, target_path)
+    except OSError:
+        shutil.copy2(source_path, target_path)
+
+
+def _safe_media_name(filename: str) -> str:
+    """공유 미디어 참조 이름 (경로 구분자 제거)"""
+    return re.sub(r'[\\/]+', '_', os.path.basename(filename or '')).strip()
+
+
+class BatchItem(BaseModel):
+    """배치 항목 (items JSON 배열의 원소)"""
+    content_data: Union[Dict[str, Any], str]
+    media: List[str] = []
+    voice: Optional[str] = None
+    ref: Optional[str] = None
+    render_seed: Optional[Union[int, str]] = None
+    output_formats: Optional[Union[str, List[str]]] = None
+
+    @field_validator('content_data')
+    @classmethod
+    def _parse_content_data(cls, value):
+        if isinstance(value, str):
+            try:
+                value = json.loads(value)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"JSON 파싱 오류: {e}")
+            if not isinstance(value, dict):
+                raise ValueError("JSON 객체여야 합니다")
+        return value
+
+    @field_validator('media')
+    @classmethod
+    def _normalize_media(cls, media):
+        """공유 미디어 참조 이름 정규화 - 작업 폴더 파일명(1.png ...)에 확장자가 필요하므로 확장자 없는 이름은 거절"""
+        names = [_safe_media_name(name) for name in media]
+        no_extension = [name for name in names if not os.path.splitext(name)[1].lstrip('.')]
+        if no_extension:
+            raise ValueError(f"확장자가 없는 미디어 파일명 {no_extension}")
+        return names
+
+
+def _validation_detail(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc']) or '항목'}: {item['msg']}" for item in error.errors()
+    )
+
+
+@router.post("/generate-reels-batch")
+async def generate_reels_batch(
+    # 배치 항목 JSON 배열: [{"content_data": {...}, "media": ["a.png", "b.jpg"], "voice": "qwen", "ref": "외부 식별자"}, ...]
+    items: str = Form(...),
+    user_email: str = Form(...),
+
+    # 배치 전체 완료 시 1회 호출되는 webhook (항목별 webhook 없음)
+    webhook_url: Optional[str] = Form(None),
+
+    # 공유 미디어 파일 (항목의 media에서 파일명으로 참조, 여러 항목이 같은 파일을 참조 가능)
+    files: List[UploadFile] = File(default=[]),
+
+    x_api_key: Optional[str] = Header(None),
+):
+    """외부 시스템용 대량 릴스 생성 API - 여러 대본을 한 번에 접수하고 배치 ID + 항목별 작업 ID 반환
+
+    미디어는 배치 공유 폴더에 한 번만 저장하고 각 작업 폴더에는 하드링크로 연결한다.
+    작업은 batch 레인으로 큐에 들어가며 진행 상황은 /v1/batch-status/{batch_id}로 조회한다.
+    """
+    _verify_api_key(x_api_key, user_email)
+
+    if not JOB_QUEUE_AVAILABLE or batch_registry is None:
+        raise HTTPException(status_code=500, detail="배치 작업 시스템이 사용 불가능합니다.")
+
+    # 1. 항목 파싱/검증 (저장 전에 전체 검증)
+    try:
+        batch_items = json.loads(items)
+    except json.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"items JSON 파싱 오류: {str(e)}")
+    if not isinstance(batch_items, list) or not batch_items:
+        raise HTTPException(status_code=400, detail="items는 비어 있지 않은 배열이어야 합니다.")
+    if len(batch_items) > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"배치당 최대 {BATCH_MAX_ITEMS}개 항목까지 접수할 수 있습니다.")
+
+    shared_names = {_safe_media_name(f.filename): f for f in files if f and f.filename}
+    parsed_items: List[BatchItem] = []
+    for index, item in enumerate(batch_items):
+        try:
+            parsed_item = BatchItem.model_validate(item)
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=f"items[{index}]: {_validation_detail(e)}")
+        missing = [name for name in parsed_item.media if name not in shared_names]
+        if missing:
+            raise HTTPException(status_code=400, detail=f"items[{index}]: 업로드되지 않은 미디어 참조 {missing}")
+        parsed_items.append(parsed_item)
+    batch_items = parsed_items
+
+    admission = _check_admission("batch", user_email)
+    batch_id = batch_registry.new_batch_id()
+    logger.info(f"🌐 외부 API 배치 요청: {user_email} (항목 {len(batch_items)}개, 공유 미디어 {len(shared_names)}개, 배치 {batch_id})")
+
+    try:
+        # 2. 공유 미디어 1회 저장
+        media_folder = os.path.join(UPLOAD_FOLDER, f"batch_{batch_id}")
+        os.makedirs(media_folder, exist_ok=True)
+        for name, uploaded_file in shared_names.items():
+            with open(os.path.join(media_folder, name), "wb") as buffer:
+                shutil.copyfileobj(uploaded_file.file, buffer)
+
+        # 3. 배치 먼저 등록 (빨리 끝난 작업도 배치 완료 판정에 포함되도록)
+        job_ids = [str(uuid.uuid4()) for _ in batch_items]
+        batch_registry.create_batch(
+            batch_id, user_email, job_ids,
+            webhook_url=webhook_url or None,
+            media_folder=media_folder,
+            item_refs=[item.ref for item in batch_items]
+        )
+
+        # 4. 항목별 작업 폴더 + 미디어 연결 + 비용 추정 + 큐 등록
+        total_cost_seconds = 0.0
+        for item, job_id in zip(batch_items, job_ids):
+            if FOLDER_MANAGER_AVAILABLE:
+                uploads_folder_to_use, _ = folder_manager.create_job_folders(job_id)
+            else:
+                uploads_folder_to_use = os.path.join(UPLOAD_FOLDER, f"job_{job_id}")
+                os.makedirs(uploads_folder_to_use, exist_ok=True)
+
+            with open(os.path.join(uploads_folder_to_use, "text.json"), 'w', encoding='utf-8') as f:
+                json.dump(item.content_data, f, ensure_ascii=False, indent=2)
+
+            # 참조 순서대로 1.ext, 2.ext ... (단건 API와 동일한 파일명 규칙)
+            saved_files = []
+            for number, name in enumerate(item.media, start=1):
+                save_filename = f"{number}{os.path.splitext(name)[1].lower()}"
+                _link_or_copy(os.path.join(media_folder, name), os.path.join(uploads_folder_to_use, save_filename))
+                saved_files.append(save_filename)
+
+            video_params = _build_video_params(
+                json.dumps(item.content_data, ensure_ascii=False), saved_files, item.voice, None,
+                item.render_seed, item.output_formats
+            )
+            video_params['batch_id'] = batch_id
+            estimate = await run_in_threadpool(job_cost_model.estimate, video_params, uploads_folder_to_use)
+            total_cost_seconds += estimate['cost_seconds']
+            job_queue.add_job(user_email, video_params, job_id=job_id, lane="batch", estimate=estimate)
+
+        return JSONResponse(
+            status_code=200,
+            content={
+                "status": "success",
+                "batch_id": batch_id,
+                "jobs": [
+                    {"index": index, "ref": item.ref, "job_id": job_id}
+                    for index, (item, job_id) in enumerate(zip(batch_items, job_ids))
+                ],
+                "message": f"릴스 {len(job_ids)}건이 접수되었습니다.",
+                "email": user_email,
+                # 배치 전체 완료 예상 (항목들이 살아 있는 워커에 나뉘어 처리된다고 가정)
+                "eta": job_cost_model.eta(
+                    admission['queue_wait_seconds'],
+                    {'cost_seconds': total_cost_seconds / admission['workers']}
+                ),
+            }
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ 외부 API 배치 접수 실패: {batch_id} - {e}")
+        raise HTTPException(status_code=500, detail=f"배치 접수 중 오류가 발생했습니다: {str(e)}")
+
+
+@router.get("/batch-status/{batch_id}")
+async def get_batch_status(batch_id: str, x_api_key: Optional[str] = Header(None)):
+    """배치 진행 상황 (상태별 개수, 전체 진행률, 항목별 상태/단계)"""
+    _verify_api_key(x_api_key, batch_id)
+
+    if not JOB_QUEUE_AVAILABLE or batch_registry is None:
+        raise HTTPException(status_code=500, detail="배치 작업 시스템이 사용 불가능합니다.")
+
+    batch = batch_registry.get_batch(batch_id)
+    if not batch:
+        raise HTTPException(status_code=404, detail="배치를 찾을 수 없습니다.")
+
+    summary = batch_registry.summarize(batch, job_queue)
+    # 배치 완료 webhook 발송 상태
+    summary['notifications'] = notification_outbox.delivery_status(batch_id)
+    return {"status": "success", "batch": summary}
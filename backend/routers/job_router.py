@@ -3,8 +3,19 @@ Job 관리 라우터
 작업 상태 조회, Job 폴더 관리, 통계 등 Job 관련 API
 """
 
-from fastapi import APIRouter, HTTPException
+import os
+import json
+import time
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from utils.logger_config import get_logger
+from job_progress import read_progress, progress_mtime, TERMINAL_STATES
+from worker_heartbeat import list_heartbeats
+from job_cost import job_cost_model
+from notification_outbox import notification_outbox
 from models.request_models import CreateJobFolderRequest, CleanupJobFolderRequest
 from models.response_models import (
     JobStatusResponse,
@@ -15,6 +26,12 @@ from models.response_models import (
 router = APIRouter(tags=["job"])
 logger = get_logger('job_router')
 
+# 작업 진행 이벤트 스트림 (SSE) 설정
+JOB_EVENTS_POLL_SECONDS = float(os.getenv('JOB_EVENTS_POLL_SECONDS', '0.5'))           # 진행 상황 파일 변경 확인 간격
+JOB_EVENTS_STATUS_RECHECK_SECONDS = float(os.getenv('JOB_EVENTS_STATUS_RECHECK_SECONDS', '15'))  # 큐 상태 재확인 간격
+JOB_EVENTS_HEARTBEAT_SECONDS = float(os.getenv('JOB_EVENTS_HEARTBEAT_SECONDS', '15'))
+JOB_EVENTS_MAX_SECONDS = float(os.getenv('JOB_EVENTS_MAX_SECONDS', '3600'))             # 연결 최대 유지 시간 (이후 클라이언트 재연결)
+
 # 전역 변수 (main.py에서 설정)
 job_queue = None
 job_logger = None
@@ -57,6 +74,12 @@ async def get_job_status(job_id: str):
             "error_message": job_data.get('error_message')
         }
 
+        # 완료/실패 알림 발송 상태 (아웃박스)
+        try:
+            response_data["notifications"] = notification_outbox.delivery_status(job_id)
+        except Exception as outbox_error:
+            logger.warning(f"알림 발송 상태 조회 실패: {outbox_error}")
+
         # 로깅 시스템에서 추가 정보 조회 (가능한 경우)
         if JOB_LOGGER_AVAILABLE:
             try:
@@ -79,15 +102,128 @@ async def get_job_status(job_id: str):
         raise HTTPException(status_code=500, detail="작업 상태 조회 중 오류가 발생했습니다.")
 
 
+def _sse_event(event: str, data: dict, event_id=None) -> str:
+    """SSE 메시지 1건 직렬화"""
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(data, ensure_ascii=False)}")
+    return "\n".join(lines) + "\n\n"
+
+
+def _queue_snapshot(job_data: dict) -> dict:
+    """큐 레코드 → 진행 이벤트 형태 (워커 진행 기록이 아직 없을 때)"""
+    return {
+        "job_id": job_data['job_id'],
+        "state": job_data['status'],
+        "stage": None,
+        "error": job_data.get('error_message'),
+        "result": job_data.get('result'),
+    }
+
+
+async def _job_event_stream(request: Request, job_id: str, job_data: dict):
+    """작업 진행 이벤트 생성기
+
+    워커가 기록하는 진행 상황 파일의 수정 시각만 확인하다가 바뀌었을 때만 읽어 전송한다.
+    상태가 바뀌면 'state', 같은 상태 안의 진행은 'progress', 완료/실패 후 'end'를 보내고 종료.
+    진행 기록이 없는 동안(대기 중)이나 워커가 기록을 남기지 못한 경우에 대비해 큐 상태는 가끔만 재확인한다.
+    """
+    started = time.monotonic()
+    last_mtime = None
+    last_state = None
+    last_sent = started
+    last_status_check = started
+
+    # 연결 직후 현재 상태 1회 전송 (진행 기록이 있으면 그것을, 없으면 큐 레코드를)
+    snapshot = read_progress(job_id)
+    if snapshot is not None:
+        last_mtime = progress_mtime(job_id)
+    else:
+        snapshot = _queue_snapshot(job_data)
+    last_state = snapshot.get('state')
+    yield _sse_event("state", snapshot, snapshot.get('seq'))
+
+    while last_state not in TERMINAL_STATES:
+        if await request.is_disconnected():
+            return
+        now = time.monotonic()
+        if now - started > JOB_EVENTS_MAX_SECONDS:
+            yield _sse_event("timeout", {"job_id": job_id, "state": last_state})
+            return
+
+        mtime = progress_mtime(job_id)
+        if mtime is not None and mtime != last_mtime:
+            last_mtime = mtime
+            snapshot = read_progress(job_id)
+            if snapshot is not None:
+                event = "state" if snapshot.get('state') != last_state else "progress"
+                last_state = snapshot.get('state')
+                last_sent = now
+                yield _sse_event(event, snapshot, snapshot.get('seq'))
+                continue
+        elif now - last_status_check >= JOB_EVENTS_STATUS_RECHECK_SECONDS:
+            last_status_check = now
+            job_data = await run_in_threadpool(job_queue.get_job, job_id)
+            if not job_data:
+                yield _sse_event("end", {"job_id": job_id, "state": "missing"})
+                return
+            if job_data['status'] != last_state and (mtime is None or job_data['status'] in TERMINAL_STATES):
+                last_state = job_data['status']
+                last_sent = now
+                yield _sse_event("state", _queue_snapshot(job_data))
+                continue
+
+        if now - last_sent >= JOB_EVENTS_HEARTBEAT_SECONDS:
+            last_sent = now
+            yield ": keep-alive\n\n"
+        await asyncio.sleep(JOB_EVENTS_POLL_SECONDS)
+
+    yield _sse_event("end", {"job_id": job_id, "state": last_state})
+
+
+@router.get("/job-events/{job_id}")
+async def stream_job_events(job_id: str, request: Request):
+    """작업 진행 이벤트 스트림 (Server-Sent Events)
+
+    /job-status 폴링 대신 구독하면 상태 전환과 세부 진행 상황(단계, 세그먼트 i/N, 인코딩 %)을 받는다.
+    이벤트: state(상태 전환) / progress(진행) / end(완료·실패로 종료) / timeout(재연결 필요)
+    """
+    if not JOB_QUEUE_AVAILABLE:
+        raise HTTPException(status_code=500, detail="배치 작업 시스템이 사용 불가능합니다.")
+
+    job_data = await run_in_threadpool(job_queue.get_job, job_id)
+    if not job_data:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+
+    return StreamingResponse(
+        _job_event_stream(request, job_id, job_data),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # nginx 프록시 버퍼링 해제
+        }
+    )
+
+
 @router.get("/queue-stats")
 async def get_queue_stats():
-    """작업 큐 통계 조회 (관리용)"""
+    """작업 큐 통계 조회 (관리용) - 하트비트가 유효한 워커와 현재 작업 포함"""
     try:
         if not JOB_QUEUE_AVAILABLE:
             raise HTTPException(status_code=500, detail="배치 작업 시스템이 사용 불가능합니다.")
 
         stats = job_queue.get_job_stats()
-        return {"status": "success", "stats": stats}
+        heartbeats = list_heartbeats()
+        workers = [worker for worker in heartbeats if worker['alive']]
+        return {
+            "status": "success",
+            "stats": stats,
+            "workers": workers,
+            "stale_workers": len(heartbeats) - len(workers),
+            "cost_model": job_cost_model.describe(),
+            "notifications": notification_outbox.get_stats()
+        }
 
     except Exception as e:
         logger.error(f"❌ 큐 통계 조회 실패: {e}")
@@ -130,13 +266,16 @@ async def get_user_jobs(user_email: str, limit: int = 20):
 
 
 @router.get("/job-statistics")
-async def get_job_statistics():
-    """Job 로그 통계 정보 조회 (관리용)"""
+async def get_job_statistics(recent_jobs: int = 200):
+    """Job 로그 통계 정보 조회 (관리용)
+
+    stage_stats: 최근 recent_jobs건의 단계별 소요 시간 p50/p95
+    """
     try:
         if not JOB_LOGGER_AVAILABLE:
             raise HTTPException(status_code=500, detail="Job 로깅 시스템이 사용 불가능합니다.")
 
-        stats = job_logger.get_job_statistics()
+        stats = job_logger.get_job_statistics(recent_jobs=max(1, min(recent_jobs, 2000)))
         return {"status": "success", "statistics": stats}
 
     except Exception as e:
@@ -5,6 +5,7 @@
 
 from fastapi import APIRouter
 from datetime import datetime
+from clip_registry import get_reader_stats
 
 router = APIRouter(tags=["system"])
 
@@ -31,7 +32,8 @@ async def get_status():
             "youtube_transcript": YOUTUBE_TRANSCRIPT_AVAILABLE,
             "aiohttp": AIOHTTP_AVAILABLE
         },
-        "message": "Reels Video Generator API is running"
+        "message": "Reels Video Generator API is running",
+        "clip_readers": get_reader_stats()
     }
 
     warnings = []
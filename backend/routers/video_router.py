@@ -5,7 +5,12 @@
 
 from fastapi import APIRouter, HTTPException, Form, File, UploadFile
 from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
 from utils.logger_config import get_logger
+from job_cost import job_cost_model
+from job_fingerprint import compute_fingerprint, stream_digest
+from email_service import email_service
+from render_config import new_render_seed, parse_render_seed, parse_output_formats
 from typing import Optional
 import os
 import shutil
@@ -27,14 +32,18 @@ OUTPUT_FOLDER = "output_videos"
 CURRENT_BGM_PATH = None
 VideoGenerator = None
 prepare_files_func = None  # main.py의 prepare_files 함수
+tts_prefetcher = None  # TTS 선행 합성 워커
+preview_service = None  # 미리보기 렌더링 서비스
 
 
 def set_dependencies(fm, jq, jl, fm_avail, jq_avail, jl_avail,
-                     upload_folder, output_folder, current_bgm, video_gen_class, prepare_func):
+                     upload_folder, output_folder, current_bgm, video_gen_class, prepare_func,
+                     prefetcher=None, preview=None):
     """main.py에서 호출하여 의존성 설정"""
     global folder_manager, job_queue, job_logger
     global FOLDER_MANAGER_AVAILABLE, JOB_QUEUE_AVAILABLE, JOB_LOGGER_AVAILABLE
     global UPLOAD_FOLDER, OUTPUT_FOLDER, CURRENT_BGM_PATH, VideoGenerator, prepare_files_func
+    global tts_prefetcher, preview_service
 
     folder_manager = fm
     job_queue = jq
@@ -47,6 +56,8 @@ def set_dependencies(fm, jq, jl, fm_avail, jq_avail, jl_avail,
     CURRENT_BGM_PATH = current_bgm
     VideoGenerator = video_gen_class
     prepare_files_func = prepare_func
+    tts_prefetcher = prefetcher
+    preview_service = preview
 
 
 @router.post("/generate-video")
@@ -101,6 +112,9 @@ async def generate_video(
     # 영상 포맷 설정
     video_format: str = Form(default="reels"),  # 'reels' (504x890) 또는 'youtube' (1280x720)
 
+    # 렌더 시드 (같은 시드 + 같은 입력이면 같은 BGM/패닝/전환 선택, 미지정 시 자동)
+    render_seed: Optional[int] = Form(None),
+
     # 이미지 파일 업로드 (최대 50개)
     image_1: Optional[UploadFile] = File(None),
     image_2: Optional[UploadFile] = File(None),
@@ -196,39 +210,59 @@ async def generate_video(
         ]
         uploaded_images = [img for img in uploaded_images if img is not None]
 
+        # 렌더 시드 (미지정 시 새로 만들어 응답에 포함 - 같은 시드로 다시 요청하면 같은 결과)
+        render_seed = parse_render_seed(render_seed)
+        if render_seed is None:
+            render_seed = new_render_seed()
+        logger.info(f"🎲 렌더 시드: {render_seed}")
+
         # prepare_files 함수 호출
         await prepare_files_func(
             json_url, music_mood, image_urls,
             content_data, background_music, use_test_files,
-            selected_bgm_path, uploaded_images, edited_texts
+            selected_bgm_path, uploaded_images, edited_texts,
+            render_seed=render_seed
         )
 
-        # 영상 생성 (포맷에 따라 클래스 선택)
+        # 영상 생성 (포맷에 따라 공유 생성기 선택)
+        from video_generator import get_shared_generator
         if video_format == 'youtube':
             # YouTube: 타이틀 영역 강제 제거, letterbox fit 전용 생성기 사용
             title_area_mode = 'remove'
             try:
                 from youtube_generator import YouTubeVideoGenerator
-                video_gen = YouTubeVideoGenerator()
+                video_gen = get_shared_generator(YouTubeVideoGenerator)
                 logger.info("🎬 YouTubeVideoGenerator 사용 (letterbox, 패닝 없음)")
             except ImportError as e:
                 logger.warning(f"⚠️ YouTubeVideoGenerator 로드 실패, 기본 생성기 사용: {e}")
-                video_gen = VideoGenerator()
-                video_gen.set_video_format(video_format)
+                video_gen = get_shared_generator(VideoGenerator)
         else:
-            video_gen = VideoGenerator()
-            video_gen.set_video_format(video_format)
+            video_gen = get_shared_generator(VideoGenerator)
 
-        # 대사별 TTS 설정 파싱 및 인스턴스에 설정
+        # 대사별 TTS 설정 파싱
+        parsed_per_body_tts = None
         if per_body_tts_settings and per_body_tts_settings.strip():
             try:
                 parsed_per_body_tts = json.loads(per_body_tts_settings)
                 if parsed_per_body_tts:
-                    video_gen.per_body_tts_settings = parsed_per_body_tts
                     logger.info(f"🎭 대사별 TTS 설정 적용: {list(parsed_per_body_tts.keys())}")
             except Exception as parse_error:
                 logger.warning(f"⚠️ 대사별 TTS 설정 파싱 실패: {parse_error}")
 
+        # 요청별 렌더 설정 (공유 생성기 인스턴스는 변경하지 않음)
+        render_config = video_gen.build_render_config(
+            video_format,
+            tts_engine=tts_engine,
+            qwen_speaker=qwen_speaker,
+            qwen_speed=qwen_speed,
+            qwen_style=qwen_style,
+            per_body_tts_settings=parsed_per_body_tts,
+            edge_speaker=edge_speaker,
+            edge_speed=edge_speed,
+            edge_pitch=edge_pitch,
+            render_seed=render_seed
+        )
+
         # BGM 파일 경로 결정
         if background_music:
             bgm_file = os.path.join(UPLOAD_FOLDER, "back.mp3")
@@ -315,7 +349,8 @@ async def generate_video(
             qwen_style,
             edge_speaker,
             edge_speed,
-            edge_pitch
+            edge_pitch,
+            render_config=render_config
         )
 
         # 영상 생성 성공 시 job 폴더 정리
@@ -339,7 +374,8 @@ async def generate_video(
             content={
                 "status": "success",
                 "message": "Video generated successfully",
-                "video_path": output_path
+                "video_path": output_path,
+                "render_seed": render_seed
             }
         )
 
@@ -418,6 +454,12 @@ async def generate_video_async(
     # 영상 포맷 설정
     video_format: str = Form(default="reels"),  # 'reels' (504x890) 또는 'youtube' (1280x720)
 
+    # 렌더 시드 (같은 시드 + 같은 입력이면 같은 BGM/패닝/전환 선택, 미지정 시 자동)
+    render_seed: Optional[int] = Form(None),
+
+    # 다중 출력 포맷 (예: "reels,youtube" - TTS/미디어 준비를 공유해 포맷별 영상을 함께 생성, 미지정 시 video_format만)
+    output_formats: str = Form(default=""),
+
     # 이미지 파일 업로드 (최대 50개)
     image_1: Optional[UploadFile] = File(None),
     image_2: Optional[UploadFile] = File(None),
@@ -487,36 +529,7 @@ async def generate_video_async(
             job_id = str(uuid.uuid4())
             logger.info(f"🆔 새 Job ID 생성: {job_id}")
 
-        # Job 폴더 처리
-        if FOLDER_MANAGER_AVAILABLE:
-            try:
-                try:
-                    job_uploads_folder, job_output_folder = folder_manager.get_job_folders(job_id)
-                    if os.path.exists(job_uploads_folder):
-                        uploads_folder_to_use = job_uploads_folder
-                        logger.info(f"📁 기존 Job 폴더 사용: {uploads_folder_to_use}")
-                    else:
-                        job_uploads_folder, job_output_folder = folder_manager.create_job_folders(job_id)
-                        uploads_folder_to_use = job_uploads_folder
-                        logger.info(f"📁 새 Job 폴더 생성: {uploads_folder_to_use}")
-                except Exception:
-                    job_uploads_folder, job_output_folder = folder_manager.create_job_folders(job_id)
-                    uploads_folder_to_use = job_uploads_folder
-                    logger.info(f"📁 Job 폴더 생성 완료: {uploads_folder_to_use}")
-            except Exception as job_error:
-                logger.warning(f"⚠️ Job 폴더 생성 실패, 기본 폴더 사용: {job_error}")
-                uploads_folder_to_use = UPLOAD_FOLDER
-                if os.path.exists(uploads_folder_to_use):
-                    shutil.rmtree(uploads_folder_to_use)
-                os.makedirs(uploads_folder_to_use, exist_ok=True)
-        else:
-            uploads_folder_to_use = UPLOAD_FOLDER
-            if os.path.exists(uploads_folder_to_use):
-                shutil.rmtree(uploads_folder_to_use)
-            os.makedirs(uploads_folder_to_use, exist_ok=True)
-            logger.info(f"📁 기본 폴더 사용: {uploads_folder_to_use}")
-
-        # 업로드된 파일들 저장
+        # 업로드된 파일 (저장은 중복 판별 후)
         uploaded_files = [
             ("image_1", image_1), ("image_2", image_2), ("image_3", image_3), ("image_4", image_4), ("image_5", image_5),
             ("image_6", image_6), ("image_7", image_7), ("image_8", image_8), ("image_9", image_9), ("image_10", image_10),
@@ -530,19 +543,17 @@ async def generate_video_async(
             ("image_46", image_46), ("image_47", image_47), ("image_48", image_48), ("image_49", image_49), ("image_50", image_50)
         ]
 
-        saved_files = []
+        # 저장 파일명(1.jpg, 2.mp4 ...)과 내용 해시 - 기존 Job 폴더에 쓰기 전에 중복 제출을 판별하기 위해 스트림에서 계산
+        pending_files = []
         for field_name, uploaded_file in uploaded_files:
             if uploaded_file and uploaded_file.filename:
                 file_number = field_name.split('_')[1]
                 file_extension = uploaded_file.filename.split('.')[-1].lower()
-                save_filename = f"{file_number}.{file_extension}"
-                save_path = os.path.join(uploads_folder_to_use, save_filename)
-
-                with open(save_path, "wb") as buffer:
-                    shutil.copyfileobj(uploaded_file.file, buffer)
-
-                saved_files.append(save_filename)
-                logger.info(f"📁 파일 저장: {save_filename}")
+                pending_files.append((f"{file_number}.{file_extension}", uploaded_file))
+        saved_files = [save_filename for save_filename, _ in pending_files]
+        upload_digests = await run_in_threadpool(
+            lambda: {save_filename: stream_digest(uploaded_file.file) for save_filename, uploaded_file in pending_files}
+        )
 
         # 작업 파라미터 구성
         video_params = {
@@ -575,9 +586,85 @@ async def generate_video_async(
             'edge_pitch': edge_pitch,
             'video_format': video_format,
         }
+        # 요청에서 지정한 렌더 시드는 지문에 포함 (시드가 다르면 다른 결과물)
+        render_seed = parse_render_seed(render_seed)
+        if render_seed is not None:
+            video_params['render_seed'] = render_seed
+        if output_formats.strip():
+            video_params['output_formats'] = parse_output_formats(output_formats, video_format)
+            logger.info(f"🎞️ 출력 포맷: {', '.join(video_params['output_formats'])}")
+
+        # 중복 제출 판별 (같은 대본/설정/미디어면 기존 작업에 합류하거나 남아 있는 결과 재사용)
+        # 프론트엔드는 재제출 시 같은 job_id를 보내므로 Job 폴더에 아무것도 쓰기 전에 판별 (합류 대상 작업의 업로드 보호)
+        fingerprint, derived_seed = compute_fingerprint(user_email, video_params, None, upload_digests)
+        if fingerprint:
+            video_params.setdefault('render_seed', derived_seed)
+            duplicate = job_queue.find_duplicate(fingerprint)
+            if duplicate:
+                job_queue.attach_duplicate(duplicate['job_id'], video_params)
+                return JSONResponse(
+                    status_code=200,
+                    content={
+                        "status": "success",
+                        "message": "동일한 요청이 이미 접수되어 기존 작업을 사용합니다",
+                        "job_id": duplicate['job_id'],
+                        "duplicate": True,
+                        "job_status": duplicate['status'],
+                        "result": email_service.public_job_result(duplicate.get('result'), user_email)
+                    }
+                )
 
-        # 작업을 큐에 추가
-        actual_job_id = job_queue.add_job(user_email, video_params, job_id=job_id)
+        # 접수 제어 (새 작업만 - 예상 대기 시간이 허용치를 넘으면 업로드 저장 전에 거절, 중복 제출은 위에서 기존 작업에 합류)
+        admission = job_cost_model.check_admission(job_queue, "interactive", user_email)
+        if not admission['admitted']:
+            raise HTTPException(
+                status_code=429,
+                detail=f"현재 대기 작업이 많습니다. 약 {admission['retry_after']}초 후 다시 시도해주세요.",
+                headers={"Retry-After": str(admission['retry_after'])}
+            )
+
+        # Job 폴더 처리
+        if FOLDER_MANAGER_AVAILABLE:
+            try:
+                try:
+                    job_uploads_folder, job_output_folder = folder_manager.get_job_folders(job_id)
+                    if os.path.exists(job_uploads_folder):
+                        uploads_folder_to_use = job_uploads_folder
+                        logger.info(f"📁 기존 Job 폴더 사용: {uploads_folder_to_use}")
+                    else:
+                        job_uploads_folder, job_output_folder = folder_manager.create_job_folders(job_id)
+                        uploads_folder_to_use = job_uploads_folder
+                        logger.info(f"📁 새 Job 폴더 생성: {uploads_folder_to_use}")
+                except Exception:
+                    job_uploads_folder, job_output_folder = folder_manager.create_job_folders(job_id)
+                    uploads_folder_to_use = job_uploads_folder
+                    logger.info(f"📁 Job 폴더 생성 완료: {uploads_folder_to_use}")
+            except Exception as job_error:
+                logger.warning(f"⚠️ Job 폴더 생성 실패, 기본 폴더 사용: {job_error}")
+                uploads_folder_to_use = UPLOAD_FOLDER
+                if os.path.exists(uploads_folder_to_use):
+                    shutil.rmtree(uploads_folder_to_use)
+                os.makedirs(uploads_folder_to_use, exist_ok=True)
+        else:
+            uploads_folder_to_use = UPLOAD_FOLDER
+            if os.path.exists(uploads_folder_to_use):
+                shutil.rmtree(uploads_folder_to_use)
+            os.makedirs(uploads_folder_to_use, exist_ok=True)
+            logger.info(f"📁 기본 폴더 사용: {uploads_folder_to_use}")
+
+        # 업로드된 파일들 저장
+        for save_filename, uploaded_file in pending_files:
+            save_path = os.path.join(uploads_folder_to_use, save_filename)
+
+            with open(save_path, "wb") as buffer:
+                shutil.copyfileobj(uploaded_file.file, buffer)
+
+            logger.info(f"📁 파일 저장: {save_filename}")
+
+        # 렌더 비용 추정 (업로드 영상 probe) 후 작업을 큐에 추가
+        estimate = await run_in_threadpool(job_cost_model.estimate, video_params, uploads_folder_to_use)
+        actual_job_id = job_queue.add_job(user_email, video_params, job_id=job_id, lane="interactive",
+                                          estimate=estimate, fingerprint=fingerprint)
 
         # Job 로깅 시스템에 로그 생성
         if JOB_LOGGER_AVAILABLE:
@@ -637,7 +724,8 @@ async def generate_video_async(
             content={
                 "status": "success",
                 "message": "영상 생성 작업이 큐에 추가되었습니다",
-                "job_id": actual_job_id
+                "job_id": actual_job_id,
+                "eta": job_cost_model.eta(admission['queue_wait_seconds'], estimate)
             }
         )
 
@@ -648,6 +736,62 @@ async def generate_video_async(
         raise HTTPException(status_code=500, detail="영상 생성 요청 중 오류가 발생했습니다.")
 
 
+@router.post("/tts-prefetch")
+async def tts_prefetch(
+    job_id: str = Form(...),
+    content_data: str = Form(...),
+    tts_engine: str = Form(default="edge"),
+    qwen_speaker: str = Form(default="Sohee"),
+    qwen_speed: str = Form(default="normal"),
+    qwen_style: str = Form(default="neutral"),
+    per_body_tts_settings: str = Form(default=""),
+    edge_speaker: str = Form(default="female"),
+    edge_speed: str = Form(default="normal"),
+    edge_pitch: str = Form(default="normal"),
+):
+    """편집 중인 대본의 TTS를 백그라운드에서 미리 합성 (같은 job_id의 이전 요청은 취소)"""
+    try:
+        if tts_prefetcher is None:
+            raise HTTPException(status_code=503, detail="TTS 선행 합성을 사용할 수 없습니다.")
+
+        try:
+            content = json.loads(content_data)
+            body_settings = json.loads(per_body_tts_settings) if per_body_tts_settings else {}
+        except json.JSONDecodeError:
+            raise HTTPException(status_code=400, detail="content_data 또는 per_body_tts_settings 형식이 올바르지 않습니다.")
+
+        body_keys = [key for key in content.keys() if key.startswith('body') and str(content[key]).strip()]
+        body_keys.sort(key=lambda x: int(x.replace('body', '')))
+        lines = {key: str(content[key]) for key in body_keys}
+
+        queued = tts_prefetcher.submit(job_id, lines, {
+            'tts_engine': tts_engine,
+            'qwen_speaker': qwen_speaker,
+            'qwen_speed': qwen_speed,
+            'qwen_style': qwen_style,
+            'per_body_tts_settings': body_settings,
+            'edge_speaker': edge_speaker,
+            'edge_speed': edge_speed,
+            'edge_pitch': edge_pitch,
+        })
+
+        return JSONResponse(
+            status_code=202,
+            content={
+                # Qwen 등 API 프로세스에서 합성하지 않는 엔진은 렌더 시 워커에서 합성
+                "status": "accepted" if tts_prefetcher.supports({'tts_engine': tts_engine}) else "skipped",
+                "job_id": job_id,
+                "queued_lines": queued
+            }
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ TTS 선행 합성 요청 실패: {e}")
+        raise HTTPException(status_code=500, detail="TTS 선행 합성 요청 중 오류가 발생했습니다.")
+
+
 @router.post("/preview-video")
 async def preview_video(
     title: str = Form(...),
@@ -668,21 +812,8 @@ async def preview_video(
     try:
         logger.info(f"미리보기 요청: {title[:20]}... (포맷: {video_format})")
 
-        # VideoGenerator 인스턴스 생성 (포맷에 따라 클래스 선택)
-        if video_format == 'youtube':
-            # YouTube: 타이틀 영역 강제 제거, letterbox fit 전용 생성기 사용
-            title_area_mode = 'remove'
-            try:
-                from youtube_generator import YouTubeVideoGenerator
-                video_generator = YouTubeVideoGenerator()
-                logger.info("🎬 [Preview] YouTubeVideoGenerator 사용 (letterbox, 패닝 없음)")
-            except ImportError as e:
-                logger.warning(f"⚠️ [Preview] YouTubeVideoGenerator 로드 실패, 기본 생성기 사용: {e}")
-                video_generator = VideoGenerator()
-                video_generator.set_video_format(video_format)
-        else:
-            video_generator = VideoGenerator()
-            video_generator.set_video_format(video_format)
+        if preview_service is None:
+            raise HTTPException(status_code=503, detail="미리보기 서비스를 사용할 수 없습니다")
 
         # 업로드 폴더 설정 (Job ID에 따라 분기)
         if job_id and FOLDER_MANAGER_AVAILABLE:
@@ -699,57 +830,13 @@ async def preview_video(
             uploads_folder = UPLOAD_FOLDER
             os.makedirs(uploads_folder, exist_ok=True)
 
-        # 이미지/비디오 파일 처리
-        preview_image_path = None
+        # 이미지/비디오 파일 처리 (업로드 데이터는 메모리에서 바로 사용, 디스크 기록 없음)
+        media_bytes = None
+        media_filename = ""
+        media_path = None
         if image_1 and hasattr(image_1, 'filename') and image_1.filename:
-            # 업로드된 파일 저장
-            import time
-            image_filename = f"preview_{int(time.time())}_{image_1.filename}"
-            image_save_path = os.path.join(uploads_folder, image_filename)
-
-            with open(image_save_path, "wb") as buffer:
-                shutil.copyfileobj(image_1.file, buffer)
-
-            # 비디오 파일인지 확인
-            video_extensions = ['.mp4', '.mov', '.avi', '.webm', '.mkv']
-            is_video = any(image_1.filename.lower().endswith(ext) for ext in video_extensions)
-
-            if is_video:
-                # 비디오 파일에서 첫 번째 프레임 추출
-                try:
-                    from moviepy.editor import VideoFileClip
-                    from PIL import Image as PILImage
-
-                    # 비디오에서 첫 번째 프레임 추출
-                    video_clip = VideoFileClip(image_save_path)
-                    frame = video_clip.get_frame(0)  # 첫 번째 프레임 (t=0)
-                    video_clip.close()
-
-                    # 프레임을 이미지로 저장
-                    frame_image = PILImage.fromarray(frame)
-
-                    # 비디오 파일명을 이미지 파일명으로 변경
-                    frame_filename = f"preview_{int(time.time())}_frame.png"
-                    frame_save_path = os.path.join(uploads_folder, frame_filename)
-                    frame_image.save(frame_save_path, "PNG")
-
-                    # 원본 비디오 파일 삭제
-                    os.unlink(image_save_path)
-                    preview_image_path = frame_save_path
-
-                    logger.info(f"비디오에서 프레임 추출 완료: {frame_filename}")
-
-                except Exception as e:
-                    logger.warning(f"비디오 프레임 추출 실패: {e}, 기본 이미지 사용")
-                    # 비디오 처리 실패 시 원본 파일 삭제하고 기본 이미지 사용
-                    try:
-                        os.unlink(image_save_path)
-                    except:
-                        pass
-                    preview_image_path = None
-            else:
-                # 이미지 파일은 그대로 사용
-                preview_image_path = image_save_path
+            media_bytes = await image_1.read()
+            media_filename = image_1.filename
         else:
             # 테스트 이미지 사용
             import glob
@@ -760,142 +847,42 @@ async def preview_video(
                 test_images.extend(test_files)
 
             if test_images:
-                preview_image_path = test_images[0]
+                media_path = test_images[0]
 
-        if not preview_image_path or not os.path.exists(preview_image_path):
+        if media_bytes is None and (not media_path or not os.path.exists(media_path)):
             raise HTTPException(status_code=400, detail="미리보기용 이미지를 찾을 수 없습니다")
 
-        # PIL로 미리보기 이미지 합성
-        from PIL import Image as PILImage
-
-        # 포맷에 따른 해상도 사용
-        vw = video_generator.video_width
-        vh = video_generator.video_height
-        th = video_generator.title_height
-        wh_keep = video_generator.work_height_keep
-        wh_remove = video_generator.work_height_remove
-
-        # 배경 이미지
-        final_image = PILImage.new('RGB', (vw, vh), color=(0, 0, 0))
-
-        title_image_path = None
-
-        if title_area_mode == "keep":
-            # 기존 방식: 타이틀 영역 + 미디어 영역
-            title_image_path = video_generator.create_title_image(
+        # 공유 생성기 + 캐시 기반 합성 (CPU 작업은 스레드 풀에서 실행)
+        try:
+            png_bytes, cache_key, cache_hit = await run_in_threadpool(
+                preview_service.render,
                 title,
-                vw,
-                th,
-                title_font,
-                title_font_size
+                body1,
+                media_bytes=media_bytes,
+                media_filename=media_filename,
+                media_path=media_path,
+                text_position=text_position,
+                text_style=text_style,
+                title_area_mode=title_area_mode,
+                title_font=title_font,
+                body_font=body_font,
+                title_font_size=title_font_size,
+                body_font_size=body_font_size,
+                image_panning_options=image_panning_options,
+                video_format=video_format,
             )
+        except ValueError as media_error:
+            logger.warning(f"미리보기 미디어 처리 실패: {media_error}")
+            raise HTTPException(status_code=400, detail="미리보기용 이미지를 찾을 수 없습니다")
 
-            # 배경 이미지 처리 - 패닝 옵션 고려
-            if os.path.exists(preview_image_path):
-                bg_image = PILImage.open(preview_image_path)
-                work_area_height = wh_keep
-
-                # 패닝 옵션 파싱
-                enable_panning = True
-                if image_panning_options and image_panning_options != "{}":
-                    try:
-                        import json
-                        panning_dict = json.loads(image_panning_options)
-                        enable_panning = panning_dict.get("0", True)
-                        logger.info(f"🎨 미리보기 패닝 옵션: {enable_panning}")
-                    except Exception as e:
-                        logger.warning(f"⚠️ 패닝 옵션 파싱 실패, 기본값(True) 사용: {e}")
-
-                if enable_panning:
-                    bg_image = bg_image.resize((vw, work_area_height), PILImage.Resampling.LANCZOS)
-                    final_image.paste(bg_image, (0, th))
-                else:
-                    img_width, img_height = bg_image.size
-                    new_width = vw
-                    new_height = int(img_height * new_width / img_width)
-                    bg_image = bg_image.resize((new_width, new_height), PILImage.Resampling.LANCZOS)
-                    final_image.paste(bg_image, (0, th))
-                    logger.info(f"📐 패닝 OFF 미리보기 (keep): {img_width}x{img_height} → {new_width}x{new_height}, Y={th}")
-
-            # 타이틀 이미지 합성 (상단)
-            if os.path.exists(title_image_path):
-                title_img = PILImage.open(title_image_path)
-                final_image.paste(title_img, (0, 0))
-        else:
-            # remove 모드: 전체 화면 미디어
-            if os.path.exists(preview_image_path):
-                bg_image = PILImage.open(preview_image_path)
-                work_area_height = wh_remove
-
-                if video_format == 'youtube':
-                    # YouTube: letterbox fit (종횡비 유지 + 검은 여백)
-                    orig_w, orig_h = bg_image.size
-                    scale = min(vw / orig_w, work_area_height / orig_h)
-                    new_w = int(orig_w * scale)
-                    new_h = int(orig_h * scale)
-                    bg_image = bg_image.resize((new_w, new_h), PILImage.Resampling.LANCZOS)
-                    x_off = (vw - new_w) // 2
-                    y_off = (work_area_height - new_h) // 2
-                    final_image.paste(bg_image, (x_off, y_off))
-                    logger.info(f"📐 YouTube letterbox 미리보기: {orig_w}x{orig_h} → {new_w}x{new_h}, 오프셋=({x_off},{y_off})")
-                else:
-                    # 패닝 옵션 파싱
-                    enable_panning = True
-                    if image_panning_options and image_panning_options != "{}":
-                        try:
-                            import json
-                            panning_dict = json.loads(image_panning_options)
-                            enable_panning = panning_dict.get("0", True)
-                            logger.info(f"🎨 미리보기 패닝 옵션 (remove): {enable_panning}")
-                        except Exception as e:
-                            logger.warning(f"⚠️ 패닝 옵션 파싱 실패 (remove): {e}")
-
-                    if enable_panning:
-                        bg_image = bg_image.resize((vw, work_area_height), PILImage.Resampling.LANCZOS)
-                        final_image.paste(bg_image, (0, 0))
-                    else:
-                        img_width, img_height = bg_image.size
-                        new_width = vw
-                        new_height = int(img_height * new_width / img_width)
-                        bg_image = bg_image.resize((new_width, new_height), PILImage.Resampling.LANCZOS)
-                        final_image.paste(bg_image, (0, 0))
-                        logger.info(f"📐 패닝 OFF 미리보기 (remove): {img_width}x{img_height} → {new_width}x{new_height}, Y=0")
-
-        # 본문 텍스트 이미지 생성 - 모든 모드 공통
-        body_text_image_path = video_generator.create_text_image(
-            body1,
-            vw,
-            vh,
-            text_position,
-            text_style,
-            is_title=False,
-            title_font=title_font,
-            body_font=body_font,
-            title_area_mode=title_area_mode,
-            title_font_size=title_font_size,
-            body_font_size=body_font_size
-        )
-
-        # 본문 텍스트 이미지 합성 (오버레이)
-        if os.path.exists(body_text_image_path):
-            body_img = PILImage.open(body_text_image_path).convert('RGBA')
-            final_image.paste(body_img, (0, 0), body_img)
-
-        # 미리보기 이미지 저장
-        import time
-        preview_filename = f"preview_{int(time.time())}.png"
+        # 미리보기 이미지 저장 (같은 입력이면 같은 파일명 → 이미 있으면 기록 생략)
+        preview_filename = f"preview_{cache_key[:16]}.png"
         preview_save_path = os.path.join(uploads_folder, preview_filename)
-        final_image.save(preview_save_path, "PNG")
-
-        # 임시 파일 정리
-        for temp_file in [title_image_path, body_text_image_path]:
-            if temp_file and os.path.exists(temp_file):
-                try:
-                    os.unlink(temp_file)
-                except:
-                    pass
+        if not os.path.exists(preview_save_path):
+            with open(preview_save_path, "wb") as f:
+                f.write(png_bytes)
 
-        logger.info(f"미리보기 생성 완료: {preview_filename}")
+        logger.info(f"미리보기 생성 완료: {preview_filename} (캐시 {'적중' if cache_hit else '미스'})")
 
         # Job ID에 따라 URL 경로 설정
         if job_id and FOLDER_MANAGER_AVAILABLE:
@@ -0,0 +1,290 @@
+"""
+작업별 임시 작업 공간 (scratch)
+TTS 음성, 리사이즈 이미지, 텍스트 PNG, 회전 정규화 MP4 등 렌더 중간 파일을 작업 전용 폴더에 모아
+작업 종료(성공/실패) 시 한 번에 삭제하고, 워커 재시작 시 남은 폴더를 정리한다.
+SCRATCH_USE_TMPFS=true이면 /dev/shm(tmpfs)에 만들고, 용량 예산을 넘으면 디스크로 넘긴다.
+"""
+
+import os
+import re
+import time
+import uuid
+import shutil
+import tempfile
+import threading
+import contextvars
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.logger_config import get_logger
+
+logger = get_logger('scratch_space')
+
+SCRATCH_ROOT = os.getenv('SCRATCH_ROOT', os.path.join(tempfile.gettempdir(), 'reels_scratch'))
+SCRATCH_USE_TMPFS = os.getenv('SCRATCH_USE_TMPFS', 'false').lower() == 'true'
+SCRATCH_TMPFS_ROOT = os.getenv('SCRATCH_TMPFS_ROOT', '/dev/shm/reels_scratch')
+SCRATCH_TMPFS_BUDGET_MB = int(os.getenv('SCRATCH_TMPFS_BUDGET_MB', '512'))  # 작업 1건당 tmpfs 사용 한도
+SCRATCH_STALE_HOURS = int(os.getenv('SCRATCH_STALE_HOURS', '24'))
+SCRATCH_RESTAT_SECONDS = float(os.getenv('SCRATCH_RESTAT_SECONDS', '1.0'))  # tmpfs 사용량 재측정 최소 간격
+
+# 현재 작업의 작업 공간 (렌더 스레드 풀에는 contextvars.copy_context로 전파)
+_active_workspace = contextvars.ContextVar('scratch_workspace', default=None)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _path_bytes(path: str) -> int:
+    if os.path.isdir(path):
+        total = 0
+        for root, _, files in os.walk(path):
+            for name in files:
+                try:
+                    total += os.path.getsize(os.path.join(root, name))
+                except OSError:
+                    pass
+        return total
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def _remove_path(path: str):
+    if os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+        return
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+class ScratchWorkspace:
+    """작업 1건의 임시 파일 폴더 - 단계(stage)별 기록 바이트와 미정리(leak) 파일 집계
+
+    바이트 합계는 단계별/위치별 누계로 유지하고(등록·해제 시 갱신),
+    파일 크기는 tmpfs 초과 여부를 판단할 때(최소 SCRATCH_RESTAT_SECONDS 간격)와 종료 집계 때만 다시 측정한다.
+    """
+
+    def __init__(self, label: str = 'job'):
+        safe_label = re.sub(r'[^0-9A-Za-z_-]', '', label)[:40] or 'job'
+        self.name = f"{os.getpid()}_{safe_label}_{uuid.uuid4().hex[:8]}"
+        self.lock = threading.Lock()
+        self.entries: List[Tuple[str, str]] = []      # (stage, 경로)
+        self.stage_of: Dict[str, str] = {}             # 경로 -> stage
+        self.observed_bytes: Dict[str, int] = {}       # 경로별 관측된 최대 크기
+        self.current_bytes: Dict[str, int] = {}        # 미해제 경로별 마지막 측정 크기
+        self.live: Dict[str, str] = {}                 # 미해제 경로 -> 위치('tmpfs'/'disk')
+        self.bytes_by_stage: Dict[str, int] = {}       # 단계별 기록 바이트 누계 (관측 최대 크기 합)
+        self.live_bytes: Dict[str, int] = {'tmpfs': 0, 'disk': 0}  # 위치별 미해제 바이트 누계
+        self.last_restat = 0.0
+        self.spilled = 0
+        self.tmpfs_dir = None
+        self.disk_dir = os.path.join(SCRATCH_ROOT, self.name)
+
+        if SCRATCH_USE_TMPFS and os.path.isdir(os.path.dirname(SCRATCH_TMPFS_ROOT.rstrip('/')) or '/'):
+            self.tmpfs_dir = os.path.join(SCRATCH_TMPFS_ROOT, self.name)
+            os.makedirs(self.tmpfs_dir, exist_ok=True)
+        else:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+    # ---------- 파일 할당 ----------
+
+    def _target_dir(self) -> str:
+        """tmpfs 예산 안이면 tmpfs, 넘으면 디스크 폴더"""
+        if self.tmpfs_dir:
+            with self.lock:
+                if time.monotonic() - self.last_restat >= SCRATCH_RESTAT_SECONDS:
+                    self._restat_locked('tmpfs')
+                within_budget = self.live_bytes['tmpfs'] < SCRATCH_TMPFS_BUDGET_MB * 1024 * 1024
+            if within_budget:
+                return self.tmpfs_dir
+            if not self.spilled:
+                logger.info(f"💽 tmpfs 예산 초과 ({SCRATCH_TMPFS_BUDGET_MB}MB) - 디스크로 전환: {self.name}")
+            self.spilled += 1
+        os.makedirs(self.disk_dir, exist_ok=True)
+        return self.disk_dir
+
+    def _register(self, stage: str, path: str):
+        location = 'tmpfs' if self.tmpfs_dir and path.startswith(self.tmpfs_dir + os.sep) else 'disk'
+        with self.lock:
+            self.entries.append((stage, path))
+            self.stage_of[path] = stage
+            self.live[path] = location
+            self._observe_locked(path, _path_bytes(path))
+
+    def file(self, suffix: str = '', stage: str = 'misc'):
+        """NamedTemporaryFile(delete=False) 대체 - 작업 폴더에 생성 (호출자가 close 후 .name 사용)"""
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=suffix, prefix=f"{stage}_", dir=self._target_dir())
+        self._register(stage, temp_file.name)
+        return temp_file
+
+    def path(self, suffix: str = '', stage: str = 'misc') -> str:
+        """작업 폴더 안의 새 파일 경로 (파일은 만들지 않음 - 외부 프로그램 출력용)"""
+        path = os.path.join(self._target_dir(), f"{stage}_{uuid.uuid4().hex[:8]}{suffix}")
+        self._register(stage, path)
+        return path
+
+    def subdir(self, stage: str = 'misc') -> str:
+        """작업 폴더 안의 하위 폴더 (세그먼트 중간 파일 등)"""
+        path = tempfile.mkdtemp(prefix=f"{stage}_", dir=self._target_dir())
+        self._register(stage, path)
+        return path
+
+    def release(self, path: str):
+        """작업 공간 파일/폴더 삭제 - 삭제 직전 크기를 기록하고 위치별 누계에서 제외"""
+        with self.lock:
+            if path in self.live:
+                self._observe_locked(path, _path_bytes(path))
+                self._forget_locked(path)
+        _remove_path(path)
+
+    # ---------- 집계 ----------
+
+    def _observe_locked(self, path: str, size: int):
+        """측정한 크기로 단계별/위치별 누계 갱신"""
+        growth = size - self.observed_bytes.get(path, 0)
+        if growth > 0:
+            self.observed_bytes[path] = size
+            stage = self.stage_of[path]
+            self.bytes_by_stage[stage] = self.bytes_by_stage.get(stage, 0) + growth
+        location = self.live.get(path)
+        if location:
+            self.live_bytes[location] += size - self.current_bytes.get(path, 0)
+            self.current_bytes[path] = size
+
+    def _forget_locked(self, path: str):
+        location = self.live.pop(path)
+        self.live_bytes[location] -= self.current_bytes.pop(path, 0)
+
+    def _restat_locked(self, location: Optional[str] = None):
+        """미해제 경로 크기 재측정 (호출자가 직접 지운 경로는 해제로 처리)"""
+        for path, path_location in list(self.live.items()):
+            if location and path_location != location:
+                continue
+            if os.path.exists(path):
+                self._observe_locked(path, _path_bytes(path))
+            else:
+                self._forget_locked(path)
+        self.last_restat = time.monotonic()
+
+    def summary(self) -> Dict[str, Any]:
+        """단계별 기록 바이트 + 현재 남아 있는(정리되지 않은) 파일"""
+        with self.lock:
+            self._restat_locked()
+            bytes_by_stage = dict(self.bytes_by_stage)
+            files_by_stage: Dict[str, int] = {}
+            for stage, _ in self.entries:
+                files_by_stage[stage] = files_by_stage.get(stage, 0) + 1
+            remaining_files = len(self.live)
+            remaining_bytes = sum(self.live_bytes.values())
+
+        return {
+            'location': 'tmpfs' if self.tmpfs_dir else 'disk',
+            'spilled_to_disk': self.spilled,
+            'bytes_by_stage': bytes_by_stage,
+            'files_by_stage': files_by_stage,
+            'total_bytes': sum(bytes_by_stage.values()),
+            'unreleased_files': remaining_files,
+            'unreleased_bytes': remaining_bytes,
+        }
+
+    # ---------- 수명 ----------
+
+    def close(self) -> Dict[str, Any]:
+        """작업 폴더 삭제 (삭제 전 집계 반환)"""
+        summary = self.summary()
+        for directory in (self.tmpfs_dir, self.disk_dir):
+            if directory:
+                shutil.rmtree(directory, ignore_errors=True)
+        if summary['unreleased_files']:
+            logger.info(f"🧹 작업 공간 정리: {self.name} - 남은 파일 {summary['unreleased_files']}개 "
+                        f"({summary['unreleased_bytes'] / 1024 / 1024:.1f}MB) 삭제")
+        return summary
+
+    def activate(self):
+        return _active_workspace.set(self)
+
+    def deactivate(self, token):
+        _active_workspace.reset(token)
+
+    def __enter__(self):
+        self._token = self.activate()
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            self.close()
+        finally:
+            self.deactivate(self._token)
+
+
+def get_active_workspace() -> Optional[ScratchWorkspace]:
+    return _active_workspace.get()
+
+
+def scratch_file(suffix: str = '', stage: str = 'misc'):
+    """활성 작업 공간에 임시 파일 생성 (작업 공간이 없으면 기존처럼 시스템 임시 폴더 사용)"""
+    workspace = _active_workspace.get()
+    if workspace is None:
+        return tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
+    return workspace.file(suffix, stage)
+
+
+def scratch_path(suffix: str = '', stage: str = 'misc') -> str:
+    """활성 작업 공간의 새 파일 경로 (작업 공간이 없으면 시스템 임시 폴더)"""
+    workspace = _active_workspace.get()
+    if workspace is None:
+        return os.path.join(tempfile.gettempdir(), f"{stage}_{uuid.uuid4().hex[:8]}{suffix}")
+    return workspace.path(suffix, stage)
+
+
+def scratch_dir(stage: str = 'misc') -> str:
+    """활성 작업 공간의 하위 폴더 (작업 공간이 없으면 시스템 임시 폴더)"""
+    workspace = _active_workspace.get()
+    if workspace is None:
+        return tempfile.mkdtemp(prefix=f"{stage}_")
+    return workspace.subdir(stage)
+
+
+def release_scratch(path: str):
+    """작업 공간 파일/폴더 삭제 (작업 공간이 없거나 등록되지 않은 경로는 그대로 삭제만)"""
+    workspace = _active_workspace.get()
+    if workspace is not None:
+        workspace.release(path)
+    else:
+        _remove_path(path)
+
+
+def cleanup_stale_workspaces(max_age_hours: int = SCRATCH_STALE_HOURS) -> int:
+    """종료된 프로세스가 남긴 작업 공간 삭제 (워커 재시작/정기 정리 시 호출)
+
+    폴더 이름의 PID가 살아 있지 않거나, max_age_hours보다 오래된 폴더를 삭제한다.
+    """
+    removed = 0
+    cutoff = time.time() - max_age_hours * 3600
+    for root in {SCRATCH_ROOT, SCRATCH_TMPFS_ROOT}:
+        if not os.path.isdir(root):
+            continue
+        for name in os.listdir(root):
+            path = os.path.join(root, name)
+            pid_text = name.split('_', 1)[0]
+            try:
+                owner_alive = pid_text.isdigit() and _pid_alive(int(pid_text))
+                expired = os.path.getmtime(path) < cutoff
+            except OSError:
+                continue
+            if not owner_alive or expired:
+                shutil.rmtree(path, ignore_errors=True)
+                removed += 1
+
+    if removed:
+        logger.info(f"🗑️ 남은 작업 공간 정리: {removed}개")
+    return removed
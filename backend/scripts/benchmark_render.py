@@ -0,0 +1,560 @@
+#!/usr/bin/env python3
+"""
+렌더 성능 벤치마크 - 합성(synthetic) 작업으로 렌더 경로별 성능 측정 (네트워크 불필요)
+
+이미지/대사 개수, 회전 메타데이터가 있는 비디오, reels/YouTube 포맷, 패닝, 크로스 디졸브,
+TTS(스텁/캐시)를 조합한 시나리오를 고정 시드로 생성해 렌더하고
+벽시계 시간, 초당 프레임, CPU 시간, 최대 RSS, 임시 파일 쓰기량을 JSON으로 기록한다.
+시나리오마다 별도 프로세스에서 실행하므로 최대 RSS/CPU 시간이 서로 섞이지 않는다.
+
+사용법 (backend 폴더에서):
+    python scripts/benchmark_render.py                                  # 전체 시나리오
+    python scripts/benchmark_render.py --scenarios reels_basic youtube_basic --repeat 3
+    python scripts/benchmark_render.py --output bench_HEAD.json --compare bench_baseline.json
+    python scripts/benchmark_render.py --list
+    python scripts/benchmark_render.py --engines moviepy <엔진> --verify --golden-dir golden/
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+import threading
+from datetime import datetime
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    RESOURCE_AVAILABLE = False
+
+BENCHMARK_VERSION = 1
+DEFAULT_SEED = 20240601
+
+# 시나리오 정의 - 이름과 값이 바뀌면 커밋 간 비교가 불가능하므로 새 이름으로 추가할 것
+SCENARIOS = {
+    'reels_basic': {
+        'images': 3, 'videos': 0, 'bodies': 4, 'video_format': 'reels',
+        'image_allocation_mode': '2_per_image', 'panning': True, 'cross_dissolve': 'enabled', 'tts': 'stub',
+    },
+    'reels_many_bodies': {
+        'images': 2, 'videos': 0, 'bodies': 8, 'video_format': 'reels',
+        'image_allocation_mode': '2_per_image', 'panning': True, 'cross_dissolve': 'enabled', 'tts': 'stub',
+    },
+    'reels_1_per_image': {
+        'images': 6, 'videos': 0, 'bodies': 6, 'video_format': 'reels',
+        'image_allocation_mode': '1_per_image', 'panning': True, 'cross_dissolve': 'enabled', 'tts': 'stub',
+    },
+    'reels_single_for_all': {
+        'images': 1, 'videos': 0, 'bodies': 4, 'video_format': 'reels',
+        'image_allocation_mode': 'single_for_all', 'panning': True, 'cross_dissolve': 'disabled', 'tts': 'stub',
+    },
+    'reels_static': {
+        'images': 3, 'videos': 0, 'bodies': 4, 'video_format': 'reels',
+        'image_allocation_mode': '2_per_image', 'panning': False, 'cross_dissolve': 'disabled', 'tts': 'stub',
+    },
+    'reels_rotated_video': {
+        'images': 1, 'videos': 2, 'bodies': 6, 'video_format': 'reels',
+        'image_allocation_mode': '2_per_image', 'panning': True, 'cross_dissolve': 'enabled', 'tts': 'stub',
+        'video_rotation': 90,
+    },
+    'reels_tts_cached': {
+        'images': 3, 'videos': 0, 'bodies': 4, 'video_format': 'reels',
+        'image_allocation_mode': '2_per_image', 'panning': True, 'cross_dissolve': 'enabled', 'tts': 'cached',
+    },
+    'youtube_basic': {
+        'images': 3, 'videos': 0, 'bodies': 4, 'video_format': 'youtube',
+        'image_allocation_mode': '2_per_image', 'panning': False, 'cross_dissolve': 'enabled', 'tts': 'stub',
+    },
+    'youtube_video': {
+        'images': 1, 'videos': 1, 'bodies': 4, 'video_format': 'youtube',
+        'image_allocation_mode': '2_per_image', 'panning': False, 'cross_dissolve': 'enabled', 'tts': 'stub',
+        'video_rotation': 90,
+    },
+}
+
+SAMPLE_LINES = [
+    "오늘은 정말 특별한 하루였어요",
+    "작은 카페에서 시작된 이야기",
+    "창밖으로 보이는 풍경이 아름다워요",
+    "우리가 함께한 시간은 소중해요",
+    "내일도 좋은 일이 가득하길 바라요",
+    "마지막까지 함께해 주셔서 감사합니다",
+    "새로운 계절이 다가오고 있어요",
+    "천천히 걸으며 생각을 정리해요",
+]
+
+
+# ==================== 합성 입력 생성 ====================
+
+def _run_ffmpeg(args):
+    subprocess.run(['ffmpeg', '-hide_banner', '-loglevel', 'error', '-y'] + args, check=True)
+
+
+def synth_tone(path, duration, frequency=440):
+    """스텁 TTS/BGM용 사인파 mp3 생성"""
+    _run_ffmpeg(['-f', 'lavfi', '-i', f'sine=frequency={frequency}:duration={duration:.2f}',
+                 '-ac', '1', '-ar', '24000', '-c:a', 'libmp3lame', '-b:a', '64k', path])
+    return path
+
+
+def stub_tts_duration(text):
+    """대사 길이에 비례한 고정 TTS 길이 (시나리오 간 비교 가능하도록 결정적)"""
+    return round(min(6.0, max(1.5, 0.9 + 0.12 * len(text))), 2)
+
+
+def synth_image(path, index, rng, size=(1080, 1350)):
+    """그라데이션 + 도형으로 된 테스트 이미지 생성 (시드 고정)"""
+    from PIL import Image, ImageDraw
+
+    width, height = size
+    base = Image.new('RGB', size)
+    draw = ImageDraw.Draw(base)
+    top = tuple(rng.randint(30, 220) for _ in range(3))
+    bottom = tuple(rng.randint(30, 220) for _ in range(3))
+    for y in range(height):
+        ratio = y / height
+        draw.line([(0, y), (width, y)], fill=tuple(int(top[c] + (bottom[c] - top[c]) * ratio) for c in range(3)))
+    for _ in range(12):
+        x0, y0 = rng.randint(0, width - 100), rng.randint(0, height - 100)
+        x1, y1 = x0 + rng.randint(60, 400), y0 + rng.randint(60, 400)
+        draw.ellipse([x0, y0, x1, y1], fill=tuple(rng.randint(0, 255) for _ in range(3)))
+    draw.text((40, 40), f"bench image {index + 1}", fill=(255, 255, 255))
+    base.save(path, 'JPEG', quality=90)
+    return path
+
+
+def synth_video(path, duration, rotation=0, size=(640, 360)):
+    """testsrc2 패턴 비디오 생성 (rotation이 있으면 회전 메타데이터 기록)"""
+    args = ['-f', 'lavfi', '-i', f'testsrc2=size={size[0]}x{size[1]}:rate=30:duration={duration:.2f}',
+            '-f', 'lavfi', '-i', f'sine=frequency=220:duration={duration:.2f}',
+            '-c:v', 'libx264', '-preset', 'ultrafast', '-pix_fmt', 'yuv420p', '-c:a', 'aac', '-shortest']
+    if not rotation:
+        _run_ffmpeg(args + [path])
+        return path
+
+    # ffmpeg 버전에 따라 회전 메타데이터 기록 방식이 다름 (신규: -display_rotation, 구버전: rotate 태그)
+    plain_path = path + '.plain.mp4'
+    _run_ffmpeg(args + [plain_path])
+    try:
+        _run_ffmpeg(['-display_rotation', str(rotation), '-i', plain_path, '-c', 'copy', path])
+    except subprocess.CalledProcessError:
+        _run_ffmpeg(['-i', plain_path, '-c', 'copy', '-metadata:s:v:0', f'rotate={rotation}', path])
+    os.remove(plain_path)
+    return path
+
+
+def build_job(name, scenario, fixture_dir, seed=DEFAULT_SEED):
+    """시나리오의 합성 작업 입력 생성 (같은 시드/시나리오면 항상 같은 입력)
+
+    Returns:
+        dict: content, media_files, music_path, 렌더 옵션
+    """
+    job_dir = os.path.join(fixture_dir, name)
+    os.makedirs(job_dir, exist_ok=True)
+
+    content = {'title': f"벤치마크 {name}"}
+    for i in range(scenario['bodies']):
+        content[f'body{i + 1}'] = SAMPLE_LINES[i % len(SAMPLE_LINES)]
+
+    # 비디오를 앞에 두어 세그먼트 배정 시 비디오 경로가 반드시 사용되도록 함
+    media_files = []
+    for i in range(scenario.get('videos', 0)):
+        path = os.path.join(job_dir, f"{i + 1}.mp4")
+        if not os.path.exists(path):
+            synth_video(path, duration=4.0, rotation=scenario.get('video_rotation', 0))
+        media_files.append((path, 'video'))
+    for i in range(scenario.get('images', 0)):
+        path = os.path.join(job_dir, f"{len(media_files) + 1}.jpg")
+        if not os.path.exists(path):
+            synth_image(path, i, random.Random(f"{seed}:{name}:{i}"))
+        media_files.append((path, 'image'))
+
+    music_path = os.path.join(fixture_dir, 'bgm.mp3')
+    if not os.path.exists(music_path):
+        synth_tone(music_path, duration=60.0, frequency=330)
+
+    return {
+        'name': name,
+        'scenario': dict(scenario),
+        'content': content,
+        'media_files': media_files,
+        'music_path': music_path,
+        'seed': seed,
+    }
+
+
+# ==================== 렌더 엔진 ====================
+
+def _make_generator(video_format):
+    """벤치마크 전용 생성기 (공유 인스턴스의 TTS 함수를 바꾸지 않도록 새로 생성)"""
+    if video_format == 'youtube':
+        from youtube_generator import YouTubeVideoGenerator
+        return YouTubeVideoGenerator()
+    from video_generator import VideoGenerator
+    return VideoGenerator()
+
+
+def _make_stub_tts(stub_dir):
+    """네트워크 없이 대사 길이에 비례한 톤을 반환하는 create_tts_audio 대체 함수"""
+    def stub_create_tts_audio(text, lang='ko'):
+        fd, path = tempfile.mkstemp(suffix='.mp3', dir=stub_dir)
+        os.close(fd)
+        return synth_tone(path, stub_tts_duration(text), frequency=440 + (len(text) % 7) * 40)
+    return stub_create_tts_audio
+
+
+def _prefill_tts_cache(generator, render_config, content, stub_tts):
+    """TTS 캐시를 미리 채워 렌더 시 실제 캐시 적중 경로(create_tts_audio)를 사용하게 함"""
+    from tts_cache import tts_cache
+
+    with generator.use_render_config(render_config):
+        for key, text in content.items():
+            if not key.startswith('body'):
+                continue
+            cache_key = generator.tts_cache_key(text)
+            if not tts_cache.contains(cache_key):
+                audio_path = stub_tts(text)
+                tts_cache.put(cache_key, audio_path)
+                os.remove(audio_path)
+
+
+def render_moviepy(job, output_folder, stub_dir):
+    """현재 MoviePy 렌더 경로 (create_video_with_local_images)로 작업 렌더
+
+    Returns:
+        str: 출력 영상 경로
+    """
+    scenario = job['scenario']
+    generator = _make_generator(scenario['video_format'])
+    render_config = generator.build_render_config(scenario['video_format'], tts_engine='edge')
+
+    stub_tts = _make_stub_tts(stub_dir)
+    if scenario.get('tts', 'stub') == 'cached':
+        _prefill_tts_cache(generator, render_config, job['content'], stub_tts)
+    else:
+        generator.create_tts_audio = stub_tts
+
+    media_files = job['media_files']
+    panning_options = {i: scenario.get('panning', True) for i in range(len(media_files))}
+    return generator.create_video_with_local_images(
+        dict(job['content']), job['music_path'], output_folder,
+        image_allocation_mode=scenario['image_allocation_mode'],
+        text_position='bottom',
+        text_style='outline',
+        title_area_mode='keep',
+        music_mood='bright',
+        media_files=list(media_files),
+        voice_narration='enabled',
+        cross_dissolve=scenario['cross_dissolve'],
+        image_panning_options=panning_options,
+        render_config=render_config,
+        local_images=[path for path, _ in media_files],
+    )
+
+
+# 렌더 경로 등록 - 대체 렌더 엔진은 여기에 추가해 같은 시나리오로 비교
+RENDER_ENGINES = {
+    'moviepy': render_moviepy,
+}
+
+
+# ==================== 측정 ====================
+
+def _dir_bytes(path, exclude=None):
+    total = 0
+    for root, dirs, files in os.walk(path):
+        if exclude:
+            dirs[:] = [d for d in dirs if os.path.join(root, d) != exclude]
+        for f in files:
+            try:
+                total += os.path.getsize(os.path.join(root, f))
+            except OSError:
+                pass
+    return total
+
+
+class TempBytesSampler:
+    """작업 디렉터리(임시 파일 위치)의 사용량을 주기적으로 샘플링해 최대값 기록"""
+
+    def __init__(self, path, exclude=None, interval=0.2):
+        self.path = path
+        self.exclude = exclude
+        self.interval = interval
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self.peak_bytes = max(self.peak_bytes, _dir_bytes(self.path, self.exclude))
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_bytes = max(self.peak_bytes, _dir_bytes(self.path, self.exclude))
+
+
+def _read_proc_io():
+    """/proc/self/io의 write_bytes (Linux 외에는 None)"""
+    try:
+        with open('/proc/self/io') as f:
+            for line in f:
+                if line.startswith('write_bytes:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _cpu_seconds():
+    if not RESOURCE_AVAILABLE:
+        return time.process_time()
+    usage_self = resource.getrusage(resource.RUSAGE_SELF)
+    usage_children = resource.getrusage(resource.RUSAGE_CHILDREN)  # ffmpeg 서브프로세스 포함
+    return usage_self.ru_utime + usage_self.ru_stime + usage_children.ru_utime + usage_children.ru_stime
+
+
+def probe_video(path):
+    """ffprobe로 출력 영상 길이/프레임 수/해상도 조회"""
+    result = subprocess.run(
+        ['ffprobe', '-v', 'error', '-select_streams', 'v:0', '-count_packets',
+         '-show_entries', 'stream=width,height,nb_read_packets:format=duration', '-of', 'json', path],
+        capture_output=True, text=True, check=True
+    )
+    info = json.loads(result.stdout)
+    stream = info['streams'][0]
+    return {
+        'duration': float(info['format']['duration']),
+        'frames': int(stream.get('nb_read_packets', 0)),
+        'width': stream['width'],
+        'height': stream['height'],
+    }
+
+
+def run_single(name, workdir, engine='moviepy', seed=DEFAULT_SEED):
+    """시나리오 1회 렌더 + 측정 (자식 프로세스에서 호출)"""
+    scenario = SCENARIOS[name]
+    job = build_job(name, scenario, os.path.join(workdir, 'fixtures'), seed)
+
+    run_dir = tempfile.mkdtemp(prefix=f"{name}_", dir=workdir)
+    output_folder = os.path.join(run_dir, 'output')
+    scratch_dir = os.path.join(run_dir, 'scratch')
+    os.makedirs(output_folder)
+    os.makedirs(scratch_dir)
+
+    # 생성기의 임시 파일(tempfile, temp-audio.m4a 등)이 모두 scratch_dir에 쓰이도록 함
+    tempfile.tempdir = scratch_dir
+    os.environ['TMPDIR'] = scratch_dir
+    os.environ['TTS_CACHE_DIR'] = os.path.join(run_dir, 'tts_cache')  # 서비스 TTS 캐시와 분리
+    os.environ['SEGMENT_CACHE_DIR'] = os.path.join(run_dir, 'segment_cache')  # 이전 실행의 세그먼트 재사용 방지
+    os.chdir(scratch_dir)
+
+    from utils.stage_timer import StageTimer
+    timer = StageTimer(f"bench-{name}")
+
+    io_before = _read_proc_io()
+    cpu_before = _cpu_seconds()
+    wall_start = time.perf_counter()
+    with TempBytesSampler(run_dir, exclude=output_folder) as sampler, timer.activate():
+        output_path = RENDER_ENGINES[engine](job, output_folder, scratch_dir)
+    wall_seconds = time.perf_counter() - wall_start
+    cpu_seconds = _cpu_seconds() - cpu_before
+    io_after = _read_proc_io()
+
+    video = probe_video(output_path)
+    stage_timings = timer.summary()
+    return {
+        'scenario': name,
+        'engine': engine,
+        'wall_seconds': round(wall_seconds, 3),
+        'cpu_seconds': round(cpu_seconds, 3),
+        'frames': video['frames'],
+        'output_duration': round(video['duration'], 3),
+        'output_size': [video['width'], video['height']],
+        'fps': round(video['frames'] / wall_seconds, 2) if wall_seconds > 0 else None,
+        'peak_rss_mb': stage_timings['peak_rss_mb'],
+        'temp_peak_bytes': sampler.peak_bytes,
+        'io_write_bytes': (io_after - io_before) if io_before is not None and io_after is not None else None,
+        'output_bytes': os.path.getsize(output_path),
+        'output_path': output_path,
+        'stages': {stage: info['total_ms'] for stage, info in stage_timings['stages'].items()},
+    }
+
+
+def run_in_subprocess(name, workdir, engine, seed, verbose=False):
+    """시나리오를 별도 프로세스에서 실행 (최대 RSS/CPU 시간 분리)"""
+    result_path = os.path.join(workdir, f"result_{name}_{engine}_{time.time_ns()}.json")
+    cmd = [sys.executable, os.path.abspath(__file__), '--child', name,
+           '--workdir', workdir, '--engine', engine, '--seed', str(seed), '--result-file', result_path]
+    completed = subprocess.run(cmd, cwd=BACKEND_DIR,
+                               stdout=None if verbose else subprocess.DEVNULL,
+                               stderr=None if verbose else subprocess.PIPE, text=True)
+    if completed.returncode != 0 or not os.path.exists(result_path):
+        error_tail = (completed.stderr or '').strip().splitlines()[-5:]
+        return {'scenario': name, 'engine': engine, 'error': '\n'.join(error_tail) or f"exit {completed.returncode}"}
+    with open(result_path) as f:
+        return json.load(f)
+
+
+def collect_environment():
+    """커밋 간 비교용 실행 환경 정보"""
+    def _command_output(cmd):
+        try:
+            return subprocess.run(cmd, capture_output=True, text=True, cwd=BACKEND_DIR).stdout.strip()
+        except OSError:
+            return None
+
+    ffmpeg_version = _command_output(['ffmpeg', '-version'])
+    return {
+        'benchmark_version': BENCHMARK_VERSION,
+        'timestamp': datetime.now().isoformat(),
+        'git_commit': _command_output(['git', 'rev-parse', 'HEAD']),
+        'git_dirty': bool(_command_output(['git', 'status', '--porcelain', '--untracked-files=no'])),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'ffmpeg': ffmpeg_version.splitlines()[0] if ffmpeg_version else None,
+        'render_workers': {key: os.getenv(key) for key in
+                           ('RENDER_TTS_WORKERS', 'RENDER_PREP_WORKERS', 'RENDER_SEGMENT_WORKERS')},
+    }
+
+
+def summarize_runs(runs):
+    """반복 실행 결과의 중앙값"""
+    ok_runs = [run for run in runs if 'error' not in run]
+    if not ok_runs:
+        return None
+    metrics = ['wall_seconds', 'cpu_seconds', 'fps', 'peak_rss_mb', 'temp_peak_bytes', 'io_write_bytes', 'output_bytes']
+    summary = {}
+    for metric in metrics:
+        values = [run[metric] for run in ok_runs if run.get(metric) is not None]
+        summary[metric] = statistics.median(values) if values else None
+    summary['frames'] = ok_runs[0]['frames']
+    return summary
+
+
+def print_comparison(results, baseline_path):
+    """기준 JSON과 중앙값 비교 출력"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    if baseline.get('environment', {}).get('benchmark_version') != BENCHMARK_VERSION:
+        print("⚠️ 벤치마크 버전이 달라 비교 결과가 정확하지 않을 수 있습니다")
+
+    baseline_by_key = {(r['scenario'], r['engine']): r for r in baseline.get('results', [])}
+    print(f"\n📊 기준 비교: {baseline_path} ({baseline.get('environment', {}).get('git_commit', '?')[:10]})")
+    print(f"{'시나리오':<24}{'엔진':<10}{'기준(s)':>10}{'현재(s)':>10}{'배율':>8}{'RSS(MB)':>16}")
+    for result in results:
+        base = baseline_by_key.get((result['scenario'], result['engine']))
+        if not base or not base.get('median') or not result.get('median'):
+            print(f"{result['scenario']:<24}{result['engine']:<10}{'-':>10}")
+            continue
+        old, new = base['median']['wall_seconds'], result['median']['wall_seconds']
+        rss = f"{base['median']['peak_rss_mb']}→{result['median']['peak_rss_mb']}"
+        print(f"{result['scenario']:<24}{result['engine']:<10}{old:>10.2f}{new:>10.2f}{new / old:>7.2f}x{rss:>16}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="렌더 성능 벤치마크 (합성 작업)")
+    parser.add_argument('--scenarios', nargs='*', help="실행할 시나리오 (기본: 전체)")
+    parser.add_argument('--engines', nargs='*', default=['moviepy'], help="비교할 렌더 엔진")
+    parser.add_argument('--repeat', type=int, default=1, help="시나리오별 반복 횟수 (중앙값 기록)")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--workdir', help="입력/출력 작업 폴더 (기본: 임시 폴더)")
+    parser.add_argument('--output', help="결과 JSON 경로 (기본: 표준 출력)")
+    parser.add_argument('--compare', help="비교할 기준 결과 JSON")
+    parser.add_argument('--keep', action='store_true', help="렌더 결과물 보존")
+    parser.add_argument('--verbose', action='store_true', help="렌더 로그 출력")
+    parser.add_argument('--list', action='store_true', help="시나리오 목록 출력")
+    parser.add_argument('--verify', action='store_true',
+                        help="엔진 간 출력 동등성 검사 (render_equivalence, 첫 번째 엔진이 기준)")
+    parser.add_argument('--golden-dir', help="--verify 시 함께 비교할 golden 영상 폴더")
+    # 내부용: 자식 프로세스 실행
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    parser.add_argument('--engine', default='moviepy', help=argparse.SUPPRESS)
+    parser.add_argument('--result-file', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.list:
+        for name, scenario in SCENARIOS.items():
+            print(f"{name:<24}{json.dumps(scenario, ensure_ascii=False)}")
+        return 0
+
+    if args.child:
+        result = run_single(args.child, args.workdir, engine=args.engine, seed=args.seed)
+        with open(args.result_file, 'w') as f:
+            json.dump(result, f, ensure_ascii=False)
+        return 0
+
+    names = args.scenarios or list(SCENARIOS.keys())
+    unknown = [name for name in names if name not in SCENARIOS]
+    unknown_engines = [engine for engine in args.engines if engine not in RENDER_ENGINES]
+    if unknown or unknown_engines:
+        print(f"❌ 알 수 없는 시나리오/엔진: {unknown + unknown_engines}")
+        return 2
+
+    workdir = os.path.abspath(args.workdir) if args.workdir else tempfile.mkdtemp(prefix='reels_bench_')
+    os.makedirs(workdir, exist_ok=True)
+    print(f"🏁 렌더 벤치마크 시작: 시나리오 {len(names)}개 x 엔진 {len(args.engines)}개 x {args.repeat}회 (작업 폴더: {workdir})")
+
+    results = []
+    for name in names:
+        for engine in args.engines:
+            runs = []
+            for attempt in range(args.repeat):
+                run = run_in_subprocess(name, workdir, engine, args.seed, verbose=args.verbose)
+                runs.append(run)
+                if 'error' in run:
+                    print(f"  ❌ {name}/{engine} #{attempt + 1}: {run['error']}")
+                else:
+                    print(f"  ✅ {name}/{engine} #{attempt + 1}: {run['wall_seconds']:.2f}s, "
+                          f"{run['fps']} fps, CPU {run['cpu_seconds']:.1f}s, RSS {run['peak_rss_mb']}MB")
+            results.append({'scenario': name, 'engine': engine, 'params': SCENARIOS[name],
+                            'median': summarize_runs(runs), 'runs': runs})
+
+    report = {'environment': collect_environment(), 'seed': args.seed, 'results': results}
+
+    verification_passed = True
+    if args.verify:
+        from render_equivalence import verify_runs
+        print("\n🔍 출력 동등성 검사")
+        equivalence = verify_runs(results, 'equivalence_report', golden_dir=args.golden_dir)
+        report['equivalence'] = {
+            key: {k: v for k, v in item.items() if k in ('passed', 'failures', 'min_psnr', 'min_ssim', 'audio', 'boundaries')}
+            for key, item in equivalence.items()
+        }
+        verification_passed = all(item['passed'] for item in equivalence.values())
+    report_json = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(report_json)
+        print(f"💾 결과 저장: {args.output}")
+    else:
+        print(report_json)
+
+    if args.compare:
+        print_comparison(results, args.compare)
+
+    if not args.keep and not args.workdir:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return 0 if all(result['median'] for result in results) and verification_passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
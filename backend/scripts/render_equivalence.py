@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+렌더 결과 동등성 검사 (golden frame 비교)
+
+대체 렌더 경로(FFmpeg 엔진, 세그먼트 병렬화, 정지 프레임 고속 경로 등)의 출력이
+현재 MoviePy 출력과 같은지 확인한다.
+- 샘플 프레임 PSNR / SSIM
+- 오디오 RMS 포락선 (dB 차이, 상관계수)
+- 세그먼트 경계(장면 전환) 시각
+- 길이 / 해상도
+임계값을 넘으면 실패로 판정하고 JSON 리포트와 차이가 가장 큰 프레임 이미지를 남긴다.
+
+사용법 (backend 폴더에서):
+    # 두 영상 직접 비교
+    python scripts/render_equivalence.py compare ref.mp4 candidate.mp4 --report-dir eq_report
+
+    # 벤치마크 시나리오를 두 엔진으로 렌더해 비교
+    python scripts/render_equivalence.py render --scenarios reels_basic --engines moviepy <엔진>
+
+    # 현재 커밋 출력을 golden으로 저장 / 이후 커밋에서 golden과 비교
+    python scripts/render_equivalence.py golden-record --golden-dir golden/
+    python scripts/render_equivalence.py golden-check --golden-dir golden/
+
+벤치마크에서 실행: python scripts/benchmark_render.py --verify [--golden-dir golden/]
+"""
+
+import os
+import sys
+import json
+import shutil
+import argparse
+import subprocess
+import tempfile
+
+import numpy as np
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPTS_DIR)
+
+# 기본 임계값 - H.264 재인코딩 차이는 통과하고 레이아웃/타이밍 변화는 잡아내는 수준
+DEFAULT_THRESHOLDS = {
+    'min_psnr': 35.0,             # dB, 샘플 프레임 중 최소값 기준
+    'min_ssim': 0.97,             # 샘플 프레임 중 최소값 기준
+    'max_duration_diff': 0.1,     # 초
+    'max_envelope_db_diff': 3.0,  # 50ms 창 RMS 포락선 최대 차이 (무음 구간 제외)
+    'min_envelope_corr': 0.98,
+    'boundary_tolerance': 0.1,    # 초, 세그먼트 경계 허용 오차
+}
+
+SAMPLE_FRAMES = 12
+ENVELOPE_WINDOW = 0.05
+ENVELOPE_SAMPLE_RATE = 8000
+SCENE_THRESHOLD = 0.3
+SILENCE_DB = -50.0
+
+
+# ==================== 디코딩 ====================
+
+def probe(path):
+    """길이 / 해상도 / fps / 오디오 유무"""
+    result = subprocess.run(
+        ['ffprobe', '-v', 'error', '-show_entries',
+         'stream=codec_type,width,height,r_frame_rate:format=duration', '-of', 'json', path],
+        capture_output=True, text=True, check=True
+    )
+    info = json.loads(result.stdout)
+    video = next(s for s in info['streams'] if s['codec_type'] == 'video')
+    num, den = video['r_frame_rate'].split('/')
+    return {
+        'duration': float(info['format']['duration']),
+        'width': int(video['width']),
+        'height': int(video['height']),
+        'fps': float(num) / float(den or 1),
+        'has_audio': any(s['codec_type'] == 'audio' for s in info['streams']),
+    }
+
+
+def read_frames(path, frame_indices, width, height):
+    """지정한 프레임 번호들을 한 번의 디코딩으로 RGB 배열로 추출"""
+    select = '+'.join(f'eq(n\\,{index})' for index in frame_indices)
+    result = subprocess.run(
+        ['ffmpeg', '-v', 'error', '-i', path, '-vf', f"select='{select}'", '-vsync', '0',
+         '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-'],
+        capture_output=True, check=True
+    )
+    frame_size = width * height * 3
+    count = len(result.stdout) // frame_size
+    frames = np.frombuffer(result.stdout[:count * frame_size], dtype=np.uint8)
+    return frames.reshape(count, height, width, 3)
+
+
+def read_audio_envelope(path, window=ENVELOPE_WINDOW):
+    """모노 PCM으로 디코딩 후 창 단위 RMS(dBFS) 포락선 계산"""
+    result = subprocess.run(
+        ['ffmpeg', '-v', 'error', '-i', path, '-vn', '-ac', '1', '-ar', str(ENVELOPE_SAMPLE_RATE),
+         '-f', 's16le', '-'],
+        capture_output=True, check=True
+    )
+    samples = np.frombuffer(result.stdout, dtype=np.int16).astype(np.float64) / 32768.0
+    window_size = int(ENVELOPE_SAMPLE_RATE * window)
+    usable = len(samples) // window_size * window_size
+    if usable == 0:
+        return np.array([])
+    rms = np.sqrt(np.mean(samples[:usable].reshape(-1, window_size) ** 2, axis=1))
+    return 20 * np.log10(np.maximum(rms, 1e-6))
+
+
+def detect_boundaries(path, threshold=SCENE_THRESHOLD):
+    """ffmpeg scene 점수로 장면 전환(세그먼트 경계) 시각 검출"""
+    result = subprocess.run(
+        ['ffmpeg', '-v', 'info', '-i', path, '-an', '-vf', f"select='gt(scene,{threshold})',showinfo",
+         '-f', 'null', '-'],
+        capture_output=True, text=True
+    )
+    boundaries = []
+    for line in result.stderr.splitlines():
+        if 'showinfo' in line and 'pts_time:' in line:
+            boundaries.append(round(float(line.split('pts_time:')[1].split()[0]), 3))
+    return boundaries
+
+
+# ==================== 지표 ====================
+
+def psnr(reference, candidate):
+    mse = np.mean((reference.astype(np.float64) - candidate.astype(np.float64)) ** 2)
+    if mse == 0:
+        return float('inf')
+    return 10 * np.log10(255.0 ** 2 / mse)
+
+
+def _box_filter(image, size):
+    """적분 영상으로 size x size 평균 필터 (valid 영역)"""
+    integral = np.pad(image, ((1, 0), (1, 0))).cumsum(axis=0).cumsum(axis=1)
+    total = integral[size:, size:] - integral[:-size, size:] - integral[size:, :-size] + integral[:-size, :-size]
+    return total / (size * size)
+
+
+def ssim(reference, candidate, window=8):
+    """휘도 채널 SSIM (8x8 평균 창)"""
+    weights = np.array([0.299, 0.587, 0.114])
+    x = reference.astype(np.float64) @ weights
+    y = candidate.astype(np.float64) @ weights
+    c1, c2 = (0.01 * 255) ** 2, (0.03 * 255) ** 2
+
+    mu_x, mu_y = _box_filter(x, window), _box_filter(y, window)
+    var_x = _box_filter(x * x, window) - mu_x ** 2
+    var_y = _box_filter(y * y, window) - mu_y ** 2
+    cov_xy = _box_filter(x * y, window) - mu_x * mu_y
+
+    ssim_map = ((2 * mu_x * mu_y + c1) * (2 * cov_xy + c2)) / ((mu_x ** 2 + mu_y ** 2 + c1) * (var_x + var_y + c2))
+    return float(ssim_map.mean())
+
+
+def compare_envelopes(reference, candidate):
+    """포락선 비교 (무음 구간 제외 최대 dB 차이 + 상관계수)"""
+    length = min(len(reference), len(candidate))
+    if length == 0:
+        return {'windows': 0, 'max_db_diff': None, 'corr': None, 'length_diff_windows': abs(len(reference) - len(candidate))}
+    reference, candidate = reference[:length], candidate[:length]
+    audible = (reference > SILENCE_DB) | (candidate > SILENCE_DB)
+    diff = np.abs(reference - candidate)[audible]
+    if reference.std() > 0 and candidate.std() > 0:
+        corr = float(np.corrcoef(reference, candidate)[0, 1])
+    else:
+        corr = 1.0 if np.allclose(reference, candidate) else 0.0
+    return {
+        'windows': int(length),
+        'max_db_diff': round(float(diff.max()), 2) if diff.size else 0.0,
+        'worst_time': round(float(np.argmax(np.abs(reference - candidate) * audible) * ENVELOPE_WINDOW), 2),
+        'corr': round(corr, 4),
+        'length_diff_windows': abs(len(reference) - len(candidate)),
+    }
+
+
+def compare_boundaries(reference, candidate, tolerance):
+    """경계 목록 매칭 (허용 오차 내 최근접 매칭)"""
+    unmatched_candidate = list(candidate)
+    missing, offsets = [], []
+    for time_ref in reference:
+        nearest = min(unmatched_candidate, key=lambda t: abs(t - time_ref), default=None)
+        if nearest is not None and abs(nearest - time_ref) <= tolerance:
+            offsets.append(round(nearest - time_ref, 3))
+            unmatched_candidate.remove(nearest)
+        else:
+            missing.append(time_ref)
+    return {
+        'reference': reference,
+        'candidate': candidate,
+        'missing': missing,
+        'extra': unmatched_candidate,
+        'max_offset': max((abs(o) for o in offsets), default=0.0),
+    }
+
+
+# ==================== 비교 ====================
+
+def compare_videos(reference_path, candidate_path, thresholds=None, sample_count=SAMPLE_FRAMES, report_dir=None):
+    """두 영상 비교 후 리포트 반환 (report_dir이 있으면 JSON + 최악 프레임 이미지 저장)"""
+    thresholds = dict(DEFAULT_THRESHOLDS, **(thresholds or {}))
+    ref_info, cand_info = probe(reference_path), probe(candidate_path)
+    failures = []
+
+    report = {
+        'reference': reference_path,
+        'candidate': candidate_path,
+        'thresholds': thresholds,
+        'reference_info': ref_info,
+        'candidate_info': cand_info,
+    }
+
+    # 길이 / 해상도
+    duration_diff = abs(ref_info['duration'] - cand_info['duration'])
+    report['duration_diff'] = round(duration_diff, 3)
+    if duration_diff > thresholds['max_duration_diff']:
+        failures.append(f"길이 차이 {duration_diff:.3f}s > {thresholds['max_duration_diff']}s")
+    if (ref_info['width'], ref_info['height']) != (cand_info['width'], cand_info['height']):
+        failures.append(f"해상도 불일치 {ref_info['width']}x{ref_info['height']} vs {cand_info['width']}x{cand_info['height']}")
+
+    # 샘플 프레임 (양쪽 공통 구간에서 균등 간격, 첫/마지막 프레임 제외)
+    frame_report = []
+    if not any('해상도' in failure for failure in failures):
+        common_frames = int(min(ref_info['duration'], cand_info['duration']) * ref_info['fps'])
+        step = max(1, common_frames // (sample_count + 1))
+        indices = [step * (i + 1) for i in range(sample_count) if step * (i + 1) < common_frames - 1]
+        ref_frames = read_frames(reference_path, indices, ref_info['width'], ref_info['height'])
+        cand_frames = read_frames(candidate_path, indices, cand_info['width'], cand_info['height'])
+
+        for index, ref_frame, cand_frame in zip(indices, ref_frames, cand_frames):
+            frame_report.append({
+                'frame': index,
+                'time': round(index / ref_info['fps'], 3),
+                'psnr': round(psnr(ref_frame, cand_frame), 2),
+                'ssim': round(ssim(ref_frame, cand_frame), 4),
+            })
+
+        if frame_report:
+            worst = min(range(len(frame_report)), key=lambda i: frame_report[i]['ssim'])
+            min_psnr = min(item['psnr'] for item in frame_report)
+            min_ssim = frame_report[worst]['ssim']
+            report['min_psnr'], report['min_ssim'] = min_psnr, min_ssim
+            if min_psnr < thresholds['min_psnr']:
+                failures.append(f"PSNR {min_psnr}dB < {thresholds['min_psnr']}dB")
+            if min_ssim < thresholds['min_ssim']:
+                failures.append(f"SSIM {min_ssim} < {thresholds['min_ssim']}")
+            if report_dir:
+                report['worst_frame_image'] = save_diff_image(
+                    ref_frames[worst], cand_frames[worst], report_dir, frame_report[worst]['frame'])
+    report['frames'] = frame_report
+
+    # 오디오 포락선
+    if ref_info['has_audio'] != cand_info['has_audio']:
+        failures.append(f"오디오 트랙 유무 불일치 (기준={ref_info['has_audio']}, 후보={cand_info['has_audio']})")
+    elif ref_info['has_audio']:
+        audio = compare_envelopes(read_audio_envelope(reference_path), read_audio_envelope(candidate_path))
+        report['audio'] = audio
+        if audio['max_db_diff'] is not None and audio['max_db_diff'] > thresholds['max_envelope_db_diff']:
+            failures.append(f"오디오 포락선 차이 {audio['max_db_diff']}dB (t={audio['worst_time']}s)")
+        if audio['corr'] is not None and audio['corr'] < thresholds['min_envelope_corr']:
+            failures.append(f"오디오 포락선 상관계수 {audio['corr']} < {thresholds['min_envelope_corr']}")
+
+    # 세그먼트 경계
+    boundaries = compare_boundaries(detect_boundaries(reference_path), detect_boundaries(candidate_path),
+                                    thresholds['boundary_tolerance'])
+    report['boundaries'] = boundaries
+    if boundaries['missing'] or boundaries['extra']:
+        failures.append(f"세그먼트 경계 불일치 (누락 {boundaries['missing']}, 추가 {boundaries['extra']})")
+
+    report['failures'] = failures
+    report['passed'] = not failures
+
+    if report_dir:
+        os.makedirs(report_dir, exist_ok=True)
+        with open(os.path.join(report_dir, 'report.json'), 'w') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2, default=float)
+    return report
+
+
+def save_diff_image(reference_frame, candidate_frame, report_dir, frame_index):
+    """기준 | 후보 | 차이(x4 증폭) 이미지를 나란히 저장"""
+    from PIL import Image
+
+    os.makedirs(report_dir, exist_ok=True)
+    diff = np.clip(np.abs(reference_frame.astype(np.int16) - candidate_frame.astype(np.int16)) * 4, 0, 255).astype(np.uint8)
+    side_by_side = np.concatenate([reference_frame, candidate_frame, diff], axis=1)
+    path = os.path.join(report_dir, f"worst_frame_{frame_index}.png")
+    Image.fromarray(side_by_side).save(path)
+    return path
+
+
+def print_report(name, report):
+    status = "✅ 동일" if report['passed'] else "❌ 차이 있음"
+    metrics = f"PSNR {report.get('min_psnr', '-')}dB, SSIM {report.get('min_ssim', '-')}"
+    audio = report.get('audio')
+    if audio:
+        metrics += f", 오디오 Δ{audio['max_db_diff']}dB r={audio['corr']}"
+    print(f"{status} {name}: {metrics}")
+    for failure in report['failures']:
+        print(f"    - {failure}")
+
+
+# ==================== 벤치마크 연동 ====================
+
+def render_scenario(name, engine, workdir, seed):
+    """벤치마크 시나리오를 지정한 엔진으로 렌더 (별도 프로세스)"""
+    from benchmark_render import run_in_subprocess
+
+    result = run_in_subprocess(name, workdir, engine, seed)
+    if 'error' in result:
+        raise RuntimeError(f"{name}/{engine} 렌더 실패: {result['error']}")
+    return result['output_path']
+
+
+def verify_runs(results, report_root, golden_dir=None, thresholds=None):
+    """벤치마크 결과의 출력 영상 검증
+
+    - 엔진이 여러 개면 첫 번째 엔진 출력을 기준으로 나머지 엔진 비교
+    - golden_dir이 있으면 golden_dir/<시나리오>.mp4 와도 비교
+
+    Returns:
+        dict: {'<시나리오>/<엔진>': report, ...}
+    """
+    reports = {}
+    by_scenario = {}
+    for result in results:
+        runs = [run for run in result['runs'] if 'error' not in run]
+        if runs:
+            by_scenario.setdefault(result['scenario'], []).append((result['engine'], runs[0]['output_path']))
+
+    for scenario, outputs in by_scenario.items():
+        reference_engine, reference_path = outputs[0]
+        for engine, output_path in outputs[1:]:
+            key = f"{scenario}/{engine}_vs_{reference_engine}"
+            reports[key] = compare_videos(reference_path, output_path, thresholds,
+                                          report_dir=os.path.join(report_root, key.replace('/', '__')))
+            print_report(key, reports[key])
+
+        if golden_dir:
+            golden_path = os.path.join(golden_dir, f"{scenario}.mp4")
+            if not os.path.exists(golden_path):
+                print(f"⚠️ golden 없음: {golden_path}")
+                continue
+            for engine, output_path in outputs:
+                key = f"{scenario}/{engine}_vs_golden"
+                reports[key] = compare_videos(golden_path, output_path, thresholds,
+                                              report_dir=os.path.join(report_root, key.replace('/', '__')))
+                print_report(key, reports[key])
+    return reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description="렌더 결과 동등성 검사")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    compare_parser = subparsers.add_parser('compare', help="두 영상 비교")
+    compare_parser.add_argument('reference')
+    compare_parser.add_argument('candidate')
+
+    render_parser = subparsers.add_parser('render', help="시나리오를 여러 엔진으로 렌더해 비교")
+    render_parser.add_argument('--engines', nargs='+', required=True)
+
+    record_parser = subparsers.add_parser('golden-record', help="현재 출력을 golden으로 저장")
+    check_parser = subparsers.add_parser('golden-check', help="golden과 현재 출력 비교")
+
+    for sub in (compare_parser, render_parser, record_parser, check_parser):
+        sub.add_argument('--report-dir', default='equivalence_report')
+        sub.add_argument('--samples', type=int, default=SAMPLE_FRAMES)
+        sub.add_argument('--min-psnr', type=float)
+        sub.add_argument('--min-ssim', type=float)
+    for sub in (render_parser, record_parser, check_parser):
+        sub.add_argument('--scenarios', nargs='*')
+        sub.add_argument('--seed', type=int)
+    for sub in (record_parser, check_parser):
+        sub.add_argument('--golden-dir', required=True)
+        sub.add_argument('--engine', default='moviepy')
+    args = parser.parse_args()
+
+    thresholds = {}
+    if args.min_psnr is not None:
+        thresholds['min_psnr'] = args.min_psnr
+    if args.min_ssim is not None:
+        thresholds['min_ssim'] = args.min_ssim
+
+    if args.command == 'compare':
+        report = compare_videos(args.reference, args.candidate, thresholds, args.samples, args.report_dir)
+        print_report(os.path.basename(args.candidate), report)
+        print(f"📄 리포트: {os.path.join(args.report_dir, 'report.json')}")
+        return 0 if report['passed'] else 1
+
+    from benchmark_render import SCENARIOS, DEFAULT_SEED
+    names = args.scenarios or list(SCENARIOS.keys())
+    seed = args.seed if args.seed is not None else DEFAULT_SEED
+    workdir = tempfile.mkdtemp(prefix='reels_equiv_')
+    all_passed = True
+
+    try:
+        for name in names:
+            if args.command == 'golden-record':
+                os.makedirs(args.golden_dir, exist_ok=True)
+                output_path = render_scenario(name, args.engine, workdir, seed)
+                shutil.copyfile(output_path, os.path.join(args.golden_dir, f"{name}.mp4"))
+                print(f"💾 golden 저장: {name}")
+                continue
+
+            if args.command == 'golden-check':
+                pairs = [('golden', os.path.join(args.golden_dir, f"{name}.mp4")),
+                         (args.engine, render_scenario(name, args.engine, workdir, seed))]
+            else:
+                pairs = [(engine, render_scenario(name, engine, workdir, seed)) for engine in args.engines]
+
+            (reference_name, reference_path) = pairs[0]
+            for candidate_name, candidate_path in pairs[1:]:
+                key = f"{name}__{candidate_name}_vs_{reference_name}"
+                report = compare_videos(reference_path, candidate_path, thresholds, args.samples,
+                                        os.path.join(args.report_dir, key))
+                print_report(key, report)
+                all_passed = all_passed and report['passed']
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+작업 배치 집계 테스트 (BatchRegistry.summarize, finish_if_done)
+실행: cd backend && python scripts/test_job_batches.py
+"""
+
+import os
+import sys
+import json
+import tempfile
+
+# backend 모듈 import 경로 (큐/배치/진행 상황/로그 파일은 임시 폴더에 생성)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(tempfile.mkdtemp(prefix='test_job_batches_'))
+os.environ['JOB_PROGRESS_DIR'] = os.path.join(os.getcwd(), 'job_progress')
+
+from job_batches import BatchRegistry
+from job_progress import progress_path
+from job_queue import JobQueue, JobStatus
+
+
+def new_batch(statuses):
+    """상태 목록대로 작업을 만들고 배치로 묶기 ('missing'은 큐에 없는 작업 ID)"""
+    folder = tempfile.mkdtemp()
+    queue = JobQueue(os.path.join(folder, 'jobs.json'))
+    registry = BatchRegistry(os.path.join(folder, 'batches.json'))
+    job_ids = []
+    for index, status in enumerate(statuses):
+        if status == 'missing':
+            job_ids.append(f"missing-{index}")
+            continue
+        job_id = queue.add_job('batch@example.com', {'content_data': '{}'})
+        if status == 'completed':
+            queue.update_job_status(job_id, JobStatus.COMPLETED, result={'video_path': f"/out/{job_id}.mp4"})
+        elif status == 'failed':
+            queue.update_job_status(job_id, JobStatus.FAILED, error_message='렌더 실패')
+        elif status == 'processing':
+            queue.claim_job(job_id, worker_id='w1')
+        job_ids.append(job_id)
+    media_folder = tempfile.mkdtemp(prefix='batch_media_')
+    batch = registry.create_batch(registry.new_batch_id(), 'batch@example.com', job_ids,
+                                  media_folder=media_folder, item_refs=[f"ref-{i}" for i in range(len(job_ids))])
+    return queue, registry, batch
+
+
+def summary_status(statuses):
+    queue, registry, batch = new_batch(statuses)
+    return registry.summarize(batch, queue)['status']
+
+
+def test_batch_status():
+    """대기/처리 중/완료/실패/일부 성공 판정 (큐에서 사라진 작업은 끝난 것으로 계산)"""
+    assert summary_status(['pending', 'pending']) == 'pending'
+    assert summary_status(['pending', 'processing']) == 'processing'
+    assert summary_status(['completed', 'pending']) == 'processing'
+    assert summary_status(['completed', 'completed']) == 'completed'
+    assert summary_status(['failed', 'missing']) == 'failed'
+    assert summary_status(['completed', 'failed']) == 'partial'
+
+
+def test_summary_items():
+    """작업별 ref/결과/오류와 상태별 집계"""
+    queue, registry, batch = new_batch(['completed', 'failed', 'missing'])
+    summary = registry.summarize(batch, queue)
+    assert summary['total'] == 3 and summary['progress'] == 100.0
+    assert summary['counts'] == {'pending': 0, 'processing': 0, 'completed': 1, 'failed': 1, 'missing': 1}
+    completed, failed, missing = summary['jobs']
+    assert completed['ref'] == 'ref-0' and completed['video_path'].endswith('.mp4')
+    assert failed['error_message'] == '렌더 실패'
+    assert missing['status'] == 'missing' and 'video_path' not in missing
+
+
+def test_processing_progress():
+    """처리 중 작업은 진행 상황 파일의 완료 비율만큼 반영"""
+    queue, registry, batch = new_batch(['processing', 'completed'])
+    job_id = batch['job_ids'][0]
+    os.makedirs(os.path.dirname(progress_path(job_id)), exist_ok=True)
+    with open(progress_path(job_id), 'w', encoding='utf-8') as f:
+        json.dump({'state': 'rendering', 'stage': 'segments', 'segments_total': 4, 'segments_done': 2,
+                   'encode_percent': 0}, f)
+    summary = registry.summarize(batch, queue)
+    assert summary['jobs'][0]['stage'] == 'segments' and summary['jobs'][0]['progress'] == 25.0
+    assert summary['progress'] == 62.5
+
+
+def test_finish_if_done_once():
+    """모든 작업이 끝나면 1회만 완료 처리하고 공유 미디어 폴더 정리"""
+    queue, registry, batch = new_batch(['completed', 'pending'])
+    assert registry.finish_if_done(batch['batch_id'], queue) is None
+
+    queue.update_job_status(batch['job_ids'][1], JobStatus.FAILED, error_message='렌더 실패')
+    finished = registry.finish_if_done(batch['batch_id'], queue)
+    assert finished and finished['summary']['status'] == 'partial'
+    assert finished['summary']['finished_at'] == registry.get_batch(batch['batch_id'])['finished_at']
+    assert not os.path.exists(batch['media_folder'])
+    assert registry.finish_if_done(batch['batch_id'], queue) is None
+    assert registry.finish_if_done('unknown', queue) is None
+
+
+if __name__ == "__main__":
+    tests = [test_batch_status, test_summary_items, test_processing_progress, test_finish_if_done_once]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} 통과")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+중복 제출 지문 / 렌더 시드 테스트 (compute_fingerprint, stream_digest)
+실행: cd backend && python scripts/test_job_fingerprint.py
+"""
+
+import io
+import os
+import sys
+import json
+import shutil
+import tempfile
+
+# backend 모듈 import 경로 (로그 파일은 임시 폴더에 생성)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(tempfile.mkdtemp(prefix='test_job_fingerprint_'))
+
+from job_fingerprint import compute_fingerprint, media_digest, stream_digest
+
+USER = 'tester@example.com'
+CONTENT = {'title': '제목', 'body1': '첫 번째 대사', 'body2': '두 번째 대사'}
+
+
+def make_media(folder: str, files):
+    for name, data in files.items():
+        with open(os.path.join(folder, name), 'wb') as f:
+            f.write(data)
+
+
+def make_params(**overrides):
+    params = {
+        'content_data': json.dumps(CONTENT, ensure_ascii=False),
+        'music_mood': 'bright',
+        'text_position': 'bottom',
+        'uploaded_files': ['1.jpg', '2.mp4'],
+        'edited_texts': '{}',
+    }
+    params.update(overrides)
+    return params
+
+
+def with_media(test):
+    """1.jpg, 2.mp4가 들어 있는 임시 폴더를 만들어 테스트에 전달"""
+    def run():
+        folder = tempfile.mkdtemp(prefix='media_')
+        try:
+            make_media(folder, {'1.jpg': b'image-bytes' * 100, '2.mp4': b'video-bytes' * 100})
+            test(folder)
+        finally:
+            shutil.rmtree(folder, ignore_errors=True)
+    run.__name__ = test.__name__
+    return run
+
+
+@with_media
+def test_stable_across_formatting(folder):
+    """JSON 키 순서/공백, 알림 파라미터(webhook_url 등)가 달라도 같은 지문"""
+    first, _ = compute_fingerprint(USER, make_params(), folder)
+    reordered = json.dumps(dict(reversed(list(CONTENT.items()))), ensure_ascii=False, indent=2)
+    second, _ = compute_fingerprint('  Tester@Example.com ', make_params(content_data=reordered,
+                                                                         webhook_url='https://hook'), folder)
+    assert first and first == second
+
+
+@with_media
+def test_changes_with_content(folder):
+    """대사/설정/사용자가 바뀌면 다른 지문"""
+    base, _ = compute_fingerprint(USER, make_params(), folder)
+    edited = dict(CONTENT, body2='고친 대사')
+    assert compute_fingerprint(USER, make_params(content_data=json.dumps(edited)), folder)[0] != base
+    assert compute_fingerprint(USER, make_params(music_mood='calm'), folder)[0] != base
+    assert compute_fingerprint('other@example.com', make_params(), folder)[0] != base
+
+
+@with_media
+def test_changes_with_media(folder):
+    """미디어 내용이나 순서가 바뀌면 다른 지문 (파일명이 아니라 내용 해시 기준)"""
+    base, _ = compute_fingerprint(USER, make_params(), folder)
+    make_media(folder, {'2.mp4': b'other-video' * 100})
+    assert compute_fingerprint(USER, make_params(), folder)[0] != base
+    assert compute_fingerprint(USER, make_params(uploaded_files=['2.mp4', '1.jpg']), folder)[0] != base
+
+
+@with_media
+def test_unreadable_media(folder):
+    """업로드 미디어를 읽을 수 없으면 (None, None) → 중복 판별 없이 새 작업"""
+    assert compute_fingerprint(USER, make_params(uploaded_files=['1.jpg', '9.png']), folder) == (None, None)
+
+
+@with_media
+def test_stream_digest_matches_saved_file(folder):
+    """저장 전 스트림 해시로 계산한 지문 == 저장된 파일로 계산한 지문, 스트림은 처음으로 되돌림"""
+    streams = {}
+    for name in ('1.jpg', '2.mp4'):
+        with open(os.path.join(folder, name), 'rb') as f:
+            streams[name] = io.BytesIO(f.read())
+    digests = {name: stream_digest(stream) for name, stream in streams.items()}
+    assert digests['1.jpg'] == media_digest(os.path.join(folder, '1.jpg'))
+    assert streams['1.jpg'].tell() == 0
+    assert compute_fingerprint(USER, make_params(), None, digests) == compute_fingerprint(USER, make_params(), folder)
+
+
+@with_media
+def test_seed_ignores_script_text(folder):
+    """렌더 시드는 대사 텍스트를 빼고 계산 - 대사만 고쳐 다시 렌더해도 같은 BGM/패닝/전환 (세그먼트 캐시 재사용)"""
+    _, seed = compute_fingerprint(USER, make_params(), folder)
+    assert isinstance(seed, int) and 0 <= seed < (1 << 32)
+    edited = dict(CONTENT, body1='고친 대사')
+    assert compute_fingerprint(USER, make_params(content_data=json.dumps(edited)), folder)[1] == seed
+    assert compute_fingerprint(USER, make_params(edited_texts=json.dumps({'body1': '수정'})), folder)[1] == seed
+
+
+@with_media
+def test_seed_changes_with_render_inputs(folder):
+    """설정/미디어/요청 시드가 바뀌면 다른 렌더 시드"""
+    _, seed = compute_fingerprint(USER, make_params(), folder)
+    assert compute_fingerprint(USER, make_params(text_position='top'), folder)[1] != seed
+    assert compute_fingerprint(USER, make_params(render_seed=42), folder)[1] != seed
+    make_media(folder, {'1.jpg': b'other-image' * 100})
+    assert compute_fingerprint(USER, make_params(), folder)[1] != seed
+
+
+if __name__ == "__main__":
+    tests = [test_stable_across_formatting, test_changes_with_content, test_changes_with_media,
+             test_unreadable_media, test_stream_digest_matches_saved_file, test_seed_ignores_script_text,
+             test_seed_changes_with_render_inputs]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} 통과")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+작업 큐 테스트 (_parse_lane_weights, fair_order 공정 분배, ensure_render_seed 시드 보존)
+실행: cd backend && python scripts/test_job_queue.py
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+# backend 모듈 import 경로 (큐/로그 파일은 임시 폴더에 생성)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(tempfile.mkdtemp(prefix='test_job_queue_'))
+
+from job_queue import JobQueue, _parse_lane_weights, fair_order, QUEUE_LANE_WEIGHTS
+
+BASE_TIME = datetime(2026, 1, 1, 9, 0, 0)
+
+
+def make_job(job_id: str, lane: str, client: str, minute: int):
+    return {
+        'job_id': job_id,
+        'lane': lane,
+        'client_key': client,
+        'user_email': f"{client}@example.com",
+        'created_at': (BASE_TIME + timedelta(minutes=minute)).isoformat(),
+        'video_params': {},
+    }
+
+
+def order_ids(pending, recent=None):
+    return [job['job_id'] for job in fair_order(pending, recent or [])]
+
+
+def test_parse_lane_weights():
+    """기본값 / 지정값 / 잘못된 항목은 기본값 유지 / 최소 1"""
+    assert _parse_lane_weights('') == {'interactive': 6, 'api': 3, 'batch': 1}
+    assert _parse_lane_weights('interactive:2, batch:5') == {'interactive': 2, 'api': 3, 'batch': 5}
+    assert _parse_lane_weights('api:x,unknown:9') == {'interactive': 6, 'api': 3, 'batch': 1}
+    assert _parse_lane_weights('batch:0')['batch'] == 1
+
+
+def test_interactive_lane_first():
+    """먼저 들어온 배치 작업보다 웹 UI 작업이 앞선다"""
+    pending = [make_job(f"b{i}", 'batch', 'bulk', i) for i in range(3)]
+    pending += [make_job('i0', 'interactive', 'web', 10), make_job('i1', 'interactive', 'web', 11)]
+    assert order_ids(pending) == ['i0', 'i1', 'b0', 'b1', 'b2']
+
+
+def test_lane_weights_share():
+    """레인 가중치 비율대로 시작 기회 배분 (기본 6:1이면 웹 UI 6건 뒤 배치 1건)"""
+    assert QUEUE_LANE_WEIGHTS == {'interactive': 6, 'api': 3, 'batch': 1}, "QUEUE_LANE_WEIGHTS 기본값 기준 테스트"
+    pending = [make_job(f"i{i}", 'interactive', f"user{i}", i) for i in range(8)]
+    pending += [make_job(f"b{i}", 'batch', 'bulk', i) for i in range(2)]
+    lanes = [job_id[0] for job_id in order_ids(pending)]
+    assert lanes[:7] == ['i'] * 6 + ['b'], lanes
+    assert len(lanes) == len(pending)
+
+
+def test_client_fairness_within_lane():
+    """같은 레인에서는 많이 넣은 클라이언트가 다른 클라이언트를 밀어내지 않는다"""
+    pending = [make_job(f"a{i}", 'api', 'alpha', i) for i in range(3)]
+    pending.append(make_job('b0', 'api', 'beta', 10))
+    assert order_ids(pending) == ['a0', 'b0', 'a1', 'a2']
+
+
+def test_recent_starts_counted():
+    """최근에 많이 시작한 클라이언트는 뒤로"""
+    pending = [make_job('a0', 'api', 'alpha', 0), make_job('b0', 'api', 'beta', 5)]
+    recent = [make_job('a-old1', 'api', 'alpha', -30), make_job('a-old2', 'api', 'alpha', -20)]
+    assert order_ids(pending, recent) == ['b0', 'a0']
+
+
+def test_legacy_job_lane():
+    """레인 필드가 없는 이전 작업은 source로 레인 추정 (external_api → api)"""
+    legacy = make_job('legacy', None, 'ext', 0)
+    legacy['video_params'] = {'source': 'external_api'}
+    pending = [legacy, make_job('b0', 'batch', 'bulk', -5)]
+    assert order_ids(pending) == ['legacy', 'b0']
+
+
+def test_render_seed_kept_across_retries():
+    """첫 클레임에 만든 렌더 시드가 큐에 저장되어 재시도/재큐잉 후에도 같은 시드"""
+    queue = JobQueue(os.path.join(tempfile.mkdtemp(), 'jobs.json'))
+    job_id = queue.add_job('seed@example.com', {'content_data': '{}'})
+    assert queue.claim_job(job_id, worker_id='w1')
+    seed = queue.ensure_render_seed(job_id)
+    assert seed is not None and queue.get_job(job_id)['video_params']['render_seed'] == seed
+    assert queue.retry_job(job_id) and queue.claim_job(job_id, worker_id='w2')
+    assert queue.ensure_render_seed(job_id) == seed
+
+    # 요청에서 지정한 시드는 정규화해서 유지
+    job_id = queue.add_job('seed@example.com', {'content_data': '{}', 'render_seed': '7'})
+    assert queue.ensure_render_seed(job_id) == 7
+    assert queue.ensure_render_seed('missing') is None
+
+
+if __name__ == "__main__":
+    tests = [test_parse_lane_weights, test_interactive_lane_first, test_lane_weights_share,
+             test_client_fairness_within_lane, test_recent_starts_counted, test_legacy_job_lane,
+             test_render_seed_kept_across_retries]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} 통과")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+알림 아웃박스 재시도 테스트 (backoff_seconds, mark_failed_attempt, claim_due, NotificationSender.deliver)
+실행: cd backend && python scripts/test_notification_outbox.py
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+# backend 모듈 import 경로 (아웃박스 DB/로그 파일은 임시 폴더에 생성)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(tempfile.mkdtemp(prefix='test_notification_outbox_'))
+
+from notification_outbox import (NotificationOutbox, NotificationSender, DeliveryStatus, backoff_seconds,
+                                 NOTIFY_MAX_ATTEMPTS, NOTIFY_BACKOFF_BASE_SECONDS, NOTIFY_BACKOFF_MAX_SECONDS,
+                                 NOTIFY_LEASE_SECONDS)
+
+
+def new_outbox() -> NotificationOutbox:
+    return NotificationOutbox(os.path.join(tempfile.mkdtemp(), 'outbox.db'))
+
+
+def enqueue_webhook(outbox: NotificationOutbox, job_id: str = 'job-1') -> int:
+    return outbox.enqueue_webhook(job_id, 'https://hook.example.com', {'job_id': job_id, 'status': 'completed'},
+                                  'completed')
+
+
+def set_next_attempt(outbox: NotificationOutbox, notification_id: int, when: float):
+    with outbox._connect() as conn:
+        conn.execute('UPDATE notifications SET next_attempt_at = ? WHERE id = ?', (when, notification_id))
+
+
+def test_backoff_seconds():
+    """지수 백오프 (기본 30초, 1분, 2분 ...) + 최대값 제한"""
+    assert backoff_seconds(0) == NOTIFY_BACKOFF_BASE_SECONDS
+    assert backoff_seconds(1) == NOTIFY_BACKOFF_BASE_SECONDS
+    assert backoff_seconds(2) == NOTIFY_BACKOFF_BASE_SECONDS * 2
+    assert backoff_seconds(3) == NOTIFY_BACKOFF_BASE_SECONDS * 4
+    assert backoff_seconds(50) == NOTIFY_BACKOFF_MAX_SECONDS
+
+
+def test_retryable_failure_waits_for_backoff():
+    """재시도 가능한 실패는 pending으로 돌아가고 백오프 시간 전에는 다시 가져오지 않는다"""
+    outbox = new_outbox()
+    notification_id = enqueue_webhook(outbox)
+    [notification] = outbox.claim_due('sender-1')
+    assert notification['id'] == notification_id and outbox.claim_due('sender-2') == []
+
+    before = time.time()
+    assert outbox.mark_failed_attempt(notification, 'http=503', retryable=True) == DeliveryStatus.PENDING.value
+    assert outbox.claim_due('sender-1') == []
+    [status] = outbox.delivery_status('job-1')
+    assert status['status'] == 'pending' and status['attempts'] == 1 and status['last_error'] == 'http=503'
+    assert 'next_attempt_at' in status
+
+    # 백오프 시각이 지나면 다시 발송 대상
+    set_next_attempt(outbox, notification_id, before - 1)
+    [retry] = outbox.claim_due('sender-1')
+    assert retry['attempts'] == 1
+
+
+def test_final_failure():
+    """재시도 불가 오류(4xx 등)는 바로 최종 실패, 재시도 가능 오류도 한도에 닿으면 최종 실패"""
+    outbox = new_outbox()
+    enqueue_webhook(outbox, 'job-4xx')
+    [notification] = outbox.claim_due('sender-1')
+    assert outbox.mark_failed_attempt(notification, 'http=404', retryable=False) == DeliveryStatus.FAILED.value
+    assert outbox.claim_due('sender-1') == []
+
+    enqueue_webhook(outbox, 'job-limit')
+    [notification] = outbox.claim_due('sender-1')
+    notification['attempts'] = NOTIFY_MAX_ATTEMPTS - 1
+    assert outbox.mark_failed_attempt(notification, 'http=500', retryable=True) == DeliveryStatus.FAILED.value
+    assert outbox.get_stats()['failed'] == 2
+
+
+def test_stale_sending_reclaimed():
+    """발송 중 상태로 임대 시간이 지난 알림(발송 프로세스 종료)은 다른 발송자가 다시 가져간다"""
+    outbox = new_outbox()
+    notification_id = enqueue_webhook(outbox)
+    assert outbox.claim_due('sender-1')
+    with outbox._connect() as conn:
+        conn.execute('UPDATE notifications SET claimed_at = ? WHERE id = ?',
+                     (time.time() - NOTIFY_LEASE_SECONDS - 1, notification_id))
+    [notification] = outbox.claim_due('sender-2')
+    assert notification['claimed_by'] == 'sender-1'  # 가져오기 전 상태 반환
+    assert outbox.claim_due('sender-3') == []
+
+
+def test_sender_deliver():
+    """발송 결과에 따라 sent / 재시도 대기 / 최종 실패 기록"""
+    outbox = new_outbox()
+    sender = NotificationSender(outbox, 'sender-test')
+    results = iter([(False, True, 'http=502'), (True, False, '')])
+    sender._send_webhook = lambda url, payload, status: next(results)
+
+    notification_id = enqueue_webhook(outbox)
+    assert sender.drain() == 1
+    assert outbox.delivery_status('job-1')[0]['status'] == 'pending'
+
+    set_next_attempt(outbox, notification_id, time.time() - 1)
+    assert sender.drain() == 1
+    [status] = outbox.delivery_status('job-1')
+    assert status['status'] == 'sent' and status['attempts'] == 2 and status['last_error'] is None
+    assert status['sent_at']
+
+
+if __name__ == "__main__":
+    tests = [test_backoff_seconds, test_retryable_failure_waits_for_backoff, test_final_failure,
+             test_stale_sending_reclaimed, test_sender_deliver]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} 통과")
+    sys.exit(1 if failed else 0)
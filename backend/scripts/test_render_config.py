@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+렌더 설정 테스트 (parse_render_seed, new_render_seed, RenderConfig.rng, parse_output_formats)
+실행: cd backend && python scripts/test_render_config.py
+"""
+
+import os
+import sys
+
+# backend 모듈 import 경로
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from render_config import (RenderConfig, RENDER_SEED_BITS, LAYOUT_PRESETS, new_render_seed, parse_render_seed,
+                           parse_output_formats)
+
+
+def test_parse_render_seed():
+    """없거나 잘못된 값은 None, 숫자/숫자 문자열은 32bit 범위로 정규화"""
+    assert parse_render_seed(None) is None
+    assert parse_render_seed('') is None
+    assert parse_render_seed('abc') is None
+    assert parse_render_seed([1]) is None
+    assert parse_render_seed(42) == 42
+    assert parse_render_seed('42') == 42
+    assert parse_render_seed(0) == 0
+    assert parse_render_seed(1 << RENDER_SEED_BITS) == 0
+    assert parse_render_seed(-1) == (1 << RENDER_SEED_BITS) - 1
+
+
+def test_new_render_seed_range():
+    """새 시드는 파싱 결과와 같은 범위"""
+    for _ in range(100):
+        seed = new_render_seed()
+        assert 0 <= seed < (1 << RENDER_SEED_BITS)
+        assert parse_render_seed(seed) == seed
+
+
+def test_rng_deterministic_per_scope():
+    """같은 시드 + 범위면 같은 난수열, 범위가 다르면 독립 (세그먼트 스레드 실행 순서와 무관)"""
+    config = RenderConfig(render_seed=1234)
+    first = [config.rng(3, 'panning').random() for _ in range(2)]
+    assert first[0] == first[1]
+    assert config.rng(3, 'panning').random() != config.rng(4, 'panning').random()
+    assert RenderConfig(render_seed=1235).rng(3, 'panning').random() != first[0]
+
+
+def test_parse_output_formats():
+    """쉼표 문자열/리스트 모두 허용, 알 수 없는 값/중복 제거, 비어 있으면 [default_format]"""
+    assert parse_output_formats('reels,youtube') == ['reels', 'youtube']
+    assert parse_output_formats(' YouTube , reels ,youtube') == ['youtube', 'reels']
+    assert parse_output_formats(['reels', 'square', 'reels']) == ['reels']
+    assert parse_output_formats(None) == ['reels']
+    assert parse_output_formats('', 'youtube') == ['youtube']
+    assert parse_output_formats('square,', 'youtube') == ['youtube']
+
+
+def test_for_format_presets():
+    """포맷별 레이아웃 프리셋 적용, 알 수 없는 포맷은 reels"""
+    youtube = RenderConfig.for_format('youtube', render_seed=7)
+    assert youtube.video_format == 'youtube' and youtube.render_seed == 7
+    assert youtube.video_width == LAYOUT_PRESETS['youtube']['video_width']
+    assert RenderConfig.for_format('square').video_format == 'reels'
+
+
+if __name__ == "__main__":
+    tests = [test_parse_render_seed, test_new_render_seed_range, test_rng_deterministic_per_scope,
+             test_parse_output_formats, test_for_format_presets]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} 통과")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+세그먼트 캐시 테스트 (should_cache 모드별 판단, get/put, media_quick_digest 작업 계획 키)
+실행: cd backend && python scripts/test_segment_cache.py
+"""
+
+import os
+import sys
+import tempfile
+
+# backend 모듈 import 경로 (캐시/로그 파일은 임시 폴더에 생성)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(tempfile.mkdtemp(prefix='test_segment_cache_'))
+os.environ['SEGMENT_CACHE_DIR'] = os.path.join(os.getcwd(), 'segment_cache')
+
+from job_fingerprint import media_quick_digest, _QUICK_SAMPLE
+from segment_cache import SegmentCache
+
+PLAN = {'media': ['1.jpg', '2.mp4'], 'music_mood': 'bright', 'render_seed': 7}
+
+
+def new_cache(mode: str) -> SegmentCache:
+    return SegmentCache(os.path.join(tempfile.mkdtemp(), 'cache'), mode)
+
+
+def test_should_cache_auto():
+    """auto: 처음 보는 작업 계획은 단일 패스, 같은 계획을 다시 렌더하거나 수정 텍스트 재렌더면 캐시 사용"""
+    cache = new_cache('auto')
+    plan_key = cache.make_key(PLAN)
+    assert cache.should_cache(plan_key) is False
+    assert cache.should_cache(plan_key) is True
+    assert cache.should_cache(cache.make_key(dict(PLAN, render_seed=8)), reuse_requested=True) is True
+    assert cache.should_cache(cache.make_key(dict(PLAN, music_mood='calm'))) is False
+
+
+def test_should_cache_modes():
+    """off는 항상 사용 안 함(계획도 기록하지 않음), on은 항상 사용, 알 수 없는 모드는 auto"""
+    off = new_cache('off')
+    plan_key = off.make_key(PLAN)
+    assert off.should_cache(plan_key, reuse_requested=True) is False
+    assert not os.path.exists(off.cache_dir)
+    assert new_cache('on').should_cache(plan_key) is True
+    assert new_cache('sometimes').mode == 'auto'
+
+
+def test_make_key_order_independent():
+    """계획 키는 딕셔너리 키 순서와 무관, 값이 바뀌면 달라짐"""
+    cache = new_cache('auto')
+    assert cache.make_key(PLAN) == cache.make_key(dict(reversed(list(PLAN.items()))))
+    assert cache.make_key(PLAN) != cache.make_key(dict(PLAN, render_seed=8))
+
+
+def test_put_get():
+    """저장한 세그먼트는 길이와 함께 돌려받고 적중/미스 집계"""
+    cache = new_cache('on')
+    workspace = tempfile.mkdtemp()
+    segment_path = os.path.join(workspace, 'segment.mp4')
+    with open(segment_path, 'wb') as f:
+        f.write(b'segment-bytes')
+    key = cache.make_key({'segment': 0, **PLAN})
+
+    target_path = os.path.join(workspace, 'reused.mp4')
+    assert cache.get(key, target_path) is None
+    cache.put(key, segment_path, 3.5)
+    assert cache.get(key, target_path) == 3.5
+    with open(target_path, 'rb') as f:
+        assert f.read() == b'segment-bytes'
+    stats = cache.get_stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (1, 1, 1)
+
+
+def test_media_quick_digest():
+    """간이 해시: 같은 내용이면 같고, 크기/앞부분/끝부분이 바뀌면 달라짐, 없는 파일은 None"""
+    folder = tempfile.mkdtemp()
+    path = os.path.join(folder, 'clip.mp4')
+    data = bytearray(b'a' * (_QUICK_SAMPLE * 3))
+
+    def digest_of(content):
+        with open(path, 'wb') as f:
+            f.write(content)
+        return media_quick_digest(path)
+
+    base = digest_of(bytes(data))
+    assert base and digest_of(bytes(data)) == base
+    assert digest_of(bytes(data) + b'a') != base
+    assert digest_of(b'b' + bytes(data[1:])) != base
+    assert digest_of(bytes(data[:-1]) + b'b') != base
+    assert digest_of(b'short') != base
+    assert media_quick_digest(os.path.join(folder, 'missing.mp4')) is None
+
+
+if __name__ == "__main__":
+    tests = [test_should_cache_auto, test_should_cache_modes, test_make_key_order_independent, test_put_get,
+             test_media_quick_digest]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} 통과")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,183 @@
+"""
+세그먼트 렌더 캐시
+세그먼트 계획(미디어 내용 해시, 대사/스타일, TTS 길이, 레이아웃, 렌더 시드)의 해시를 키로
+스트리밍 합성 중간 파일을 보관한다. 수정된 텍스트로 다시 렌더할 때 바뀌지 않은 세그먼트는
+합성/중간 인코딩 없이 캐시 파일을 그대로 이어 붙이고, 바뀐 세그먼트만 새로 렌더한다.
+
+중간 파일 경로는 세그먼트마다 인코딩/디코딩을 한 번 더 거치므로, auto 모드(기본)에서는
+재렌더로 세그먼트를 재사용할 수 있는 작업(수정 텍스트가 있거나 같은 작업 계획을 이전에 렌더한 경우)에만 사용한다.
+"""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import tempfile
+import threading
+from typing import Any, Dict, Optional
+
+from utils.logger_config import get_logger
+
+logger = get_logger('segment_cache')
+
+SEGMENT_CACHE_DIR = os.getenv('SEGMENT_CACHE_DIR', os.path.join(os.path.dirname(__file__), "segment_cache"))
+SEGMENT_CACHE_MODE = os.getenv('RENDER_SEGMENT_CACHE', 'auto').lower()  # on / off / auto
+SEGMENT_CACHE_MAX_AGE_HOURS = int(os.getenv('SEGMENT_CACHE_MAX_AGE_HOURS', '24'))
+SEGMENT_CACHE_MAX_MB = int(os.getenv('SEGMENT_CACHE_MAX_MB', '4096'))
+
+# 세그먼트 합성 방식이 바뀌면 올려서 이전 캐시를 무효화
+SEGMENT_PLAN_VERSION = 1
+
+
+class SegmentCache:
+    """세그먼트 계획 해시 → 중간 파일(.mp4) + 길이 기록(.json)"""
+
+    def __init__(self, cache_dir: str = SEGMENT_CACHE_DIR, mode: str = SEGMENT_CACHE_MODE):
+        self.cache_dir = cache_dir
+        self.mode = mode if mode in ('on', 'off', 'auto') else 'auto'
+        self.enabled = self.mode != 'off'
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if self.enabled:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def make_key(self, plan: Dict[str, Any]) -> str:
+        """세그먼트 계획 해시 (키 순서와 무관)"""
+        payload = json.dumps({'version': SEGMENT_PLAN_VERSION, 'plan': plan},
+                             ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def should_cache(self, plan_key: str, reuse_requested: bool = False) -> bool:
+        """이 작업 계획에 세그먼트 캐시(중간 파일 경로)를 쓸지 결정하고 계획을 기록
+
+        auto: 수정 텍스트 재렌더 요청이거나 같은 작업 계획(대사 텍스트 제외)을 이전에 렌더한 적 있을 때만.
+        처음 렌더하는 작업은 캐시 적중 가능성이 없으므로 단일 패스 합성을 유지한다.
+        """
+        if not self.enabled:
+            return False
+        plan_path = os.path.join(self.cache_dir, f"{plan_key}.plan")
+        known = os.path.exists(plan_path)
+        try:
+            with open(plan_path, 'a'):
+                pass
+            os.utime(plan_path, None)  # 정리 기준 (오래 재렌더가 없으면 prune에서 삭제)
+        except OSError as e:
+            logger.debug(f"작업 계획 기록 실패: {plan_key[:12]} - {e}")
+        return self.mode == 'on' or reuse_requested or known
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.mp4")
+
+    def _meta_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str, target_path: str) -> Optional[float]:
+        """캐시된 세그먼트를 target_path에 연결(하드링크, 불가하면 복사)하고 길이 반환 (없으면 None)
+
+        작업 공간의 사본을 쓰므로 렌더 중에 캐시 정리가 돌아도 안전하다.
+        """
+        cached_path = self._path(key)
+        try:
+            with open(self._meta_path(key), 'r', encoding='utf-8') as f:
+                duration = float(json.load(f)['duration'])
+            _link_or_copy(cached_path, target_path)
+            os.utime(cached_path, None)  # 최근 사용 시간 갱신 (정리 기준)
+        except (OSError, ValueError, KeyError):
+            with self.lock:
+                self.misses += 1
+            return None
+
+        with self.lock:
+            self.hits += 1
+        return duration
+
+    def put(self, key: str, segment_path: str, duration: float):
+        """렌더한 세그먼트 중간 파일 저장 (임시 파일에 쓴 뒤 원자적으로 교체, 길이 기록은 마지막에)"""
+        try:
+            fd, temp_path = tempfile.mkstemp(suffix='.part', dir=self.cache_dir)
+            os.close(fd)
+            os.remove(temp_path)
+            _link_or_copy(segment_path, temp_path)
+            os.replace(temp_path, self._path(key))
+            with open(self._meta_path(key), 'w', encoding='utf-8') as f:
+                json.dump({'duration': duration, 'created_at': time.time()}, f)
+            logger.debug(f"💾 세그먼트 캐시 저장: {key[:12]} ({duration:.1f}초)")
+        except Exception as e:
+            logger.warning(f"⚠️ 세그먼트 캐시 저장 실패: {key[:12]} - {e}")
+
+    def prune(self, max_age_hours: int = SEGMENT_CACHE_MAX_AGE_HOURS, max_mb: int = SEGMENT_CACHE_MAX_MB) -> int:
+        """오래된 세그먼트 삭제 후, 용량 초과 시 가장 오래 사용되지 않은 세그먼트부터 삭제"""
+        if not os.path.isdir(self.cache_dir):
+            return 0
+        removed = 0
+        cutoff = time.time() - max_age_hours * 3600
+        entries = []
+
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if name.endswith('.json'):
+                # 길이 기록은 세그먼트 파일과 함께 삭제 (파일이 없는 기록만 정리)
+                if not os.path.exists(path[:-len('.json')] + '.mp4'):
+                    self._remove_quietly(path)
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if stat.st_mtime < cutoff:
+                if self._remove_quietly(path):
+                    removed += 1
+            else:
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total_bytes = sum(size for _, size, _ in entries)
+        max_bytes = max_mb * 1024 * 1024
+        for _, size, path in sorted(entries):
+            if total_bytes <= max_bytes:
+                break
+            if self._remove_quietly(path):
+                total_bytes -= size
+                removed += 1
+
+        if removed:
+            logger.info(f"🗑️ 세그먼트 캐시 정리: {removed}개 삭제")
+        return removed
+
+    def _remove_quietly(self, path: str) -> bool:
+        """파일 삭제 (세그먼트 파일이면 길이 기록도 함께)"""
+        try:
+            os.remove(path)
+        except OSError:
+            return False
+        if path.endswith('.mp4'):
+            try:
+                os.remove(path[:-len('.mp4')] + '.json')
+            except OSError:
+                pass
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 통계"""
+        files = [f for f in os.listdir(self.cache_dir) if f.endswith('.mp4')] if os.path.isdir(self.cache_dir) else []
+        return {
+            'enabled': self.enabled,
+            'mode': self.mode,
+            'entries': len(files),
+            'total_bytes': sum(os.path.getsize(os.path.join(self.cache_dir, f)) for f in files),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+
+def _link_or_copy(source: str, target: str):
+    """같은 파일시스템이면 하드링크, 아니면 복사"""
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
+
+
+# 전역 인스턴스
+segment_cache = SegmentCache()
@@ -0,0 +1,159 @@
+"""
+세그먼트 스트리밍 합성
+미디어가 많은 작업에서 세그먼트의 소스(이미지/비디오 리더)를 해당 세그먼트를 렌더하는 동안만 열고
+중간 파일로 렌더한 즉시 닫아, 최대 메모리와 동시에 열린 FFmpeg 디코더 수를 제한
+"""
+
+import gc
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import wait, FIRST_COMPLETED
+from typing import List, Optional
+
+from moviepy.editor import VideoClip, VideoFileClip
+
+from utils.logger_config import get_logger
+from utils.stage_timer import get_current_rss_mb
+
+logger = get_logger('segment_stream')
+
+RENDER_STREAMING = os.getenv('RENDER_STREAMING', 'auto')  # auto / on / off
+RENDER_STREAMING_MIN_SEGMENTS = int(os.getenv('RENDER_STREAMING_MIN_SEGMENTS', '6'))
+RENDER_MEMORY_CEILING_MB = int(os.getenv('RENDER_MEMORY_CEILING_MB', '3072'))  # 0이면 제한 없음
+RENDER_MAX_DECODERS = int(os.getenv('RENDER_MAX_DECODERS', '4'))
+
+# 프로세스 전체 비디오 소스 디코더 동시 실행 수 제한 (공유 생성기로 여러 작업이 함께 렌더할 수 있음)
+decoder_slots = threading.BoundedSemaphore(RENDER_MAX_DECODERS)
+
+
+def should_stream(segment_count: int) -> bool:
+    """스트리밍 합성 사용 여부 (auto: 세그먼트 수가 기준 이상일 때만)"""
+    mode = RENDER_STREAMING.lower()
+    if mode == 'on':
+        return True
+    if mode == 'off':
+        return False
+    return segment_count >= RENDER_STREAMING_MIN_SEGMENTS
+
+
+def write_segment_file(clip, path: str, fps: int):
+    """세그먼트 중간 파일 렌더 (-qp 0: 양자화 손실은 없지만 yuv420p 변환으로 색차 해상도는 줄어듦)"""
+    clip.write_videofile(
+        path,
+        fps=fps,
+        codec='libx264',
+        audio=False,
+        preset='ultrafast',
+        ffmpeg_params=['-qp', '0'],
+        verbose=False,
+        logger=None
+    )
+
+
+def close_clip_tree(clip):
+    """합성 클립과 하위 클립(레이어, 마스크, 오디오)의 리더를 모두 닫기"""
+    seen = set()
+    stack = [clip]
+    while stack:
+        current = stack.pop()
+        if current is None or id(current) in seen:
+            continue
+        seen.add(id(current))
+        stack.extend(getattr(current, 'clips', None) or [])
+        stack.append(getattr(current, 'mask', None))
+        stack.append(getattr(current, 'audio', None))
+        try:
+            current.close()
+        except Exception:
+            pass
+
+
+class MemoryGuard:
+    """작업별 메모리 상한 - 상한을 넘으면 진행 중인 세그먼트가 끝날 때까지 다음 세그먼트 시작을 보류"""
+
+    def __init__(self, ceiling_mb: int = RENDER_MEMORY_CEILING_MB):
+        self.ceiling_mb = ceiling_mb
+        self.waits = 0
+        self.peak_rss_mb = get_current_rss_mb() or 0.0
+
+    def _sample(self) -> Optional[float]:
+        rss = get_current_rss_mb()
+        if rss is not None:
+            self.peak_rss_mb = max(self.peak_rss_mb, rss)
+        return rss
+
+    def wait_for_headroom(self, in_flight: List):
+        """현재 RSS가 상한 이하가 될 때까지 대기
+
+        진행 중인 세그먼트가 없는데도 상한을 넘으면 더 기다려도 줄지 않으므로 MemoryError
+        """
+        rss = self._sample()
+        if not self.ceiling_mb or rss is None:
+            return
+
+        while rss > self.ceiling_mb:
+            pending = [future for future in in_flight if not future.done()]
+            if not pending:
+                gc.collect()
+                rss = self._sample()
+                if rss > self.ceiling_mb:
+                    raise MemoryError(f"작업 메모리 상한 초과: {rss:.0f}MB > {self.ceiling_mb}MB")
+                return
+
+            self.waits += 1
+            logger.info(f"⏸️ 메모리 상한 대기: {rss:.0f}MB > {self.ceiling_mb}MB (진행 중 세그먼트 {len(pending)}개)")
+            wait(pending, return_when=FIRST_COMPLETED)
+            gc.collect()
+            rss = self._sample()
+
+
+class SegmentReaderPool:
+    """세그먼트 중간 파일 리더를 최대 max_open개까지만 열어두는 LRU 풀
+
+    최종 연결 시 재생 중인 세그먼트의 리더만 열려 있고, 지나간 세그먼트의 리더는 닫힌다.
+    """
+
+    def __init__(self, max_open: int = 2):
+        self.max_open = max(1, max_open)
+        self.lock = threading.Lock()
+        self.readers: 'OrderedDict[str, VideoFileClip]' = OrderedDict()
+
+    def get(self, path: str) -> VideoFileClip:
+        with self.lock:
+            reader = self.readers.get(path)
+            if reader is not None:
+                self.readers.move_to_end(path)
+                return reader
+
+            while len(self.readers) >= self.max_open:
+                _, oldest = self.readers.popitem(last=False)
+                oldest.close()
+
+            reader = VideoFileClip(path, audio=False)
+            self.readers[path] = reader
+            return reader
+
+    @property
+    def open_count(self) -> int:
+        with self.lock:
+            return len(self.readers)
+
+    def close_all(self):
+        with self.lock:
+            for reader in self.readers.values():
+                try:
+                    reader.close()
+                except Exception:
+                    pass
+            self.readers.clear()
+
+
+def streamed_segment_clip(path: str, duration: float, pool: SegmentReaderPool) -> VideoClip:
+    """중간 파일을 필요할 때만 풀에서 열어 읽는 클립"""
+    def make_frame(t):
+        reader = pool.get(path)
+        last_frame_time = max(0.0, reader.duration - 1.0 / reader.fps)
+        return reader.get_frame(min(t, last_frame_time))
+
+    return VideoClip(make_frame, duration=duration)
@@ -0,0 +1,298 @@
+"""
+TTS 음성 캐시 및 편집 중 선행 합성(prefetch)
+동일한 엔진/화자 설정과 전처리된 문장에 대해 합성된 음성을 재사용
+"""
+
+import os
+import json
+import time
+import queue
+import shutil
+import hashlib
+import tempfile
+import threading
+from typing import Dict, Optional, Any
+from utils.logger_config import get_logger
+from scratch_space import scratch_file
+from audio_duration import audio_duration
+
+logger = get_logger('tts_cache')
+
+TTS_CACHE_DIR = os.getenv('TTS_CACHE_DIR', os.path.join(os.path.dirname(__file__), "tts_cache"))
+TTS_CACHE_MAX_AGE_HOURS = int(os.getenv('TTS_CACHE_MAX_AGE_HOURS', '72'))
+TTS_CACHE_MAX_MB = int(os.getenv('TTS_CACHE_MAX_MB', '1024'))
+TTS_PREFETCH_NICE = int(os.getenv('TTS_PREFETCH_NICE', '10'))
+# 선행 합성은 API 프로세스에서 실행되므로 가벼운 네트워크 엔진만 허용
+# (Qwen은 모델을 메모리에 올리고 CPU를 점유하므로 렌더 워커에서만 합성)
+TTS_PREFETCH_ENGINES = ('edge',)
+
+
+class TTSCache:
+    """전처리된 텍스트 + TTS 설정 해시를 키로 하는 파일 기반 음성 캐시"""
+
+    def __init__(self, cache_dir: str = TTS_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def make_key(self, engine: str, voice: Dict[str, Any], normalized_text: str) -> str:
+        """캐시 키 생성 (엔진 + 화자/속도/톤/스타일 + preprocess_korean_text 결과)"""
+        payload = json.dumps({'engine': engine, 'voice': voice, 'text': normalized_text},
+                             ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.mp3")
+
+    def _duration_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.duration")
+
+    def _read_duration(self, key: str) -> Optional[float]:
+        try:
+            with open(self._duration_path(key), 'r') as f:
+                return float(f.read().strip())
+        except (OSError, ValueError):
+            return None
+
+    def contains(self, key: str) -> bool:
+        """캐시 보유 여부"""
+        return os.path.exists(self._path(key))
+
+    def get(self, key: str) -> Optional[str]:
+        """캐시된 음성을 작업 공간 임시 파일로 복사해 반환 (호출자가 자유롭게 삭제 가능)"""
+        cached_path = self._path(key)
+        if not os.path.exists(cached_path):
+            with self.lock:
+                self.misses += 1
+            return None
+
+        try:
+            temp_file = scratch_file('.mp3', 'tts')
+            temp_file.close()
+            shutil.copyfile(cached_path, temp_file.name)
+            os.utime(cached_path, None)  # 최근 사용 시간 갱신 (정리 기준)
+            # 저장된 길이를 복사본에 등록 → 세그먼트 길이 계획 시 파일을 다시 읽지 않음
+            audio_duration.remember(temp_file.name, self._read_duration(key))
+            with self.lock:
+                self.hits += 1
+            return temp_file.name
+        except Exception as e:
+            logger.warning(f"⚠️ TTS 캐시 읽기 실패: {key[:12]} - {e}")
+            with self.lock:
+                self.misses += 1
+            return None
+
+    def put(self, key: str, audio_path: str):
+        """합성된 음성을 캐시에 저장 (임시 파일에 쓴 뒤 원자적으로 교체)"""
+        if not audio_path or not os.path.exists(audio_path):
+            return
+        try:
+            fd, temp_path = tempfile.mkstemp(suffix='.part', dir=self.cache_dir)
+            os.close(fd)
+            shutil.copyfile(audio_path, temp_path)
+            os.replace(temp_path, self._path(key))
+            duration = audio_duration.get_duration(audio_path)
+            if duration:
+                with open(self._duration_path(key), 'w') as f:
+                    f.write(f"{duration:.6f}")
+            logger.debug(f"💾 TTS 캐시 저장: {key[:12]}")
+        except Exception as e:
+            logger.warning(f"⚠️ TTS 캐시 저장 실패: {key[:12]} - {e}")
+
+    def prune(self, max_age_hours: int = TTS_CACHE_MAX_AGE_HOURS, max_mb: int = TTS_CACHE_MAX_MB) -> int:
+        """오래된 항목 삭제 후, 용량 초과 시 가장 오래 사용되지 않은 항목부터 삭제"""
+        removed = 0
+        cutoff = time.time() - max_age_hours * 3600
+        entries = []
+
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if name.endswith('.duration'):
+                # 길이 기록은 음성 파일과 함께 삭제 (음성이 없는 기록만 정리)
+                if not os.path.exists(path[:-len('.duration')] + '.mp3'):
+                    self._remove_quietly(path)
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if stat.st_mtime < cutoff:
+                if self._remove_quietly(path):
+                    removed += 1
+            else:
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total_bytes = sum(size for _, size, _ in entries)
+        max_bytes = max_mb * 1024 * 1024
+        for _, size, path in sorted(entries):
+            if total_bytes <= max_bytes:
+                break
+            if self._remove_quietly(path):
+                total_bytes -= size
+                removed += 1
+
+        if removed:
+            logger.info(f"🗑️ TTS 캐시 정리: {removed}개 삭제")
+        return removed
+
+    def _remove_quietly(self, path: str) -> bool:
+        """파일 삭제 (음성 파일이면 길이 기록도 함께)"""
+        try:
+            os.remove(path)
+        except OSError:
+            return False
+        if path.endswith('.mp3'):
+            try:
+                os.remove(path[:-len('.mp3')] + '.duration')
+            except OSError:
+                pass
+        return True
+
+    def get_stats(self) -> Dict[str, int]:
+        """캐시 통계"""
+        files = [f for f in os.listdir(self.cache_dir) if f.endswith('.mp3')]
+        return {
+            'entries': len(files),
+            'total_bytes': sum(os.path.getsize(os.path.join(self.cache_dir, f)) for f in files),
+            'hits': self.hits,
+            'misses': self.misses,
+            'durations': audio_duration.get_stats(),
+        }
+
+
+class TTSPrefetcher:
+    """편집 중인 대본의 TTS를 백그라운드에서 미리 합성하는 저우선순위 워커
+
+    draft_id(프론트엔드의 job_id)별로 가장 최근에 제출된 대본만 유효하며,
+    새 대본이 제출되면 이전 대본의 남은 문장은 합성하지 않고 취소된다.
+    API 프로세스에서 실행되므로 TTS_PREFETCH_ENGINES(Edge)만 합성한다.
+    """
+
+    def __init__(self, cache: TTSCache):
+        self.cache = cache
+        self.lock = threading.Lock()
+        self.tasks = queue.Queue()
+        self.generations: Dict[str, int] = {}
+        self.worker_thread: Optional[threading.Thread] = None
+        self.stats = {'submitted': 0, 'synthesized': 0, 'cached': 0, 'cancelled': 0, 'failed': 0, 'skipped': 0}
+
+    @staticmethod
+    def supports(tts_settings: Dict[str, Any]) -> bool:
+        """선행 합성 가능한 엔진인지 확인"""
+        return tts_settings.get('tts_engine', 'edge') in TTS_PREFETCH_ENGINES
+
+    def submit(self, draft_id: str, lines: Dict[str, str], tts_settings: Dict[str, Any]) -> int:
+        """대본 제출 - 같은 draft_id의 이전 대본은 무효화
+
+        Returns:
+            int: 선행 합성 대상 문장 수 (지원하지 않는 엔진이면 0)
+        """
+        if not self.supports(tts_settings):
+            with self.lock:
+                self.stats['skipped'] += 1
+            logger.info(f"⏭️ TTS 선행 합성 건너뜀: {draft_id} ({tts_settings.get('tts_engine')} 엔진은 렌더 워커에서 합성)")
+            return 0
+
+        lines = {key: text for key, text in lines.items() if text and text.strip()}
+
+        with self.lock:
+            generation = self.generations.get(draft_id, 0) + 1
+            self.generations[draft_id] = generation
+            self.stats['submitted'] += 1
+
+            if self.worker_thread is None or not self.worker_thread.is_alive():
+                self.worker_thread = threading.Thread(target=self._worker_loop, name='tts-prefetch', daemon=True)
+                self.worker_thread.start()
+
+        self.tasks.put((draft_id, generation, lines, dict(tts_settings)))
+        logger.info(f"📝 TTS 선행 합성 요청: {draft_id} (버전 {generation}, {len(lines)}문장)")
+        return len(lines)
+
+    def _is_current(self, draft_id: str, generation: int) -> bool:
+        with self.lock:
+            return self.generations.get(draft_id) == generation
+
+    def _worker_loop(self):
+        """선행 합성 루프 (렌더 작업보다 낮은 CPU 우선순위)"""
+        try:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), TTS_PREFETCH_NICE)
+        except Exception:
+            pass
+
+        while True:
+            draft_id, generation, lines, tts_settings = self.tasks.get()
+            try:
+                self._process(draft_id, generation, lines, tts_settings)
+            except Exception as e:
+                logger.error(f"❌ TTS 선행 합성 오류: {draft_id} - {e}")
+            finally:
+                with self.lock:
+                    if self.generations.get(draft_id) == generation:
+                        del self.generations[draft_id]
+                self.tasks.task_done()
+
+    def _count(self, stat: str, amount: int = 1):
+        with self.lock:
+            self.stats[stat] += amount
+
+    def _process(self, draft_id: str, generation: int, lines: Dict[str, str], tts_settings: Dict[str, Any]):
+        if not self._is_current(draft_id, generation):
+            self._count('cancelled', len(lines))
+            return
+
+        from video_generator import get_shared_generator
+        generator = get_shared_generator()
+        render_config = generator.build_render_config(
+            tts_engine=tts_settings.get('tts_engine', 'edge'),
+            qwen_speaker=tts_settings.get('qwen_speaker'),
+            qwen_speed=tts_settings.get('qwen_speed'),
+            qwen_style=tts_settings.get('qwen_style'),
+            per_body_tts_settings=tts_settings.get('per_body_tts_settings'),
+            edge_speaker=tts_settings.get('edge_speaker'),
+            edge_speed=tts_settings.get('edge_speed'),
+            edge_pitch=tts_settings.get('edge_pitch'),
+        )
+
+        body_keys = list(lines.keys())
+        for index, body_key in enumerate(body_keys):
+            # 더 새로운 대본이 들어왔으면 남은 문장은 취소 (새 대본 작업이 다시 처리)
+            if not self._is_current(draft_id, generation):
+                self._count('cancelled', len(body_keys) - index)
+                logger.info(f"⏭️ TTS 선행 합성 취소: {draft_id} 버전 {generation} ({len(body_keys) - index}문장)")
+                return
+
+            # 렌더 시와 동일하게 대사별 화자/스타일이 적용된 설정으로 합성
+            with generator.use_render_config(render_config.for_body(body_key)):
+                if self.cache.contains(generator.tts_cache_key(lines[body_key])):
+                    self._count('cached')
+                    continue
+
+                audio_path = generator.create_tts_audio(lines[body_key])
+                if audio_path:
+                    self._count('synthesized')
+                    if os.path.exists(audio_path):
+                        os.unlink(audio_path)  # 캐시에 저장되었으므로 반환된 사본은 삭제
+                else:
+                    self._count('failed')
+
+        logger.info(f"✅ TTS 선행 합성 완료: {draft_id} 버전 {generation}")
+
+    def get_status(self) -> Dict[str, Any]:
+        """선행 합성 워커 상태"""
+        with self.lock:
+            active_drafts = len(self.generations)
+            stats = dict(self.stats)
+        return {
+            'queued_tasks': self.tasks.qsize(),
+            'active_drafts': active_drafts,
+            'engines': list(TTS_PREFETCH_ENGINES),
+            'stats': stats,
+            'cache': self.cache.get_stats(),
+        }
+
+
+# 전역 인스턴스
+tts_cache = TTSCache()
+tts_prefetcher = TTSPrefetcher(tts_cache)
@@ -26,6 +26,23 @@ LOG_LEVELS = {
     'thumbnail_generator': os.getenv('LOG_LEVEL_THUMBNAIL_GENERATOR', 'INFO'),
     'media_asset_manager': os.getenv('LOG_LEVEL_MEDIA_ASSET_MANAGER', 'INFO'),
     'cleanup_scheduler': os.getenv('LOG_LEVEL_CLEANUP_SCHEDULER', 'INFO'),
+    'tts_cache': os.getenv('LOG_LEVEL_TTS_CACHE', 'INFO'),
+    'segment_cache': os.getenv('LOG_LEVEL_SEGMENT_CACHE', 'INFO'),
+    'preview_service': os.getenv('LOG_LEVEL_PREVIEW_SERVICE', 'INFO'),
+    'segment_stream': os.getenv('LOG_LEVEL_SEGMENT_STREAM', 'INFO'),
+    'clip_registry': os.getenv('LOG_LEVEL_CLIP_REGISTRY', 'INFO'),
+    'scratch_space': os.getenv('LOG_LEVEL_SCRATCH_SPACE', 'INFO'),
+    'audio_mixer': os.getenv('LOG_LEVEL_AUDIO_MIXER', 'INFO'),
+    'bgm_catalog': os.getenv('LOG_LEVEL_BGM_CATALOG', 'INFO'),
+    'media_probe': os.getenv('LOG_LEVEL_MEDIA_PROBE', 'INFO'),
+    'audio_duration': os.getenv('LOG_LEVEL_AUDIO_DURATION', 'INFO'),
+    'composite_optimizer': os.getenv('LOG_LEVEL_COMPOSITE_OPTIMIZER', 'INFO'),
+    'job_progress': os.getenv('LOG_LEVEL_JOB_PROGRESS', 'INFO'),
+    'job_batches': os.getenv('LOG_LEVEL_JOB_BATCHES', 'INFO'),
+    'worker_heartbeat': os.getenv('LOG_LEVEL_WORKER_HEARTBEAT', 'INFO'),
+    'job_cost': os.getenv('LOG_LEVEL_JOB_COST', 'INFO'),
+    'notification_outbox': os.getenv('LOG_LEVEL_NOTIFICATION_OUTBOX', 'INFO'),
+    'job_fingerprint': os.getenv('LOG_LEVEL_JOB_FINGERPRINT', 'INFO'),
     'default': os.getenv('LOG_LEVEL_DEFAULT', 'INFO'),
 }
 
@@ -0,0 +1,159 @@
+"""
+작업 단계별 실행 시간 측정
+작업 1건 동안 단계(span)별 소요 시간, 처리 바이트/프레임 수, 메모리(RSS)를 기록
+
+메모리는 프로세스 평생 최대값(ru_maxrss)이 아니라 작업 중에 샘플링한 현재 RSS로 기록한다.
+장시간 실행되는 워커에서도 단계/작업별 값이 그 작업의 메모리 사용을 반영하도록.
+"""
+
+import os
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+# 작업 메타데이터에 보관할 개별 span 최대 개수 (단계별 합계는 항상 전체 반영)
+MAX_RECORDED_SPANS = 200
+# 작업 중 RSS 샘플링 간격 (초) - span 시작/종료 시점 사이의 최고치를 잡기 위해
+RSS_SAMPLE_SECONDS = float(os.getenv('STAGE_RSS_SAMPLE_SECONDS', '0.5'))
+
+# 현재 작업의 타이머 (렌더 스레드 풀에는 contextvars.copy_context로 전파)
+_active_timer = contextvars.ContextVar('stage_timer', default=None)
+
+
+def get_current_rss_mb() -> Optional[float]:
+    """현재 프로세스 RSS (MB, /proc 기반 - Linux 외에는 None)"""
+    try:
+        with open('/proc/self/statm') as f:
+            resident_pages = int(f.read().split()[1])
+        return round(resident_pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024), 1)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class StageTimer:
+    """작업 1건의 단계별 측정 기록 (여러 스레드에서 동시에 기록 가능)"""
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self.lock = threading.Lock()
+        self.spans: List[Dict[str, Any]] = []
+        self.started_at = time.time()
+        # 작업 시작 시점 RSS와 작업 중 샘플 최고치 (None이면 /proc 미지원 - 메모리 기록 생략)
+        self.baseline_rss_mb = get_current_rss_mb()
+        self.peak_rss_mb = self.baseline_rss_mb
+        self.open_spans: Dict[int, Dict[str, Any]] = {}
+        self.sampler_stop = threading.Event()
+
+    def sample_rss(self) -> Optional[float]:
+        """현재 RSS를 작업 최고치와 진행 중인 span들의 최고치에 반영"""
+        rss = get_current_rss_mb()
+        if rss is None:
+            return None
+        with self.lock:
+            self.peak_rss_mb = max(self.peak_rss_mb or 0.0, rss)
+            for record in self.open_spans.values():
+                record['peak_rss_mb'] = max(record.get('peak_rss_mb', 0.0), rss)
+        return rss
+
+    def _sample_loop(self):
+        while not self.sampler_stop.wait(RSS_SAMPLE_SECONDS):
+            self.sample_rss()
+
+    @contextmanager
+    def span(self, stage: str, **attrs):
+        """단계 측정 - 블록 안에서 yield된 dict에 bytes/frames 등을 채울 수 있음
+
+        예:
+            with timer.span('encode') as span:
+                ...
+                span['frames'] = frame_count
+        """
+        record = dict(attrs)
+        rss_start = self.sample_rss()
+        if rss_start is not None:
+            record['rss_start_mb'] = rss_start
+            record['peak_rss_mb'] = rss_start
+        with self.lock:
+            self.open_spans[id(record)] = record
+        start = time.perf_counter()
+        status = 'ok'
+        try:
+            yield record
+        except BaseException:
+            status = 'error'
+            raise
+        finally:
+            record['stage'] = stage
+            record['duration_ms'] = round((time.perf_counter() - start) * 1000, 1)
+            record['status'] = status
+            rss_end = self.sample_rss()
+            if rss_end is not None and rss_start is not None:
+                record['rss_end_mb'] = rss_end
+                record['rss_delta_mb'] = round(rss_end - rss_start, 1)
+            with self.lock:
+                self.open_spans.pop(id(record), None)
+                self.spans.append(record)
+
+    @contextmanager
+    def activate(self):
+        """이 타이머를 현재 컨텍스트의 활성 타이머로 지정 (활성 동안 RSS를 주기적으로 샘플링)"""
+        token = _active_timer.set(self)
+        sampler = None
+        if self.baseline_rss_mb is not None:
+            self.sampler_stop.clear()
+            sampler = threading.Thread(target=self._sample_loop, name=f"rss-{self.job_id[:8]}", daemon=True)
+            sampler.start()
+        try:
+            yield self
+        finally:
+            if sampler is not None:
+                self.sampler_stop.set()
+                sampler.join(timeout=RSS_SAMPLE_SECONDS + 1)
+            _active_timer.reset(token)
+
+    def summary(self) -> Dict[str, Any]:
+        """단계별 합계 + 개별 span 목록 (job 메타데이터 저장용)"""
+        with self.lock:
+            spans = list(self.spans)
+
+        stages: Dict[str, Dict[str, Any]] = {}
+        for record in spans:
+            stage = stages.setdefault(record['stage'], {
+                'count': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'bytes': 0, 'frames': 0, 'errors': 0
+            })
+            stage['count'] += 1
+            stage['total_ms'] = round(stage['total_ms'] + record['duration_ms'], 1)
+            stage['max_ms'] = max(stage['max_ms'], record['duration_ms'])
+            stage['bytes'] += int(record.get('bytes') or 0)
+            stage['frames'] += int(record.get('frames') or 0)
+            if record['status'] != 'ok':
+                stage['errors'] += 1
+            if record.get('peak_rss_mb') is not None:
+                stage['peak_rss_mb'] = max(stage.get('peak_rss_mb', 0.0), record['peak_rss_mb'])
+
+        self.sample_rss()
+        return {
+            'total_ms': round((time.time() - self.started_at) * 1000, 1),
+            'baseline_rss_mb': self.baseline_rss_mb,  # 작업 시작 시점 RSS
+            'peak_rss_mb': self.peak_rss_mb,          # 작업 중 샘플링한 RSS 최고치
+            'stages': stages,
+            'spans': spans[:MAX_RECORDED_SPANS],
+        }
+
+
+@contextmanager
+def stage_span(stage: str, **attrs):
+    """현재 활성 타이머에 단계 기록 (활성 타이머가 없으면 측정 없이 통과)"""
+    timer = _active_timer.get()
+    if timer is None:
+        yield dict(attrs)
+        return
+    with timer.span(stage, **attrs) as record:
+        yield record
+
+
+def get_active_timer() -> Optional[StageTimer]:
+    """현재 컨텍스트의 활성 타이머"""
+    return _active_timer.get()
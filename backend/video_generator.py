@@ -5,19 +5,36 @@ from PIL import Image, ImageDraw, ImageFont, ImageOps
 from moviepy.editor import *
 import numpy as np
 import uuid
-import tempfile
 import edge_tts
 import asyncio
 import re
 import base64
 import json
-import random
 import math
 import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
+from render_config import RenderConfig
+from clip_registry import ClipRegistry, track_clip
+from scratch_space import ScratchWorkspace, get_active_workspace, scratch_file, scratch_path, scratch_dir, release_scratch
+from audio_mixer import AUDIO_MIX_ENGINE, AudioInput, AudioMixPlan, render_audio_mix, mux_audio, extract_audio_pcm
+from media_probe import probe_media, has_audio
+from audio_duration import audio_duration
+from composite_optimizer import CompositeReport, compose_layers, concatenate_clips
+from segment_stream import (
+    should_stream, write_segment_file, close_clip_tree, decoder_slots,
+    MemoryGuard, SegmentReaderPool, streamed_segment_clip
+)
+from segment_cache import segment_cache
+from job_fingerprint import media_digest, media_quick_digest
 
 # 통합 로깅 시스템 import
 from utils.logger_config import get_logger
+from utils.stage_timer import stage_span
+from job_progress import report_stage, report_segment_done, encode_progress_logger
 logger = get_logger('video_generator')
 
 # Qwen TTS 서비스 import
@@ -37,6 +54,29 @@ except ImportError as e:
     QWEN_SPEAKERS = {}
     SPEED_PRESETS = {}
 
+# TTS 음성 캐시 import
+try:
+    from tts_cache import tts_cache
+    TTS_CACHE_AVAILABLE = True
+except ImportError as e:
+    logger.warning(f"⚠️ TTS 캐시 모듈 로드 실패: {e}")
+    tts_cache = None
+    TTS_CACHE_AVAILABLE = False
+
+# BGM 카탈로그 import (PCM 캐시 / 라우드니스 기반 더킹)
+try:
+    from bgm_catalog import bgm_catalog
+    BGM_CATALOG_AVAILABLE = True
+except ImportError as e:
+    logger.warning(f"⚠️ BGM 카탈로그 모듈 로드 실패: {e}")
+    bgm_catalog = None
+    BGM_CATALOG_AVAILABLE = False
+
+# 렌더 단계 그래프 동시 실행 수 (TTS / 미디어 준비 / 세그먼트 합성)
+RENDER_TTS_WORKERS = int(os.getenv('RENDER_TTS_WORKERS', '4'))
+RENDER_PREP_WORKERS = int(os.getenv('RENDER_PREP_WORKERS', '4'))
+RENDER_SEGMENT_WORKERS = int(os.getenv('RENDER_SEGMENT_WORKERS', '2'))
+
 # HEIC 파일 지원을 위한 pillow-heif
 try:
     from pillow_heif import register_heif_opener
@@ -45,23 +85,185 @@ try:
 except ImportError:
     logger.warning("⚠️ pillow-heif 미설치 - HEIC 파일 지원 불가")
 
+# 작업별 렌더 설정 / 미디어 준비 결과 (스레드·작업 간 격리, 렌더 스레드 풀로 전파)
+_active_render_config = contextvars.ContextVar('render_config', default=None)
+_active_prepared_sources = contextvars.ContextVar('prepared_sources', default=None)
+# 현재 합성 중인 세그먼트 (render_seed 난수 생성기의 범위 키)
+_active_rng_scope = contextvars.ContextVar('rng_scope', default=None)
+
+# 발음 사전은 읽기 전용이므로 프로세스 전체에서 1회만 로드
+_pronunciation_dict = None
+_pronunciation_dict_lock = threading.Lock()
+
+# 공유 생성기 인스턴스 (클래스별 1개)
+_shared_generators = {}
+_shared_generators_lock = threading.Lock()
+
+
+def get_pronunciation_dict():
+    """공유 발음 사전 반환 (최초 호출 시 로드)"""
+    global _pronunciation_dict
+    with _pronunciation_dict_lock:
+        if _pronunciation_dict is None:
+            from utils.pronunciation_dict import PronunciationDictionary
+            pronunciation_dict = PronunciationDictionary()
+            logger.info("📚 발음 사전 초기화 완료")
+
+            # 외부 사전 파일이 있으면 로드 (선택사항)
+            custom_dict_path = os.path.join(os.path.dirname(__file__), "pronunciation_dict.json")
+            if os.path.exists(custom_dict_path):
+                pronunciation_dict.load_from_file(custom_dict_path)
+                logger.info(f"📚 커스텀 발음 사전 로드: {custom_dict_path}")
+            _pronunciation_dict = pronunciation_dict
+        return _pronunciation_dict
+
+
+def get_shared_generator(generator_class=None):
+    """클래스별 공유 생성기 반환 (폰트/사전/TTS 모델을 재사용하는 warm 인스턴스)
+
+    작업별 설정은 RenderConfig로 전달하므로 여러 스레드가 동시에 사용해도 안전하다.
+    """
+    generator_class = generator_class or VideoGenerator
+    with _shared_generators_lock:
+        generator = _shared_generators.get(generator_class)
+        if generator is None:
+            generator = generator_class()
+            _shared_generators[generator_class] = generator
+            logger.info(f"♻️ 공유 생성기 생성: {generator_class.__name__}")
+        return generator
+
+
+# 로드된 폰트 캐시 ((경로, 크기, 굵기) → FreeTypeFont)
+_font_cache = {}
+_font_cache_lock = threading.Lock()
+
+
+def load_font(font_path, font_size, weight=None):
+    """폰트 로드 (프로세스 전체 캐시, Variable 폰트는 굵기별로 별도 캐시)
+
+    로드 실패 시 ImageFont.truetype과 동일하게 예외를 발생시킨다.
+    """
+    cache_key = (font_path, font_size, weight)
+    with _font_cache_lock:
+        font = _font_cache.get(cache_key)
+    if font is not None:
+        return font
+
+    font = ImageFont.truetype(font_path, font_size)
+    if weight is not None:
+        try:
+            font.set_variation_by_name('wght', weight)
+        except Exception as var_error:
+            print(f"⚠️ Variable 폰트 굵기 설정 실패 (기본 굵기 사용): {var_error}")
+
+    with _font_cache_lock:
+        _font_cache[cache_key] = font
+    return font
+
+
+def _config_property(name):
+    """현재 렌더 설정(RenderConfig)의 필드를 읽는 속성
+
+    직접 대입하면 인스턴스 기본 설정이 교체된다 (단독 사용 인스턴스 하위 호환용).
+    """
+    def getter(self):
+        return getattr(self.render_config, name)
+
+    def setter(self, value):
+        self._default_config = self._default_config.copy_with(**{name: value})
+
+    return property(getter, setter)
+
+
+class SharedPreparation:
+    """다중 출력 작업의 포맷별 렌더가 함께 쓰는 준비 단계 (TTS, 미디어 검증/회전 정규화)
+
+    같은 대사/미디어는 처음 요청한 렌더만 실제로 준비하고 나머지 렌더는 같은 Future를 기다린다.
+    포맷과 무관한 단계만 공유하며 레이아웃/합성/인코딩은 포맷별로 따로 수행한다.
+    준비 단계 임시 파일은 모든 렌더가 끝난 뒤 close()에서 정리한다.
+    """
+
+    def __init__(self, tts_engine: str = 'edge'):
+        tts_workers = 1 if tts_engine == 'qwen' else RENDER_TTS_WORKERS  # Qwen 모델은 단일 레인
+        self.tts_pool = ThreadPoolExecutor(max_workers=tts_workers, thread_name_prefix='shared-tts')
+        self.prep_pool = ThreadPoolExecutor(max_workers=RENDER_PREP_WORKERS, thread_name_prefix='shared-prep')
+        self.lock = threading.Lock()
+        self.tts_futures = {}
+        self.media_futures = {}
+        self.prepared_sources = {}  # 원본 경로 → (준비된 경로, 임시파일 여부) - 모든 렌더가 같은 dict 사용
+        self.reused = 0
+
+    def tts_future(self, generator, body_key, text, voice_narration, subtitle_duration):
+        """대사 TTS Future (같은 대사 + 같은 TTS 설정이면 기존 Future 재사용)"""
+        config = generator.render_config.for_body(body_key)
+        key = (body_key, text, voice_narration, subtitle_duration, config.tts_engine, config.qwen_speaker,
+               config.qwen_speed, config.qwen_style, config.edge_speaker, config.edge_speed, config.edge_pitch)
+        return self._get_or_submit(self.tts_futures, key, self.tts_pool, generator._synthesize_body_tts,
+                                   body_key, text, voice_narration, subtitle_duration)
+
+    def media_future(self, generator, media_path):
+        """미디어 준비 Future (검증/회전 정규화 결과는 prepared_sources에 등록)"""
+        return self._get_or_submit(self.media_futures, media_path, self.prep_pool,
+                                   generator._prepare_media_source, media_path)
+
+    def _get_or_submit(self, futures, key, pool, fn, *args):
+        with self.lock:
+            future = futures.get(key)
+            if future is None:
+                future = VideoGenerator._submit_in_context(pool, fn, *args)
+                futures[key] = future
+            else:
+                self.reused += 1
+            return future
+
+    def close(self):
+        """공유 스레드 풀 종료 + 준비 단계 임시 파일 정리"""
+        self.tts_pool.shutdown(wait=True)
+        self.prep_pool.shutdown(wait=True)
+        for prepared_path, is_temp in list(self.prepared_sources.values()):
+            if is_temp and os.path.exists(prepared_path):
+                try:
+                    os.remove(prepared_path)
+                except OSError:
+                    pass
+        self.prepared_sources.clear()
+        logger.info(f"♻️ 공유 준비 단계 종료: TTS {len(self.tts_futures)}개, 미디어 {len(self.media_futures)}개, 재사용 {self.reused}회")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
 class VideoGenerator:
+    # 렌더 설정 필드 (작업 중에는 RenderConfig에서, 그 외에는 인스턴스 기본 설정에서 읽음)
+    video_width = _config_property('video_width')
+    video_height = _config_property('video_height')
+    title_height = _config_property('title_height')
+    work_height_keep = _config_property('work_height_keep')
+    work_height_remove = _config_property('work_height_remove')
+    text_y_top = _config_property('text_y_top')
+    text_y_bottom = _config_property('text_y_bottom')
+    text_y_bottom_edge_margin = _config_property('text_y_bottom_edge_margin')
+    panning_range = _config_property('panning_range')
+    tts_engine = _config_property('tts_engine')
+    qwen_speaker = _config_property('qwen_speaker')
+    qwen_speed = _config_property('qwen_speed')
+    qwen_style = _config_property('qwen_style')
+    edge_speaker = _config_property('edge_speaker')
+    edge_speed = _config_property('edge_speed')
+    edge_pitch = _config_property('edge_pitch')
+    per_body_tts_settings = _config_property('per_body_tts_settings')
+
     def __init__(self):
         # 통합 로깅 시스템 사용 (더 이상 개별 로그 파일 생성 안함)
         logger.info("🎬 VideoGenerator 초기화")
 
-        self.video_width = 504
-        self.video_height = 890  # 쇼츠/릴스 해상도 (504x890)
+        # 기본 렌더 설정 (릴스 504x890, Edge TTS) - 작업별 설정은 RenderConfig로 전달
+        self._default_config = self.base_render_config()
         self.fps = 30
 
-        # 레이아웃 설정 (릴스 기본값)
-        self.title_height = 220
-        self.work_height_keep = 670      # title_area_mode='keep'일 때 (video_height - title_height)
-        self.work_height_remove = 890    # title_area_mode='remove'일 때 (video_height)
-        self.text_y_top = 430            # 상단 텍스트 영역 중앙 Y
-        self.text_y_bottom = 610         # 하단 텍스트 영역 중앙 Y
-        self.text_y_bottom_edge_margin = 80  # 최하단 텍스트 여백
-        self.panning_range = 60          # 패닝 최대 범위 (px)
         self.font_path = os.path.join(os.path.dirname(__file__), "font", "BMYEONSUNG_otf.otf")
 
         # Naver Clova Voice 설정 (환경변수에서 가져오기)
@@ -72,56 +274,96 @@ class VideoGenerator:
         self.azure_speech_key = os.getenv('AZURE_SPEECH_KEY')
         self.azure_speech_region = os.getenv('AZURE_SPEECH_REGION', 'koreacentral')
 
-        # 발음 사전 초기화 (다국어 → 한글 발음 변환)
-        from utils.pronunciation_dict import PronunciationDictionary
-        self.pronunciation_dict = PronunciationDictionary()
-        logger.info("📚 발음 사전 초기화 완료")
+        # 발음 사전 (다국어 → 한글 발음 변환, 프로세스 전체 공유)
+        self.pronunciation_dict = get_pronunciation_dict()
 
-        # 외부 사전 파일이 있으면 로드 (선택사항)
-        custom_dict_path = os.path.join(os.path.dirname(__file__), "pronunciation_dict.json")
-        if os.path.exists(custom_dict_path):
-            self.pronunciation_dict.load_from_file(custom_dict_path)
-            logger.info(f"📚 커스텀 발음 사전 로드: {custom_dict_path}")
-
-        # Qwen TTS 서비스 초기화 (지연 로딩)
+        # Qwen TTS 서비스 초기화 (지연 로딩) - 단일 모델이므로 호출은 락으로 직렬화
         self.qwen_tts_service = None
-        self.tts_engine = "edge"  # 기본 TTS 엔진: edge
-        self.qwen_speaker = "Sohee"  # 기본 Qwen 화자 (한국어)
-        self.qwen_speed = "normal"   # 기본 Qwen 속도
-        self.qwen_style = "neutral"  # 기본 Qwen 스타일
-        self.per_body_tts_settings = None  # 대사별 TTS 설정 (None이면 전역 설정 사용)
-        self.edge_speaker = "female"   # 기본 Edge 화자
-        self.edge_speed = "normal"     # 기본 Edge 속도
-        self.edge_pitch = "normal"     # 기본 Edge 톤
+        self._qwen_lock = threading.Lock()
         logger.info(f"🎤 기본 TTS 엔진: {self.tts_engine}")
 
+    # ==================== 렌더 설정 ====================
+
+    def base_render_config(self, video_format: str = 'reels'):
+        """이 생성기의 포맷별 기본 렌더 설정"""
+        return RenderConfig.for_format(video_format)
+
+    def build_render_config(self, video_format: str = 'reels', tts_engine: str = 'edge', qwen_speaker: str = None,
+                            qwen_speed: str = None, qwen_style: str = None, per_body_tts_settings: dict = None,
+                            edge_speaker: str = None, edge_speed: str = None, edge_pitch: str = None,
+                            render_seed: int = None, reuse_segments: bool = False):
+        """작업 파라미터로 불변 렌더 설정 생성 (render_seed를 주면 랜덤 선택이 재현 가능,
+        reuse_segments는 수정 텍스트 재렌더 - 세그먼트 캐시 사용)"""
+        return self.base_render_config(video_format).with_tts(
+            tts_engine, qwen_speaker, qwen_speed, qwen_style,
+            per_body_tts_settings=per_body_tts_settings or {},
+            edge_speaker=edge_speaker, edge_speed=edge_speed, edge_pitch=edge_pitch
+        ).copy_with(render_seed=render_seed, reuse_segments=reuse_segments)
+
+    @property
+    def render_config(self):
+        """현재 스레드/작업에 적용 중인 렌더 설정 (없으면 인스턴스 기본 설정)"""
+        return _active_render_config.get() or self._default_config
+
+    @contextmanager
+    def use_render_config(self, config):
+        """with 블록 안에서만 지정한 렌더 설정 적용 (인스턴스 상태는 변경하지 않음)"""
+        token = _active_render_config.set(config)
+        try:
+            yield config
+        finally:
+            _active_render_config.reset(token)
+
+    @contextmanager
+    def _rng_scope(self, scope):
+        """with 블록 안의 랜덤 선택을 scope(세그먼트 등) 단위 난수열로 고정"""
+        token = _active_rng_scope.set(scope)
+        try:
+            yield scope
+        finally:
+            _active_rng_scope.reset(token)
+
+    def _render_rng(self, purpose, media_path=None):
+        """현재 렌더의 랜덤 선택용 생성기 (세그먼트 합성 중이면 세그먼트 번호, 아니면 미디어 파일명으로 범위 고정)"""
+        scope = _active_rng_scope.get()
+        if scope is None:
+            scope = os.path.basename(media_path) if media_path else ''
+        return self.render_config.rng(scope, purpose)
+
+    @property
+    def _prepared_sources(self):
+        """현재 렌더의 미디어 준비 결과 (원본 경로 → (준비된 경로, 임시파일 여부))"""
+        prepared_sources = _active_prepared_sources.get()
+        return prepared_sources if prepared_sources is not None else {}
+
+    @staticmethod
+    def _submit_in_context(pool, fn, *args, **kwargs):
+        """현재 렌더 설정을 유지한 채 스레드 풀에 작업 제출"""
+        return pool.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
     def set_video_format(self, video_format: str):
         """
-        영상 포맷 설정 (레이아웃 관련 인스턴스 변수 일괄 변경)
+        영상 포맷 설정 (인스턴스 기본 렌더 설정의 레이아웃 교체)
+
+        단독 사용 인스턴스용 하위 호환 API. 공유 생성기에서는 build_render_config()로
+        만든 RenderConfig를 작업마다 전달한다.
 
         Args:
             video_format: 'reels' (세로 504x890) 또는 'youtube' (가로 1280x720)
         """
-        if video_format == 'youtube':
-            self.video_width = 1280
-            self.video_height = 720
-            self.title_height = 120
-            self.work_height_keep = 600
-            self.work_height_remove = 720
-            self.text_y_top = 340
-            self.text_y_bottom = 520
-            self.text_y_bottom_edge_margin = 60
-            self.panning_range = 60
-        else:  # reels (기본값)
-            self.video_width = 504
-            self.video_height = 890
-            self.title_height = 220
-            self.work_height_keep = 670
-            self.work_height_remove = 890
-            self.text_y_top = 430
-            self.text_y_bottom = 610
-            self.text_y_bottom_edge_margin = 80
-            self.panning_range = 60
+        layout = RenderConfig.for_format(video_format)
+        self._default_config = self._default_config.copy_with(
+            video_format=layout.video_format,
+            video_width=layout.video_width,
+            video_height=layout.video_height,
+            title_height=layout.title_height,
+            work_height_keep=layout.work_height_keep,
+            work_height_remove=layout.work_height_remove,
+            text_y_top=layout.text_y_top,
+            text_y_bottom=layout.text_y_bottom,
+            text_y_bottom_edge_margin=layout.text_y_bottom_edge_margin,
+            panning_range=layout.panning_range,
+        )
         logger.info(f"🎬 영상 포맷 설정: {video_format} ({self.video_width}x{self.video_height})")
 
     def get_video_rotation(self, video_path):
@@ -224,6 +466,11 @@ class VideoGenerator:
         Returns:
             tuple: (사용할_비디오_경로, 임시파일_여부)
         """
+        # 미디어 준비 단계에서 이미 정규화된 경우 재사용 (임시 파일 정리는 준비 단계가 담당)
+        prepared = self._prepared_sources.get(video_path)
+        if prepared:
+            return prepared[0], False
+
         rotation = self.get_video_rotation(video_path)
 
         if rotation == 0:
@@ -232,22 +479,23 @@ class VideoGenerator:
 
         print(f"🔄 비디오 회전 정상화 시작: {rotation}° → 0° ({os.path.basename(video_path)})")
 
-        # 임시 파일 경로 생성
-        temp_dir = tempfile.gettempdir()
-        base_name = os.path.splitext(os.path.basename(video_path))[0]
-        temp_path = os.path.join(temp_dir, f"rotfix_{base_name}_{uuid.uuid4().hex[:8]}.mp4")
+        # 임시 파일 경로 생성 (작업 공간)
+        temp_path = scratch_path('.mp4', 'rotation')
 
         try:
             # FFmpeg로 회전 적용 + 메타데이터 제거
             # FFmpeg은 자동으로 rotation 메타데이터를 적용하여 프레임을 올바른 방향으로 출력
-            result = subprocess.run(
-                ['ffmpeg', '-i', video_path,
-                 '-c:v', 'libx264', '-preset', 'ultrafast', '-crf', '18',
-                 '-an',       # 오디오 불필요 (TTS 별도 사용)
-                 '-y',        # 기존 파일 덮어쓰기
-                 temp_path],
-                capture_output=True, text=True, timeout=120
-            )
+            with stage_span('rotation_normalize', rotation=rotation) as span:
+                result = subprocess.run(
+                    ['ffmpeg', '-i', video_path,
+                     '-c:v', 'libx264', '-preset', 'ultrafast', '-crf', '18',
+                     '-an',       # 오디오 불필요 (TTS 별도 사용)
+                     '-y',        # 기존 파일 덮어쓰기
+                     temp_path],
+                    capture_output=True, text=True, timeout=120
+                )
+                if os.path.exists(temp_path):
+                    span['bytes'] = os.path.getsize(temp_path)
 
             if result.returncode == 0 and os.path.exists(temp_path):
                 # 변환 후 실제 크기 확인
@@ -279,7 +527,7 @@ class VideoGenerator:
 
     def set_tts_engine(self, engine: str, speaker: str = None, speed: str = None, style: str = None, per_body_tts_settings: dict = None, edge_speaker: str = None, edge_speed: str = None, edge_pitch: str = None):
         """
-        TTS 엔진 설정
+        TTS 엔진 설정 (인스턴스 기본 렌더 설정 교체, 단독 사용 인스턴스용 하위 호환 API)
 
         Args:
             engine: 'edge' 또는 'qwen'
@@ -293,35 +541,18 @@ class VideoGenerator:
         """
         if engine not in ['edge', 'qwen']:
             logger.warning(f"⚠️ 알 수 없는 TTS 엔진 '{engine}', 기본값 'edge' 사용")
-            engine = 'edge'
-
-        self.tts_engine = engine
-        logger.info(f"🎤 TTS 엔진 설정: {engine}")
 
-        if engine == 'edge':
-            if edge_speaker:
-                self.edge_speaker = edge_speaker
-            if edge_speed:
-                self.edge_speed = edge_speed
-            if edge_pitch:
-                self.edge_pitch = edge_pitch
+        self._default_config = self._default_config.with_tts(
+            engine, speaker, speed, style, per_body_tts_settings=per_body_tts_settings,
+            edge_speaker=edge_speaker, edge_speed=edge_speed, edge_pitch=edge_pitch
+        )
+        logger.info(f"🎤 TTS 엔진 설정: {self.tts_engine}")
+        if self.tts_engine == 'edge':
             logger.info(f"🔊 Edge TTS 설정: 화자={self.edge_speaker}, 속도={self.edge_speed}, 톤={self.edge_pitch}")
-        elif engine == 'qwen':
-            if speaker:
-                self.qwen_speaker = speaker
-                logger.info(f"🎤 Qwen 화자 설정: {speaker}")
-            if speed:
-                self.qwen_speed = speed
-                logger.info(f"⏱️ Qwen 속도 설정: {speed}")
-            if style:
-                self.qwen_style = style
-                logger.info(f"🎭 Qwen 스타일 설정: {style}")
-
-        # 대사별 TTS 설정 저장 (명시적으로 전달된 경우에만 덮어쓰기)
-        if per_body_tts_settings is not None:
-            self.per_body_tts_settings = per_body_tts_settings
-            if per_body_tts_settings:
-                logger.info(f"🎭 대사별 TTS 설정 적용: {list(per_body_tts_settings.keys())}")
+        else:
+            logger.info(f"🎤 Qwen 설정: 화자={self.qwen_speaker}, 속도={self.qwen_speed}, 스타일={self.qwen_style}")
+        if self.per_body_tts_settings:
+            logger.info(f"🎭 대사별 TTS 설정 적용: {list(self.per_body_tts_settings.keys())}")
 
     def _init_qwen_tts(self):
         """Qwen TTS 서비스 지연 초기화"""
@@ -342,21 +573,24 @@ class VideoGenerator:
         try:
             logger.info(f"🎙️ Qwen TTS 생성 중: {text[:50]}...")
 
-            # Qwen TTS 서비스 초기화 확인
-            if not self._init_qwen_tts():
-                logger.warning("⚠️ Qwen TTS 사용 불가, Edge TTS로 폴백")
-                return self.create_tts_audio_edge(text, lang)
-
-            # 화자, 속도, 스타일 설정 업데이트
-            self.qwen_tts_service.set_speaker(self.qwen_speaker)
-            self.qwen_tts_service.set_speed(self.qwen_speed)
-            self.qwen_tts_service.set_style(self.qwen_style)
-
             # 텍스트 전처리
             processed_text = self.preprocess_korean_text(text)
+            config = self.render_config
+
+            # 단일 모델 공유: 초기화 + 화자/속도/스타일 설정 + 생성을 하나의 임계 구역으로 처리
+            with self._qwen_lock:
+                # Qwen TTS 서비스 초기화 확인
+                if not self._init_qwen_tts():
+                    logger.warning("⚠️ Qwen TTS 사용 불가, Edge TTS로 폴백")
+                    return self.create_tts_audio_edge(text, lang)
+
+                # 화자, 속도, 스타일 설정 업데이트
+                self.qwen_tts_service.set_speaker(config.qwen_speaker)
+                self.qwen_tts_service.set_speed(config.qwen_speed)
+                self.qwen_tts_service.set_style(config.qwen_style)
 
-            # Qwen TTS로 음성 생성
-            audio_path = self.qwen_tts_service.generate(processed_text, output_format="mp3")
+                # Qwen TTS로 음성 생성
+                audio_path = self.qwen_tts_service.generate(processed_text, output_format="mp3")
 
             if audio_path and os.path.exists(audio_path):
                 logger.info(f"✅ Qwen TTS 원본 생성 완료: {audio_path}")
@@ -378,7 +612,7 @@ class VideoGenerator:
                     'fast': 1.5,
                     'very_fast': 1.8,
                 }
-                speed_factor = qwen_speed_factors.get(self.qwen_speed, 1.0)
+                speed_factor = qwen_speed_factors.get(config.qwen_speed, 1.0)
                 if speed_factor != 1.0:
                     speed_adjusted_path = self.speed_up_audio(audio_path, speed_factor=speed_factor)
                     if speed_adjusted_path != audio_path and os.path.exists(speed_adjusted_path):
@@ -423,7 +657,7 @@ class VideoGenerator:
                 logger.info(f"📈 볼륨 증폭: +{boost_db:.1f}dB")
 
             # 새 파일로 저장
-            output_path = tempfile.NamedTemporaryFile(delete=False, suffix='.mp3').name
+            output_path = scratch_path('.mp3', 'tts')
             normalized_audio.export(output_path, format="mp3")
 
             final_dbfs = normalized_audio.dBFS
@@ -462,7 +696,7 @@ class VideoGenerator:
             logger.info(f"🔊 Edge TTS 옵션: voice={voice}, rate={rate}, pitch={pitch}")
 
             # edge-tts는 async이므로 asyncio.run() 사용
-            original_temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.mp3')
+            original_temp_file = scratch_file('.mp3', 'tts')
             original_temp_file.close()
 
             async def _generate():
@@ -600,7 +834,7 @@ class VideoGenerator:
             draw.text((x, y), text, font=font, fill=(255, 255, 255))
             
             # 임시 파일로 저장
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.jpg')
+            temp_file = scratch_file('.jpg', 'media')
             img.save(temp_file.name, "JPEG", quality=85)
             temp_file.close()
             
@@ -630,7 +864,7 @@ class VideoGenerator:
                 raise Exception(f"이미지 파일이 너무 작습니다: {len(response.content)} bytes")
             
             # 임시 파일로 저장
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.jpg')
+            temp_file = scratch_file('.jpg', 'media')
             temp_file.write(response.content)
             temp_file.close()
             
@@ -759,28 +993,24 @@ class VideoGenerator:
         # 타이틀 폰트 설정
         title_font_path = os.path.join(os.path.dirname(__file__), "font", title_font)
         try:
-            font = ImageFont.truetype(title_font_path, title_font_size)
-
             # Variable 폰트의 경우 굵기 설정
             if 'variable' in title_font.lower() or 'vf' in title_font.lower():
-                try:
-                    weight = 600  # 타이틀은 SemiBold
-                    font.set_variation_by_name('wght', weight)
-                    print(f"✅ Variable 타이틀 폰트 로드 성공: {title_font} ({title_font_size}pt, weight={weight})")
-                except Exception as var_error:
-                    print(f"⚠️ Variable 폰트 굵기 설정 실패 (기본 굵기 사용): {var_error}")
+                weight = 600  # 타이틀은 SemiBold
+                font = load_font(title_font_path, title_font_size, weight)
+                print(f"✅ Variable 타이틀 폰트 로드 성공: {title_font} ({title_font_size}pt, weight={weight})")
             else:
+                font = load_font(title_font_path, title_font_size)
                 print(f"✅ 타이틀 폰트 로드 성공: {title_font} ({title_font_size}pt)")
         except Exception as e:
             print(f"❌ 타이틀 폰트 로드 실패 ({title_font}): {e}")
             # 기본 폰트로 fallback
             try:
-                font = ImageFont.truetype(self.font_path, title_font_size)
+                font = load_font(self.font_path, title_font_size)
                 print(f"✅ 기본 타이틀 폰트로 fallback: {self.font_path}")
             except Exception as e2:
                 print(f"❌ 기본 타이틀 폰트도 실패: {e2}")
                 try:
-                    font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", title_font_size)
+                    font = load_font("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", title_font_size)
                 except:
                     font = ImageFont.load_default()
         
@@ -837,7 +1067,7 @@ class VideoGenerator:
         emoji_font = None
         if emoji_font_path:
             try:
-                emoji_font = ImageFont.truetype(emoji_font_path, 44)  # 22 → 44로 2배 증가
+                emoji_font = load_font(emoji_font_path, 44)  # 22 → 44로 2배 증가
             except:
                 emoji_font = None
         
@@ -898,7 +1128,7 @@ class VideoGenerator:
                 current_x += word_width
         
         # 임시 파일로 저장
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.png')
+        temp_file = scratch_file('.png', 'text')
         img.save(temp_file.name, "PNG")
         temp_file.close()
         
@@ -925,29 +1155,25 @@ class VideoGenerator:
 
         # 한글 폰트 설정
         try:
-            font = ImageFont.truetype(font_path, font_size)
-
             # Variable 폰트의 경우 굵기 설정 (Pretendard Variable 등)
             if 'variable' in selected_font.lower() or 'vf' in selected_font.lower():
-                try:
-                    # Variable 폰트의 weight 설정 (400=Regular, 600=SemiBold, 700=Bold)
-                    weight = 600 if is_title else 500  # 타이틀은 SemiBold, 본문은 Medium
-                    font.set_variation_by_name('wght', weight)
-                    print(f"✅ Variable 폰트 굵기 설정: {selected_font} ({font_size}pt, weight={weight})")
-                except Exception as var_error:
-                    print(f"⚠️ Variable 폰트 굵기 설정 실패 (기본 굵기 사용): {var_error}")
+                # Variable 폰트의 weight 설정 (400=Regular, 600=SemiBold, 700=Bold)
+                weight = 600 if is_title else 500  # 타이틀은 SemiBold, 본문은 Medium
+                font = load_font(font_path, font_size, weight)
+                print(f"✅ Variable 폰트 굵기 설정: {selected_font} ({font_size}pt, weight={weight})")
             else:
+                font = load_font(font_path, font_size)
                 print(f"✅ 폰트 로드 성공: {selected_font} ({font_size}pt)")
         except Exception as e:
             print(f"❌ 사용자 폰트 로드 실패 ({selected_font}): {e}")
             # 기본 폰트로 fallback
             try:
-                font = ImageFont.truetype(self.font_path, font_size)
+                font = load_font(self.font_path, font_size)
                 print(f"✅ 기본 폰트로 fallback: {self.font_path}")
             except Exception as e2:
                 print(f"❌ 기본 폰트도 실패: {e2}")
                 try:
-                    font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", font_size)
+                    font = load_font("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", font_size)
                 except:
                     font = ImageFont.load_default()
         
@@ -1009,7 +1235,7 @@ class VideoGenerator:
         emoji_font = None
         if emoji_font_path:
             try:
-                emoji_font = ImageFont.truetype(emoji_font_path, 32)  # 36pt 본문에 맞춘 이모지 크기
+                emoji_font = load_font(emoji_font_path, 32)  # 36pt 본문에 맞춘 이모지 크기
             except:
                 emoji_font = None
         
@@ -1028,7 +1254,7 @@ class VideoGenerator:
             self._render_text_with_outline(draw, lines, font, emoji_font, width, start_y, line_height, font_size)
         
         # 임시 파일로 저장
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.png')
+        temp_file = scratch_file('.png', 'text')
         img.save(temp_file.name, "PNG")
         temp_file.close()
         
@@ -1204,6 +1430,11 @@ class VideoGenerator:
 
     def _ensure_valid_image(self, image_path):
         """이미지 파일 검증 및 포맷 자동변환. 유효한 이미지 경로 반환 (실패 시 None)"""
+        # 미디어 준비 단계에서 이미 검증된 경우 재사용
+        prepared = self._prepared_sources.get(image_path)
+        if prepared:
+            return prepared[0]
+
         try:
             with Image.open(image_path) as img:
                 img.verify()  # 파일 무결성 검증
@@ -1292,7 +1523,7 @@ class VideoGenerator:
                     print(f"🔳 RGBA → RGB 변환 완료")
                 
                 # 임시 파일로 저장
-                temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.jpg')
+                temp_file = scratch_file('.jpg', 'media')
                 resized_img.save(temp_file.name, 'JPEG', quality=95)
                 
                 print(f"🔳 최종 리사이즈: → 716x716")
@@ -1403,7 +1634,7 @@ class VideoGenerator:
                     print(f"🔳 RGBA → RGB 변환 완료")
 
                 # 임시 파일로 저장 (고품질)
-                temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.jpg')
+                temp_file = scratch_file('.jpg', 'media')
                 resized_img.save(temp_file.name, 'JPEG', quality=95)
                 processed_image_path = temp_file.name
                 print(f"💾 고품질 임시 파일 생성: {processed_image_path}")
@@ -1419,7 +1650,7 @@ class VideoGenerator:
                 if image_aspect_ratio > work_aspect_ratio:
                     # 가로형 이미지: 좌우 패닝
                     pan_range = min(self.panning_range, (resized_width - work_width) // 2)
-                    pattern = random.randint(1, 2)
+                    pattern = self._render_rng('panning', image_path).randint(1, 2)
 
                     if pattern == 1:
                         # 패턴 1: 좌 → 우 패닝
@@ -1442,7 +1673,7 @@ class VideoGenerator:
                 else:
                     # 세로형 이미지: 상하 패닝
                     pan_range = min(self.panning_range, (resized_height - work_height) // 2)
-                    pattern = random.randint(3, 4)
+                    pattern = self._render_rng('panning', image_path).randint(3, 4)
 
                     if pattern == 3:
                         # 패턴 3: 위 → 아래 패닝
@@ -1498,7 +1729,7 @@ class VideoGenerator:
                 except AttributeError:
                     resized_fallback = fallback_img.resize((new_w, new_h), Image.LANCZOS)
 
-                fallback_temp = tempfile.NamedTemporaryFile(delete=False, suffix='.jpg')
+                fallback_temp = scratch_file('.jpg', 'media')
                 resized_fallback.save(fallback_temp.name, 'JPEG', quality=95)
                 fallback_clip = ImageClip(fallback_temp.name).set_duration(duration).set_position((0, self.title_height))
                 os.unlink(fallback_temp.name)
@@ -1553,7 +1784,7 @@ class VideoGenerator:
             if enable_panning:
                 # === 패닝 활성화: 기존 패닝 로직 ===
                 # 2가지 패닝 패턴 중 랜덤 선택
-                pattern = random.randint(1, 2)
+                pattern = self._render_rng('panning', image_path).randint(1, 2)
 
                 if pattern == 1:
                     # 패턴 1: 연속 좌 → 우 패닝 (Linear 이징 + 60px 이동)
@@ -1616,7 +1847,7 @@ class VideoGenerator:
                     resized_pil = background
 
                 # 새 임시 파일로 저장
-                resized_temp_file = tempfile.NamedTemporaryFile(suffix='.jpg', delete=False)
+                resized_temp_file = scratch_file('.jpg', 'media')
                 resized_pil.save(resized_temp_file.name, format='JPEG', quality=95)
                 resized_temp_file.close()
 
@@ -1690,7 +1921,7 @@ class VideoGenerator:
         try:
             # 비디오 파일 로드 (정규화된 파일 사용)
             logger.debug(f"🔍 [DEBUG] VideoFileClip() 호출 시작 (경로: {normalized_path})")
-            video_clip = VideoFileClip(normalized_path)
+            video_clip = track_clip(VideoFileClip(normalized_path))
             logger.debug(f"🔍 [DEBUG] VideoFileClip() 호출 성공")
 
             # 비디오 메타데이터 검증
@@ -1837,7 +2068,7 @@ class VideoGenerator:
                     pan_range = min(self.panning_range, (resized_width - work_width) // 2)  # 최대 60px 또는 여유 공간의 절반
 
                     # 2가지 좌우 패닝 패턴 중 랜덤 선택
-                    pattern = random.randint(1, 2)
+                    pattern = self._render_rng('panning', video_path).randint(1, 2)
 
                     if pattern == 1:
                         # 패턴 1: 좌 → 우 패닝
@@ -1911,7 +2142,7 @@ class VideoGenerator:
                     pan_range = min(self.panning_range, (resized_height - work_height) // 2)  # 최대 60px 또는 여유 공간의 절반
 
                     # 2가지 상하 패닝 패턴 중 랜덤 선택
-                    pattern = random.randint(3, 4)  # 패턴 3, 4로 구분
+                    pattern = self._render_rng('panning', video_path).randint(3, 4)  # 패턴 3, 4로 구분
 
                     if pattern == 3:
                         # 패턴 3: 위 → 아래 패닝
@@ -1992,7 +2223,7 @@ class VideoGenerator:
             response = requests.post(url, headers=headers, data=data)
             
             if response.status_code == 200:
-                temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.mp3')
+                temp_file = scratch_file('.mp3', 'tts')
                 temp_file.write(response.content)
                 temp_file.close()
                 print(f"네이버 TTS 생성 완료: {temp_file.name}")
@@ -2033,7 +2264,7 @@ class VideoGenerator:
             response = requests.post(url, headers=headers, data=ssml.encode('utf-8'))
             
             if response.status_code == 200:
-                temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.mp3')
+                temp_file = scratch_file('.mp3', 'tts')
                 temp_file.write(response.content)
                 temp_file.close()
                 print(f"Azure TTS 생성 완료: {temp_file.name}")
@@ -2056,12 +2287,36 @@ class VideoGenerator:
         """
         logger.info(f"🎤 TTS 생성 요청 (엔진: {self.tts_engine}): {text[:50]}...")
 
-        if self.tts_engine == 'qwen':
-            if not QWEN_TTS_AVAILABLE:
-                logger.warning("⚠️ TTS 'qwen' 요청 → QWEN_TTS_AVAILABLE=False → Edge 폴백!")
-            else:
-                return self.create_tts_audio_qwen(text, lang)
-        return self.create_tts_audio_edge(text, lang)
+        # 캐시 확인 (편집 중 선행 합성 또는 이전 작업에서 생성된 음성 재사용)
+        cache_key = None
+        if TTS_CACHE_AVAILABLE:
+            cache_key = self.tts_cache_key(text)
+            cached_path = tts_cache.get(cache_key)
+            if cached_path:
+                logger.info(f"♻️ TTS 캐시 적중: {text[:30]}...")
+                return cached_path
+
+        if self.tts_engine == 'qwen' and not QWEN_TTS_AVAILABLE:
+            logger.warning("⚠️ TTS 'qwen' 요청 → QWEN_TTS_AVAILABLE=False → Edge 폴백!")
+
+        if self.tts_engine == 'qwen' and QWEN_TTS_AVAILABLE:
+            audio_path = self.create_tts_audio_qwen(text, lang)
+        else:
+            audio_path = self.create_tts_audio_edge(text, lang)
+
+        if cache_key and audio_path:
+            tts_cache.put(cache_key, audio_path)
+        return audio_path
+
+    def tts_cache_key(self, text):
+        """현재 TTS 설정과 전처리된 텍스트로 캐시 키 생성"""
+        if self.tts_engine == 'qwen' and QWEN_TTS_AVAILABLE:
+            engine = 'qwen'
+            voice = {'speaker': self.qwen_speaker, 'speed': self.qwen_speed, 'style': self.qwen_style}
+        else:
+            engine = 'edge'
+            voice = {'speaker': self.edge_speaker, 'speed': self.edge_speed, 'pitch': self.edge_pitch}
+        return tts_cache.make_key(engine, voice, self.preprocess_korean_text(text))
     
     def speed_up_audio(self, audio_path, speed_factor=1.5):
         """고급 오디오 속도 조정 (다중 알고리즘 지원)"""
@@ -2111,7 +2366,7 @@ class VideoGenerator:
             raise Exception("FFmpeg가 설치되지 않았습니다")
         
         # 출력 파일 생성
-        speed_adjusted_file = tempfile.NamedTemporaryFile(delete=False, suffix='.mp3')
+        speed_adjusted_file = scratch_file('.mp3', 'tts')
         speed_adjusted_file.close()
         
         # FFmpeg 명령어로 속도 조정 (atempo 필터 사용)
@@ -2167,7 +2422,7 @@ class VideoGenerator:
         new_duration = speed_adjusted_clip.duration
         
         # 파일 저장
-        speed_adjusted_file = tempfile.NamedTemporaryFile(delete=False, suffix='.mp3')
+        speed_adjusted_file = scratch_file('.mp3', 'tts')
         speed_adjusted_clip.write_audiofile(
             speed_adjusted_file.name, 
             verbose=False, 
@@ -2203,7 +2458,7 @@ class VideoGenerator:
         speed_adjusted_audio = speed_adjusted_audio.set_frame_rate(audio.frame_rate)
         
         # 파일 저장
-        speed_adjusted_file = tempfile.NamedTemporaryFile(delete=False, suffix='.mp3')
+        speed_adjusted_file = scratch_file('.mp3', 'tts')
         speed_adjusted_audio.export(speed_adjusted_file.name, format="mp3")
         speed_adjusted_file.close()
         
@@ -2222,7 +2477,7 @@ class VideoGenerator:
         
         # WAV로 먼저 변환 (필요한 경우)
         from moviepy.editor import AudioFileClip
-        temp_wav = tempfile.NamedTemporaryFile(delete=False, suffix='.wav')
+        temp_wav = scratch_file('.wav', 'tts')
         temp_wav.close()
         
         audio_clip = AudioFileClip(audio_path)
@@ -2243,14 +2498,14 @@ class VideoGenerator:
             speed_adjusted_data = audio_data
         
         # 새로운 WAV 파일 생성
-        speed_adjusted_wav = tempfile.NamedTemporaryFile(delete=False, suffix='.wav')
+        speed_adjusted_wav = scratch_file('.wav', 'tts')
         with wave.open(speed_adjusted_wav.name, 'wb') as new_wav:
             new_wav.setparams(sound_info)
             new_wav.writeframes(speed_adjusted_data.tobytes())
         speed_adjusted_wav.close()
         
         # MP3로 변환
-        speed_adjusted_file = tempfile.NamedTemporaryFile(delete=False, suffix='.mp3')
+        speed_adjusted_file = scratch_file('.mp3', 'tts')
         converted_clip = AudioFileClip(speed_adjusted_wav.name)
         converted_clip.write_audiofile(speed_adjusted_file.name, verbose=False, logger=None)
         converted_clip.close()
@@ -2351,15 +2606,12 @@ class VideoGenerator:
             return text  # 실패시 원본 반환
     
     def get_audio_duration(self, audio_path):
-        """오디오 파일의 실제 재생 시간 반환"""
-        try:
-            audio = AudioFileClip(audio_path)
-            duration = audio.duration
-            audio.close()
-            return duration
-        except Exception as e:
-            print(f"오디오 길이 확인 실패: {e}")
+        """오디오 파일의 실제 재생 시간 반환 (파일 헤더 기반, 필요할 때만 ffprobe)"""
+        duration = audio_duration.get_duration(audio_path)
+        if duration is None:
+            print(f"오디오 길이 확인 실패: {audio_path}")
             return 3.0  # 기본값
+        return duration
     
     def get_local_images(self, test_folder="./test"):
         """test 폴더에서 이미지 파일들을 이름순으로 가져오기"""
@@ -2398,13 +2650,347 @@ class VideoGenerator:
         
         return image_files
     
-    def create_video_with_local_images(self, content, music_path, output_folder, image_allocation_mode="2_per_image", text_position="bottom", text_style="outline", title_area_mode="keep", title_font="BMYEONSUNG_otf.otf", body_font="BMYEONSUNG_otf.otf", title_font_size=42, body_font_size=36, music_mood="bright", media_files=None, voice_narration="enabled", cross_dissolve="enabled", subtitle_duration=0.0, image_panning_options=None, tts_engine="edge", qwen_speaker="Sohee", qwen_speed="normal", qwen_style="neutral", edge_speaker="female", edge_speed="normal", edge_pitch="normal"):
+    # ==================== 렌더 단계 그래프 헬퍼 ====================
+
+    def _plan_segments(self, body_keys, media_count, image_allocation_mode):
+        """이미지 할당 모드에 따른 세그먼트 계획 생성
+
+        Returns:
+            list: [(세그먼트 인덱스, 미디어 인덱스, [body_key, ...]), ...]
+        """
+        if image_allocation_mode == "1_per_image":
+            # body 1개당 이미지 1개 (이미지가 부족하면 마지막 이미지 사용)
+            print("🖼️ 1:1 매칭 모드: body별로 각각 다른 이미지 사용")
+            return [(i, min(i, media_count - 1), [body_key]) for i, body_key in enumerate(body_keys)]
+        elif image_allocation_mode == "2_per_image":
+            # body 2개당 이미지 1개 (body1,2 → image0, body3,4 → image1)
+            print("🖼️ 2:1 매칭 모드: body 2개당 이미지 1개 사용")
+            return [
+                (group_idx // 2, min(group_idx // 2, media_count - 1), body_keys[group_idx:group_idx + 2])
+                for group_idx in range(0, len(body_keys), 2)
+            ]
+        else:  # single_for_all
+            # 모든 대사에 첫 번째 미디어 1개 연속 사용
+            print("🖼️ 1:ALL 매칭 모드: 모든 대사에 동일한 미디어 1개 연속 사용")
+            return [(0, 0, list(body_keys))] if media_count > 0 else []
+
+    def _synthesize_body_tts(self, body_key, text, voice_narration="enabled", subtitle_duration=0.0):
+        """body 1개의 TTS 생성 (TTS 단계 작업 단위)
+
+        Returns:
+            tuple: (body_key, tts_path, duration) - 생성 실패 시 None
+        """
+        # 자막 지속 시간 최적화: voice_narration=disabled이고 subtitle_duration > 0이면 TTS 생성 건너뜀
+        if voice_narration == "disabled" and subtitle_duration > 0:
+            logger.info(f"⏱️ {body_key} TTS 건너뜀 (자막 지속 시간 {subtitle_duration}초 사용)")
+            return (body_key, None, subtitle_duration)
+
+        # 대사별 TTS 설정이 있으면 이 body에만 화자/스타일을 적용한 설정 사용
+        body_config = self.render_config.for_body(body_key)
+        if body_config is not self.render_config:
+            logger.info(f"🎭 {body_key} 개별 TTS: 화자={body_config.qwen_speaker}, 스타일={body_config.qwen_style}")
+
+        with stage_span('tts', body_key=body_key, engine=body_config.tts_engine) as span:
+            with self.use_render_config(body_config):
+                logger.info(f"🎙️ {body_key} TTS 생성 중... 내용: '{text[:50]}...'")
+                body_tts = self.create_tts_audio(text)
+            if body_tts and os.path.exists(body_tts):
+                span['bytes'] = os.path.getsize(body_tts)
+
+        if body_tts:
+            body_duration = self.get_audio_duration(body_tts)
+            logger.info(f"✅ {body_key} TTS 완료: {body_duration:.1f}초")
+            return (body_key, body_tts, body_duration)
+
+        logger.error(f"❌ {body_key} TTS 생성 실패")
+        return None
+
+    def _prepare_media_source(self, media_path):
+        """미디어 준비 단계: 이미지 검증/변환, 비디오 회전 정규화를 미리 수행
+
+        결과는 self._prepared_sources에 등록되어 배경 클립 생성 시 재사용됩니다.
+        """
+        video_extensions = ['.mp4', '.mov', '.avi', '.webm', '.mkv', '.gif']
+        try:
+            with stage_span('media_prep', media=os.path.basename(media_path)) as span:
+                if os.path.exists(media_path):
+                    span['bytes'] = os.path.getsize(media_path)
+                if any(media_path.lower().endswith(ext) for ext in video_extensions):
+                    probe_media(media_path)  # 스트림 정보 캐시 (오디오 추출 단계에서 재사용)
+                    prepared_path, is_temp = self.normalize_video_rotation(media_path)
+                else:
+                    prepared_path, is_temp = self._ensure_valid_image(media_path), False
+            if prepared_path:
+                self._prepared_sources[media_path] = (prepared_path, is_temp)
+        except Exception as e:
+            logger.warning(f"⚠️ 미디어 사전 준비 실패 (합성 단계에서 재시도): {os.path.basename(media_path)} - {e}")
+        return media_path
+
+    def _release_prepared_sources(self):
+        """미디어 준비 단계에서 생성한 임시 파일 정리"""
+        for prepared_path, is_temp in list(self._prepared_sources.values()):
+            if is_temp and os.path.exists(prepared_path):
+                try:
+                    os.remove(prepared_path)
+                    print(f"🗑️ 준비 단계 임시 파일 정리: {os.path.basename(prepared_path)}")
+                except Exception:
+                    pass
+        self._prepared_sources.clear()
+
+    def _build_segment_clip(self, segment_index, media_index, segment_bodies, content, tts_futures, media_future,
+                            text_futures, title_future, image_allocation_mode, title_area_mode, image_panning_options):
+        """세그먼트 합성 단계: 자신의 TTS/미디어/텍스트 입력만 기다린 뒤 클립 생성
+
+        Returns:
+            tuple: (세그먼트 클립, [(body_key, body_text, tts_path, duration), ...])
+        """
+        media_path = media_future.result()
+        segment_tts_info, segment_duration = self._collect_segment_tts(segment_bodies, content, tts_futures)
+
+        # 파일 타입 확인 (비디오 vs 이미지)
+        video_extensions = ['.mp4', '.mov', '.avi', '.webm', '.mkv', '.gif']
+        is_video = any(media_path.lower().endswith(ext) for ext in video_extensions)
+        file_type = "비디오" if is_video else "이미지"
+
+        print(f"📸 세그먼트 {segment_index + 1}: {[info[0] for info in segment_tts_info]} → '{os.path.basename(media_path)}' ({file_type}, {segment_duration:.1f}초)")
+
+        # 이미지별 패닝 옵션 확인
+        enable_panning = True  # 기본값
+        if image_panning_options is not None and media_index in image_panning_options:
+            enable_panning = image_panning_options[media_index]
+            print(f"🎨 이미지 {media_index}: 패닝 옵션 = {enable_panning}")
+
+        # 세그먼트 번호로 랜덤 선택 범위 고정 (스레드 실행 순서와 무관하게 같은 시드면 같은 결과)
+        with self._rng_scope(f"segment{segment_index}"), \
+                stage_span('composite', segment=segment_index + 1, bodies=len(segment_bodies)):
+            # 타이틀 영역 모드에 따른 배경 클립 생성
+            if title_area_mode == "keep":
+                # 기존 방식: 타이틀 영역 + 미디어 영역
+                if is_video:
+                    # 비디오는 항상 패닝 off (중앙 고정 배치)
+                    bg_clip = self.create_video_background_clip(media_path, segment_duration, enable_panning=False)
+                elif image_allocation_mode == "1_per_image":
+                    bg_clip = self.create_background_clip(media_path, segment_duration, enable_panning=enable_panning, title_area_mode=title_area_mode)
+                else:
+                    bg_clip = self.create_continuous_background_clip(media_path, segment_duration, 0.0, enable_panning=enable_panning, title_area_mode=title_area_mode)
+                black_top = ColorClip(size=(self.video_width, self.title_height), color=(0,0,0)).set_duration(segment_duration).set_position((0, 0))
+                title_clip = ImageClip(title_future.result()).set_duration(segment_duration).set_position((0, 0))
+                layers = [bg_clip, black_top, title_clip]
+            else:
+                # remove 모드: 전체 화면 미디어 + 동일한 텍스트 위치
+                if is_video:
+                    # 비디오는 항상 패닝 off (중앙 고정 배치)
+                    bg_clip = self.create_fullscreen_video_clip(media_path, segment_duration, enable_panning=False)
+                else:
+                    bg_clip = self.create_fullscreen_background_clip(media_path, segment_duration, enable_panning=enable_panning)
+                layers = [bg_clip]
+
+            # 텍스트 클립들 (body 순서대로 이어 붙임)
+            text_clips = []
+            current_time = 0.0
+            for body_key, body_text, tts_path, duration in segment_tts_info:
+                text_image_path = text_futures[body_key].result()
+                text_clip = ImageClip(text_image_path).set_start(current_time).set_duration(duration).set_position((0, 0))
+                text_clips.append(text_clip)
+                print(f"      {body_key}: {current_time:.1f}~{current_time + duration:.1f}초")
+                current_time += duration
+
+            # 가려진 레이어 제거/고정 레이어 미리 합성 후 생성 (composite_optimizer)
+            segment_clip = compose_layers(layers + text_clips, size=(self.video_width, self.video_height))
+        print(f"    ✅ 세그먼트 {segment_index + 1} 완료")
+        return segment_clip, segment_tts_info
+
+    @staticmethod
+    def _collect_segment_tts(segment_bodies, content, tts_futures):
+        """세그먼트 TTS 정보 수집 (실패한 body는 3초 기본값)
+
+        Returns:
+            tuple: ([(body_key, body_text, tts_path, duration), ...], 세그먼트 길이)
+        """
+        segment_tts_info = []
+        segment_duration = 0.0
+        for body_key in segment_bodies:
+            tts_result = tts_futures[body_key].result()
+            if tts_result:
+                _, tts_path, tts_duration = tts_result
+            else:
+                tts_path, tts_duration = None, 3.0
+            segment_tts_info.append((body_key, content[body_key], tts_path, tts_duration))
+            segment_duration += tts_duration
+        return segment_tts_info, segment_duration
+
+    def _segment_plan_key(self, plan_base, segment_index, media_index, segment_tts_info, image_panning_options):
+        """세그먼트 캐시 키 - 세그먼트 픽셀에 영향을 주는 모든 입력의 해시 (미디어를 읽을 수 없으면 None)
+
+        전환 효과(크로스 디졸브)는 세그먼트 파일을 이어 붙일 때 적용되므로 키에 포함하지 않는다.
+        패닝 방향은 render_seed + 세그먼트 번호로 정해지므로 둘 다 포함한다.
+        """
+        source_path = plan_base['media'][media_index]
+        digests = plan_base['media_digests']
+        if media_index not in digests:
+            digests[media_index] = media_digest(source_path)
+        if digests[media_index] is None:
+            return None
+
+        enable_panning = True
+        if image_panning_options is not None and media_index in image_panning_options:
+            enable_panning = image_panning_options[media_index]
+
+        plan = {
+            'job': plan_base['job'],
+            'segment_index': segment_index,
+            'media': [os.path.splitext(source_path)[1].lower(), digests[media_index]],
+            'panning': enable_panning,
+            'bodies': [[body_key, body_text, round(duration, 3)] for body_key, body_text, _, duration in segment_tts_info],
+        }
+        return segment_cache.make_key(plan)
+
+    def _render_segment_to_file(self, segment_dir, plan_base, segment_index, media_index, segment_bodies, content,
+                                tts_futures, media_future, text_futures, title_future, image_allocation_mode,
+                                title_area_mode, image_panning_options):
+        """스트리밍 합성 단위: 세그먼트 클립을 만들어 중간 파일로 렌더한 뒤 소스를 바로 닫음
+
+        plan_base가 있으면 세그먼트 계획 해시로 캐시를 먼저 확인하고, 없을 때만 렌더한 뒤 캐시에 저장한다.
+
+        Returns:
+            tuple: (중간 파일 경로, 세그먼트 길이, [(body_key, body_text, tts_path, duration), ...], 캐시 사용 여부)
+        """
+        segment_path = os.path.join(segment_dir, f"segment_{segment_index:03d}.mp4")
+        cache_key = None
+        if plan_base is not None:
+            segment_tts_info, _ = self._collect_segment_tts(segment_bodies, content, tts_futures)
+            cache_key = self._segment_plan_key(plan_base, segment_index, media_index, segment_tts_info, image_panning_options)
+            cached_duration = segment_cache.get(cache_key, segment_path) if cache_key else None
+            if cached_duration is not None:
+                report_segment_done()
+                print(f"    ♻️ 세그먼트 {segment_index + 1} 캐시 사용 ({cached_duration:.1f}초)")
+                return segment_path, cached_duration, segment_tts_info, True
+
+        video_extensions = ['.mp4', '.mov', '.avi', '.webm', '.mkv', '.gif']
+        media_path = media_future.result()
+        uses_decoder = any(media_path.lower().endswith(ext) for ext in video_extensions)
+
+        # 비디오 소스는 프로세스 전체 디코더 수 제한을 따름
+        if uses_decoder:
+            decoder_slots.acquire()
+        try:
+            segment_clip, segment_tts_info = self._build_segment_clip(
+                segment_index, media_index, segment_bodies, content, tts_futures, media_future,
+                text_futures, title_future, image_allocation_mode, title_area_mode, image_panning_options
+            )
+            segment_duration = segment_clip.duration
+            try:
+                with stage_span('segment_render', segment=segment_index + 1) as span:
+                    write_segment_file(segment_clip, segment_path, self.fps)
+                    span['frames'] = int(segment_duration * self.fps)
+                    span['bytes'] = os.path.getsize(segment_path)
+            finally:
+                close_clip_tree(segment_clip)
+            report_segment_done()
+        finally:
+            if uses_decoder:
+                decoder_slots.release()
+
+        if cache_key:
+            segment_cache.put(cache_key, segment_path, segment_duration)
+        print(f"    💾 세그먼트 {segment_index + 1} 중간 파일 렌더 완료 ({segment_duration:.1f}초)")
+        return segment_path, segment_duration, segment_tts_info, False
+
+    def _segment_plan_base(self, local_images, content, title_area_mode, image_allocation_mode, text_position,
+                           text_style, title_font, body_font, title_font_size, body_font_size):
+        """작업 공통 세그먼트 계획 (생성기/레이아웃/렌더 시드/텍스트 스타일) - 세그먼트별 항목은 _segment_plan_key에서 추가
+
+        plan_key는 대사 텍스트를 뺀 작업 계획 + 미디어 간이 해시(크기 + 앞/뒤 일부)로, 같은 작업의 재렌더인지 판단하는 데만 쓴다.
+        전체 미디어 해시는 캐시를 쓰기로 한 작업에서만 _segment_plan_key가 미디어별로 계산한다 (매 렌더마다 전체 입력을 다시 읽지 않음).
+        """
+        config = self.render_config
+        plan_base = {
+            'job': {
+                'generator': type(self).__name__,
+                'fps': self.fps,
+                'layout': [config.video_format, config.video_width, config.video_height, config.title_height,
+                           config.work_height_keep, config.work_height_remove, config.text_y_top,
+                           config.text_y_bottom, config.text_y_bottom_edge_margin, config.panning_range],
+                'render_seed': config.render_seed,
+                'title': content.get('title', '') if title_area_mode == "keep" else None,
+                'style': [title_area_mode, image_allocation_mode, text_position, text_style,
+                          title_font, body_font, title_font_size, body_font_size],
+            },
+            'media': list(local_images),
+            'media_digests': {},
+        }
+        plan_base['plan_key'] = segment_cache.make_key({
+            'job': plan_base['job'],
+            'media': [media_quick_digest(path) for path in local_images],
+        })
+        return plan_base
+
+    def _render_segments_streaming(self, segment_pool, segment_args, segment_dir, segment_readers, plan_base=None):
+        """세그먼트를 동시 실행 수/메모리 상한 안에서 순차 제출해 중간 파일로 렌더 (plan_base가 있으면 세그먼트 캐시 사용)
+
+        Returns:
+            tuple: (중간 파일을 필요할 때만 여는 세그먼트 클립 목록, 세그먼트 TTS 정보)
+        """
+        guard = MemoryGuard()
+        logger.info(f"🌊 스트리밍 합성: 세그먼트 {len(segment_args)}개 (메모리 상한 {guard.ceiling_mb}MB)")
+
+        with stage_span('composite_streaming', segments=len(segment_args)) as span:
+            futures = []
+            for args in segment_args:
+                # 세그먼트 워커 수만큼만 진행시키고, 메모리 상한을 넘으면 진행 중인 세그먼트 완료까지 대기
+                pending = [future for future in futures if not future.done()]
+                if len(pending) >= RENDER_SEGMENT_WORKERS:
+                    wait(pending, return_when=FIRST_COMPLETED)
+                guard.wait_for_headroom(futures)
+                futures.append(self._submit_in_context(segment_pool, self._render_segment_to_file, segment_dir, plan_base, *args))
+
+            group_clips = []
+            segment_tts_info = []
+            cache_hits = 0
+            for future in futures:
+                segment_path, segment_duration, tts_info, cached = future.result()
+                group_clips.append(streamed_segment_clip(segment_path, segment_duration, segment_readers))
+                segment_tts_info.extend(tts_info)
+                cache_hits += int(cached)
+
+            span['memory_waits'] = guard.waits
+            span['rss_peak_mb'] = guard.peak_rss_mb
+            span['cache_hits'] = cache_hits
+
+        logger.info(f"✅ 스트리밍 합성 완료: 캐시 사용 {cache_hits}/{len(segment_args)}개, 메모리 대기 {guard.waits}회, 최대 RSS {guard.peak_rss_mb:.0f}MB")
+        return group_clips, segment_tts_info
+
+    def create_video_with_local_images(self, content, music_path, output_folder, image_allocation_mode="2_per_image", text_position="bottom", text_style="outline", title_area_mode="keep", title_font="BMYEONSUNG_otf.otf", body_font="BMYEONSUNG_otf.otf", title_font_size=42, body_font_size=36, music_mood="bright", media_files=None, voice_narration="enabled", cross_dissolve="enabled", subtitle_duration=0.0, image_panning_options=None, tts_engine="edge", qwen_speaker="Sohee", qwen_speed="normal", qwen_style="neutral", edge_speaker="female", edge_speed="normal", edge_pitch="normal", render_config=None, local_images=None, shared_prep=None):
         """로컬 이미지 파일들을 사용한 릴스 영상 생성
 
         Args:
             image_panning_options: 이미지별 패닝 옵션 딕셔너리 (예: {0: True, 1: False, 2: True})
                                    None이면 모든 이미지에 패닝 적용 (기본값)
+            render_config: 작업별 RenderConfig. None이면 인스턴스 기본 설정에 TTS 파라미터를 적용해 생성
+            local_images: 사용할 미디어 파일 목록. None이면 get_local_images() 결과 사용
+            shared_prep: 다중 출력 작업의 SharedPreparation. 주면 TTS/미디어 준비를 다른 포맷 렌더와 공유
         """
+        # 작업별 렌더 설정은 이 호출(및 렌더 스레드 풀) 안에서만 유효 - 공유 인스턴스 상태는 변경하지 않음
+        if render_config is None:
+            render_config = self._default_config.with_tts(
+                tts_engine, qwen_speaker, qwen_speed, qwen_style,
+                edge_speaker=edge_speaker, edge_speed=edge_speed, edge_pitch=edge_pitch
+            )
+        config_token = _active_render_config.set(render_config)
+        sources_token = _active_prepared_sources.set(shared_prep.prepared_sources if shared_prep is not None else {})
+        # 이 호출에서 연 VideoFileClip/AudioFileClip 리더는 성공/실패와 무관하게 끝에서 모두 닫음
+        clip_registry = ClipRegistry(content.get('title', '')[:30])
+        registry_token = clip_registry.activate()
+        composite_report = CompositeReport()
+        report_token = composite_report.activate()
+        # 중간 파일은 작업 공간에 기록 (워커가 만든 작업 공간이 없으면 이 호출이 만들고 정리)
+        owned_workspace = None
+        if get_active_workspace() is None:
+            owned_workspace = ScratchWorkspace('render')
+            workspace_token = owned_workspace.activate()
+        segment_dir = None
+        segment_readers = None
+
         try:
             # 디버깅: 파라미터 확인
             print(f"🔍 create_video_with_local_images 호출됨!")
@@ -2414,13 +3000,11 @@ class VideoGenerator:
             logging.info(f"🔍 cross_dissolve 파라미터: '{cross_dissolve}' (타입: {type(cross_dissolve)})")
             logging.info(f"🔍 image_panning_options: {image_panning_options}")
 
-            # TTS 엔진 설정 적용
-            self.set_tts_engine(tts_engine, qwen_speaker, qwen_speed, qwen_style,
-                               edge_speaker=edge_speaker, edge_speed=edge_speed, edge_pitch=edge_pitch)
-            logger.info(f"🎤 TTS 설정: 엔진={tts_engine}, Qwen화자={qwen_speaker}, Qwen속도={qwen_speed}, Qwen스타일={qwen_style}, Edge화자={edge_speaker}, Edge속도={edge_speed}, Edge톤={edge_pitch}")
+            logger.info(f"🎤 TTS 설정: 엔진={self.tts_engine}, Qwen화자={self.qwen_speaker}, Qwen속도={self.qwen_speed}, Qwen스타일={self.qwen_style}, Edge화자={self.edge_speaker}, Edge속도={self.edge_speed}, Edge톤={self.edge_pitch}")
 
             # 로컬 이미지 파일들 가져오기
-            local_images = self.get_local_images()
+            if local_images is None:
+                local_images = self.get_local_images()
 
             if not local_images:
                 raise Exception("test 폴더에 이미지 파일이 없습니다")
@@ -2455,22 +3039,6 @@ class VideoGenerator:
                 logging.info(msg)
             print(f"🏠 타이틀 영역 모드: {title_area_mode}")
 
-            # 타이틀 영역 모드에 따른 처리
-            title_image_path = None
-            if title_area_mode == "keep":
-                # 기존 방식: 타이틀 영역 유지 (504x220)
-                title_image_path = self.create_title_image(
-                    content['title'],
-                    self.video_width,
-                    220,
-                    title_font,
-                    title_font_size
-                )
-                print("✅ 타이틀 영역 확보: 220px 타이틀 + 670px 미디어")
-            else:
-                # remove 모드: 타이틀 제거, 전체 화면 미디어
-                print("✅ 타이틀 영역 제거: 전체 890px 미디어")
-            
             # 각 body별로 개별 TTS 생성 (빈 값 제외, 순서 보장)
             body_keys = [key for key in content.keys() if key.startswith('body') and content[key].strip()]
             body_keys.sort(key=lambda x: int(x.replace('body', '')))  # body1, body2, ... 순서로 정렬
@@ -2479,300 +3047,97 @@ class VideoGenerator:
             logger.info(f"🔍 [디버깅] subtitle_duration={subtitle_duration} (타입: {type(subtitle_duration).__name__})")
             logger.info(f"🔍 [디버깅] 조건 체크: voice_narration == 'disabled' = {voice_narration == 'disabled'}")
             logger.info(f"🔍 [디버깅] 조건 체크: subtitle_duration > 0 = {subtitle_duration > 0}")
-            tts_files = []
-
-            for body_key in body_keys:
-                # 자막 지속 시간 최적화: voice_narration=disabled이고 subtitle_duration > 0이면 TTS 생성 건너뜀
-                if voice_narration == "disabled" and subtitle_duration > 0:
-                    logger.info(f"⏱️ {body_key} TTS 건너뜀 (자막 지속 시간 {subtitle_duration}초 사용)")
-                    tts_files.append((body_key, None, subtitle_duration))
-                else:
-                    # 대사별 TTS 설정이 있으면 임시로 화자/스타일 교체
-                    original_speaker = self.qwen_speaker
-                    original_style = self.qwen_style
-                    if self.per_body_tts_settings and self.tts_engine == 'qwen' and body_key in self.per_body_tts_settings:
-                        body_setting = self.per_body_tts_settings[body_key]
-                        self.qwen_speaker = body_setting.get('speaker', original_speaker)
-                        self.qwen_style = body_setting.get('style', original_style)
-                        logger.info(f"🎭 {body_key} 개별 TTS: 화자={self.qwen_speaker}, 스타일={self.qwen_style}")
-
-                    logger.info(f"🎙️ {body_key} TTS 생성 중... 내용: '{content[body_key][:50]}...'")
-                    body_tts = self.create_tts_audio(content[body_key])
-
-                    # 원래 설정 복원
-                    self.qwen_speaker = original_speaker
-                    self.qwen_style = original_style
-
-                    if body_tts:
-                        body_duration = self.get_audio_duration(body_tts)
-                        tts_files.append((body_key, body_tts, body_duration))
-                        logger.info(f"✅ {body_key} TTS 완료: {body_duration:.1f}초")
-                    else:
-                        logger.error(f"❌ {body_key} TTS 생성 실패")
 
-            # 이미지 할당 모드에 따른 처리 분기
+            # 이미지 할당 모드에 따른 세그먼트 계획 (세그먼트 인덱스, 미디어 인덱스, body 목록)
             print(f"🎬 이미지 할당 모드: {image_allocation_mode}")
-
-            group_clips = []
-            audio_segments = []
-            
-            if image_allocation_mode == "1_per_image":
-                # Mode 2: body 1개당 이미지 1개 (1:1 매칭)
-                print("🖼️ 1:1 매칭 모드: body별로 각각 다른 이미지 사용")
-                
-                for i, body_key in enumerate(body_keys):
-                    # body별로 개별 이미지 할당 (이미지가 부족하면 마지막 이미지 사용)
-                    image_index = min(i, len(local_images) - 1)
-                    current_image_path = local_images[image_index]
-                    print(f"🎯 매칭 디버그: i={i}, body_key={body_key}, image_index={image_index}, image={os.path.basename(current_image_path)}")
-                    
-                    # 해당 body의 TTS 정보 찾기
-                    body_tts_info = None
-                    body_duration = 3.0
-                    for tts_key, tts_path, tts_duration in tts_files:
-                        if tts_key == body_key:
-                            body_tts_info = (body_key, content[body_key], tts_path, tts_duration)
-                            body_duration = tts_duration
-                            break
-                    else:
-                        body_tts_info = (body_key, content[body_key], None, 3.0)
-                    
-                    # 파일 타입 확인 (비디오 vs 이미지)
-                    video_extensions = ['.mp4', '.mov', '.avi', '.webm', '.mkv', '.gif']
-                    is_video = any(current_image_path.lower().endswith(ext) for ext in video_extensions)
-                    file_type = "비디오" if is_video else "이미지"
-                    
-                    print(f"📸 {body_key}: {file_type} {image_index + 1}/{len(local_images)} → '{os.path.basename(current_image_path)}' ({body_duration:.1f}초)")
-                    
-                    # 이미지별 패닝 옵션 확인
-                    enable_panning = True  # 기본값
-                    if image_panning_options is not None and image_index in image_panning_options:
-                        enable_panning = image_panning_options[image_index]
-                        print(f"🎨 이미지 {image_index}: 패닝 옵션 = {enable_panning}")
-
-                    # 타이틀 영역 모드에 따른 배경 클립 생성
-                    if title_area_mode == "keep":
-                        # 기존 방식: 타이틀 영역 + 미디어 영역
-                        if is_video:
-                            # 비디오는 항상 패닝 off (중앙 고정 배치)
-                            bg_clip = self.create_video_background_clip(current_image_path, body_duration, enable_panning=False)
-                        else:
-                            bg_clip = self.create_background_clip(current_image_path, body_duration, enable_panning=enable_panning, title_area_mode=title_area_mode)
-                        black_top = ColorClip(size=(self.video_width, self.title_height), color=(0,0,0)).set_duration(body_duration).set_position((0, 0))
-                        title_clip = ImageClip(title_image_path).set_duration(body_duration).set_position((0, 0))
-
-                        # 텍스트 클립 (기존 위치)
-                        text_image_path = self.create_text_image(content[body_key], self.video_width, self.video_height, text_position, text_style, is_title=False, title_font=title_font, body_font=body_font, title_area_mode=title_area_mode, title_font_size=title_font_size, body_font_size=body_font_size)
-                        text_clip = ImageClip(text_image_path).set_duration(body_duration).set_position((0, 0))
-
-                        # 기존 방식 합성
-                        individual_clip = CompositeVideoClip([bg_clip, black_top, title_clip, text_clip], size=(self.video_width, self.video_height))
-                    else:
-                        # remove 모드: 전체 화면 미디어 + 동일한 텍스트 위치
-                        if is_video:
-                            # 비디오는 항상 패닝 off (중앙 고정 배치)
-                            bg_clip = self.create_fullscreen_video_clip(current_image_path, body_duration, enable_panning=False)
-                        else:
-                            bg_clip = self.create_fullscreen_background_clip(current_image_path, body_duration, enable_panning=enable_panning)
-
-                        # 텍스트 클립 (기존과 동일한 위치 유지)
-                        text_image_path = self.create_text_image(content[body_key], self.video_width, self.video_height, text_position, text_style, is_title=False, title_font=title_font, body_font=body_font, title_area_mode=title_area_mode, title_font_size=title_font_size, body_font_size=body_font_size)
-                        text_clip = ImageClip(text_image_path).set_duration(body_duration).set_position((0, 0))
-
-                        # 전체 화면 합성 (타이틀 없음)
-                        individual_clip = CompositeVideoClip([bg_clip, text_clip], size=(self.video_width, self.video_height))
-                    group_clips.append(individual_clip)
-                    print(f"    ✅ {body_key} 완료: 개별 이미지 적용")
-                    
-                    # 오디오 추가 (voice_narration이 enabled일 때만)
-                    if body_tts_info[2] and voice_narration == "enabled":  # tts_path가 있고 자막 읽어주기가 활성화된 경우에만
-                        audio_segments.append(AudioFileClip(body_tts_info[2]))
-
-            elif image_allocation_mode == "2_per_image":
-                # Mode 1: body 2개당 이미지 1개 (그룹 방식)
-                print("🖼️ 2:1 매칭 모드: body 2개당 이미지 1개 사용")
-                
-                for group_idx in range(0, len(body_keys), 2):
-                    group_bodies = body_keys[group_idx:group_idx + 2]
-                    # 그룹 순서대로 이미지 사용 (body1,2 → image0, body3,4 → image1)
-                    image_index = min(group_idx // 2, len(local_images) - 1)
-                    current_image_path = local_images[image_index]
-                    print(f"그룹 {group_idx//2 + 1}: 이미지 인덱스 {image_index}, 파일: {os.path.basename(current_image_path)}")
-                    
-                    # 그룹 TTS 정보 수집
-                    group_tts_info = []
-                    group_total_duration = 0.0
-                    
-                    for body_key in group_bodies:
-                        for tts_key, tts_path, tts_duration in tts_files:
-                            if tts_key == body_key:
-                                group_tts_info.append((body_key, content[body_key], tts_path, tts_duration))
-                                group_total_duration += tts_duration
-                                break
-                        else:
-                            group_tts_info.append((body_key, content[body_key], None, 3.0))
-                            group_total_duration += 3.0
-                    
-                    # 파일 타입 확인 (비디오 vs 이미지)
-                    video_extensions = ['.mp4', '.mov', '.avi', '.webm', '.mkv', '.gif']
-                    is_video = any(current_image_path.lower().endswith(ext) for ext in video_extensions)
-                    file_type = "비디오" if is_video else "이미지"
-                    
-                    print(f"📸 그룹 {group_idx//2 + 1}: {[info[0] for info in group_tts_info]} → '{os.path.basename(current_image_path)}' ({file_type}, {group_total_duration:.1f}초)")
-
-                    # 이미지별 패닝 옵션 확인
-                    enable_panning = True  # 기본값
-                    if image_panning_options is not None and image_index in image_panning_options:
-                        enable_panning = image_panning_options[image_index]
-                        print(f"🎨 이미지 {image_index}: 패닝 옵션 = {enable_panning}")
-
-                    # 타이틀 영역 모드에 따른 배경 클립 생성
-                    if title_area_mode == "keep":
-                        # 기존 방식: 타이틀 영역 + 미디어 영역
-                        if is_video:
-                            # 비디오는 항상 패닝 off (중앙 고정 배치)
-                            bg_clip = self.create_video_background_clip(current_image_path, group_total_duration, enable_panning=False)
-                        else:
-                            bg_clip = self.create_continuous_background_clip(current_image_path, group_total_duration, 0.0, enable_panning=enable_panning, title_area_mode=title_area_mode)
-                        black_top = ColorClip(size=(self.video_width, self.title_height), color=(0,0,0)).set_duration(group_total_duration)
-                        title_clip = ImageClip(title_image_path).set_duration(group_total_duration).set_position((0, 0))
-
-                        # 텍스트 클립들 (기존 위치)
-                        text_clips = []
-                        current_time = 0.0
-                        for body_key, body_text, tts_path, duration in group_tts_info:
-                            text_image_path = self.create_text_image(body_text, self.video_width, self.video_height, text_position, text_style, is_title=False, title_font=title_font, body_font=body_font, title_area_mode=title_area_mode, title_font_size=title_font_size, body_font_size=body_font_size)
-                            text_clip = ImageClip(text_image_path).set_start(current_time).set_duration(duration).set_position((0, 0))
-                            text_clips.append(text_clip)
-                            print(f"      {body_key}: {current_time:.1f}~{current_time + duration:.1f}초")
-                            current_time += duration
-
-                        # 기존 방식 합성
-                        group_clip = CompositeVideoClip([bg_clip, black_top, title_clip] + text_clips, size=(self.video_width, self.video_height))
-                    else:
-                        # remove 모드: 전체 화면 미디어 + 동일한 텍스트 위치
-                        if is_video:
-                            # 비디오는 항상 패닝 off (중앙 고정 배치)
-                            bg_clip = self.create_fullscreen_video_clip(current_image_path, group_total_duration, enable_panning=False)
-                        else:
-                            bg_clip = self.create_fullscreen_background_clip(current_image_path, group_total_duration, enable_panning=enable_panning)
-
-                        # 텍스트 클립들 (기존과 동일한 위치 유지)
-                        text_clips = []
-                        current_time = 0.0
-                        for body_key, body_text, tts_path, duration in group_tts_info:
-                            text_image_path = self.create_text_image(body_text, self.video_width, self.video_height, text_position, text_style, is_title=False, title_font=title_font, body_font=body_font, title_area_mode=title_area_mode, title_font_size=title_font_size, body_font_size=body_font_size)
-                            text_clip = ImageClip(text_image_path).set_start(current_time).set_duration(duration).set_position((0, 0))
-                            text_clips.append(text_clip)
-                            print(f"      {body_key}: {current_time:.1f}~{current_time + duration:.1f}초")
-                            current_time += duration
-
-                        # 전체 화면 합성 (타이틀 없음)
-                        group_clip = CompositeVideoClip([bg_clip] + text_clips, size=(self.video_width, self.video_height))
-                    group_clips.append(group_clip)
-                    print(f"    ✅ 그룹 {group_idx//2 + 1} 완료: 배경 연속 보장")
-                    
-                    # 오디오 추가 (voice_narration이 enabled일 때만)
-                    for _, _, tts_path, _ in group_tts_info:
-                        if tts_path and voice_narration == "enabled":
-                            audio_segments.append(AudioFileClip(tts_path))
-
-            else:  # image_allocation_mode == "single_for_all"
-                # Mode 3: 모든 대사에 미디어 1개 (단일 이미지/비디오 연속 사용)
-                print("🖼️ 1:ALL 매칭 모드: 모든 대사에 동일한 미디어 1개 연속 사용")
-                logger.debug(f"🔍 [DEBUG] single_for_all 모드 진입 - body 개수: {len(body_keys)}")
-
-                # 첫 번째 이미지/비디오만 사용
-                if local_images:
-                    single_media_path = local_images[0]
-                    print(f"사용할 미디어: {os.path.basename(single_media_path)}")
-                    logger.debug(f"🔍 [DEBUG] 미디어 파일 경로: {single_media_path}")
-                    logger.debug(f"🔍 [DEBUG] 파일 존재 여부: {os.path.exists(single_media_path)}")
-
-                    # 모든 대사의 TTS 정보 수집
-                    all_tts_info = []
-                    total_duration = 0.0
-
-                    for body_key in body_keys:
-                        for tts_key, tts_path, tts_duration in tts_files:
-                            if tts_key == body_key:
-                                all_tts_info.append((body_key, content[body_key], tts_path, tts_duration))
-                                total_duration += tts_duration
-                                break
-                        else:
-                            all_tts_info.append((body_key, content[body_key], None, 3.0))
-                            total_duration += 3.0
-
-                    # 파일 타입 확인 (비디오 vs 이미지)
-                    video_extensions = ['.mp4', '.mov', '.avi', '.webm', '.mkv', '.gif']
-                    is_video = any(single_media_path.lower().endswith(ext) for ext in video_extensions)
-                    file_type = "비디오" if is_video else "이미지"
-                    logger.debug(f"🔍 [DEBUG] 파일 타입 판별: is_video={is_video}, file_type={file_type}")
-
-                    print(f"📍 모든 대사 ({len(body_keys)}개): {file_type} 연속 사용 - {os.path.basename(single_media_path)} (총 {total_duration:.1f}초)")
-
-                    # 이미지별 패닝 옵션 확인 (단일 이미지는 인덱스 0)
-                    enable_panning = True  # 기본값
-                    if image_panning_options is not None and 0 in image_panning_options:
-                        enable_panning = image_panning_options[0]
-                        print(f"🎨 단일 이미지: 패닝 옵션 = {enable_panning}")
-
-                    # 타이틀 영역 모드에 따른 배경 클립 생성
-                    logger.debug(f"🔍 [DEBUG] title_area_mode={title_area_mode}, is_video={is_video}")
-                    if title_area_mode == "keep":
-                        # 기존 방식: 타이틀 영역 + 미디어 영역
-                        if is_video:
-                            # 비디오는 항상 패닝 off (중앙 고정 배치)
-                            logger.debug(f"🔍 [DEBUG] create_video_background_clip() 호출 시작 (keep 모드)")
-                            bg_clip = self.create_video_background_clip(single_media_path, total_duration, enable_panning=False)
-                            logger.debug(f"🔍 [DEBUG] create_video_background_clip() 호출 완료 (keep 모드)")
-                        else:
-                            bg_clip = self.create_continuous_background_clip(single_media_path, total_duration, 0.0, enable_panning=enable_panning, title_area_mode=title_area_mode)
-                        black_top = ColorClip(size=(self.video_width, self.title_height), color=(0,0,0)).set_duration(total_duration)
-                        title_clip = ImageClip(title_image_path).set_duration(total_duration).set_position((0, 0))
-
-                        # 텍스트 클립들 (기존 위치)
-                        text_clips = []
-                        current_time = 0.0
-                        for body_key, body_text, tts_path, duration in all_tts_info:
-                            text_image_path = self.create_text_image(body_text, self.video_width, self.video_height, text_position, text_style, is_title=False, title_font=title_font, body_font=body_font, title_area_mode=title_area_mode, title_font_size=title_font_size, body_font_size=body_font_size)
-                            text_clip = ImageClip(text_image_path).set_start(current_time).set_duration(duration).set_position((0, 0))
-                            text_clips.append(text_clip)
-                            print(f"      {body_key}: {current_time:.1f}~{current_time + duration:.1f}초")
-                            current_time += duration
-
-                        # 기존 방식 합성
-                        single_clip = CompositeVideoClip([bg_clip, black_top, title_clip] + text_clips, size=(self.video_width, self.video_height))
-                    else:
-                        # remove 모드: 전체 화면 미디어 + 동일한 텍스트 위치
-                        if is_video:
-                            # 비디오는 항상 패닝 off (중앙 고정 배치)
-                            logger.debug(f"🔍 [DEBUG] create_fullscreen_video_clip() 호출 시작 (remove 모드)")
-                            bg_clip = self.create_fullscreen_video_clip(single_media_path, total_duration, enable_panning=False)
-                            logger.debug(f"🔍 [DEBUG] create_fullscreen_video_clip() 호출 완료 (remove 모드)")
+            segment_plan = self._plan_segments(body_keys, len(local_images), image_allocation_mode)
+            report_stage('prepare', segments_total=len(segment_plan))
+
+            # ========== 단계 그래프 실행 ==========
+            # TTS / 미디어 준비(검증, 회전 정규화) / 텍스트 이미지는 서로 독립적이므로 동시에 시작하고,
+            # 각 세그먼트는 자신의 TTS 길이와 미디어가 준비되는 즉시 합성을 시작한다.
+            tts_workers = 1 if self.tts_engine == 'qwen' else RENDER_TTS_WORKERS  # Qwen 모델은 단일 레인
+            logger.info(f"⚙️ 렌더 단계 병렬화: TTS {tts_workers}, 준비 {RENDER_PREP_WORKERS}, 세그먼트 {RENDER_SEGMENT_WORKERS} (세그먼트 {len(segment_plan)}개)")
+
+            with ThreadPoolExecutor(max_workers=tts_workers, thread_name_prefix='tts') as tts_pool, \
+                    ThreadPoolExecutor(max_workers=RENDER_PREP_WORKERS, thread_name_prefix='prep') as prep_pool, \
+                    ThreadPoolExecutor(max_workers=RENDER_SEGMENT_WORKERS, thread_name_prefix='segment') as segment_pool:
+
+                # 1) TTS 단계: body 순서대로 제출 (다중 출력 작업이면 다른 포맷 렌더와 공유)
+                if shared_prep is not None:
+                    tts_futures = {
+                        body_key: shared_prep.tts_future(self, body_key, content[body_key], voice_narration, subtitle_duration)
+                        for body_key in body_keys
+                    }
+                else:
+                    tts_futures = {
+                        body_key: self._submit_in_context(tts_pool, self._synthesize_body_tts, body_key, content[body_key], voice_narration, subtitle_duration)
+                        for body_key in body_keys
+                    }
+
+                # 2) 미디어 준비 단계: 세그먼트에서 실제 사용하는 미디어만 1회씩 준비
+                media_futures = {}
+                for _, media_index, _ in segment_plan:
+                    if media_index not in media_futures:
+                        if shared_prep is not None:
+                            media_futures[media_index] = shared_prep.media_future(self, local_images[media_index])
                         else:
-                            bg_clip = self.create_fullscreen_background_clip(single_media_path, total_duration, enable_panning=enable_panning)
+                            media_futures[media_index] = self._submit_in_context(prep_pool, self._prepare_media_source, local_images[media_index])
 
-                        # 텍스트 클립들 (기존과 동일한 위치 유지)
-                        text_clips = []
-                        current_time = 0.0
-                        for body_key, body_text, tts_path, duration in all_tts_info:
-                            text_image_path = self.create_text_image(body_text, self.video_width, self.video_height, text_position, text_style, is_title=False, title_font=title_font, body_font=body_font, title_area_mode=title_area_mode, title_font_size=title_font_size, body_font_size=body_font_size)
-                            text_clip = ImageClip(text_image_path).set_start(current_time).set_duration(duration).set_position((0, 0))
-                            text_clips.append(text_clip)
-                            print(f"      {body_key}: {current_time:.1f}~{current_time + duration:.1f}초")
-                            current_time += duration
+                # 타이틀 이미지 (keep 모드에서만)
+                title_future = None
+                if title_area_mode == "keep":
+                    # 기존 방식: 타이틀 영역 유지 (504x220)
+                    title_future = self._submit_in_context(prep_pool, self.create_title_image, content['title'], self.video_width, 220, title_font, title_font_size)
+                    print("✅ 타이틀 영역 확보: 220px 타이틀 + 670px 미디어")
+                else:
+                    # remove 모드: 타이틀 제거, 전체 화면 미디어
+                    print("✅ 타이틀 영역 제거: 전체 890px 미디어")
 
-                        # 전체 화면 합성 (타이틀 없음)
-                        single_clip = CompositeVideoClip([bg_clip] + text_clips, size=(self.video_width, self.video_height))
+                # 텍스트 이미지 (TTS 길이와 무관)
+                text_futures = {
+                    body_key: self._submit_in_context(prep_pool, self.create_text_image, content[body_key], self.video_width, self.video_height, text_position, text_style, is_title=False, title_font=title_font, body_font=body_font, title_area_mode=title_area_mode, title_font_size=title_font_size, body_font_size=body_font_size)
+                    for body_key in body_keys
+                }
 
-                    group_clips.append(single_clip)
-                    print(f"    ✅ 모든 대사 완료: 단일 미디어 연속 적용 ({total_duration:.1f}초)")
+                # 3) 세그먼트 합성 단계: 입력이 준비되는 대로 개별 시작
+                segment_args = [
+                    (segment_index, media_index, segment_bodies, content, tts_futures, media_futures[media_index],
+                     text_futures, title_future, image_allocation_mode, title_area_mode, image_panning_options)
+                    for segment_index, media_index, segment_bodies in segment_plan
+                ]
 
-                    # 오디오 추가 (voice_narration이 enabled일 때만)
-                    for _, _, tts_path, _ in all_tts_info:
-                        if tts_path and voice_narration == "enabled":
-                            audio_segments.append(AudioFileClip(tts_path))
+                report_stage('composite')
+                # 세그먼트 캐시는 재렌더로 세그먼트를 재사용할 수 있는 작업에만 사용 (수정 텍스트 또는 이전에 렌더한 계획)
+                plan_base = None
+                if segment_cache.enabled:
+                    plan_base = self._segment_plan_base(
+                        local_images, content, title_area_mode, image_allocation_mode, text_position, text_style,
+                        title_font, body_font, title_font_size, body_font_size
+                    )
+                    if not segment_cache.should_cache(plan_base['plan_key'], self.render_config.reuse_segments):
+                        plan_base = None
+                if plan_base is not None or should_stream(len(segment_plan)):
+                    # 스트리밍 합성: 세그먼트별로 소스를 열어 중간 파일로 렌더한 뒤 바로 닫음 (메모리 상한 적용)
+                    # 세그먼트 캐시 사용 시 항상 중간 파일 경로 - 텍스트 수정 후 재렌더에서 바뀐 세그먼트만 렌더
+                    segment_dir = scratch_dir('segments')
+                    segment_readers = SegmentReaderPool()
+                    group_clips, segment_tts_info = self._render_segments_streaming(
+                        segment_pool, segment_args, segment_dir, segment_readers, plan_base
+                    )
+                else:
+                    segment_futures = [
+                        self._submit_in_context(segment_pool, self._build_segment_clip, *args)
+                        for args in segment_args
+                    ]
+
+                    group_clips = []
+                    segment_tts_info = []
+                    for future in segment_futures:
+                        segment_clip, tts_info = future.result()
+                        group_clips.append(segment_clip)
+                        segment_tts_info.extend(tts_info)
+                        report_segment_done()
 
             # 그룹들 연결 (크로스 디졸브 옵션에 따라 처리)
             print(f"🎬 영상 클립들 연결: {len(group_clips)}개 클립")
@@ -2786,97 +3151,31 @@ class VideoGenerator:
             else:
                 print("🎬 [그룹모드] 기본 연결 방식 사용 (크로스 디졸브 미적용)")
                 logging.info("🎬 [그룹모드] 기본 연결 방식 사용 (크로스 디졸브 미적용)")
-                final_video = concatenate_videoclips(group_clips, method="compose")
-            
-            # 8. TTS 오디오들 연결
-            final_audio = None
-            if audio_segments:
-                final_audio = concatenate_audioclips(audio_segments)
-
-                # 자막 읽어주기 설정에 따른 TTS 볼륨 조절
-                if voice_narration == "disabled":
-                    print("🔇 자막 읽어주기 제거: TTS 볼륨을 0으로 설정")
-                    final_audio = final_audio.volumex(0)  # TTS 음성 무음 처리
-            else:
-                print("📢 TTS 오디오 없음 (자막 지속 시간 모드 또는 생성 실패)")
-
-            # 9. 배경음악 또는 원본 비디오 소리 추가
-            if music_mood == "none":
-                # 음악 선택 안함: 원본 비디오 파일에서 직접 오디오 추출
-                print("🔇 음악 선택 안함 모드: 원본 비디오 파일에서 오디오 추출")
-                video_audio = None
-                video_extensions = ['.mp4', '.mov', '.avi', '.webm', '.mkv', '.gif']
-
-                if media_files:
-                    for media_path, file_type in media_files:
-                        if file_type == "video" and any(media_path.lower().endswith(ext) for ext in video_extensions):
-                            try:
-                                source_clip = VideoFileClip(media_path)
-                                if source_clip.audio is not None:
-                                    video_audio = source_clip.audio
-                                    # 오디오 길이를 영상 길이에 맞춤
-                                    target_duration = final_audio.duration if final_audio else final_video.duration
-                                    if video_audio.duration < target_duration:
-                                        video_audio = video_audio.loop(duration=target_duration)
-                                    else:
-                                        video_audio = video_audio.subclip(0, target_duration)
-                                    print(f"📹 원본 비디오 오디오 추출 성공: {os.path.basename(media_path)} ({video_audio.duration:.1f}초)")
-                                    break  # 첫 번째 비디오의 오디오만 사용
-                                else:
-                                    print(f"📸 비디오에 오디오 없음: {os.path.basename(media_path)}")
-                            except Exception as e:
-                                print(f"⚠️ 비디오 오디오 추출 실패 ({os.path.basename(media_path)}): {e}")
-                                continue
-                else:
-                    print("⚠️ 미디어 파일 정보 없음 - 원본 비디오 소리 사용 불가")
-
-                # 비디오 오디오와 TTS 합성
-                if video_audio is not None:
-                    if voice_narration == "disabled" or final_audio is None:
-                        # 자막 읽어주기 제거: 원본 비디오 소리 100%
-                        final_audio = video_audio.volumex(1.0)
-                        print("🔊 자막 읽어주기 꺼짐 - 원본 비디오 소리 100%")
-                    else:
-                        # 자막 읽어주기 추가: TTS(70%) + 원본 비디오 소리(50%) 믹싱
-                        video_audio = video_audio.volumex(0.5)
-                        final_audio = CompositeAudioClip([
-                            final_audio.volumex(0.7),
-                            video_audio
-                        ])
-                        print("🎵 TTS(70%) + 비디오 원본 오디오(50%) 합성 완료")
-                else:
-                    if voice_narration == "disabled" or final_audio is None:
-                        print("🔇 자막 읽어주기 제거 + 비디오 오디오 없음: 완전 무음")
-                    else:
-                        print("🔇 비디오 오디오 없음: TTS만 사용")
+                final_video = concatenate_clips(group_clips)
 
-            elif music_path and os.path.exists(music_path):
-                # 배경음악 사용
-                background_music = AudioFileClip(music_path)
-
-                # 배경음악 길이 조정 기준: final_audio가 있으면 그 길이, 없으면 영상 길이
-                target_duration = final_audio.duration if final_audio else final_video.duration
-
-                # 배경음악이 영상보다 짧으면 반복, 길면 자르기
-                if background_music.duration < target_duration:
-                    background_music = background_music.loop(duration=target_duration)
-                else:
-                    background_music = background_music.subclip(0, target_duration)
-
-                if voice_narration == "disabled" or final_audio is None:
-                    # 자막 읽어주기 제거: 배경음악 100%
-                    final_audio = background_music.volumex(1.0)  # 배경음악 볼륨 100%
-                    print("🔇 자막 읽어주기 제거: 배경음악 100%")
-                else:
-                    # 자막 읽어주기 추가: TTS + 배경음악 합성
-                    background_music = background_music.volumex(0.15)  # 볼륨 15% (TTS가 잘 들리도록)
-                    final_audio = CompositeAudioClip([final_audio, background_music])
-                    print("🎵 TTS + 배경음악 합성 완료")
-
-            if final_audio:
-                final_video = final_video.set_audio(final_audio)
-            else:
-                print("🔇 최종 오디오 없음: 무음 영상 생성")
+            # 합성 최적화 결과 기록 (프레임당 제거된 레이어 합성 수)
+            optimize_summary = composite_report.summary()
+            with stage_span('composite_optimize', **optimize_summary):
+                pass
+            if optimize_summary['composites'] or optimize_summary['chain_concats']:
+                logger.info(f"🧩 합성 최적화: 레이어 {optimize_summary['layers_in']}→{optimize_summary['layers_out']}개, "
+                            f"프레임당 합성 {optimize_summary['blits_per_frame_before']}→{optimize_summary['blits_per_frame_after']}회")
+            
+            # 8~9. 오디오: 나레이션 + 배경음악/원본 소리를 FFmpeg로 한 번에 믹싱 (실패 시 MoviePy 합성으로 대체)
+            report_stage('audio_mix')
+            mixed_audio_path = None
+            use_audio_mixer = AUDIO_MIX_ENGINE == 'ffmpeg'
+            if use_audio_mixer:
+                try:
+                    mix_plan = self._plan_audio_mix(segment_tts_info, final_video.duration, music_mood, music_path, media_files, voice_narration)
+                    mixed_audio_path = render_audio_mix(mix_plan, scratch_path('.m4a', 'audio_mix'))
+                    if mixed_audio_path is None:
+                        print("🔇 최종 오디오 없음: 무음 영상 생성")
+                except Exception as e:
+                    logger.warning(f"⚠️ FFmpeg 오디오 믹싱 실패 - MoviePy 합성으로 대체: {e}")
+                    use_audio_mixer = False
+            if not use_audio_mixer:
+                final_video = self._attach_moviepy_audio(final_video, segment_tts_info, music_mood, music_path, media_files, voice_narration)
             
             # 10. 최종 영상 저장
             video_id = str(uuid.uuid4())[:8]
@@ -2890,25 +3189,211 @@ class VideoGenerator:
             output_path = os.path.join(output_folder, output_filename)
             
             print(f"최종 영상 렌더링 시작: {output_path}")
-            final_video.write_videofile(
-                output_path,
-                fps=self.fps,
-                codec='libx264',
-                audio_codec='aac',
-                temp_audiofile='temp-audio.m4a',
-                remove_temp=True,
-                verbose=False,
-                logger=None
-            )
+            encode_frames = int(final_video.duration * self.fps)
+            report_stage('encode')
+            # MoviePy는 합성을 프레임 단위로 지연 실행하므로 실제 합성 비용은 encode 단계에 포함됨
+            if use_audio_mixer:
+                # 영상만 인코딩한 뒤 믹싱된 오디오를 재인코딩 없이 합침
+                video_only_path = scratch_path('.mp4', 'encode')
+                with stage_span('encode', frames=encode_frames) as span:
+                    final_video.write_videofile(
+                        video_only_path,
+                        fps=self.fps,
+                        codec='libx264',
+                        audio=False,
+                        verbose=False,
+                        logger=encode_progress_logger(encode_frames)
+                    )
+                    span['bytes'] = os.path.getsize(video_only_path)
+                report_stage('mux')
+                mux_audio(video_only_path, mixed_audio_path, output_path)
+            else:
+                with stage_span('encode', frames=encode_frames) as span:
+                    final_video.write_videofile(
+                        output_path,
+                        fps=self.fps,
+                        codec='libx264',
+                        audio_codec='aac',
+                        temp_audiofile=scratch_path('.m4a', 'encode'),
+                        remove_temp=True,
+                        verbose=False,
+                        logger=encode_progress_logger(encode_frames)
+                    )
+                    span['bytes'] = os.path.getsize(output_path)
             
             print(f"영상 생성 완료: {output_path}")
             return output_path
             
         except Exception as e:
             raise Exception(f"로컬 이미지 영상 생성 실패: {str(e)}")
+
+        finally:
+            composite_report.deactivate(report_token)
+            clip_registry.close_all()
+            clip_registry.deactivate(registry_token)
+            # 스트리밍 합성 중간 파일 리더/파일 정리
+            if segment_readers is not None:
+                segment_readers.close_all()
+            if segment_dir:
+                release_scratch(segment_dir)
+            # 미디어 준비 단계 임시 파일(회전 정규화 등) 정리 - 공유 준비 결과는 SharedPreparation.close()에서 정리
+            if shared_prep is None:
+                self._release_prepared_sources()
+            _active_prepared_sources.reset(sources_token)
+            if owned_workspace is not None:
+                owned_workspace.close()
+                owned_workspace.deactivate(workspace_token)
+            _active_render_config.reset(config_token)
     
+    def _plan_audio_mix(self, segment_tts_info, video_duration, music_mood, music_path, media_files, voice_narration):
+        """최종 오디오 믹스 계획 (MoviePy 합성 경로와 같은 볼륨 비율)
+
+        나레이션은 세그먼트 순서대로 각 TTS 길이만큼 이어 붙이고(TTS가 없는 세그먼트는 무음으로 자리 유지),
+        배경음악 또는 원본 비디오 소리는 영상 길이에 맞춰 반복/자른다.
+        """
+        narration = []
+        if voice_narration == "enabled" and any(tts_path for _, _, tts_path, _ in segment_tts_info):
+            narration = [(tts_path, duration) for _, _, tts_path, duration in segment_tts_info]
+        else:
+            print("📢 TTS 오디오 없음 (자막 읽어주기 꺼짐, 자막 지속 시간 모드 또는 생성 실패)")
+
+        plan = AudioMixPlan(duration=video_duration, narration=narration, description='나레이션')
+
+        if music_mood == "none":
+            # 음악 선택 안함: 첫 번째 오디오 있는 원본 비디오의 소리 - TTS(70%) + 원본(50%), 나레이션 없으면 원본 100%
+            # 미디어 준비 단계의 probe 결과로 오디오 유무를 확인하고, 오디오 스트림만 PCM으로 추출 (비디오 디코딩 없음)
+            video_extensions = ['.mp4', '.mov', '.avi', '.webm', '.mkv', '.gif']
+            for media_path, file_type in (media_files or []):
+                if file_type == "video" and any(media_path.lower().endswith(ext) for ext in video_extensions):
+                    if not has_audio(media_path):
+                        print(f"📸 비디오에 오디오 없음: {os.path.basename(media_path)}")
+                        continue
+                    plan.bed = extract_audio_pcm(media_path, scratch_path('.pcm', 'audio_mix'), max_duration=video_duration)
+                    plan.narration_gain, plan.bed_gain, plan.bed_solo_gain = 0.7, 0.5, 1.0
+                    plan.description = f"원본 비디오 소리 ({os.path.basename(media_path)})"
+                    print(f"📹 원본 비디오 오디오 추출 성공: {os.path.basename(media_path)}")
+                    break
+        elif music_path and os.path.exists(music_path):
+            # 배경음악: 나레이션과 함께면 15% (TTS가 잘 들리도록), 나레이션 없으면 100%
+            # 카탈로그 곡은 PCM 캐시를 입력으로 쓰고 더킹 볼륨을 실제 라우드니스로 계산
+            if BGM_CATALOG_AVAILABLE:
+                plan.bed = bgm_catalog.mix_input(music_path)
+                plan.bed_gain = bgm_catalog.ducking_gain(music_path)
+            else:
+                plan.bed = AudioInput(music_path)
+                plan.bed_gain = 0.15
+            plan.bed_solo_gain = 1.0
+            plan.description = f"배경음악 ({os.path.basename(music_path)}, 더킹 {plan.bed_gain:.2f})"
+
+        return plan
+
+    def _attach_moviepy_audio(self, final_video, segment_tts_info, music_mood, music_path, media_files, voice_narration):
+        """MoviePy 합성 오디오 경로 (AUDIO_MIX_ENGINE=moviepy 또는 FFmpeg 믹싱 실패 시)"""
+        # 오디오 추가 (voice_narration이 enabled일 때만, 세그먼트 순서 유지)
+        audio_segments = []
+        for _, _, tts_path, _ in segment_tts_info:
+            if tts_path and voice_narration == "enabled":
+                audio_segments.append(track_clip(AudioFileClip(tts_path)))
+
+        # 8. TTS 오디오들 연결
+        final_audio = None
+        if audio_segments:
+            final_audio = concatenate_audioclips(audio_segments)
+
+            # 자막 읽어주기 설정에 따른 TTS 볼륨 조절
+            if voice_narration == "disabled":
+                print("🔇 자막 읽어주기 제거: TTS 볼륨을 0으로 설정")
+                final_audio = final_audio.volumex(0)  # TTS 음성 무음 처리
+        else:
+            print("📢 TTS 오디오 없음 (자막 지속 시간 모드 또는 생성 실패)")
+
+        # 9. 배경음악 또는 원본 비디오 소리 추가
+        if music_mood == "none":
+            # 음악 선택 안함: 원본 비디오 파일에서 직접 오디오 추출
+            print("🔇 음악 선택 안함 모드: 원본 비디오 파일에서 오디오 추출")
+            video_audio = None
+            video_extensions = ['.mp4', '.mov', '.avi', '.webm', '.mkv', '.gif']
+
+            if media_files:
+                for media_path, file_type in media_files:
+                    if file_type == "video" and any(media_path.lower().endswith(ext) for ext in video_extensions):
+                        try:
+                            # 오디오 스트림만 읽음 (VideoFileClip은 비디오 디코더까지 열기 때문에 사용하지 않음)
+                            if has_audio(media_path):
+                                video_audio = track_clip(AudioFileClip(media_path))
+                                # 오디오 길이를 영상 길이에 맞춤
+                                target_duration = final_audio.duration if final_audio else final_video.duration
+                                if video_audio.duration < target_duration:
+                                    video_audio = video_audio.loop(duration=target_duration)
+                                else:
+                                    video_audio = video_audio.subclip(0, target_duration)
+                                print(f"📹 원본 비디오 오디오 추출 성공: {os.path.basename(media_path)} ({video_audio.duration:.1f}초)")
+                                break  # 첫 번째 비디오의 오디오만 사용
+                            else:
+                                print(f"📸 비디오에 오디오 없음: {os.path.basename(media_path)}")
+                        except Exception as e:
+                            print(f"⚠️ 비디오 오디오 추출 실패 ({os.path.basename(media_path)}): {e}")
+                            continue
+            else:
+                print("⚠️ 미디어 파일 정보 없음 - 원본 비디오 소리 사용 불가")
+
+            # 비디오 오디오와 TTS 합성
+            if video_audio is not None:
+                if voice_narration == "disabled" or final_audio is None:
+                    # 자막 읽어주기 제거: 원본 비디오 소리 100%
+                    final_audio = video_audio.volumex(1.0)
+                    print("🔊 자막 읽어주기 꺼짐 - 원본 비디오 소리 100%")
+                else:
+                    # 자막 읽어주기 추가: TTS(70%) + 원본 비디오 소리(50%) 믹싱
+                    video_audio = video_audio.volumex(0.5)
+                    final_audio = CompositeAudioClip([
+                        final_audio.volumex(0.7),
+                        video_audio
+                    ])
+                    print("🎵 TTS(70%) + 비디오 원본 오디오(50%) 합성 완료")
+            else:
+                if voice_narration == "disabled" or final_audio is None:
+                    print("🔇 자막 읽어주기 제거 + 비디오 오디오 없음: 완전 무음")
+                else:
+                    print("🔇 비디오 오디오 없음: TTS만 사용")
+
+        elif music_path and os.path.exists(music_path):
+            # 배경음악 사용
+            background_music = track_clip(AudioFileClip(music_path))
+
+            # 배경음악 길이 조정 기준: final_audio가 있으면 그 길이, 없으면 영상 길이
+            target_duration = final_audio.duration if final_audio else final_video.duration
+
+            # 배경음악이 영상보다 짧으면 반복, 길면 자르기
+            if background_music.duration < target_duration:
+                background_music = background_music.loop(duration=target_duration)
+            else:
+                background_music = background_music.subclip(0, target_duration)
+
+            if voice_narration == "disabled" or final_audio is None:
+                # 자막 읽어주기 제거: 배경음악 100%
+                final_audio = background_music.volumex(1.0)  # 배경음악 볼륨 100%
+                print("🔇 자막 읽어주기 제거: 배경음악 100%")
+            else:
+                # 자막 읽어주기 추가: TTS + 배경음악 합성
+                background_music = background_music.volumex(0.15)  # 볼륨 15% (TTS가 잘 들리도록)
+                final_audio = CompositeAudioClip([final_audio, background_music])
+                print("🎵 TTS + 배경음악 합성 완료")
+
+        if final_audio:
+            final_video = final_video.set_audio(final_audio)
+        else:
+            print("🔇 최종 오디오 없음: 무음 영상 생성")
+        return final_video
+
     def create_video(self, content, image_urls, music_path, output_folder, image_allocation_mode="2_per_image", text_position="bottom", text_style="outline"):
         """릴스 영상 생성 (414x896 해상도, 여러 이미지 지원)"""
+        clip_registry = ClipRegistry(content.get('title', '')[:30])
+        registry_token = clip_registry.activate()
+        owned_workspace = None
+        if get_active_workspace() is None:
+            owned_workspace = ScratchWorkspace('render')
+            workspace_token = owned_workspace.activate()
         try:
             # 여러 이미지 다운로드
             image_paths = []
@@ -2948,21 +3433,14 @@ class VideoGenerator:
                     logger.info(f"⏱️ {body_key} TTS 건너뜀 (자막 지속 시간 {subtitle_duration}초 사용)")
                     tts_files.append((body_key, None, subtitle_duration))
                 else:
-                    # 대사별 TTS 설정이 있으면 임시로 화자/스타일 교체
-                    original_speaker = self.qwen_speaker
-                    original_style = self.qwen_style
-                    if self.per_body_tts_settings and self.tts_engine == 'qwen' and body_key in self.per_body_tts_settings:
-                        body_setting = self.per_body_tts_settings[body_key]
-                        self.qwen_speaker = body_setting.get('speaker', original_speaker)
-                        self.qwen_style = body_setting.get('style', original_style)
-                        logger.info(f"🎭 {body_key} 개별 TTS: 화자={self.qwen_speaker}, 스타일={self.qwen_style}")
-
-                    logger.info(f"🎙️ {body_key} TTS 생성 중... 내용: '{content[body_key][:50]}...'")
-                    body_tts = self.create_tts_audio(content[body_key])
-
-                    # 원래 설정 복원
-                    self.qwen_speaker = original_speaker
-                    self.qwen_style = original_style
+                    # 대사별 TTS 설정이 있으면 이 body에만 화자/스타일을 적용한 설정 사용
+                    body_config = self.render_config.for_body(body_key)
+                    if body_config is not self.render_config:
+                        logger.info(f"🎭 {body_key} 개별 TTS: 화자={body_config.qwen_speaker}, 스타일={body_config.qwen_style}")
+
+                    with self.use_render_config(body_config):
+                        logger.info(f"🎙️ {body_key} TTS 생성 중... 내용: '{content[body_key][:50]}...'")
+                        body_tts = self.create_tts_audio(content[body_key])
 
                     if body_tts:
                         body_duration = self.get_audio_duration(body_tts)
@@ -3003,7 +3481,8 @@ class VideoGenerator:
                     print(f"{body_key} 클립 생성: {clip_duration:.1f}초, 이미지: {image_index + 1}/{len(image_paths)} (1:1 매칭)")
                     
                     # 개별 body 클립 생성
-                    bg_clip = self.create_background_clip(current_image_path, clip_duration)
+                    with self._rng_scope(body_key):
+                        bg_clip = self.create_background_clip(current_image_path, clip_duration)
                     black_top = ColorClip(size=(self.video_width, self.title_height), color=(0,0,0)).set_duration(clip_duration).set_position((0, 0))
                     title_clip = ImageClip(title_image_path).set_duration(clip_duration).set_position((0, 0))
 
@@ -3016,7 +3495,7 @@ class VideoGenerator:
                     
                     # 오디오 세그먼트 추가
                     if tts_path and os.path.exists(tts_path):
-                        body_audio = AudioFileClip(tts_path)
+                        body_audio = track_clip(AudioFileClip(tts_path))
                         audio_segments.append(body_audio)
                         print(f"{body_key} 오디오 세그먼트 추가")
                         
@@ -3047,7 +3526,8 @@ class VideoGenerator:
                     print(f"{body_key} 클립 생성: {clip_duration:.1f}초, 이미지: {image_index + 1}/{len(image_paths)} (2:1 매칭)")
                     
                     # 기존 방식대로 클립 생성
-                    bg_clip = self.create_background_clip(current_image_path, clip_duration)
+                    with self._rng_scope(body_key):
+                        bg_clip = self.create_background_clip(current_image_path, clip_duration)
                     black_top = ColorClip(size=(self.video_width, self.title_height), color=(0,0,0)).set_duration(clip_duration).set_position((0, 0))
                     title_clip = ImageClip(title_image_path).set_duration(clip_duration).set_position((0, 0))
 
@@ -3060,7 +3540,7 @@ class VideoGenerator:
                     
                     # 오디오 세그먼트 추가
                     if tts_path and os.path.exists(tts_path):
-                        body_audio = AudioFileClip(tts_path)
+                        body_audio = track_clip(AudioFileClip(tts_path))
                         audio_segments.append(body_audio)
                         print(f"{body_key} 오디오 세그먼트 추가")
 
@@ -3126,7 +3606,7 @@ class VideoGenerator:
                     # 오디오 세그먼트 추가
                     for body_key, tts_path, duration in all_tts_info:
                         if tts_path and os.path.exists(tts_path):
-                            body_audio = AudioFileClip(tts_path)
+                            body_audio = track_clip(AudioFileClip(tts_path))
                             audio_segments.append(body_audio)
                             print(f"{body_key} 오디오 세그먼트 추가")
 
@@ -3174,7 +3654,7 @@ class VideoGenerator:
                             media_path, file_type = media_file
                             if file_type == "video" and any(media_path.lower().endswith(ext) for ext in video_extensions):
                                 try:
-                                    video_audio = VideoFileClip(media_path).audio
+                                    video_audio = track_clip(VideoFileClip(media_path)).audio
                                     if video_audio is not None:
                                         # 비디오 오디오 길이 조정: TTS가 있으면 TTS 길이에, 없으면 영상 길이에 맞춤
                                         target_duration = combined_tts.duration if combined_tts else final_video.duration
@@ -3204,11 +3684,11 @@ class VideoGenerator:
                     # 자막 읽어주기 설정에 따른 배경음악 볼륨 조절
                     if voice_narration == "disabled" or combined_tts is None:
                         # TTS 음성이 꺼진 경우 또는 TTS 없는 경우 배경음악을 100%로 설정
-                        bg_music = AudioFileClip(music_path).volumex(1.0)
+                        bg_music = track_clip(AudioFileClip(music_path)).volumex(1.0)
                         print("🎵 자막 읽어주기 꺼짐 - 배경음악 100%")
                     else:
                         # TTS가 더 잘 들리도록 15%로 낮춤
-                        bg_music = AudioFileClip(music_path).volumex(0.15)
+                        bg_music = track_clip(AudioFileClip(music_path)).volumex(0.15)
                         print("🎵 자막 읽어주기 켜짐 - 배경음악 15%")
 
                     # 배경음악 길이 조정: TTS가 있으면 TTS 길이에, 없으면 영상 길이에 맞춤
@@ -3250,7 +3730,7 @@ class VideoGenerator:
                 fps=self.fps,
                 codec='libx264',
                 audio_codec='aac',
-                temp_audiofile='temp-audio.m4a',
+                temp_audiofile=scratch_path('.m4a', 'encode'),
                 remove_temp=True,
                 verbose=False,
                 logger=None
@@ -3272,6 +3752,13 @@ class VideoGenerator:
             
         except Exception as e:
             raise Exception(f"Video generation failed: {str(e)}")
+
+        finally:
+            clip_registry.close_all()
+            clip_registry.deactivate(registry_token)
+            if owned_workspace is not None:
+                owned_workspace.close()
+                owned_workspace.deactivate(workspace_token)
     
     def scan_uploads_folder(self, uploads_folder="uploads"):
         """uploads 폴더를 스캔하여 파일들을 찾고 분류"""
@@ -3352,11 +3839,13 @@ class VideoGenerator:
         
         return scan_result
     
-    def create_video_from_uploads(self, output_folder, bgm_file_path=None, image_allocation_mode="2_per_image", text_position="bottom", text_style="outline", title_area_mode="keep", title_font="BMYEONSUNG_otf.otf", body_font="BMYEONSUNG_otf.otf", title_font_size=42, body_font_size=36, uploads_folder="uploads", music_mood="bright", voice_narration="enabled", cross_dissolve="enabled", subtitle_duration=0.0, image_panning_options=None, tts_engine="edge", qwen_speaker="Sohee", qwen_speed="normal", qwen_style="neutral", edge_speaker="female", edge_speed="normal", edge_pitch="normal"):
+    def create_video_from_uploads(self, output_folder, bgm_file_path=None, image_allocation_mode="2_per_image", text_position="bottom", text_style="outline", title_area_mode="keep", title_font="BMYEONSUNG_otf.otf", body_font="BMYEONSUNG_otf.otf", title_font_size=42, body_font_size=36, uploads_folder="uploads", music_mood="bright", voice_narration="enabled", cross_dissolve="enabled", subtitle_duration=0.0, image_panning_options=None, tts_engine="edge", qwen_speaker="Sohee", qwen_speed="normal", qwen_style="neutral", edge_speaker="female", edge_speed="normal", edge_pitch="normal", render_config=None, shared_prep=None):
         """uploads 폴더의 파일들을 사용하여 영상 생성 (기존 메서드 재사용)
 
         Args:
             image_panning_options: 이미지별 패닝 옵션 딕셔너리 (예: {0: True, 1: False})
+            render_config: 작업별 RenderConfig (공유 생성기 사용 시 전달)
+            shared_prep: 다중 출력 작업의 SharedPreparation (포맷별 렌더 간 TTS/미디어 준비 공유)
         """
         try:
             print("🚀 uploads 폴더 기반 영상 생성 시작")
@@ -3385,27 +3874,15 @@ class VideoGenerator:
                 music_path = ""
 
             # 기존 create_video_with_local_images 방식 재사용
-            # 스캔된 이미지 파일들로 로컬 이미지 리스트 대체
-            self._temp_local_images = scan_result['image_files']
-
+            # 스캔된 이미지 파일들로 로컬 이미지 리스트 대체 (인스턴스에 저장하지 않고 직접 전달)
             # 기존 메서드 호출 (이미지 할당 모드, 텍스트 위치, 텍스트 스타일, 타이틀 영역 모드, 폰트 설정, 폰트 크기, 자막 읽어주기, 자막 지속 시간, 패닝 옵션, TTS 설정 전달)
-            return self.create_video_with_local_images(content, music_path, output_folder, image_allocation_mode, text_position, text_style, title_area_mode, title_font, body_font, title_font_size, body_font_size, music_mood, scan_result['media_files'], voice_narration, cross_dissolve, subtitle_duration, image_panning_options, tts_engine, qwen_speaker, qwen_speed, qwen_style, edge_speaker, edge_speed, edge_pitch)
+            return self.create_video_with_local_images(content, music_path, output_folder, image_allocation_mode, text_position, text_style, title_area_mode, title_font, body_font, title_font_size, body_font_size, music_mood, scan_result['media_files'], voice_narration, cross_dissolve, subtitle_duration, image_panning_options, tts_engine, qwen_speaker, qwen_speed, qwen_style, edge_speaker, edge_speed, edge_pitch, render_config=render_config, local_images=scan_result['image_files'], shared_prep=shared_prep)
 
         except Exception as e:
             raise Exception(f"uploads 폴더 기반 영상 생성 실패: {str(e)}")
     
     def get_local_images(self, test_folder="./test"):
         """test 폴더에서 이미지 파일들을 이름순으로 가져오기"""
-        # uploads 폴더 사용 시 임시 이미지 리스트가 있으면 그것을 사용
-        if hasattr(self, '_temp_local_images') and self._temp_local_images:
-            images = self._temp_local_images
-            self._temp_local_images = None  # 사용 후 정리
-            print(f"업로드 이미지 파일 발견: {len(images)}개 (순서대로)")
-            for i, file in enumerate(images):
-                print(f"  {i+1}. {os.path.basename(file)}")
-            return images
-        
-        # 기존 test 폴더 로직
         import glob
         
         # 이미지 확장자 패턴 (webp 추가)
@@ -3561,7 +4038,7 @@ class VideoGenerator:
                     logger.info(f"🔳 RGBA → RGB 변환 완료")
 
                 # 임시 파일로 저장 (고품질)
-                temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.jpg')
+                temp_file = scratch_file('.jpg', 'media')
                 resized_img.save(temp_file.name, 'JPEG', quality=95)
                 processed_image_path = temp_file.name
                 logger.info(f"💾 resizedImage 저장 완료: {processed_image_path}")
@@ -3584,7 +4061,7 @@ class VideoGenerator:
                     safe_pan_range = min(self.panning_range, available_margin)
 
                     # 가로 패닝 방향만 랜덤 선택
-                    pattern = random.choice([1, 2])
+                    pattern = self._render_rng('panning', image_path).choice([1, 2])
 
                     if pattern == 1:
                         # 좌→우 패닝: 이미지를 왼쪽으로 이동 (왼쪽 부분 → 오른쪽 부분 보여주기)
@@ -3606,7 +4083,7 @@ class VideoGenerator:
                     safe_pan_range = min(self.panning_range, available_margin)
 
                     # 세로 패닝 방향만 랜덤 선택
-                    pattern = random.choice([1, 2])
+                    pattern = self._render_rng('panning', image_path).choice([1, 2])
 
                     if pattern == 1:
                         # 상→하 패닝: 이미지를 위쪽으로 이동 (위쪽 부분 → 아래쪽 부분 보여주기)
@@ -3678,7 +4155,7 @@ class VideoGenerator:
 
         try:
             # 비디오 클립 로드 (정규화된 파일 사용)
-            video_clip = VideoFileClip(normalized_path)
+            video_clip = track_clip(VideoFileClip(normalized_path))
             orig_width, orig_height = video_clip.size
             print(f"📐 비디오 크기: {orig_width}x{orig_height} (정규화: {'예' if is_temp_file else '아니오'})")
 
@@ -3934,7 +4411,7 @@ class VideoGenerator:
                 processed_clips.append(clips[i])
             else:
                 # 이전 클립과 현재 클립 사이에 전환 효과 적용
-                transition_type = random.choice(transitions)
+                transition_type = self._render_rng('transition', f"clip{i}").choice(transitions)
                 print(f"  🔄 클립 {i}: {transition_type} 전환")
 
                 if transition_type == 'cut':
@@ -4032,7 +4509,7 @@ class VideoGenerator:
         """와이프 전환 효과 적용 (4방향 랜덤)"""
         try:
             wipe_directions = ['left_to_right', 'right_to_left', 'top_to_bottom', 'bottom_to_top']
-            direction = random.choice(wipe_directions)
+            direction = self._render_rng('wipe', f"{clip1.duration:.3f}-{clip2.duration:.3f}").choice(wipe_directions)
 
             # 안전한 duration 계산
             safe_duration = min(duration, clip1.duration * 0.2)
@@ -4301,7 +4778,7 @@ class VideoGenerator:
             msg = "   ⚠️ 클립이 없거나 1개 이하입니다. 기본 연결 사용"
             print(msg)
             logging.warning(msg)
-            return concatenate_videoclips(clips, method="compose") if clips else None
+            return concatenate_clips(clips) if clips else None
 
         msg = f"🎬 스마트 크로스 디졸브 전환 시작: {len(clips)}개 클립 (강화된 2초 효과)"
         print(msg)
@@ -4326,7 +4803,7 @@ class VideoGenerator:
             msg = "   -> concatenate_videoclips로 기본 연결합니다"
             print(msg)
             logging.info(msg)
-            return concatenate_videoclips(clips, method="compose")
+            return concatenate_clips(clips)
 
         # 개별 클립에 fade 효과 적용
         print("🔄 개별 클립에 fade 효과 적용 호출...")
@@ -4345,7 +4822,7 @@ class VideoGenerator:
                 except Exception as e:
                     print(f"   클립 [{i}]: 정보 확인 실패 - {e}")
 
-            final_video = concatenate_videoclips(processed_clips, method="compose")
+            final_video = concatenate_clips(processed_clips)
             print(f"✅ 크로스 디졸브 전환 완료: 최종 길이 {final_video.duration:.2f}초")
             return final_video
         except Exception as e:
@@ -9,7 +9,9 @@ import time
 import json
 import logging
 import signal
+import random
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, Any, Optional
 
@@ -19,11 +21,20 @@ sys.path.insert(0, current_dir)
 
 # 통합 로깅 시스템 import
 from utils.logger_config import get_logger
+from utils.stage_timer import StageTimer
 logger = get_logger('worker')
 
 from job_queue import job_queue, JobStatus
 from email_service import email_service
-from video_generator import VideoGenerator
+from video_generator import VideoGenerator, SharedPreparation, get_shared_generator
+from clip_registry import get_reader_stats
+from scratch_space import ScratchWorkspace, cleanup_stale_workspaces
+from job_progress import ProgressReporter, publish_state, progress_part, get_active_reporter
+from worker_heartbeat import HeartbeatWriter, live_workers
+from job_cost import job_cost_model
+from notification_outbox import notification_outbox, NotificationSender
+from job_notifications import queue_notification, webhook_urls, send_job_webhook, notify_job_failed, finish_batch
+from render_config import new_render_seed, parse_render_seed, parse_output_formats
 
 # Job 로깅 시스템 import
 try:
@@ -45,6 +56,15 @@ except ImportError as e:
     folder_manager = None
     FOLDER_MANAGER_AVAILABLE = False
 
+# BGM 카탈로그 import
+try:
+    from bgm_catalog import bgm_catalog
+    BGM_CATALOG_AVAILABLE = True
+except ImportError as e:
+    logger.warning(f"⚠️ Worker: BGM 카탈로그 로드 실패: {e}")
+    bgm_catalog = None
+    BGM_CATALOG_AVAILABLE = False
+
 logger.info("🤖 Worker 프로세스 시작")
 
 class VideoWorker:
@@ -52,7 +72,11 @@ class VideoWorker:
         self.worker_id = worker_id
         self.is_running = False
         self.current_job = None
-        self.video_generator = VideoGenerator()
+        self.current_progress: Optional[ProgressReporter] = None
+        self.processed_jobs = 0
+        self.video_generator = get_shared_generator(VideoGenerator)
+        self.heartbeat = HeartbeatWriter(worker_id, self._heartbeat_status)
+        self.notifier = NotificationSender(notification_outbox, worker_id)
 
         # 정상 종료를 위한 시그널 핸들러 설정
         signal.signal(signal.SIGINT, self._signal_handler)
@@ -65,29 +89,76 @@ class VideoWorker:
         logger.info(f"📥 종료 신호 수신 ({signum}). 현재 작업 완료 후 종료합니다...")
         self.is_running = False
 
-    def _send_webhook(self, webhook_url: str, job_id: str, status: str, video_url: Optional[str] = None) -> None:
-        """webhook_url로 작업 완료/실패 알림 POST 전송"""
+    def _heartbeat_status(self) -> Dict[str, Any]:
+        """하트비트에 기록할 현재 상태 (현재 작업/단계/클립 리더)"""
+        progress = self.current_progress.snapshot() if self.current_progress else {}
+        return {
+            'is_running': self.is_running,
+            'current_job': self.current_job,
+            'stage': progress.get('stage'),
+            'segments': f"{progress.get('segments_done', 0)}/{progress.get('segments_total', 0)}" if progress else None,
+            'encode_percent': progress.get('encode_percent'),
+            'processed_jobs': self.processed_jobs,
+            'clip_readers': get_reader_stats(),
+        }
+
+    def _other_busy_workers(self) -> int:
+        """작업을 처리 중인 다른 워커 수 (하트비트 기준)"""
+        return sum(1 for worker in live_workers()
+                   if worker['worker_id'] != self.worker_id and worker.get('current_job'))
+
+    def process_job(self, job_data: Dict[str, Any]) -> Optional[bool]:
+        """개별 작업 처리 (단계별 소요 시간을 측정해 Job 로그 metadata에 저장)
+
+        성공 True, 실패 False, 이 워커가 처리 권한을 갖지 못했거나 잃은 작업은 None (재시도/알림 없음).
+
+        렌더 중간 파일은 작업 전용 작업 공간에 기록되고 작업이 끝나면(실패 포함) 삭제된다.
+        진행 상황(단계, 세그먼트 i/N, 인코딩 프레임)은 job_progress로 API 프로세스에 전달된다.
+        """
+        timer = StageTimer(job_data['job_id'])
+        progress = ProgressReporter(job_data['job_id'])
+        self.current_progress = progress
+        video_params = job_data.get('video_params') or {}
+        outputs = len(parse_output_formats(video_params.get('output_formats'), video_params.get('video_format', 'reels')))
+        with timer.activate(), progress.activate(), ScratchWorkspace(job_data['job_id']) as workspace:
+            try:
+                return self._run_job(job_data, progress)
+            finally:
+                self.current_progress = None
+                self._save_stage_timings(timer, workspace, outputs)
+                reader_stats = get_reader_stats()
+                logger.info(f"🎞️ 클립 리더 현황: 열림 {reader_stats['open_readers']}개, 누적 생성 {reader_stats['opened']}개, 작업 종료 시 정리 {reader_stats['closed_at_scope_end']}개")
+
+    def _save_stage_timings(self, timer: StageTimer, workspace: Optional[ScratchWorkspace] = None, outputs: int = 1) -> None:
+        """단계별 측정 결과(+ 작업 공간 단계별 기록 바이트, 출력 포맷 수)를 Job 로그 metadata의 stage_timings에 병합"""
+        summary = timer.summary()
+        summary['outputs'] = outputs
+        if workspace is not None:
+            summary['scratch'] = workspace.summary()
+            scratch_text = ", ".join(f"{stage}={size / 1024 / 1024:.1f}MB" for stage, size in summary['scratch']['bytes_by_stage'].items())
+            logger.info(f"💽 작업 공간 기록량: {timer.job_id} | {summary['scratch']['location']} | {scratch_text}")
+        stage_text = ", ".join(f"{stage}={info['total_ms']:.0f}ms" for stage, info in summary['stages'].items())
+        logger.info(f"⏱️ 단계별 소요 시간: {timer.job_id} | 전체={summary['total_ms']:.0f}ms | {stage_text}")
+
+        if not JOB_LOGGER_AVAILABLE:
+            return
         try:
-            import requests
-            payload = {"job_id": job_id, "status": status}
-            if video_url:
-                payload["video_url"] = video_url
-            headers = {
-                "Content-Type": "application/json",
-                "User-Agent": "Mozilla/5.0",
-            }
-            resp = requests.post(webhook_url, json=payload, headers=headers, timeout=10)
-            if resp.ok:
-                logger.info(f"🔗 Webhook 전송 성공: {webhook_url} (status={status}, http={resp.status_code})")
-            else:
-                # 응답 body 앞 500자 로깅 (JSON vs HTML 판별용)
-                body_preview = resp.text[:500].replace('\n', ' ')
-                logger.warning(f"⚠️ Webhook 전송 실패: http={resp.status_code} | body={body_preview}")
-        except Exception as wh_error:
-            logger.warning(f"⚠️ Webhook 전송 실패: {webhook_url} - {wh_error}")
-
-    def process_job(self, job_data: Dict[str, Any]) -> bool:
-        """개별 작업 처리"""
+            job_logger.update_job_metadata(timer.job_id, {'stage_timings': summary}, merge=True)
+        except Exception as log_error:
+            logger.warning(f"⚠️ 단계별 소요 시간 저장 실패: {log_error}")
+
+    def _record_render_seed(self, job_id: str, render_seed: int) -> None:
+        """렌더 시드를 Job 로그 metadata에 기록 (같은 시드로 다시 렌더하면 같은 결과)"""
+        logger.info(f"🎲 렌더 시드: {job_id} -> {render_seed}")
+        if not JOB_LOGGER_AVAILABLE:
+            return
+        try:
+            job_logger.update_job_metadata(job_id, {'render_seed': render_seed}, merge=True)
+        except Exception as log_error:
+            logger.warning(f"⚠️ 렌더 시드 기록 실패: {log_error}")
+
+    def _run_job(self, job_data: Dict[str, Any], progress: ProgressReporter) -> Optional[bool]:
+        """작업 1건 실행"""
         job_id = job_data['job_id']
         user_email = job_data['user_email']
         video_params = job_data['video_params']
@@ -96,11 +167,12 @@ class VideoWorker:
 
         try:
             # 작업을 처리 중 상태로 변경
-            if not job_queue.claim_job(job_id):
+            if not job_queue.claim_job(job_id, worker_id=self.worker_id):
                 logger.warning(f"⚠️ 작업 클레임 실패: {job_id} (이미 처리 중이거나 완료됨)")
-                return False
+                return None
 
             self.current_job = job_id
+            progress.set_state('processing', worker_id=self.worker_id)
 
             # Job 로거 상태 업데이트 (처리 시작)
             if JOB_LOGGER_AVAILABLE:
@@ -138,6 +210,15 @@ class VideoWorker:
             cross_dissolve = video_params.get('cross_dissolve', 'enabled')
             # 자막 지속 시간 파라미터 추출
             subtitle_duration = video_params.get('subtitle_duration', 0.0)
+            # 렌더 시드 (요청 지정값 또는 작업 지문에서 도출, 없으면 새로 만들어 작업에 저장 - 같은 시드면 같은 BGM/패닝/전환 선택)
+            # 큐의 video_params에 저장되므로 재시도 때도 같은 시드 사용
+            render_seed = job_queue.ensure_render_seed(job_id)
+            if render_seed is None:
+                render_seed = parse_render_seed(video_params.get('render_seed'))
+            if render_seed is None:
+                render_seed = new_render_seed()
+            video_params['render_seed'] = render_seed
+            self._record_render_seed(job_id, render_seed)
             # TTS 파라미터 추출
             tts_engine = video_params.get('tts_engine', 'edge')
             qwen_speaker = video_params.get('qwen_speaker', 'Sohee')
@@ -168,7 +249,8 @@ class VideoWorker:
             logger.debug(f"🔍 voice_narration='{voice_narration}' (타입: {type(voice_narration).__name__})")
             logger.debug(f"🔍 subtitle_duration={subtitle_duration} (타입: {type(subtitle_duration).__name__})")
 
-            # 콘텐츠 데이터 파싱
+            # 콘텐츠 데이터 파싱 (수정된 텍스트가 있으면 재렌더 - 바뀌지 않은 세그먼트는 세그먼트 캐시 재사용)
+            reuse_segments = False
             try:
                 content = json.loads(content_data) if isinstance(content_data, str) else content_data
                 video_title = content.get('title', '릴스 영상')
@@ -178,6 +260,7 @@ class VideoWorker:
                 try:
                     edited_texts_dict = json.loads(edited_texts_str) if isinstance(edited_texts_str, str) else edited_texts_str
                     if edited_texts_dict:
+                        reuse_segments = True
                         logger.info(f"📝 수정된 텍스트 적용: {len(edited_texts_dict)}개 이미지 인덱스")
                         for image_idx_str, texts in edited_texts_dict.items():
                             image_idx = int(image_idx_str)
@@ -220,13 +303,20 @@ class VideoWorker:
                     bgm_file_path = None
 
             # selected_bgm_path 없거나 파일 없으면 music_mood 폴더에서 랜덤 선택
-            if bgm_file_path is None and music_mood and music_mood != "none":
-                import random
+            # (render_seed로 고정 - 같은 제출은 같은 곡, 중복 제출 결과 재사용이 정확하도록)
+            bgm_rng = random.Random(render_seed)
+            if bgm_file_path is None and music_mood and music_mood != "none" and BGM_CATALOG_AVAILABLE:
+                bgm_file_path = bgm_catalog.select_random(music_mood, rng=bgm_rng)
+                if bgm_file_path:
+                    logger.info(f"🎵 BGM 랜덤 선택: {os.path.basename(bgm_file_path)} ({music_mood})")
+                else:
+                    logger.warning(f"⚠️ BGM 카탈로그에 {music_mood} 음악 없음")
+            elif bgm_file_path is None and music_mood and music_mood != "none":
                 bgm_folder = os.path.join(current_dir, "bgm", music_mood)
                 if os.path.exists(bgm_folder):
-                    bgm_files = [f for f in os.listdir(bgm_folder) if f.lower().endswith(('.mp3', '.wav', '.m4a'))]
+                    bgm_files = sorted(f for f in os.listdir(bgm_folder) if f.lower().endswith(('.mp3', '.wav', '.m4a')))
                     if bgm_files:
-                        selected_bgm = random.choice(bgm_files)
+                        selected_bgm = bgm_rng.choice(bgm_files)
                         bgm_file_path = os.path.join(bgm_folder, selected_bgm)
                         logger.info(f"🎵 BGM 랜덤 선택: {selected_bgm} ({music_mood})")
                     else:
@@ -263,84 +353,55 @@ class VideoWorker:
                 logger.error(f"❌ text.json 저장 실패: {e}")
                 raise
 
-            # 영상 포맷 설정 (포맷에 따라 클래스 선택)
-            if video_format == 'youtube':
-                # YouTube: 타이틀 영역 강제 제거, letterbox fit 전용 생성기 사용
-                title_area_mode = 'remove'
-                try:
-                    from youtube_generator import YouTubeVideoGenerator
-                    self.video_generator = YouTubeVideoGenerator()
-                    logger.info("🎬 [Worker] YouTubeVideoGenerator 사용 (letterbox, 패닝 없음)")
-                except ImportError as e:
-                    logger.warning(f"⚠️ [Worker] YouTubeVideoGenerator 로드 실패, 기본 생성기 사용: {e}")
-                    self.video_generator = VideoGenerator()
-                    self.video_generator.set_video_format(video_format)
-            else:
-                self.video_generator = VideoGenerator()
-                self.video_generator.set_video_format(video_format)
-
-            # 대사별 TTS 설정을 인스턴스에 적용
+            # 포맷과 무관한 렌더 인자 (레이아웃/타이틀 영역/렌더 설정은 포맷별로 _render_format에서 결정)
+            render_kwargs = dict(
+                output_folder=output_folder,
+                bgm_file_path=bgm_file_path,
+                image_allocation_mode=image_allocation_mode,
+                text_position=text_position,
+                text_style=text_style,
+                uploads_folder=uploads_folder,
+                title_font=title_font,
+                body_font=body_font,
+                title_font_size=title_font_size,
+                body_font_size=body_font_size,
+                music_mood=music_mood,
+                voice_narration=voice_narration,
+                cross_dissolve=cross_dissolve,
+                subtitle_duration=subtitle_duration,
+                image_panning_options=parsed_panning_options,
+                tts_engine=tts_engine,
+                qwen_speaker=qwen_speaker,
+                qwen_speed=qwen_speed,
+                qwen_style=qwen_style,
+                edge_speaker=edge_speaker,
+                edge_speed=edge_speed,
+                edge_pitch=edge_pitch
+            )
             if parsed_per_body_tts:
-                self.video_generator.per_body_tts_settings = parsed_per_body_tts
-                logger.info(f"🎭 VideoGenerator에 대사별 TTS 설정 적용 완료")
+                logger.info(f"🎭 렌더 설정에 대사별 TTS 설정 적용 완료")
+
+            # 출력 포맷 (output_formats로 여러 포맷을 지정하면 준비 단계를 공유해 포맷별로 병렬 렌더)
+            output_formats = parse_output_formats(video_params.get('output_formats'), video_format)
 
             # 영상 생성 실행
             if use_test_files:
                 # 테스트 파일 사용
                 logger.info("🧪 테스트 파일 모드로 영상 생성")
-                result = self.video_generator.create_video_from_uploads(
-                    output_folder=output_folder,
-                    bgm_file_path=bgm_file_path,
-                    image_allocation_mode=image_allocation_mode,
-                    text_position=text_position,
-                    text_style=text_style,
-                    title_area_mode=title_area_mode,
-                    uploads_folder=uploads_folder,
-                    title_font=title_font,
-                    body_font=body_font,
-                    title_font_size=title_font_size,
-                    body_font_size=body_font_size,
-                    music_mood=music_mood,
-                    voice_narration=voice_narration,
-                    cross_dissolve=cross_dissolve,
-                    subtitle_duration=subtitle_duration,
-                    image_panning_options=parsed_panning_options,
-                    tts_engine=tts_engine,
-                    qwen_speaker=qwen_speaker,
-                    qwen_speed=qwen_speed,
-                    qwen_style=qwen_style,
-                    edge_speaker=edge_speaker,
-                    edge_speed=edge_speed,
-                    edge_pitch=edge_pitch
-                )
             else:
                 # 업로드된 파일 사용
                 logger.info("📁 업로드 파일 모드로 영상 생성")
-                result = self.video_generator.create_video_from_uploads(
-                    output_folder=output_folder,
-                    bgm_file_path=bgm_file_path,
-                    image_allocation_mode=image_allocation_mode,
-                    text_position=text_position,
-                    text_style=text_style,
-                    title_area_mode=title_area_mode,
-                    uploads_folder=uploads_folder,
-                    title_font=title_font,
-                    body_font=body_font,
-                    title_font_size=title_font_size,
-                    body_font_size=body_font_size,
-                    music_mood=music_mood,
-                    voice_narration=voice_narration,
-                    cross_dissolve=cross_dissolve,
-                    subtitle_duration=subtitle_duration,
-                    image_panning_options=parsed_panning_options,
-                    tts_engine=tts_engine,
-                    qwen_speaker=qwen_speaker,
-                    qwen_speed=qwen_speed,
-                    qwen_style=qwen_style,
-                    edge_speaker=edge_speaker,
-                    edge_speed=edge_speed,
-                    edge_pitch=edge_pitch
-                )
+            if len(output_formats) == 1:
+                outputs = {output_formats[0]: self._render_format(output_formats[0], title_area_mode, render_seed,
+                                                                  parsed_per_body_tts, render_kwargs,
+                                                                  reuse_segments=reuse_segments)}
+            else:
+                outputs = self._render_formats(output_formats, title_area_mode, render_seed,
+                                               parsed_per_body_tts, render_kwargs, reuse_segments=reuse_segments)
+
+            # 대표 결과는 첫 번째 포맷 (video_path), 포맷이 하나라도 실패하면 작업 실패
+            failed_outputs = [path for path in outputs.values() if not (path and isinstance(path, str))]
+            result = failed_outputs[0] if failed_outputs else outputs[output_formats[0]]
 
             if result and isinstance(result, str):
                 # 영상 생성 성공 (VideoGenerator는 성공 시 파일 경로 문자열 반환)
@@ -349,6 +410,21 @@ class VideoWorker:
 
                 logger.info(f"✅ 영상 생성 완료: {video_path}")
 
+                # 작업 완료 상태로 업데이트 (이 워커가 아직 처리 중인 작업일 때만 - 재대기 후 다른 워커가 클레임했으면 결과/알림 생략)
+                if not job_queue.update_job_status(
+                    job_id=job_id,
+                    status=JobStatus.COMPLETED,
+                    result={
+                        'video_path': video_path,
+                        'outputs': outputs,
+                        'duration': duration,
+                        'render_seed': render_seed,
+                        'completed_at': datetime.now().isoformat()
+                    },
+                    worker_id=self.worker_id
+                ):
+                    return None
+
                 # Job 로거에 출력 비디오 경로 설정
                 if JOB_LOGGER_AVAILABLE:
                     try:
@@ -358,43 +434,27 @@ class VideoWorker:
                     except Exception as log_error:
                         logger.warning(f"⚠️ Job 로그 완료 업데이트 실패: {log_error}")
 
-                # 작업 완료 상태로 업데이트
-                job_queue.update_job_status(
-                    job_id=job_id,
-                    status=JobStatus.COMPLETED,
-                    result={
-                        'video_path': video_path,
-                        'duration': duration,
-                        'completed_at': datetime.now().isoformat()
-                    }
-                )
-
-                # 완료 이메일 발송
-                logger.info(f"📧 완료 이메일 발송 시작: {user_email}")
-                email_sent = email_service.send_completion_email(
-                    user_email=user_email,
-                    video_path=video_path,
-                    video_title=video_title,
-                    duration=duration,
-                    content_data=content
-                )
-
-                if email_sent:
-                    logger.info(f"✅ 완료 이메일 발송 성공: {user_email}")
-                else:
-                    logger.error(f"❌ 완료 이메일 발송 실패: {user_email}")
-
-                # Webhook 알림 (webhook_url이 있을 때만)
-                webhook_url = video_params.get('webhook_url')
-                if webhook_url:
-                    try:
-                        download_token = email_service.generate_download_token(video_path, user_email)
-                        base_url = os.getenv("BASE_URL", "http://localhost:8097")
-                        video_download_url = f"{base_url}/api/download-video?token={download_token}"
-                    except Exception as token_error:
-                        logger.warning(f"⚠️ Webhook video_url 생성 실패: {token_error}")
-                        video_download_url = None
-                    self._send_webhook(webhook_url, job_id, "completed", video_url=video_download_url)
+                progress.set_state('completed', stage=None)
+
+                # 완료 이메일 (알림 아웃박스에 기록 → 발송 스레드가 전달, 워커는 바로 다음 작업으로)
+                queue_notification(notification_outbox.enqueue_completion_email, job_id, user_email,
+                                   video_path, video_title, duration, content, outputs)
+
+                # Webhook 알림 (webhook_url이 있을 때만, 처리 중 합류한 중복 제출의 webhook 포함)
+                job_webhook_urls = webhook_urls(job_queue.get_job(job_id) or job_data)
+                if job_webhook_urls:
+                    base_url = os.getenv("BASE_URL", "http://localhost:8097")
+                    output_urls = {}
+                    for output_format, output_path in outputs.items():
+                        try:
+                            download_token = email_service.generate_download_token(output_path, user_email)
+                            output_urls[output_format] = f"{base_url}/api/download-video?token={download_token}"
+                        except Exception as token_error:
+                            logger.warning(f"⚠️ Webhook video_url 생성 실패 ({output_format}): {token_error}")
+                    video_download_url = output_urls.get(output_formats[0])
+                    for webhook_url in job_webhook_urls:
+                        send_job_webhook(webhook_url, job_id, "completed", video_url=video_download_url,
+                                         outputs=output_urls if len(outputs) > 1 else None)
 
                 return True
 
@@ -403,6 +463,15 @@ class VideoWorker:
                 error_msg = f"예상하지 못한 결과 형태: {type(result)} - {str(result)}" if result else '영상 생성 실패'
                 logger.error(f"❌ 영상 생성 실패: {error_msg}")
 
+                # 작업 실패 상태로 업데이트 (이 워커가 아직 처리 중인 작업일 때만)
+                if not job_queue.update_job_status(
+                    job_id=job_id,
+                    status=JobStatus.FAILED,
+                    error_message=error_msg,
+                    worker_id=self.worker_id
+                ):
+                    return None
+
                 # Job 로거 상태 업데이트 (실패)
                 if JOB_LOGGER_AVAILABLE:
                     try:
@@ -411,13 +480,6 @@ class VideoWorker:
                     except Exception as log_error:
                         logger.warning(f"⚠️ Job 로그 실패 업데이트 실패: {log_error}")
 
-                # 작업 실패 상태로 업데이트
-                job_queue.update_job_status(
-                    job_id=job_id,
-                    status=JobStatus.FAILED,
-                    error_message=error_msg
-                )
-
                 # 실패 이메일 발송은 재시도 불가능할 때만 (run 메서드에서 처리)
                 # 이렇게 하면 재시도마다 이메일이 발송되지 않음
 
@@ -426,6 +488,15 @@ class VideoWorker:
         except Exception as e:
             logger.error(f"❌ 작업 처리 중 예외 발생: {e}")
 
+            # 작업 실패 상태로 업데이트 (이 워커가 아직 처리 중인 작업일 때만)
+            if not job_queue.update_job_status(
+                job_id=job_id,
+                status=JobStatus.FAILED,
+                error_message=str(e),
+                worker_id=self.worker_id
+            ):
+                return None
+
             # Job 로거 상태 업데이트 (예외로 인한 실패)
             if JOB_LOGGER_AVAILABLE:
                 try:
@@ -434,13 +505,6 @@ class VideoWorker:
                 except Exception as log_error:
                     logger.warning(f"⚠️ Job 로그 예외 실패 업데이트 실패: {log_error}")
 
-            # 작업 실패 상태로 업데이트
-            job_queue.update_job_status(
-                job_id=job_id,
-                status=JobStatus.FAILED,
-                error_message=str(e)
-            )
-
             # 실패 이메일 발송은 재시도 불가능할 때만 (run 메서드에서 처리)
             # 이렇게 하면 재시도마다 이메일이 발송되지 않음
 
@@ -449,6 +513,71 @@ class VideoWorker:
         finally:
             self.current_job = None
 
+    def _render_format(self, video_format: str, title_area_mode: str, render_seed: int,
+                       per_body_tts_settings: Optional[Dict[str, Any]], render_kwargs: Dict[str, Any],
+                       shared_prep: Optional[SharedPreparation] = None, reuse_segments: bool = False):
+        """포맷 1개 렌더 (포맷에 따라 공유 생성기 선택 - 폰트/발음 사전/TTS 모델 재사용)"""
+        generator = get_shared_generator(VideoGenerator)
+        if video_format == 'youtube':
+            # YouTube: 타이틀 영역 강제 제거, letterbox fit 전용 생성기 사용
+            title_area_mode = 'remove'
+            try:
+                from youtube_generator import YouTubeVideoGenerator
+                generator = get_shared_generator(YouTubeVideoGenerator)
+                logger.info("🎬 [Worker] YouTubeVideoGenerator 사용 (letterbox, 패닝 없음)")
+            except ImportError as e:
+                logger.warning(f"⚠️ [Worker] YouTubeVideoGenerator 로드 실패, 기본 생성기 사용: {e}")
+
+        # 작업별 렌더 설정 (포맷 레이아웃 + TTS + 대사별 TTS) - 생성기 인스턴스는 변경하지 않음
+        render_config = generator.build_render_config(
+            video_format,
+            tts_engine=render_kwargs['tts_engine'],
+            qwen_speaker=render_kwargs['qwen_speaker'],
+            qwen_speed=render_kwargs['qwen_speed'],
+            qwen_style=render_kwargs['qwen_style'],
+            per_body_tts_settings=per_body_tts_settings,
+            edge_speaker=render_kwargs['edge_speaker'],
+            edge_speed=render_kwargs['edge_speed'],
+            edge_pitch=render_kwargs['edge_pitch'],
+            render_seed=render_seed,
+            reuse_segments=reuse_segments
+        )
+        return generator.create_video_from_uploads(
+            title_area_mode=title_area_mode,
+            render_config=render_config,
+            shared_prep=shared_prep,
+            **render_kwargs
+        )
+
+    def _render_formats(self, output_formats, title_area_mode: str, render_seed: int,
+                        per_body_tts_settings: Optional[Dict[str, Any]], render_kwargs: Dict[str, Any],
+                        reuse_segments: bool = False) -> Dict[str, Any]:
+        """여러 포맷을 병렬 렌더 - TTS/미디어 검증/회전 정규화는 1회만 수행해 공유
+
+        Returns:
+            dict: {포맷: 영상 경로} (포맷 하나라도 예외가 나면 그대로 전파 → 작업 실패/재시도)
+        """
+        logger.info(f"🎞️ 다중 출력 렌더: {', '.join(output_formats)} (준비 단계 공유, 포맷별 병렬)")
+        # 진행 상황은 포맷별로 따로 기록하고 작업 전체 값은 집계 (세그먼트 수/인코딩 %가 포맷끼리 덮어쓰지 않도록)
+        reporter = get_active_reporter()
+        if reporter is not None:
+            for video_format in output_formats:
+                reporter.add_part(video_format)
+
+        def render_part(video_format, shared_prep):
+            with progress_part(video_format):
+                return self._render_format(video_format, title_area_mode, render_seed, per_body_tts_settings,
+                                           render_kwargs, shared_prep, reuse_segments)
+
+        with SharedPreparation(render_kwargs['tts_engine']) as shared_prep, \
+                ThreadPoolExecutor(max_workers=len(output_formats), thread_name_prefix='render-format') as pool:
+            # 컨텍스트(진행 상황 기록기, 단계 측정, 작업 공간)를 포맷별 렌더 스레드로 전달
+            futures = {
+                video_format: VideoGenerator._submit_in_context(pool, render_part, video_format, shared_prep)
+                for video_format in output_formats
+            }
+            return {video_format: future.result() for video_format, future in futures.items()}
+
     def start(self, poll_interval: int = 5):
         """워커 시작"""
         logger.info(f"🚀 워커 시작: {self.worker_id} (폴링 간격: {poll_interval}초)")
@@ -464,8 +593,11 @@ class VideoWorker:
                 if pending_jobs:
                     logger.info(f"📋 대기 중인 작업: {len(pending_jobs)}개")
 
-                    # 첫 번째 작업 처리
-                    job_data = pending_jobs[0]
+                    # 대기열 앞쪽 작업 중 가용 메모리에 맞는 작업 선택 (없으면 다른 워커가 메모리를 풀 때까지 대기)
+                    job_data = job_cost_model.pick_job(pending_jobs, self._other_busy_workers())
+                    if job_data is None:
+                        time.sleep(poll_interval)
+                        continue
                     job_id = job_data['job_id']
 
                     logger.info(f"🎯 작업 선택: {job_id}")
@@ -473,9 +605,14 @@ class VideoWorker:
                     # 작업 처리
                     success = self.process_job(job_data)
                     processed_jobs += 1
+                    self.processed_jobs = processed_jobs
 
-                    if success:
+                    if success is None:
+                        # 하트비트 지연으로 재대기된 뒤 다른 워커가 다시 클레임한 작업 - 결과/재시도/알림/폴더 정리는 새 처리가 담당
+                        logger.warning(f"⚠️ 작업 처리 권한 상실, 결과 폐기: {job_id}")
+                    elif success:
                         logger.info(f"✅ 작업 처리 완료: {job_id} (총 처리: {processed_jobs}개)")
+                        finish_batch(job_data, job_queue)
                         # 성공 시 Job 폴더 정리 (output 보존, uploads 정리)
                         if FOLDER_MANAGER_AVAILABLE:
                             try:
@@ -492,42 +629,23 @@ class VideoWorker:
 
                         # 재시도 가능한 경우 재시도 큐에 추가
                         can_retry = job_queue.retry_job(job_id)
+                        latest_job_data = job_queue.get_job(job_id) or {}
                         if can_retry:
                             logger.info(f"🔄 작업 재시도 큐에 추가: {job_id} (Job 폴더 유지)")
+                            publish_state(job_id, 'pending', stage=None, message='재시도 대기',
+                                          error=latest_job_data.get('error_message'))
                         else:
-                            # 최대 재시도 횟수 초과 - 최종 실패 이메일 발송
-                            logger.error(f"💀 최종 실패: {job_id} - 실패 이메일 발송")
+                            publish_state(job_id, 'failed', stage=None,
+                                          error=latest_job_data.get('error_message', '작업 처리 실패'))
+                            finish_batch(job_data, job_queue)
+                            # 최대 재시도 횟수 초과 - 최종 실패 이메일/webhook 기록
+                            logger.error(f"💀 최종 실패: {job_id} - 실패 알림 기록")
                             try:
-                                # job_data에서 user_email 추출
-                                user_email = job_data.get('user_email', 'unknown')
-
-                                # job_queue에서 최신 error_message 가져오기
-                                latest_job_data = job_queue.get_job(job_id)
+                                # job_queue의 최신 상태 (error_message, 합류한 중복 제출의 webhook 포함)
                                 error_msg = latest_job_data.get('error_message', '알 수 없는 오류') if latest_job_data else '작업 처리 실패'
-
-                                # video_params에서 대사 데이터 추출
-                                video_params = job_data.get('video_params', {})
-                                try:
-                                    content_data_str = video_params.get('content_data', '{}')
-                                    error_content = json.loads(content_data_str) if isinstance(content_data_str, str) else content_data_str
-                                except Exception:
-                                    error_content = None
-
-                                email_service.send_error_email(
-                                    user_email=user_email,
-                                    job_id=job_id,
-                                    error_message=error_msg,
-                                    content_data=error_content
-                                )
-                                logger.info(f"📧 최종 실패 이메일 발송 완료: {user_email}")
-
-                                # Webhook 알림 (webhook_url이 있을 때만)
-                                webhook_url = job_data.get('video_params', {}).get('webhook_url')
-                                if webhook_url:
-                                    self._send_webhook(webhook_url, job_id, "failed")
-
+                                notify_job_failed(latest_job_data or job_data, error_msg)
                             except Exception as email_error:
-                                logger.error(f"❌ 실패 이메일 발송 실패: {email_error}")
+                                logger.error(f"❌ 실패 알림 기록 실패: {email_error}")
 
                             # 최종 실패 시 Job 폴더 정리 (모든 폴더 삭제)
                             if FOLDER_MANAGER_AVAILABLE:
@@ -555,6 +673,8 @@ class VideoWorker:
         """워커 중지"""
         logger.info(f"🛑 워커 중지 요청: {self.worker_id}")
         self.is_running = False
+        self.heartbeat.stop()
+        self.notifier.stop()
 
     def get_status(self) -> Dict[str, Any]:
         """워커 상태 조회"""
@@ -562,6 +682,7 @@ class VideoWorker:
             'worker_id': self.worker_id,
             'is_running': self.is_running,
             'current_job': self.current_job,
+            'clip_readers': get_reader_stats(),
             'queue_stats': job_queue.get_job_stats()
         }
 
@@ -575,6 +696,20 @@ def run_worker(worker_id: str = None, poll_interval: int = 5):
     try:
         # 시작 전 큐 정리 (오래된 작업 제거)
         job_queue.cleanup_old_jobs(days=7)
+        notification_outbox.cleanup()
+
+        # 이전 워커 프로세스가 남긴 작업 공간 정리 (비정상 종료/재시작 대비)
+        cleanup_stale_workspaces()
+
+        # BGM 카탈로그 구축 (곡 분석/PCM 캐시는 백그라운드)
+        if BGM_CATALOG_AVAILABLE:
+            bgm_catalog.start_watcher()
+
+        # 하트비트 시작 (끊기면 처리 중이던 작업은 API 서버의 회수 루프가 재대기시킴)
+        worker.heartbeat.start()
+
+        # 알림 발송 스레드 시작 (이전 실행에서 남은 알림도 이어서 발송)
+        worker.notifier.start()
 
         # 워커 시작
         worker.start(poll_interval=poll_interval)
@@ -0,0 +1,119 @@
+"""
+워커 하트비트
+각 워커 프로세스가 주기적으로 자신의 상태(현재 작업, 진행 단계, 클립 리더 현황)를
+워커별 JSON 파일에 기록한다. 하트비트가 끊긴 워커의 처리 중 작업은
+cleanup_scheduler의 stale-job reaper가 다시 대기열로 돌려보낸다(또는 최종 실패 처리).
+"""
+
+import os
+import json
+import time
+import socket
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.logger_config import get_logger
+
+logger = get_logger('worker_heartbeat')
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+HEARTBEAT_DIR = os.getenv('WORKER_HEARTBEAT_DIR', os.path.join(current_dir, 'worker_heartbeats'))
+HEARTBEAT_INTERVAL_SECONDS = int(os.getenv('WORKER_HEARTBEAT_INTERVAL_SECONDS', '10'))
+HEARTBEAT_TTL_SECONDS = int(os.getenv('WORKER_HEARTBEAT_TTL_SECONDS', '60'))  # 이 시간 동안 갱신이 없으면 죽은 워커로 판단
+
+
+def heartbeat_path(worker_id: str) -> str:
+    return os.path.join(HEARTBEAT_DIR, f"{worker_id}.json")
+
+
+class HeartbeatWriter:
+    """워커 상태를 주기적으로 기록하는 백그라운드 스레드"""
+
+    def __init__(self, worker_id: str, status_fn: Callable[[], Dict[str, Any]],
+                 interval: int = HEARTBEAT_INTERVAL_SECONDS):
+        self.worker_id = worker_id
+        self.status_fn = status_fn
+        self.interval = interval
+        self.started_at = datetime.now().isoformat()
+        self.stop_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self):
+        os.makedirs(HEARTBEAT_DIR, exist_ok=True)
+        self.beat()
+        self.thread = threading.Thread(target=self._loop, name=f"heartbeat-{self.worker_id}", daemon=True)
+        self.thread.start()
+        logger.info(f"💓 워커 하트비트 시작: {self.worker_id} ({self.interval}초 간격)")
+
+    def stop(self):
+        """정상 종료 시 하트비트 파일 제거 (reaper가 즉시 죽은 워커로 판단)"""
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=self.interval + 1)
+        try:
+            os.remove(heartbeat_path(self.worker_id))
+        except OSError:
+            pass
+        logger.info(f"💓 워커 하트비트 종료: {self.worker_id}")
+
+    def beat(self):
+        """하트비트 1회 기록 (원자적 교체)"""
+        try:
+            record = {
+                'worker_id': self.worker_id,
+                'pid': os.getpid(),
+                'host': socket.gethostname(),
+                'started_at': self.started_at,
+                'heartbeat_at': time.time(),
+            }
+            record.update(self.status_fn())
+            path = heartbeat_path(self.worker_id)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(record, f, ensure_ascii=False, default=str)
+            os.replace(temp_path, path)
+        except Exception as e:
+            logger.warning(f"⚠️ 하트비트 기록 실패: {self.worker_id} - {e}")
+
+    def _loop(self):
+        while not self.stop_event.wait(self.interval):
+            self.beat()
+
+
+def list_heartbeats() -> List[Dict[str, Any]]:
+    """기록된 모든 워커 하트비트 (last_seen_seconds, alive 포함)"""
+    if not os.path.isdir(HEARTBEAT_DIR):
+        return []
+    now = time.time()
+    heartbeats = []
+    for name in sorted(os.listdir(HEARTBEAT_DIR)):
+        if not name.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(HEARTBEAT_DIR, name), 'r', encoding='utf-8') as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            continue
+        record['last_seen_seconds'] = round(now - record.get('heartbeat_at', 0), 1)
+        record['alive'] = record['last_seen_seconds'] <= HEARTBEAT_TTL_SECONDS
+        heartbeats.append(record)
+    return heartbeats
+
+
+def live_workers() -> List[Dict[str, Any]]:
+    """하트비트가 유효한 워커 목록"""
+    return [record for record in list_heartbeats() if record['alive']]
+
+
+def remove_dead_heartbeats(max_age_seconds: int = HEARTBEAT_TTL_SECONDS * 60) -> int:
+    """오래전에 끊긴 워커의 하트비트 파일 정리"""
+    removed = 0
+    for record in list_heartbeats():
+        if record['last_seen_seconds'] > max_age_seconds:
+            try:
+                os.remove(heartbeat_path(record['worker_id']))
+                removed += 1
+            except OSError:
+                pass
+    return removed
@@ -12,11 +12,13 @@ YouTube 16:9 포맷을 독립적으로 처리합니다.
 """
 
 import os
-import tempfile
 from PIL import Image, ImageOps
 from moviepy.editor import ImageClip, ColorClip, CompositeVideoClip, VideoFileClip
 
 from utils.logger_config import get_logger
+from render_config import RenderConfig
+from clip_registry import track_clip
+from scratch_space import scratch_file
 from video_generator import VideoGenerator
 
 logger = get_logger('youtube_generator')
@@ -37,30 +39,32 @@ class YouTubeVideoGenerator(VideoGenerator):
     def __init__(self):
         super().__init__()
 
-        # 캔버스 크기 재설정
-        self.video_width = self.CANVAS_W
-        self.video_height = self.CANVAS_H
-
-        # 타이틀 영역 없음 (YouTube 모드에서는 항상 title_area_mode='remove')
-        self.title_height = 0
-        self.work_height_keep = self.CANVAS_H
-        self.work_height_remove = self.CANVAS_H
-
-        # 텍스트 위치 (1280x720 기준)
-        # 상단: 캔버스 높이의 25% (180px)
-        # 하단: 캔버스 높이의 75% (540px)
-        self.text_y_top = 180
-        self.text_y_bottom = 540
-        self.text_y_bottom_edge_margin = 60
-
-        # 패닝 없음 (letterbox fit이므로 overflow 공간 없음)
-        self.panning_range = 0
-
         logger.info(
             f"🎬 YouTubeVideoGenerator 초기화 완료: "
             f"{self.video_width}x{self.video_height}, 타이틀 없음, 패닝 없음"
         )
 
+    def base_render_config(self, video_format: str = 'youtube'):
+        """YouTube letterbox 레이아웃 (video_format과 무관하게 항상 1280x720)"""
+        return RenderConfig.for_format(
+            'youtube',
+            # 캔버스 크기
+            video_width=self.CANVAS_W,
+            video_height=self.CANVAS_H,
+            # 타이틀 영역 없음 (YouTube 모드에서는 항상 title_area_mode='remove')
+            title_height=0,
+            work_height_keep=self.CANVAS_H,
+            work_height_remove=self.CANVAS_H,
+            # 텍스트 위치 (1280x720 기준)
+            # 상단: 캔버스 높이의 25% (180px)
+            # 하단: 캔버스 높이의 75% (540px)
+            text_y_top=180,
+            text_y_bottom=540,
+            text_y_bottom_edge_margin=60,
+            # 패닝 없음 (letterbox fit이므로 overflow 공간 없음)
+            panning_range=0,
+        )
+
     # ------------------------------------------------------------------
     # letterbox 계산 헬퍼
     # ------------------------------------------------------------------
@@ -132,7 +136,7 @@ class YouTubeVideoGenerator(VideoGenerator):
                 canvas.paste(resized, (x_off, y_off))
 
                 # 임시 파일 저장 (고품질 JPEG)
-                tmp = tempfile.NamedTemporaryFile(delete=False, suffix='.jpg')
+                tmp = scratch_file('.jpg', 'media')
                 canvas.save(tmp.name, 'JPEG', quality=95)
                 tmp.close()
 
@@ -171,7 +175,7 @@ class YouTubeVideoGenerator(VideoGenerator):
             # 회전 메타데이터 정규화 (iPhone .mov 등, 부모 메서드 재사용)
             norm_path, is_temp = self.normalize_video_rotation(video_path)
 
-            video_clip = VideoFileClip(norm_path)
+            video_clip = track_clip(VideoFileClip(norm_path))
             orig_w, orig_h = video_clip.size
             logger.info(f"📐 원본 비디오: {orig_w}x{orig_h}")
 